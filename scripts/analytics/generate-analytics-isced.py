@@ -11,6 +11,7 @@ Improves on the original analytics by:
 
 import json
 import math
+import sqlite3
 import sys
 import re
 from pathlib import Path
@@ -18,6 +19,12 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "knowledge-graph"))  # For rem_manifest
+from rem_manifest import load_manifest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "review"))  # For schedule_store
+from schedule_store import open_store
+
 
 class ISCEDAnalytics:
     """Analytics engine with ISCED domain classification"""
@@ -26,7 +33,7 @@ class ISCEDAnalytics:
         self.base_path = base_path or Path.cwd()
 
         # Load data sources
-        self.schedule = self.load_json('.review/schedule.json')
+        self.schedule = self.load_schedule()
         self.history = self.load_json('.review/history.json')
         self.chats = self.load_json('chats/index.json')
 
@@ -53,6 +60,17 @@ class ISCEDAnalytics:
         # Fallback: just title case the whole thing
         return domain_code.replace('-', ' ').title()
 
+    def load_schedule(self) -> Dict:
+        """Review schedule, from the SQLite store when enabled (schedule.json may lag it)"""
+        try:
+            store = open_store(self.base_path / '.review/schedule.json')
+        except sqlite3.Error as e:
+            print(f"Warning: schedule store unreadable ({e}), using schedule.json", file=sys.stderr)
+            store = None
+        if store is not None:
+            return store.to_schedule()
+        return self.load_json('.review/schedule.json')
+
     def load_json(self, path: str) -> Dict:
         """Load JSON file or return empty dict"""
         try:
@@ -67,37 +85,14 @@ class ISCEDAnalytics:
         concept_isced = {}
         kb_path = self.base_path / 'knowledge-base'
 
-        for rem_file in kb_path.rglob('*.md'):
-            if rem_file.name.startswith('_'):
+        for entry in load_manifest(kb_path).entries():
+            if entry.path.name.startswith('_'):
                 continue
 
-            try:
-                with open(rem_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                if content.startswith('---'):
-                    parts = content.split('---', 2)
-                    if len(parts) >= 3:
-                        frontmatter = parts[1]
-
-                        # Extract rem_id and isced
-                        rem_id = None
-                        isced = None
-
-                        for line in frontmatter.split('\n'):
-                            line = line.strip()
-                            if line.startswith('rem_id:'):
-                                rem_id = line.split(':', 1)[1].strip()
-                            elif line.startswith('isced:'):
-                                isced = line.split(':', 1)[1].strip()
-
-                        if rem_id and isced:
-                            # Extract domain from ISCED code
-                            domain = self.extract_domain_from_isced(isced)
-                            concept_isced[rem_id] = domain
-
-            except Exception:
-                continue
+            # Extract domain from ISCED code
+            if entry.rem_id and entry.isced:
+                domain = self.extract_domain_from_isced(entry.isced)
+                concept_isced[entry.rem_id] = domain
 
         return concept_isced
 
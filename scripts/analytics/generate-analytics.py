@@ -12,7 +12,7 @@ Calculates 7 key metrics from review and learning data:
 7. Time investment (hours/domain)
 
 Data Sources:
-- .review/schedule.json: SM-2 review schedule
+- .review/schedule.json: SM-2 review schedule (schedule.db when the SQLite store is enabled)
 - .review/history.json: Review session history
 - .review/adaptive-profile.json: Adaptive difficulty telemetry
 - knowledge-base/_index/backlinks.json: Concept relationships
@@ -24,12 +24,16 @@ Output:
 
 import json
 import math
+import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "review"))  # For schedule_store
+from schedule_store import open_store
+
 
 class AnalyticsEngine:
     """Aggregates learning analytics from multiple data sources"""
@@ -44,12 +48,23 @@ class AnalyticsEngine:
         self.base_path = base_path or Path.cwd()
 
         # Load all data sources
-        self.schedule = self.load_json('.review/schedule.json')
+        self.schedule = self.load_schedule()
         self.history = self.load_json('.review/history.json')
         self.adaptive = self.load_json('.review/adaptive-profile.json')
         self.backlinks = self.load_json('knowledge-base/_index/backlinks.json')
         self.chats = self.load_json('chats/index.json')
 
+    def load_schedule(self) -> Dict:
+        """Review schedule, from the SQLite store when enabled (schedule.json may lag it)"""
+        try:
+            store = open_store(self.base_path / '.review/schedule.json')
+        except sqlite3.Error as e:
+            print(f"Warning: schedule store unreadable ({e}), using schedule.json", file=sys.stderr)
+            store = None
+        if store is not None:
+            return store.to_schedule()
+        return self.load_json('.review/schedule.json')
+
     def load_json(self, path: str) -> Dict:
         """
         Load JSON file or return empty dict
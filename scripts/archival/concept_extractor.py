@@ -12,7 +12,9 @@ from typing import List, Dict, Optional
 # Add scripts directory to path
 SCRIPT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(SCRIPT_DIR / "knowledge-graph"))  # For rem_manifest
 
+from rem_manifest import load_manifest
 from utils.token_estimation import estimate_tokens, check_token_limit, format_token_count
 
 class ConceptExtractor:
@@ -106,28 +108,17 @@ class ConceptExtractor:
         if not self.kb_dir.exists():
             return duplicates
 
-        # Scan all Rem files for title comparison
+        # Collect frontmatter titles from the shared Rem manifest
         existing_titles = []
-        for md_file in self.kb_dir.rglob('*.md'):
+        for entry in load_manifest(self.kb_dir).entries():
             # Skip templates and index
-            if '_template' in str(md_file) or '_index' in str(md_file):
-                continue
-
-            try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    # Read first 10 lines to find title in frontmatter
-                    for i, line in enumerate(f):
-                        if i > 10:
-                            break
-                        if line.startswith('title:'):
-                            title = line.replace('title:', '').strip().strip('"\'')
-                            existing_titles.append({
-                                'title': title.lower(),
-                                'file': str(md_file)
-                            })
-                            break
-            except Exception:
+            if '_template' in str(entry.path) or '_index' in str(entry.path):
                 continue
+            if entry.title:
+                existing_titles.append({
+                    'title': entry.title.lower(),
+                    'file': str(entry.path)
+                })
 
         # Check each candidate against existing titles
         for concept in candidate_concepts:
@@ -30,6 +30,9 @@ from typing import Dict, List, Set
 # Constants
 ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "scripts" / "knowledge-graph"))  # For knowledge_graph
+
+from knowledge_graph import load_graph
 
 KB_DIR = ROOT / "knowledge-base"
 BACKLINKS_FILE = KB_DIR / "_index" / "backlinks.json"
@@ -52,19 +55,16 @@ VALID_RELATION_TYPES = {
 }
 
 
-def load_backlinks() -> Dict:
-    """Load backlinks.json"""
+def load_concepts_meta() -> Dict[str, Dict]:
+    """Load concept metadata from the indexed knowledge graph"""
     if not BACKLINKS_FILE.exists():
-        return {'concepts': {}}
-
-    with open(BACKLINKS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        return {}
+    return load_graph(BACKLINKS_FILE).concepts
 
 
 def get_existing_concepts(domain_path: str) -> Dict[str, Dict]:
     """Get all existing concepts in domain with metadata"""
-    backlinks = load_backlinks()
-    concepts_meta = backlinks.get('concepts', {})
+    concepts_meta = load_concepts_meta()
 
     existing = {}
     for concept_id, meta in concepts_meta.items():
@@ -191,16 +191,21 @@ def atomic_write_all_files(
     return result
 
 
-def update_knowledge_graph(rem_ids: List[str], conversation_path: Path, metadata: Dict):
+def update_knowledge_graph(
+    rem_ids: List[str],
+    conversation_path: Path,
+    metadata: Dict,
+    rem_paths: Optional[List[Path]] = None
+):
     """
     Update Knowledge Graph
 
     Executes:
       1. update-backlinks-incremental.py (rebuild backlinks for new Rems)
       2. update-conversation-index.py (add to chats/index.json)
-      3. normalize-links.py (normalize wikilinks)
+      3. normalize-links.py (normalize wikilinks, written Rems only)
       4. sync-related-rems-from-backlinks.py (update Related Rems sections)
-      5. fix-bidirectional-links.py (add missing reverse links)
+      5. fix-bidirectional-links.py (add missing reverse links, new Rems only)
     """
     print("\n" + "="*60, file=sys.stderr)
     print("🔗 Update Knowledge Graph", file=sys.stderr)
@@ -259,10 +264,13 @@ def update_knowledge_graph(rem_ids: List[str], conversation_path: Path, metadata
     else:
         print(f"  ✓ Conversation index updated", file=sys.stderr)
 
-    # Sub-step 3: Normalize wikilinks
+    # Sub-step 3: Normalize wikilinks (only the Rems just written when known)
     print("  Normalizing wikilinks...", file=sys.stderr)
+    normalize_cmd = [sys.executable, 'scripts/knowledge-graph/normalize-links.py', '--mode', 'replace']
+    if rem_paths:
+        normalize_cmd += ['--files'] + [str(p) for p in rem_paths]
     result = subprocess.run(
-        [sys.executable, 'scripts/knowledge-graph/normalize-links.py', '--mode', 'replace'],
+        normalize_cmd,
         cwd=ROOT,
         capture_output=True,
         text=True
@@ -288,7 +296,7 @@ def update_knowledge_graph(rem_ids: List[str], conversation_path: Path, metadata
     # Sub-step 4.5: Fix bidirectional links (add missing reverses)
     print("  Fixing bidirectional links...", file=sys.stderr)
     result = subprocess.run(
-        [sys.executable, 'scripts/fix-bidirectional-links.py'],
+        [sys.executable, 'scripts/fix-bidirectional-links.py', '--concept-ids'] + rem_ids,
         cwd=ROOT,
         capture_output=True,
         text=True
@@ -721,7 +729,7 @@ def main():
 
     # Update knowledge graph (backlinks + indexes + normalization)
     rem_ids = [r['rem_id'] for r in rems]
-    update_knowledge_graph(rem_ids, write_result.conversation_path, metadata)
+    update_knowledge_graph(rem_ids, write_result.conversation_path, metadata, write_result.created_rems)
 
     # Materialize inferred links (optional, non-interactive)
     if not args.skip_materialize:
@@ -7,9 +7,12 @@ import sys
 import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "knowledge-graph"))  # For rem_resolver
+from rem_resolver import get_resolver
+
 def find_rem_file(rem_id):
-    """Find Rem file by ID using glob."""
-    matches = list(Path('knowledge-base').rglob(f'{rem_id}.md'))
+    """Find Rem file by ID using the persistent Rem resolver index."""
+    matches = get_resolver(Path('knowledge-base')).find_all(rem_id)
     if len(matches) == 0:
         print(f"Error: Rem {rem_id} not found", file=sys.stderr)
         return None
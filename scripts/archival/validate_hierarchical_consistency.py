@@ -12,12 +12,16 @@ Purpose: Prevent hierarchical contradictions in knowledge graph
 
 import json
 import sys
-from typing import List, Dict, Tuple, Set
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Set
 from collections import defaultdict
 
 # Import relation types from central configuration
 from relation_types import ASYMMETRIC_TYPES, SYMMETRIC_TYPES, PAIRED_TYPES
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "knowledge-graph"))
+from reachability import ReachabilityIndex, load_reachability
+
 
 class ContradictionError:
     """Represents a hierarchical contradiction"""
@@ -167,12 +171,63 @@ def validate_proposed_relations(
     return (len(errors) == 0, errors)
 
 
-def detect_cycles(enriched_rems: List[dict]) -> List[List[str]]:
+def check_hierarchy(
+    enriched_rems: List[dict],
+    reachability: ReachabilityIndex
+) -> Tuple[List[ContradictionError], List[List[str]]]:
     """
-    Detect cycles in prerequisite_of relations using DFS.
+    Check proposed prerequisite/component relations against the whole KB.
+
+    Each relation is looked up in the reachability index (O(1)); relations
+    that pass are layered onto it, so later relations in the same batch are
+    checked against KB + batch. A relation that would close a cycle, i.e.
+    contradict an existing ancestor chain, is reported as a critical error.
+
+    Returns: (errors, cycles) - cycles as lists of rem_ids, like detect_cycles()
+    """
+    errors = []
+    cycles = []
+    for rem in enriched_rems:
+        rem_id = rem.get('rem_id')
+        for rel in rem.get('typed_relations', []):
+            cycle = reachability.closes_cycle(rem_id, rel['to'], rel['type'])
+            if cycle:
+                cycles.append(cycle[:-1])
+                errors.append(ContradictionError(
+                    from_rem=rem_id,
+                    to_rem=rel['to'],
+                    rel_type=rel['type'],
+                    issue=f"Would close a hierarchy cycle: {' → '.join(cycle)}",
+                    severity='critical'
+                ))
+            else:
+                reachability.add_edge(rem_id, rel['to'], rel['type'])
+    return errors, cycles
+
+
+def load_hierarchy_index(backlinks_path: Optional[Path] = None) -> Optional[ReachabilityIndex]:
+    """Load the KB-wide reachability index, or None if backlinks.json is unavailable."""
+    try:
+        if backlinks_path is None:
+            return load_reachability()
+        return load_reachability(Path(backlinks_path))
+    except (OSError, ValueError):
+        return None
+
+
+def detect_cycles(enriched_rems: List[dict],
+                  reachability: Optional[ReachabilityIndex] = None) -> List[List[str]]:
+    """
+    Detect cycles in prerequisite_of relations.
+
+    With a reachability index, cycles are found across the whole KB (see
+    check_hierarchy); otherwise a DFS over the batch's own relations is used.
 
     Returns: List of cycles (each cycle is a list of rem_ids)
     """
+    if reachability is not None:
+        return check_hierarchy(enriched_rems, reachability)[1]
+
     # Build graph of prerequisite relations
     graph = defaultdict(list)
     for rem in enriched_rems:
@@ -245,6 +300,7 @@ def print_validation_report(errors: List[ContradictionError], cycles: List[List[
         same_type = [e for e in critical if 'Same-type bidirectional' in e.issue]
         wrong_type = [e for e in critical if 'Wrong reverse type' in e.issue]
         backlink_conflict = [e for e in critical if 'already exists in backlinks' in e.issue]
+        hierarchy_cycle = [e for e in critical if 'hierarchy cycle' in e.issue]
 
         if same_type:
             print(f"\n  Same-Type Bidirectional ({len(same_type)}):")
@@ -270,6 +326,14 @@ def print_validation_report(errors: List[ContradictionError], cycles: List[List[
             if len(backlink_conflict) > 5:
                 print(f"    ... and {len(backlink_conflict) - 5} more")
 
+        if hierarchy_cycle:
+            print(f"\n  Hierarchy Cycles Across KB ({len(hierarchy_cycle)}):")
+            for i, error in enumerate(hierarchy_cycle[:5], 1):
+                print(f"    {i}. {error.from_rem} → {error.to_rem} [{error.rel_type}]")
+                print(f"       {error.issue}")
+            if len(hierarchy_cycle) > 5:
+                print(f"    ... and {len(hierarchy_cycle) - 5} more")
+
     if warnings:
         print("\n" + "-" * 80)
         print("⚠️  WARNINGS (should review)")
@@ -408,12 +408,22 @@ def main():
         if not args.quiet:
             print("\n🔍 Validating hierarchical consistency...", file=sys.stderr)
         from archival.validate_hierarchical_consistency import (
-            build_relation_map, validate_proposed_relations, detect_cycles
+            build_relation_map, validate_proposed_relations, detect_cycles,
+            check_hierarchy, load_hierarchy_index
         )
 
         existing_relations = build_relation_map(backlinks)
         is_valid, errors = validate_proposed_relations(enriched_rems, existing_relations)
-        cycles = detect_cycles(enriched_rems)
+
+        # Cycles and ancestor-chain contradictions across the whole KB
+        # (falls back to batch-only cycle detection without backlinks.json)
+        hierarchy_index = load_hierarchy_index()
+        if hierarchy_index is not None:
+            hierarchy_errors, cycles = check_hierarchy(enriched_rems, hierarchy_index)
+            errors.extend(hierarchy_errors)
+            is_valid = is_valid and not hierarchy_errors
+        else:
+            cycles = detect_cycles(enriched_rems)
 
         if not is_valid or cycles:
             print(f"\n❌ VALIDATION FAILED: Hierarchical contradictions detected!", file=sys.stderr)
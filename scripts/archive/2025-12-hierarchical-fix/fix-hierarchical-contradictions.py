@@ -53,6 +53,9 @@ from rebuild_utils import (
     cleanup_old_backups
 )
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "knowledge-graph"))
+from reachability import Hierarchy, normalize_edge
+
 # Constants
 KB_DIR = ROOT / "knowledge-base"
 IDX_DIR = KB_DIR / "_index"
@@ -146,6 +149,7 @@ class HierarchicalContradictionFixer:
         self.backlinks_data = None
         self.contradictions = []
         self.stats = ResolutionStats()
+        self.hierarchy: Optional[Hierarchy] = None
         
     def load_backlinks(self) -> bool:
         """Load backlinks.json file"""
@@ -197,6 +201,25 @@ class HierarchicalContradictionFixer:
         
         return contradictions
     
+    def build_hierarchy(self) -> None:
+        """
+        Prerequisite reachability over every edge outside the contradicting pairs.
+
+        Lets analyze_prerequisites() settle a pair from the rest of the graph:
+        if A reaches B through other prerequisite chains, A is the prerequisite.
+        """
+        contested = {c.pair_key for c in self.contradictions}
+        edges = []
+        for rem_id, rem_data in self.backlinks_data['links'].items():
+            for typed_link in rem_data.get('typed_links_to', []):
+                normalized = normalize_edge(rem_id, typed_link['to'], typed_link['type'])
+                if not normalized or normalized[0] != 'prerequisite':
+                    continue
+                if tuple(sorted([rem_id, typed_link['to']])) in contested:
+                    continue
+                edges.append(normalized[1:])
+        self.hierarchy = Hierarchy.from_edges(edges)
+
     def get_rem_info(self, rem_id: str) -> Dict:
         """Get concept information for a Rem"""
         if rem_id in self.backlinks_data.get('concepts', {}):
@@ -272,6 +295,15 @@ class HierarchicalContradictionFixer:
         Returns 'a' if rem_a is prerequisite, 'b' if rem_b is prerequisite,
         or 'unknown' if cannot determine.
         """
+        # The rest of the prerequisite hierarchy decides when it orders the pair
+        if self.hierarchy is not None:
+            a_to_b = self.hierarchy.reaches(rem_a, rem_b)
+            b_to_a = self.hierarchy.reaches(rem_b, rem_a)
+            if a_to_b and not b_to_a:
+                return 'a'
+            if b_to_a and not a_to_b:
+                return 'b'
+
         # Check for explicit ordering indicators
         info_a = self.get_rem_info(rem_a)
         info_b = self.get_rem_info(rem_b)
@@ -566,6 +598,12 @@ class HierarchicalContradictionFixer:
         
         # Resolve each contradiction
         self.logger.info("Analyzing and resolving contradictions...")
+        self.build_hierarchy()
+        longer_cycles = [c for c in self.hierarchy.cycles() if len(c) > 2]
+        if longer_cycles:
+            self.logger.warning(f"{len(longer_cycles)} prerequisite cycles span 3+ Rems (not auto-fixed):")
+            for members in longer_cycles[:5]:
+                self.logger.warning(f"  {', '.join(members)}")
         with_progress = len(contradictions) > 10
         
         for i, contradiction in enumerate(contradictions):
@@ -3,13 +3,24 @@
 Enhanced bidirectional links fixer with multi-pair detection.
 
 Prevents adding reverse links if the node pair already has a different paired relation.
+
+All checks are lookups in the hashed (from, to, type) edge set of the
+KnowledgeGraph, so a full run is a single O(E) pass over typed edges.
+
+Usage:
+    source venv/bin/activate && python scripts/fix-bidirectional-links.py [--dry-run]
+    source venv/bin/activate && python scripts/fix-bidirectional-links.py --concept-ids rem-a rem-b
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent / "knowledge-graph"))
+from knowledge_graph import KnowledgeGraph
+
 # Symmetric relations
 SYMMETRIC_TYPES = {
     'related_to', 'contrasts_with', 'complements',
@@ -47,7 +58,7 @@ def load_backlinks():
         data = json.load(f)
     return data
 
-def get_existing_paired_relations(backlinks, node_a, node_b):
+def get_existing_paired_relations(graph, node_a, node_b):
     """
     Get all existing paired relations between two nodes.
 
@@ -55,101 +66,104 @@ def get_existing_paired_relations(backlinks, node_a, node_b):
     """
     paired_types = set()
 
-    # Check A → B
-    if node_a in backlinks:
-        for link in backlinks[node_a].get('typed_links_to', []):
-            if link.get('to') == node_b:
-                rel_type = link.get('type')
-                if rel_type in ASYMMETRIC_PAIRS:
-                    # Check if reverse exists
-                    expected_reverse = ASYMMETRIC_PAIRS[rel_type]
-                    if node_b in backlinks:
-                        for reverse_link in backlinks[node_b].get('typed_links_to', []):
-                            if reverse_link.get('to') == node_a and reverse_link.get('type') == expected_reverse:
-                                paired_types.add(rel_type)
-                                break
+    # Check A → B (typed edges are hash-indexed)
+    for rel_type in graph.relation_types(node_a, node_b):
+        if rel_type in ASYMMETRIC_PAIRS:
+            # Check if reverse exists
+            if graph.has_edge(node_b, node_a, ASYMMETRIC_PAIRS[rel_type]):
+                paired_types.add(rel_type)
 
     return paired_types
 
-def find_missing_bidirectional(backlinks_data):
-    """Find missing bidirectional links while detecting multi-pair conflicts."""
-    backlinks = backlinks_data.get('links', {})
+def iter_typed_edges(graph, concept_ids=None):
+    """
+    Yield (source, target, type) typed edges in index order.
+
+    With concept_ids, only edges touching those concepts (outgoing or
+    incoming) are yielded, each once.
+    """
+    if concept_ids is None:
+        for source_id in graph:
+            for target_id, rel_type in graph.typed_links_to(source_id):
+                yield source_id, target_id, rel_type
+        return
+
+    seen = set()
+    for concept_id in concept_ids:
+        edges = [(concept_id, t, rel) for t, rel in graph.typed_links_to(concept_id)]
+        edges += [(s, concept_id, rel) for s, rel in graph.typed_linked_from(concept_id)]
+        for edge in edges:
+            if edge not in seen:
+                seen.add(edge)
+                yield edge
+
+def find_missing_bidirectional(graph, concept_ids=None):
+    """
+    Find missing bidirectional links while detecting multi-pair conflicts.
+
+    Single pass over typed edges (or only edges touching concept_ids);
+    every reverse and multi-pair check is an O(1) edge-set lookup.
+    """
     missing = []
     multi_pair_warnings = []
     checked_pairs = set()
 
-    for source_id, source_data in backlinks.items():
-        for link_info in source_data.get('typed_links_to', []):
-            if not isinstance(link_info, dict):
-                continue
-
-            target_id = link_info.get('to')
-            rel_type = link_info.get('type')
-
-            if not target_id or not rel_type:
-                continue
-
-            if target_id not in backlinks:
-                print(f"Warning: Target {target_id} not in backlinks index", file=sys.stderr)
-                continue
-
-            # Create canonical pair key
-            if rel_type in SYMMETRIC_TYPES:
-                pair_key = tuple(sorted([source_id, target_id])) + (rel_type,)
-            else:
-                pair_key = (source_id, target_id, rel_type)
-
-            if pair_key in checked_pairs:
-                continue
-            checked_pairs.add(pair_key)
-
-            target_data = backlinks[target_id]
-
-            # Determine expected reverse type
-            if rel_type in SYMMETRIC_TYPES:
-                expected_reverse = rel_type
-            elif rel_type in ASYMMETRIC_PAIRS:
-                expected_reverse = ASYMMETRIC_PAIRS[rel_type]
-            else:
+    for source_id, target_id, rel_type in iter_typed_edges(graph, concept_ids):
+        if target_id not in graph:
+            print(f"Warning: Target {target_id} not in backlinks index", file=sys.stderr)
+            continue
+
+        # Create canonical pair key
+        if rel_type in SYMMETRIC_TYPES:
+            pair_key = tuple(sorted([source_id, target_id])) + (rel_type,)
+        else:
+            pair_key = (source_id, target_id, rel_type)
+
+        if pair_key in checked_pairs:
+            continue
+        checked_pairs.add(pair_key)
+
+        # Determine expected reverse type
+        if rel_type in SYMMETRIC_TYPES:
+            expected_reverse = rel_type
+        elif rel_type in ASYMMETRIC_PAIRS:
+            expected_reverse = ASYMMETRIC_PAIRS[rel_type]
+        else:
+            continue
+
+        # Check if reverse exists
+        if not graph.has_edge(target_id, source_id, expected_reverse):
+            # 🔧 NEW: Check if this pair already has OTHER paired relations
+            existing_pairs = get_existing_paired_relations(graph, source_id, target_id)
+
+            if existing_pairs:
+                # This would create a second pair - SKIP
+                multi_pair_warnings.append({
+                    'node_a': source_id,
+                    'node_b': target_id,
+                    'existing_pairs': list(existing_pairs),
+                    'would_add': expected_reverse,
+                    'forward_rel': rel_type,
+                    'reason': f"Would create multiple paired relations between {source_id} and {target_id}"
+                })
+                print(f"⚠️  SKIP: {source_id} ↔ {target_id} already has {existing_pairs}, won't add reverse {expected_reverse} for {rel_type}", file=sys.stderr)
                 continue
 
-            # Check if reverse exists
-            has_reverse = False
-            for reverse_link in target_data.get('typed_links_to', []):
-                if reverse_link.get('to') == source_id and reverse_link.get('type') == expected_reverse:
-                    has_reverse = True
-                    break
-
-            if not has_reverse:
-                # 🔧 NEW: Check if this pair already has OTHER paired relations
-                existing_pairs = get_existing_paired_relations(backlinks, source_id, target_id)
-
-                if existing_pairs:
-                    # This would create a second pair - SKIP
-                    multi_pair_warnings.append({
-                        'node_a': source_id,
-                        'node_b': target_id,
-                        'existing_pairs': list(existing_pairs),
-                        'would_add': expected_reverse,
-                        'forward_rel': rel_type,
-                        'reason': f"Would create multiple paired relations between {source_id} and {target_id}"
-                    })
-                    print(f"⚠️  SKIP: {source_id} ↔ {target_id} already has {existing_pairs}, won't add reverse {expected_reverse} for {rel_type}", file=sys.stderr)
-                    continue
-
-                missing.append({
-                    'source': target_id,
-                    'target': source_id,
-                    'type': expected_reverse,
-                    'reason': f'Missing reverse of {source_id} -> {target_id} [{rel_type}]'
-                })
+            missing.append({
+                'source': target_id,
+                'target': source_id,
+                'type': expected_reverse,
+                'reason': f'Missing reverse of {source_id} -> {target_id} [{rel_type}]'
+            })
 
     return missing, multi_pair_warnings
 
-def add_missing_links(backlinks_data, missing_links):
-    """Add the missing bidirectional links."""
+def add_missing_links(backlinks_data, graph, missing_links):
+    """Add the missing bidirectional links (keeps graph in sync)."""
     backlinks = backlinks_data.get('links', {})
     added_count = 0
+    # target -> hashed (from, type) of its typed_linked_from, built on first use
+    reverse_seen = {}
 
     for link in missing_links:
         source_id = link['source']
@@ -165,14 +179,8 @@ def add_missing_links(backlinks_data, missing_links):
 
         source_data = backlinks[source_id]
 
-        # Check if link already exists
-        exists = False
-        for existing_link in source_data.get('typed_links_to', []):
-            if existing_link.get('to') == target_id and existing_link.get('type') == rel_type:
-                exists = True
-                break
-
-        if not exists:
+        # Check if link already exists (O(1) typed-edge lookup)
+        if graph.add_typed_edge(source_id, target_id, rel_type):
             if 'typed_links_to' not in source_data:
                 source_data['typed_links_to'] = []
 
@@ -181,19 +189,17 @@ def add_missing_links(backlinks_data, missing_links):
                 'type': rel_type
             })
 
-            # Update typed_linked_from for target
+            # Update typed_linked_from for target, unless a stale entry is already there
             if target_id in backlinks:
                 target_data = backlinks[target_id]
                 if 'typed_linked_from' not in target_data:
                     target_data['typed_linked_from'] = []
 
-                from_exists = False
-                for existing_from in target_data['typed_linked_from']:
-                    if existing_from.get('from') == source_id and existing_from.get('type') == rel_type:
-                        from_exists = True
-                        break
-
-                if not from_exists:
+                if target_id not in reverse_seen:
+                    reverse_seen[target_id] = {(e.get('from'), e.get('type'))
+                                               for e in target_data['typed_linked_from']}
+                if (source_id, rel_type) not in reverse_seen[target_id]:
+                    reverse_seen[target_id].add((source_id, rel_type))
                     target_data['typed_linked_from'].append({
                         'from': source_id,
                         'type': rel_type
@@ -221,11 +227,22 @@ def save_backlinks(backlinks_data):
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description='Add missing reverse typed links to backlinks.json')
+    parser.add_argument('--concept-ids', nargs='+',
+                        help='Only check edges touching these concepts (e.g. Rems just saved)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report missing links without writing')
+    args = parser.parse_args()
+
     print("Loading backlinks index...", file=sys.stderr)
     backlinks_data = load_backlinks()
+    graph = KnowledgeGraph.from_data(backlinks_data)
 
-    print("Finding missing bidirectional links...", file=sys.stderr)
-    missing_links, multi_pair_warnings = find_missing_bidirectional(backlinks_data)
+    if args.concept_ids:
+        print(f"Finding missing bidirectional links for {len(args.concept_ids)} concepts...", file=sys.stderr)
+    else:
+        print("Finding missing bidirectional links...", file=sys.stderr)
+    missing_links, multi_pair_warnings = find_missing_bidirectional(graph, args.concept_ids)
 
     print(f"\nFound {len(missing_links)} missing bidirectional links", file=sys.stderr)
 
@@ -244,9 +261,11 @@ def main():
         for rel_type, count in sorted(by_type.items(), key=lambda x: -x[1]):
             print(f"  {rel_type}: {count}", file=sys.stderr)
 
-    if missing_links:
+    if missing_links and args.dry_run:
+        print("\nDRY RUN - no changes written", file=sys.stderr)
+    elif missing_links:
         print(f"\nAdding {len(missing_links)} missing links...", file=sys.stderr)
-        added = add_missing_links(backlinks_data, missing_links)
+        added = add_missing_links(backlinks_data, graph, missing_links)
         print(f"Successfully added {added} links", file=sys.stderr)
 
         print("\nSaving updated backlinks...", file=sys.stderr)
@@ -32,6 +32,21 @@ def extract_tags_from_conversation(file_path):
                     return [t for t in tags if t]  # Filter empty
     return []
 
+def node_conversations(node, content_dir, shards):
+    """Conversations of a node, inline (older files) or from its content shard."""
+    if 'conversations' in node:
+        return node['conversations']
+    if not content_dir or not node.get('shard'):
+        return []
+    name = node['shard']
+    if name not in shards:
+        shard_path = content_dir / f"{name}.json"
+        shards[name] = {}
+        if shard_path.exists():
+            with open(shard_path, 'r', encoding='utf-8') as f:
+                shards[name] = json.load(f)
+    return shards[name].get('nodes', {}).get(node['id'], {}).get('conversations', [])
+
 def fix_graph_tags():
     """Main function to fix missing tags in graph."""
 
@@ -41,6 +56,9 @@ def fix_graph_tags():
         graph_data = json.load(f)
 
     fixed_count = 0
+    content_dir = graph_data['metadata'].get('contentDir')
+    content_dir = Path(graph_path).parent / content_dir if content_dir else None
+    shards = {}
 
     for node in graph_data['nodes']:
         # Skip template node
@@ -50,9 +68,10 @@ def fix_graph_tags():
         # If tags are empty or missing
         if not node.get('tags'):
             # Try to get tags from conversations
-            if 'conversations' in node:
+            conversations = node_conversations(node, content_dir, shards)
+            if conversations:
                 all_tags = set()
-                for conv in node['conversations']:
+                for conv in conversations:
                     conv_path = conv.get('path', '')
                     if conv_path:
                         # Fix path if needed
@@ -70,7 +89,7 @@ def fix_graph_tags():
 
     # Save updated graph
     with open(graph_path, 'w', encoding='utf-8') as f:
-        json.dump(graph_data, f, indent=2, ensure_ascii=False)
+        json.dump(graph_data, f, separators=(',', ':'), ensure_ascii=False)
 
     print(f"\nTotal nodes fixed: {fixed_count}")
     return fixed_count
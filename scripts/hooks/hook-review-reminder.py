@@ -3,14 +3,19 @@ import os
 import sys
 """
 UserPromptSubmit Hook: Gentle review reminder every 10th user input
-Checks .review/schedule.json for overdue reviews and reminds user periodically
+Checks .review/schedule.json (via the due index) for overdue reviews and reminds user periodically
 """
 
 import json
+import sqlite3
 import sys
-from datetime import datetime, date
+from datetime import date
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'review'))
+from due_index import load_due_index
+from schedule_store import open_store
+
 # Portable project root detection using CLAUDE_PROJECT_DIR
 # This environment variable is set by Claude Code to the project root
 PROJECT_DIR = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
@@ -45,37 +50,20 @@ def save_counter(count: int):
 
 
 def count_overdue_reviews() -> int:
-    """Count concepts that are overdue for review"""
+    """Count concepts that are due today or overdue"""
     if not SCHEDULE_FILE.exists():
         return 0
 
+    today = date.today().strftime('%Y-%m-%d')
     try:
-        with open(SCHEDULE_FILE, 'r') as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, IOError):
+        store = open_store(SCHEDULE_FILE)
+        if store is not None:
+            return store.count_due(today)
+        index = load_due_index(SCHEDULE_FILE)
+    except (ValueError, OSError, sqlite3.Error):
         return 0
 
-    today = date.today()
-    concepts = data.get('concepts', {})
-
-    # Handle both dict and list formats
-    if isinstance(concepts, dict):
-        concepts = concepts.values()
-
-    # Count overdue (not just due today, but past due)
-    overdue_count = 0
-    for concept in concepts:
-        fsrs_state = concept.get('fsrs_state', {})
-        next_review = fsrs_state.get('next_review')
-        if next_review:
-            try:
-                review_date = datetime.strptime(next_review, '%Y-%m-%d').date()
-                if review_date <= today:  # Due today or overdue
-                    overdue_count += 1
-            except (ValueError, TypeError):
-                continue
-
-    return overdue_count
+    return index.count_due(today)
 
 
 def main():
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 """
 SessionStart Hook: Display count of due reviews on session startup
-Reads .review/schedule.json and counts concepts where next_review_date <= today
+Counts concepts whose fsrs_state.next_review <= today from the due index
+next to .review/schedule.json (schedule.json is only parsed if the index is stale),
+or from the SQLite store when that backend is enabled
 """
 
 import os
+import sqlite3
 import sys
-import json
-from datetime import datetime, date
+from datetime import date
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'review'))
+from due_index import load_due_index
+from schedule_store import open_store
+
 # Portable project root detection using CLAUDE_PROJECT_DIR
 # This environment variable is set by Claude Code to the project root
 PROJECT_DIR = Path(os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
@@ -20,26 +26,16 @@ def count_due_reviews(schedule_file: Path) -> int:
     if not schedule_file.exists():
         return 0
 
+    today = date.today().strftime('%Y-%m-%d')
     try:
-        with open(schedule_file, 'r') as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, IOError):
+        store = open_store(schedule_file)
+        if store is not None:
+            return store.count_due(today)
+        index = load_due_index(schedule_file)
+    except (ValueError, OSError, sqlite3.Error):
         return 0
 
-    today = date.today()
-    concepts = data.get('concepts', {})
-
-    # Handle both dict and list formats
-    if isinstance(concepts, dict):
-        concepts = concepts.values()
-
-    due_count = sum(
-        1 for concept in concepts
-        if concept.get('next_review_date') and
-        datetime.strptime(concept['next_review_date'], '%Y-%m-%d').date() <= today
-    )
-
-    return due_count
+    return index.count_due(today)
 
 
 def main():
@@ -32,21 +32,24 @@ def main():
             scripts_dir = PROJECT_DIR / 'scripts'
             
             # Step 1: Normalize wikilinks to markdown file links
-            normalize_script = scripts_dir / 'normalize-links.py'
+            # Only the edited file is converted; other Rems are left untouched
+            normalize_script = scripts_dir / 'knowledge-graph' / 'normalize-links.py'
             if normalize_script.exists():
                 subprocess.run(
-                    [sys.executable, str(normalize_script), '--mode', 'replace'],
+                    [sys.executable, str(normalize_script), '--mode', 'replace', '--files', file_path],
                     stderr=subprocess.DEVNULL,
                     stdout=subprocess.DEVNULL,
                     cwd=PROJECT_DIR
                 )
             
             # Step 2: Rebuild backlinks index (includes typed + inferred links)
+            # Incremental: only the edited Rem is re-extracted and its
+            # neighbourhood patched (falls back to a full rebuild when needed)
             # Auto-cleanup: keep only 1 most recent backup
-            rebuild_script = scripts_dir / 'rebuild-backlinks.py'
+            rebuild_script = scripts_dir / 'knowledge-graph' / 'rebuild-backlinks.py'
             if rebuild_script.exists():
                 subprocess.run(
-                    [sys.executable, str(rebuild_script), '--cleanup-backups', '1'],
+                    [sys.executable, str(rebuild_script), '--incremental', '--cleanup-backups', '1'],
                     stderr=subprocess.DEVNULL,
                     stdout=subprocess.DEVNULL,
                     cwd=PROJECT_DIR
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Community Partition Cache
+
+Louvain communities over the whole knowledge graph, so review sessions and
+the graph visualization group related Rems by dense neighbourhoods instead
+of connected components (which collapse into one giant component on a
+well-linked KB).
+
+The graph is undirected and weighted: every link counts LINK_WEIGHT and
+each typed relation on it adds TYPED_WEIGHT. Louvain runs with a fixed seed.
+
+The partition is persisted next to backlinks.json (communities.json), keyed
+by the index's (mtime_ns, size) like the graph pickle, and recomputed when
+the index changes. On recompute, communities keep the ID of the previous
+community most of their members came from, so colours and review groups
+stay stable across small edits.
+
+Usage:
+    from communities import load_communities
+
+    partition = load_communities()
+    partition.community('call-option')   # -> 3
+    partition.group(['call-option', 'put-option', 'subjunctive'])
+
+CLI:
+    python3 scripts/knowledge-graph/communities.py [--rebuild] [concept-id]
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from knowledge_graph import BACKLINKS_PATH, KnowledgeGraph, load_graph
+from rebuild_utils import atomic_write_json
+from utils.file_lock import FileLock
+
+INDEX_NAME = "communities.json"
+INDEX_VERSION = 1
+LINK_WEIGHT = 1.0
+TYPED_WEIGHT = 1.5
+RESOLUTION = 1.0
+SEED = 42
+
+# Qualitative palette for community colouring (cycled)
+COMMUNITY_COLORS = [
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b',
+    '#e377c2', '#7f7f7f', '#bcbd22', '#17becf', '#393b79', '#637939',
+    '#8c6d31', '#843c39', '#7b4173', '#3182bd', '#e6550d', '#31a354',
+]
+
+
+class CommunityPartition:
+    """Concept -> community ID mapping."""
+
+    def __init__(self, communities: Optional[Dict[str, int]] = None):
+        self.communities: Dict[str, int] = communities or {}
+
+    def __contains__(self, cid: str) -> bool:
+        return cid in self.communities
+
+    def __len__(self) -> int:
+        return len(set(self.communities.values()))
+
+    def community(self, cid: str) -> Optional[int]:
+        return self.communities.get(cid)
+
+    def members(self, community: int) -> List[str]:
+        return sorted(cid for cid, c in self.communities.items() if c == community)
+
+    def sizes(self) -> Dict[int, int]:
+        sizes: Dict[int, int] = {}
+        for c in self.communities.values():
+            sizes[c] = sizes.get(c, 0) + 1
+        return sizes
+
+    def group(self, ids: Iterable[str]) -> List[List[str]]:
+        """
+        Split ids by community, keeping input order within and across groups.
+
+        IDs outside the partition (not in the graph) form singleton groups.
+        """
+        groups: Dict[object, List[str]] = {}
+        for cid in ids:
+            key = self.communities.get(cid)
+            groups.setdefault(('id', cid) if key is None else key, []).append(cid)
+        return list(groups.values())
+
+    def color(self, cid: str) -> Optional[str]:
+        c = self.communities.get(cid)
+        return None if c is None else COMMUNITY_COLORS[c % len(COMMUNITY_COLORS)]
+
+
+def community_graph(kg: KnowledgeGraph):
+    """Undirected weighted networkx graph of kg's indexed concepts."""
+    import networkx as nx
+
+    g = nx.Graph()
+    g.add_nodes_from(kg)
+    for cid in kg:
+        for other in kg.neighbors(cid):
+            if other == cid or other not in kg:
+                continue
+            w = LINK_WEIGHT + TYPED_WEIGHT * len(kg.relation_types(cid, other))
+            prev = g.get_edge_data(cid, other, {}).get('weight', 0)
+            g.add_edge(cid, other, weight=prev + w)
+    return g
+
+
+def compute_communities(kg: KnowledgeGraph, previous: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    Louvain partition of kg.
+
+    Communities are numbered by size (then smallest member); with a
+    previous partition, each community instead takes the previous ID most
+    of its members had, if no larger community claimed it first.
+    """
+    import networkx as nx
+
+    g = community_graph(kg)
+    if not g.number_of_nodes():
+        return {}
+    comms = nx.community.louvain_communities(g, weight='weight', resolution=RESOLUTION, seed=SEED)
+    comms = sorted((sorted(c) for c in comms), key=lambda c: (-len(c), c[0]))
+
+    ids: List[Optional[int]] = [None] * len(comms)
+    if previous:
+        used = set()
+        for i, members in enumerate(comms):
+            votes: Dict[int, int] = {}
+            for cid in members:
+                if cid in previous:
+                    votes[previous[cid]] = votes.get(previous[cid], 0) + 1
+            for old, _ in sorted(votes.items(), key=lambda kv: (-kv[1], kv[0])):
+                if old not in used:
+                    ids[i] = old
+                    used.add(old)
+                    break
+        next_id = max(previous.values(), default=-1) + 1
+    else:
+        next_id = 0
+    for i in range(len(comms)):
+        if ids[i] is None:
+            ids[i], next_id = next_id, next_id + 1
+    return {cid: ids[i] for i, members in enumerate(comms) for cid in members}
+
+
+def index_path_for(backlinks_path: Path) -> Path:
+    """Return the community cache location for a backlinks index."""
+    return Path(backlinks_path).with_name(INDEX_NAME)
+
+
+def _signature(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_communities(backlinks_path: Path = BACKLINKS_PATH, use_cache: bool = True,
+                     rebuild: bool = False) -> CommunityPartition:
+    """
+    Load the community partition, recomputing it when backlinks.json changed.
+
+    use_cache=False computes without reading or writing any cache; rebuild
+    ignores the cached partition (and graph) but persists the new one.
+
+    Raises:
+        FileNotFoundError: If backlinks.json does not exist
+        ImportError: If networkx is needed (stale cache) but not installed
+    """
+    backlinks_path = Path(backlinks_path)
+    signature = _signature(backlinks_path)
+    index_path = index_path_for(backlinks_path)
+
+    previous = None
+    if use_cache and not rebuild:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                if data.get("signature") == signature:
+                    return CommunityPartition(data["communities"])
+                previous = data.get("communities")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    graph = load_graph(backlinks_path, use_cache=use_cache and not rebuild)
+    communities = compute_communities(graph, previous)
+    if use_cache or rebuild:
+        payload = {"version": INDEX_VERSION, "signature": signature, "communities": communities}
+        try:
+            with FileLock(index_path, timeout=30):
+                atomic_write_json(index_path, payload, indent=None)
+        except (OSError, TimeoutError):
+            pass
+    return CommunityPartition(communities)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Knowledge graph community partition')
+    parser.add_argument('concept_id', nargs='?', help='Show the community of this concept')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute and rewrite the cached partition')
+    args = parser.parse_args()
+
+    try:
+        partition = load_communities(rebuild=args.rebuild)
+    except FileNotFoundError:
+        print(f"Error: {BACKLINKS_PATH} not found", file=sys.stderr)
+        return 1
+
+    if args.concept_id:
+        c = partition.community(args.concept_id)
+        if c is None:
+            print(f"Error: concept not found: {args.concept_id}", file=sys.stderr)
+            return 1
+        print(json.dumps({"id": args.concept_id, "community": c, "members": partition.members(c)},
+                         indent=2, ensure_ascii=False))
+        return 0
+
+    sizes = partition.sizes()
+    print(f"{len(partition.communities)} concepts in {len(sizes)} communities")
+    for c, size in sorted(sizes.items(), key=lambda kv: (-kv[1], kv[0]))[:10]:
+        print(f"  {c}: {size} concepts")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
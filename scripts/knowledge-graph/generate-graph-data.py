@@ -4,11 +4,61 @@ Generate graph visualization data from backlinks.json
 
 Transforms RemNote-style backlinks into D3.js-compatible graph format
 with additional metrics (PageRank, clustering, centrality)
+
+Metrics are computed server-side with networkx/SciPy and emitted as node
+attributes: pageRank (sparse power iteration), betweenness (sampled),
+clustering coefficient, degree, cluster (connected component) and an
+initial 2D layout (x, y; KD-tree cutoff Fruchterman-Reingold on large
+graphs). They are cached in
+knowledge-base/_index/graph-metrics-cache.json, keyed by the backlinks.json
+hash and the node set, so the browser renders from precomputed coordinates
+instead of simulating from scratch.
+
+Parsed conversation files are cached in
+knowledge-base/_index/conversation-cache.json, keyed by path and
+(mtime_ns, size), so a chat shared by many Rems is read once per run and
+not at all on later runs until it changes. Concept files are processed on
+a thread pool (--jobs); output order follows the manifest.
+
+Output is split so browser load time does not scale with chat volume:
+    graph-data.json            minified topology (nodes, metrics, edges)
+    graph-data-content/<d>.json  per-domain content shards: Rem content and
+                                 conversations per node, with each full
+                                 conversation stored once per shard
+Nodes carry a "shard" key; the visualization loads a shard on first click.
+
+Communities come from the KB-wide partition cache (communities.py,
+refreshed when backlinks.json changes): each node carries "community" and
+"communityColor", and the browser can colour by community instead of domain.
+
+Level-of-detail export (--lod; automatic above LOD_AUTO_NODES nodes):
+nodes are grouped into communities (cached communities split by ISCED
+domain; Louvain within each domain without the cache) and the topology
+holds one super-node per community with weighted inter-cluster edges. Each
+cluster's full subgraph is written to graph-data-clusters/<cluster>.json
+and expanded on demand in the browser. The hierarchy is a single level:
+there are no domain super-nodes above the communities. Instead, domains
+scope the communities (cluster keys are "<domain>-<n>", and a community
+never spans two domains) and super-nodes keep their domain colour, so
+domain grouping stays visible without a second level to expand.
+
+Incremental regeneration: Rems whose file and conversation are unchanged
+are reused from graph-concept-cache.json, existing nodes keep their
+layout position, and metric values within METRIC_TOLERANCE of the
+previous snapshot are kept. Each run diffs against the previous snapshot
+and writes graph-data-delta.json (added / removed / changed nodes and
+edges, rewritten shards) plus graph-data-manifest.json (monotonic
+version, file digests), so deployed copies can patch instead of reloading.
 """
 
+import hashlib
 import json
+import math
 import re
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 import sys
@@ -19,6 +69,42 @@ except ImportError:
     print("Error: networkx not installed. Run: pip install networkx")
     sys.exit(1)
 
+try:
+    import numpy as np
+    from scipy.spatial import cKDTree
+except ImportError:
+    print("Error: scipy not installed. Run: pip install scipy")
+    sys.exit(1)
+
+sys.path.insert(0, str(Path(__file__).parent))
+from rem_manifest import load_manifest
+from communities import load_communities
+from rebuild_utils import atomic_write_json, atomic_write_text
+
+CONV_CACHE_PATH = Path('knowledge-base/_index/conversation-cache.json')
+CONV_CACHE_VERSION = 1
+CONCEPT_CACHE_PATH = Path('knowledge-base/_index/graph-concept-cache.json')
+CONCEPT_CACHE_VERSION = 1
+DEFAULT_JOBS = 4
+CONTENT_FIELDS = ('content', 'conversations')
+
+METRICS_CACHE_PATH = Path('knowledge-base/_index/graph-metrics-cache.json')
+METRICS_VERSION = 2
+BETWEENNESS_SAMPLES = 256  # exact below this many nodes
+LAYOUT_ITERATIONS = 50
+LAYOUT_SEED = 42
+LAYOUT_SPACING = 60  # px per sqrt(node); matches the browser link distance
+DENSE_LAYOUT_NODES = 500  # networkx spring_layout below; cutoff FR above
+RELAYOUT_FRACTION = 0.2  # full re-layout when more than this share of nodes is new
+METRIC_TOLERANCE = 0.05  # relative change below which a previous metric value is kept
+STABLE_METRICS = ('pageRank', 'betweenness', 'clustering')
+
+GRAPH_MANIFEST_VERSION = '1.0.0'
+
+LOD_AUTO_NODES = 2000
+MIN_CLUSTER_SIZE = 3  # smaller communities join their domain's "misc" cluster
+CLUSTER_PREFIX = 'cluster:'
+
 ISCED_TO_DOMAIN = {
     '01': 'education', '02': 'humanities', '03': 'social-sciences',
     '04': 'business-law', '05': 'natural-sciences', '06': 'ict',
@@ -171,25 +257,153 @@ def _extract_full_conv(lines):
     return '\n'.join(result).strip()
 
 
-def extract_conversation_content(conv_path):
-    """Extract structured content from a conversation file."""
+def _parse_conversation(p):
+    """Parse a conversation file into summary, tags, date, excerpt and content."""
+    fm, body = _parse_frontmatter(p.read_text(encoding='utf-8'))
+    lines = body.split('\n')
+    tags = fm.get('tags', [])
+    return {
+        'summary': _extract_section(lines, 'Summary'),
+        'tags': tags if isinstance(tags, list) else [],
+        'date': fm.get('date', ''),
+        'excerpt': _extract_excerpt(lines),
+        'content': _extract_full_conv(lines)
+    }
+
+
+def _file_sig(path):
+    """[mtime_ns, size] of path, or None if it does not exist."""
     try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class _SignatureCache:
+    """Thread-safe JSON-persisted cache of per-file entries (best effort)."""
+
+    VERSION = 1
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.entries, self.seen = {}, set()
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        if self.path:
+            self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.entries = data.get('entries', {})
+
+    def save(self):
+        """Persist entries used this run (best effort; it is a cache)."""
+        if not self.path or (not self.misses and self.seen == set(self.entries)):
+            return False
+        entries = {k: self.entries[k] for k in sorted(self.seen) if k in self.entries}
+        try:
+            atomic_write_json(self.path, {'version': self.VERSION, 'entries': entries}, indent=None)
+        except OSError:
+            return False
+        return True
+
+
+class ConversationCache(_SignatureCache):
+    """Parsed-conversation cache keyed by path and (mtime_ns, size)."""
+
+    VERSION = CONV_CACHE_VERSION
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self._key_locks = {}
+
+    def get(self, conv_path):
+        """Return parsed content for conv_path ({} if missing or unreadable)."""
         p = Path(conv_path)
-        if not p.exists():
+        sig = _file_sig(p)
+        if sig is None:
             return {}
-        fm, body = _parse_frontmatter(p.read_text(encoding='utf-8'))
-        lines = body.split('\n')
-        tags = fm.get('tags', [])
-        return {
-            'summary': _extract_section(lines, 'Summary'),
-            'tags': tags if isinstance(tags, list) else [],
-            'date': fm.get('date', ''),
-            'excerpt': _extract_excerpt(lines),
-            'content': _extract_full_conv(lines)
-        }
-    except Exception as e:
-        print(f"Warning: {conv_path}: {e}", file=sys.stderr)
-        return {}
+        key = str(p)
+        with self._lock:
+            self.seen.add(key)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Per-path lock: Rems sharing a chat wait for one parse instead of racing
+        with key_lock:
+            e = self.entries.get(key)
+            if e and e.get('sig') == sig:
+                with self._lock:
+                    self.hits += 1
+                return e['data']
+            try:
+                data = _parse_conversation(p)
+            except Exception as ex:
+                print(f"Warning: {conv_path}: {ex}", file=sys.stderr)
+                return {}
+            with self._lock:
+                self.misses += 1
+                self.entries[key] = {'sig': sig, 'data': data}
+            return data
+
+
+class ConceptCache(_SignatureCache):
+    """
+    Processed Rem metadata keyed by file path.
+
+    An entry is valid while both the Rem and its source conversation keep
+    their (mtime_ns, size); full conversation text is not stored here but
+    re-attached from the ConversationCache.
+    """
+
+    VERSION = CONCEPT_CACHE_VERSION
+
+    def get(self, cf, conv_cache):
+        """Return the cached {rem_id: meta} for cf, or None if stale."""
+        key = str(cf)
+        with self._lock:
+            self.seen.add(key)
+        e = self.entries.get(key)
+        if not e or e.get('sig') != _file_sig(cf):
+            return None
+        conv = e.get('conv')
+        if conv and _file_sig(conv[0]) != conv[1]:
+            return None
+        out = {}
+        for rem_id, meta in e['meta'].items():
+            meta = dict(meta)
+            if meta.get('conversation'):
+                full = extract_conversation_content(meta['conversation']['path'], conv_cache)
+                meta['conversation'] = dict(meta['conversation'], content=full.get('content', ''))
+            out[rem_id] = meta
+        with self._lock:
+            self.hits += 1
+        return out
+
+    def put(self, cf, out):
+        stored, conv = {}, None
+        for rem_id, meta in out.items():
+            fc = meta.get('conversation')
+            if fc:
+                conv = [fc['path'], _file_sig(fc['path'])]
+                meta = dict(meta, conversation={k: v for k, v in fc.items() if k != 'content'})
+            stored[rem_id] = meta
+        with self._lock:
+            self.misses += 1
+            self.seen.add(str(cf))
+            self.entries[str(cf)] = {'sig': _file_sig(cf), 'conv': conv, 'meta': stored}
+
+
+# In-memory default so ad-hoc callers still parse each chat once per process
+_CONV_CACHE = ConversationCache()
+
+
+def extract_conversation_content(conv_path, cache=None):
+    """Extract structured content from a conversation file (cached)."""
+    return (cache or _CONV_CACHE).get(conv_path)
 
 
 def _extract_title(body):
@@ -199,12 +413,12 @@ def _extract_title(body):
     return ''
 
 
-def _build_conv_link(source):
+def _build_conv_link(source, cache=None):
     """Build conversation link from frontmatter source field."""
     source = source.replace('../', '')
     if not source.startswith('chats/'):
         return {}
-    conv = extract_conversation_content(source)
+    conv = extract_conversation_content(source, cache)
     name = Path(source).stem
     return {
         'title': name.replace('-conversation-', ' - ').replace('-', ' ').title(),
@@ -214,7 +428,7 @@ def _build_conv_link(source):
     }
 
 
-def _body_conv_link(body):
+def _body_conv_link(body, cache=None):
     """Extract conversation link from legacy body format."""
     active = False
     for line in body.split('\n'):
@@ -231,7 +445,7 @@ def _body_conv_link(body):
         if not m:
             continue
         path = m.group(2).replace('../', '')
-        conv = extract_conversation_content(path)
+        conv = extract_conversation_content(path, cache)
         return {
             'title': m.group(1), 'path': path,
             'date': conv.get('date', ''), 'summary': conv.get('summary', ''),
@@ -264,7 +478,7 @@ def _resolve_isced(fm, fp):
     return isced
 
 
-def _process_concept(cf, kb_path, metadata):
+def _process_concept(cf, kb_path, metadata, conv_cache=None):
     """Process one concept file into metadata dict."""
     try:
         content = cf.read_text(encoding='utf-8')
@@ -283,7 +497,7 @@ def _process_concept(cf, kb_path, metadata):
     tags = [tags] if isinstance(tags, str) else tags
     source = fm.get('source')
     domain = extract_isced_domain(fp, {'isced': isced, 'subdomain': subdomain})
-    fc = (_build_conv_link(source) if source else {}) or _body_conv_link(body)
+    fc = (_build_conv_link(source, conv_cache) if source else {}) or _body_conv_link(body, conv_cache)
     if not tags and fc.get('tags'):
         tags = fc['tags']
     metadata[rem_id] = {
@@ -294,13 +508,41 @@ def _process_concept(cf, kb_path, metadata):
     }
 
 
-def load_concept_metadata(kb_path):
-    """Load metadata from all concept files."""
-    metadata = {}
-    for cf in kb_path.rglob('**/*.md'):
+def _concept_worker(cf, kb_path, conv_cache, concept_cache=None):
+    out = concept_cache.get(cf, conv_cache) if concept_cache else None
+    if out is None:
+        out = {}
+        _process_concept(cf, kb_path, out, conv_cache)
+        if concept_cache:
+            concept_cache.put(cf, out)
+    return out
+
+
+def load_concept_metadata(kb_path, jobs=1, conv_cache=None, concept_cache=None):
+    """
+    Load metadata from all concept files (in manifest order for any jobs).
+
+    With a ConceptCache, only Rems whose file or conversation changed
+    since the last run are re-read.
+    """
+    files = []
+    for entry in load_manifest(kb_path).entries():
+        cf = entry.path
         if cf.name.startswith('_') or '/_templates/' in str(cf):
             continue
-        _process_concept(cf, kb_path, metadata)
+        # Manifest frontmatter lets us skip non-Rem files without reading them
+        if not entry.rem_id:
+            continue
+        files.append(cf)
+    work = partial(_concept_worker, kb_path=kb_path, conv_cache=conv_cache, concept_cache=concept_cache)
+    if jobs <= 1 or len(files) < 2:
+        results = map(work, files)
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+            results = list(pool.map(work, files))
+    metadata = {}
+    for out in results:
+        metadata.update(out)
     return metadata
 
 
@@ -337,8 +579,7 @@ def _truncate_convs(convs):
         {'title': c.get('title', ''), 'path': c.get('path', ''),
          'date': c.get('date', ''), 'tags': c.get('tags', []),
          'summary': _truncate(c.get('summary', ''), 500),
-         'excerpt': _truncate(c.get('excerpt', ''), 300),
-         'content': c.get('content', '')}
+         'excerpt': _truncate(c.get('excerpt', ''), 300)}
         for c in convs if c
     ]
 
@@ -443,8 +684,187 @@ def _build_nodes(metas, concepts, rstats, conn):
     return nodes
 
 
-def transform_to_graph_format(bd, cm, domain_filter=None):
-    """Transform backlinks to D3.js graph format."""
+def _scatter(idx, vec, n):
+    """Sum 2D vectors into n rows by index."""
+    return np.column_stack((np.bincount(idx, vec[:, 0], n), np.bincount(idx, vec[:, 1], n)))
+
+
+def _cutoff_fr_layout(ug, node_ids, iterations=LAYOUT_ITERATIONS, seed=LAYOUT_SEED):
+    """
+    Fruchterman-Reingold with repulsion limited to a 3k radius.
+
+    networkx's sparse layout is O(n^2) per iteration in Python loops;
+    here neighbour pairs come from a KD-tree, so an iteration costs
+    O(n log n + pairs + edges) in vectorized NumPy.
+
+    Returns:
+        (n, 2) positions centered on 0 within [-1, 1]
+    """
+    n = len(node_ids)
+    index = {cid: i for i, cid in enumerate(node_ids)}
+    edges = np.array([(index[a], index[b]) for a, b in ug.edges() if a != b],
+                     dtype=np.intp).reshape(-1, 2)
+    pos = np.random.default_rng(seed).random((n, 2))
+    k = 1 / np.sqrt(n)
+    temp = 0.1
+    cool = temp / (iterations + 1)
+
+    def deltas(pairs):
+        d = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+        return d, np.maximum(np.hypot(d[:, 0], d[:, 1]), 0.01 * k)
+
+    for _ in range(iterations):
+        disp = np.zeros((n, 2))
+        pairs = cKDTree(pos).query_pairs(3 * k, output_type='ndarray')
+        if len(pairs):
+            d, dist = deltas(pairs)
+            f = (k * k / dist ** 2)[:, None] * d
+            disp += _scatter(pairs[:, 0], f, n) - _scatter(pairs[:, 1], f, n)
+        if len(edges):
+            d, dist = deltas(edges)
+            f = (dist / k)[:, None] * d
+            disp += _scatter(edges[:, 1], f, n) - _scatter(edges[:, 0], f, n)
+        length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), 0.01)
+        pos += disp * (np.minimum(length, temp) / length)[:, None]
+        temp -= cool
+
+    pos -= pos.mean(axis=0)
+    return pos / (np.abs(pos).max() or 1)
+
+
+def _place_incrementally(ug, node_ids, prev_positions):
+    """Keep previous positions; new nodes go near their placed neighbours."""
+    rng = np.random.default_rng(LAYOUT_SEED)
+    extent = LAYOUT_SPACING * len(node_ids) ** 0.5
+    pos = {cid: np.asarray(prev_positions[cid], dtype=float)
+           for cid in node_ids if cid in prev_positions}
+    for cid in node_ids:
+        if cid in pos:
+            continue
+        placed = [pos[nb] for nb in ug.neighbors(cid) if nb in pos]
+        if placed:
+            pos[cid] = np.mean(placed, axis=0) + rng.normal(0, LAYOUT_SPACING / 2, 2)
+        else:
+            pos[cid] = rng.uniform(-extent, extent, 2)
+    return pos
+
+
+def _layout(ug, node_ids, prev_positions=None):
+    """
+    Initial 2D layout in px, centered on 0,0.
+
+    With prev_positions ({id: (x, y)} from the last snapshot) and few new
+    nodes, existing nodes keep their coordinates so the view stays stable
+    and graph-delta.json only lists what actually moved.
+    """
+    if prev_positions:
+        new = sum(1 for cid in node_ids if cid not in prev_positions)
+        if new <= RELAYOUT_FRACTION * len(node_ids):
+            return _place_incrementally(ug, node_ids, prev_positions)
+    scale = LAYOUT_SPACING * len(node_ids) ** 0.5
+    if len(node_ids) <= DENSE_LAYOUT_NODES:
+        pos = nx.spring_layout(ug, iterations=LAYOUT_ITERATIONS, seed=LAYOUT_SEED, scale=scale)
+        return {cid: pos[cid] for cid in node_ids}
+    pos = _cutoff_fr_layout(ug, node_ids) * scale
+    return dict(zip(node_ids, pos))
+
+
+def compute_graph_metrics(node_ids, edges, prev_positions=None):
+    """
+    Compute per-node metrics and an initial layout.
+
+    PageRank runs on the directed, weighted graph; betweenness (sampled
+    with a fixed seed above BETWEENNESS_SAMPLES nodes), clustering, degree,
+    connected components and the spring layout use its undirected view.
+
+    Returns:
+        ({id: {pageRank, betweenness, clustering, degree, cluster, x, y}}, cluster count)
+    """
+    if not node_ids:
+        return {}, 0
+    dg = nx.DiGraph()
+    dg.add_nodes_from(node_ids)
+    for e in edges:
+        s, t, w = e['source'], e['target'], e.get('weight', 1.0)
+        if s != t and w > dg.get_edge_data(s, t, {}).get('weight', 0):
+            dg.add_edge(s, t, weight=w)
+    ug = dg.to_undirected(as_view=True)
+    n = len(node_ids)
+
+    pr = nx.pagerank(dg, weight='weight')
+    k = BETWEENNESS_SAMPLES if n > BETWEENNESS_SAMPLES else None
+    bc = nx.betweenness_centrality(ug, k=k, seed=LAYOUT_SEED)
+    cc = nx.clustering(ug)
+    order = {cid: i for i, cid in enumerate(node_ids)}
+    comps = sorted(nx.connected_components(ug), key=lambda c: min(order[x] for x in c))
+    cluster = {cid: i for i, comp in enumerate(comps) for cid in comp}
+    pos = _layout(ug, node_ids, prev_positions)
+
+    return {
+        cid: {
+            'pageRank': round(pr[cid], 6), 'betweenness': round(bc[cid], 6),
+            'clustering': round(cc[cid], 4), 'degree': ug.degree(cid),
+            'cluster': cluster[cid],
+            'x': round(float(pos[cid][0]), 1), 'y': round(float(pos[cid][1]), 1)
+        }
+        for cid in node_ids
+    }, len(comps)
+
+
+def _metrics_key(node_ids, edges, domain_filter):
+    """Digest of the nodes and edges the metrics are computed from."""
+    h = hashlib.sha256(f'{METRICS_VERSION}:{domain_filter or ""}'.encode())
+    h.update('\n'.join(node_ids).encode('utf-8'))
+    for e in edges:
+        h.update(f"\n{e['source']}\t{e['target']}\t{e.get('weight', 1.0)}".encode('utf-8'))
+    return h.hexdigest()
+
+
+def _load_metrics_cache():
+    try:
+        data = json.loads(METRICS_CACHE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('entries', {}) if isinstance(data, dict) and data.get('version') == METRICS_VERSION else {}
+
+
+def _graph_metrics(node_ids, edges, backlinks_hash=None, domain_filter=None, prev_positions=None):
+    """
+    compute_graph_metrics, cached on disk when the backlinks hash is known.
+
+    The cache is keyed on this view's nodes and edges rather than on
+    backlinks.json, so edits that leave them unchanged (other domains under
+    a domain filter, bookkeeping fields) reuse the metrics. Any change to
+    the graph recomputes PageRank, betweenness and layout for the whole
+    view: dangling-node PageRank mass and sampled betweenness are global,
+    so reusing untouched components would change their numbers. The layout
+    still moves only new nodes when prev_positions is given.
+    """
+    if not backlinks_hash:
+        return compute_graph_metrics(node_ids, edges, prev_positions)
+    key = _metrics_key(node_ids, edges, domain_filter)
+    slot = domain_filter or '*'
+    entries = _load_metrics_cache()
+    hit = entries.get(slot)
+    if hit and hit.get('key') == key:
+        return hit['metrics'], hit['clusters']
+    metrics, clusters = compute_graph_metrics(node_ids, edges, prev_positions)
+    entries[slot] = {'key': key, 'metrics': metrics, 'clusters': clusters}
+    try:  # best effort; it is a cache
+        atomic_write_json(METRICS_CACHE_PATH, {'version': METRICS_VERSION, 'entries': entries}, indent=None)
+    except OSError:
+        pass
+    return metrics, clusters
+
+
+def transform_to_graph_format(bd, cm, domain_filter=None, backlinks_hash=None, prev_positions=None):
+    """
+    Transform backlinks to D3.js graph format.
+
+    With backlinks_hash (sha256 of backlinks.json), metrics and layout are
+    reused from the metrics cache when the graph is unchanged.
+    prev_positions ({id: (x, y)}) keeps the previous layout stable.
+    """
     ld = bd.get('links', {})
     cd = bd.get('concepts', {})
     rs = load_review_stats()
@@ -454,6 +874,9 @@ def transform_to_graph_format(bd, cm, domain_filter=None):
     conn = _count_connections(cm, ld)
     nodes = _build_nodes(cm, cd, rs, conn)
     edges = _build_edges(ld, cm)
+    metrics, clusters = _graph_metrics(list(cm), edges, backlinks_hash, domain_filter, prev_positions)
+    for n in nodes:
+        n.update(metrics[n['id']])
     dc = {}
     for n in nodes:
         dc[n['domain']] = dc.get(n['domain'], 0) + 1
@@ -462,12 +885,379 @@ def transform_to_graph_format(bd, cm, domain_filter=None):
         'metadata': {
             'nodeCount': len(nodes), 'edgeCount': len(edges),
             'domainFilter': domain_filter, 'domainDistribution': dc,
+            'clusters': clusters, 'layout': bool(nodes),
             'relationTypeColors': RELATION_TYPE_COLORS,
             'generated': datetime.now().isoformat()
         }
     }
 
 
+def split_content(gd, cm):
+    """
+    Move per-node content out of the topology into per-domain shards.
+
+    Nodes keep a "shard" key naming their shard. Full conversation text is
+    stored once per shard under "conversations", keyed by path.
+
+    Returns:
+        {domain: {"nodes": {id: {content, conversations}}, "conversations": {path: text}}}
+    """
+    shards = {}
+    for n in gd['nodes']:
+        dom = n['domain']
+        shard = shards.setdefault(dom, {'nodes': {}, 'conversations': {}})
+        shard['nodes'][n['id']] = {f: n.pop(f) for f in CONTENT_FIELDS if f in n}
+        n['shard'] = dom
+        conv = cm.get(n['id'], {}).get('conversation') or {}
+        if conv.get('path') and conv.get('content'):
+            shard['conversations'][conv['path']] = conv['content']
+    return shards
+
+
+def _dump_min(data, path, prev_digest=None):
+    """
+    Write minified JSON, skipping the write when the digest is unchanged.
+
+    Returns:
+        {bytes, sha256}
+    """
+    text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+    raw = text.encode('utf-8')
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest != prev_digest or not path.exists():
+        atomic_write_text(path, text)
+    return {'bytes': len(raw), 'sha256': digest}
+
+
+def apply_communities(gd, partition):
+    """
+    Tag nodes with their cached KB-wide community and its colour.
+
+    Nodes missing from the partition (not in backlinks.json) get community
+    None and the generic colour.
+    """
+    seen = set()
+    for n in gd['nodes']:
+        c = partition.community(n['id'])
+        n['community'] = c
+        n['communityColor'] = partition.color(n['id']) or DOMAIN_COLORS['generic']
+        if c is not None:
+            seen.add(c)
+    gd['metadata']['communities'] = len(seen)
+
+
+def _load_partition(bp):
+    """Cached community partition, or None if it cannot be loaded."""
+    try:
+        return load_communities(bp)
+    except (OSError, ValueError):
+        return None
+
+
+def detect_communities(gd):
+    """
+    Group nodes into domain-scoped communities.
+
+    This is the only LOD level: domains partition the communities but get
+    no super-node of their own.
+
+    Nodes tagged by apply_communities() are grouped by (domain, community);
+    otherwise Louvain (fixed seed) runs on each domain's weighted,
+    undirected subgraph. Communities are numbered by size, then first node
+    order.
+
+    Returns:
+        {node_id: cluster key}, e.g. "ict-0", "ict-misc"
+    """
+    by_domain = {}
+    for n in gd['nodes']:
+        by_domain.setdefault(n['domain'], []).append(n['id'])
+    order = {n['id']: i for i, n in enumerate(gd['nodes'])}
+
+    if gd['nodes'] and all('community' in n for n in gd['nodes']):
+        found = {dom: {} for dom in by_domain}
+        for n in gd['nodes']:
+            c = n['community']
+            found[n['domain']].setdefault(n['id'] if c is None else c, set()).add(n['id'])
+        partitions = {dom: list(found[dom].values()) for dom in by_domain}
+    else:
+        domain_of = {n['id']: n['domain'] for n in gd['nodes']}
+        graphs = {dom: nx.Graph() for dom in by_domain}
+        for dom, ids in by_domain.items():
+            graphs[dom].add_nodes_from(ids)
+        for e in gd['edges']:
+            s, t = e['source'], e['target']
+            if s != t and domain_of[s] == domain_of[t]:
+                g = graphs[domain_of[s]]
+                w = g.get_edge_data(s, t, {}).get('weight', 0)
+                g.add_edge(s, t, weight=w + e.get('weight', 1.0))
+        partitions = {dom: nx.community.louvain_communities(graphs[dom], weight='weight', seed=LAYOUT_SEED)
+                      for dom in by_domain}
+
+    clusters = {}
+    for dom, comms in partitions.items():
+        comms = sorted(comms, key=lambda c: (-len(c), min(order[x] for x in c)))
+        i = 0
+        for comm in comms:
+            if len(comm) < MIN_CLUSTER_SIZE:
+                key = f'{dom}-misc'
+            else:
+                key, i = f'{dom}-{i}', i + 1
+            for cid in comm:
+                clusters[cid] = key
+    return clusters
+
+
+def build_lod_graph(gd, clusters):
+    """
+    Aggregate the graph into cluster super-nodes.
+
+    Args:
+        gd: Graph data (content already split out)
+        clusters: {node_id: cluster key} from detect_communities()
+
+    Returns:
+        (LOD graph data, {cluster key: {"nodes", "edges", "external"}})
+        where "edges" are intra-cluster and "external" are edges to other
+        clusters annotated with sourceCluster / targetCluster.
+    """
+    shards, members = {}, {}
+    for n in gd['nodes']:
+        key = clusters[n['id']]
+        members.setdefault(key, []).append(n)
+        shards.setdefault(key, {'nodes': [], 'edges': [], 'external': []})['nodes'].append(n)
+
+    agg = {}
+    for e in gd['edges']:
+        cs, ct = clusters[e['source']], clusters[e['target']]
+        if cs == ct:
+            shards[cs]['edges'].append(e)
+            continue
+        ext = dict(e, sourceCluster=cs, targetCluster=ct)
+        shards[cs]['external'].append(ext)
+        shards[ct]['external'].append(ext)
+        pair = (cs, ct) if cs < ct else (ct, cs)
+        agg[pair] = agg.get(pair, 0) + 1
+
+    neighbours = {}
+    for a, b in agg:
+        neighbours[a] = neighbours.get(a, 0) + 1
+        neighbours[b] = neighbours.get(b, 0) + 1
+
+    nodes = []
+    for key, ms in members.items():
+        top = max(ms, key=lambda m: m.get('pageRank', 0))
+        dom = top['domain']
+        label = top['label'] if len(ms) == 1 else f"{top['label']} +{len(ms) - 1}"
+        nodes.append({
+            'id': CLUSTER_PREFIX + key, 'label': label, 'kind': 'cluster',
+            'clusterShard': key, 'members': len(ms),
+            'domain': dom, 'isced': top.get('isced', ''), 'subdomain': '',
+            'color': DOMAIN_COLORS.get(dom, DOMAIN_COLORS['generic']),
+            'size': 8 + 4 * len(ms) ** 0.5,
+            'pageRank': round(sum(m.get('pageRank', 0) for m in ms), 6),
+            'connections': neighbours.get(key, 0),
+            'x': round(sum(m.get('x', 0) for m in ms) / len(ms), 1),
+            'y': round(sum(m.get('y', 0) for m in ms) / len(ms), 1),
+            'tags': [], 'reviewCount': sum(m.get('reviewCount', 0) for m in ms)
+        })
+
+    clr = RELATION_TYPE_COLORS.get('reference', '#999')
+    edges = [
+        {'source': CLUSTER_PREFIX + a, 'target': CLUSTER_PREFIX + b, 'type': 'cluster',
+         'count': c, 'weight': round(min(1 + math.log2(c), 6), 2), 'color': clr,
+         'dashed': False, 'bidirectional': False}
+        for (a, b), c in sorted(agg.items())
+    ]
+    md = dict(gd['metadata'], lod={'clusters': len(nodes), 'edges': len(edges)})
+    return {'nodes': nodes, 'edges': edges, 'metadata': md}, shards
+
+
+def _write_shard_dir(shard_dir, shards, prev=None):
+    """Write {name: data} as shard_dir/<name>.json, removing stale shards."""
+    prev = prev or {}
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    files = {name: _dump_min(shards[name], shard_dir / f'{name}.json', prev.get(name, {}).get('sha256'))
+             for name in sorted(shards)}
+    for stale in shard_dir.glob('*.json'):
+        if stale.stem not in shards:
+            stale.unlink()
+    return files
+
+
+def write_graph_outputs(gd, shards, op, cluster_shards=None, prev_manifest=None):
+    """
+    Write the topology file, its content shards and (LOD) cluster shards.
+
+    Shards whose digest matches prev_manifest are not rewritten.
+
+    Returns:
+        File report {topology, shards, clusters}, each file as {bytes, sha256}
+    """
+    prev_manifest = prev_manifest or {}
+    content_dir = op.with_name(f'{op.stem}-content')
+    files = {'shards': _write_shard_dir(content_dir, shards, prev_manifest.get('shards')),
+             'clusters': {}}
+    gd['metadata']['contentDir'] = content_dir.name
+    cluster_dir = op.with_name(f'{op.stem}-clusters')
+    if cluster_shards is not None:
+        files['clusters'] = _write_shard_dir(cluster_dir, cluster_shards, prev_manifest.get('clusters'))
+        gd['metadata']['clusterDir'] = cluster_dir.name
+    elif cluster_dir.exists():
+        _write_shard_dir(cluster_dir, {})
+    files['topology'] = _dump_min(gd, op)
+    return files
+
+
+def _sidecar(op, name):
+    return op.with_name(f'{op.stem}-{name}.json')
+
+
+def _read_json(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def load_previous_graph(op):
+    """
+    Previous full graph snapshot ({nodes, edges, metadata}) or None.
+
+    LOD outputs are reassembled from their cluster shards.
+    """
+    gd = _read_json(op)
+    if not isinstance(gd, dict) or 'nodes' not in gd:
+        return None
+    md = gd.get('metadata', {})
+    if not md.get('lod'):
+        return gd
+    nodes, edges, seen = [], [], set()
+    for shard_path in sorted(op.with_name(md.get('clusterDir', '')).glob('*.json')):
+        shard = _read_json(shard_path) or {}
+        nodes.extend(shard.get('nodes', []))
+        for e in shard.get('edges', []) + shard.get('external', []):
+            key = _edge_key(e)
+            if key not in seen:
+                seen.add(key)
+                edges.append({k: v for k, v in e.items() if k not in ('sourceCluster', 'targetCluster')})
+    return {'nodes': nodes, 'edges': edges, 'metadata': md}
+
+
+def stabilize_against(gd, prev_nodes):
+    """
+    Keep previous metric values and cluster ids where they barely changed.
+
+    Any edit shifts PageRank and betweenness slightly everywhere and can
+    renumber components; without this every node would appear as changed
+    in the delta. Kept values stay within METRIC_TOLERANCE of the exact ones.
+    """
+    prev = {n['id']: n for n in prev_nodes}
+
+    # Map each component to the previous id most of its members had
+    votes = {}
+    for n in gd['nodes']:
+        p = prev.get(n['id'])
+        if p is not None and 'cluster' in p:
+            votes.setdefault(n['cluster'], {}).setdefault(p['cluster'], 0)
+            votes[n['cluster']][p['cluster']] += 1
+    mapping, used = {}, set()
+    for c in sorted(votes, key=lambda c: (-sum(votes[c].values()), c)):
+        for old, _ in sorted(votes[c].items(), key=lambda kv: (-kv[1], kv[0])):
+            if old not in used:
+                mapping[c] = old
+                used.add(old)
+                break
+    next_id = max([p.get('cluster', -1) for p in prev_nodes] + [-1]) + 1
+    for n in gd['nodes']:
+        if n['cluster'] not in mapping:
+            mapping[n['cluster']], next_id = next_id, next_id + 1
+        n['cluster'] = mapping[n['cluster']]
+
+    for n in gd['nodes']:
+        p = prev.get(n['id'])
+        if p is None:
+            continue
+        for f in STABLE_METRICS:
+            if f in p and abs(n[f] - p[f]) <= METRIC_TOLERANCE * max(abs(n[f]), abs(p[f])):
+                n[f] = p[f]
+
+
+def _edge_key(e):
+    return (e['source'], e['target'], e['type'])
+
+
+def diff_graphs(prev, gd):
+    """
+    Node and edge changes from prev to gd (nodes without content).
+
+    Returns:
+        {"nodes": {added, removed, changed}, "edges": {added, removed, changed}}
+        where added/changed hold full records and removed holds node ids or
+        [source, target, type] edge keys.
+    """
+    def delta(old, new, key):
+        old = {key(x): x for x in old}
+        new = {key(x): x for x in new}
+        return {
+            'added': [x for k, x in new.items() if k not in old],
+            'removed': [k for k in old if k not in new],
+            'changed': [x for k, x in new.items() if k in old and old[k] != x],
+        }
+
+    edges = delta(prev['edges'], gd['edges'], _edge_key)
+    edges['removed'] = [list(k) for k in edges['removed']]
+    return {'nodes': delta(prev['nodes'], gd['nodes'], lambda n: n['id']), 'edges': edges}
+
+
+def _file_changes(prev, files):
+    prev = prev or {}
+    return {
+        'changed': sorted(n for n, f in files.items() if prev.get(n, {}).get('sha256') != f['sha256']),
+        'removed': sorted(n for n in prev if n not in files),
+    }
+
+
+def write_delta_and_manifest(op, full, prev, prev_manifest, files, backlinks_hash, md):
+    """
+    Write <output>-delta.json and the versioned <output>-manifest.json.
+
+    The delta lists node/edge changes against the previous snapshot plus
+    the shard files that were rewritten, so a deployed copy can patch
+    instead of reloading. Without a comparable previous snapshot it is
+    marked "full" (clients reload everything).
+
+    Returns:
+        (manifest, delta)
+    """
+    prev_manifest = prev_manifest or {}
+    version = prev_manifest.get('version', 0) + 1
+    delta = {'from': version - 1 if prev else None, 'to': version, 'full': prev is None,
+             'generated': md.get('generated')}
+    if prev:
+        delta.update(diff_graphs(prev, full))
+    delta['shards'] = _file_changes(prev_manifest.get('shards'), files['shards'])
+    delta['clusters'] = _file_changes(prev_manifest.get('clusters'), files['clusters'])
+    delta_path = _sidecar(op, 'delta')
+    delta_file = _dump_min(delta, delta_path)
+
+    manifest = {
+        'formatVersion': GRAPH_MANIFEST_VERSION, 'version': version,
+        'generated': md.get('generated'), 'backlinksHash': backlinks_hash,
+        'domainFilter': md.get('domainFilter'), 'lod': bool(md.get('lod')),
+        'topology': dict(files['topology'], file=op.name),
+        'contentDir': md.get('contentDir'), 'shards': files['shards'],
+        'clusterDir': md.get('clusterDir'), 'clusters': files['clusters'],
+        'delta': dict(delta_file, file=delta_path.name, to=version, **{'from': delta['from']}),
+    }
+    atomic_write_json(_sidecar(op, 'manifest'), manifest)
+    return manifest, delta
+
+
+def _use_lod(args, gd):
+    return args.lod == 'on' or (args.lod == 'auto' and gd['metadata']['nodeCount'] > LOD_AUTO_NODES)
+
+
 def _run_generation(args):
     """Core generation logic."""
     bp = Path('knowledge-base/_index/backlinks.json')
@@ -479,22 +1269,53 @@ def _run_generation(args):
         if op.stat().st_mtime > bp.stat().st_mtime:
             print("Using cached graph data. Use --force to regenerate")
             return
-    bd = load_backlinks(bp)
-    cm = load_concept_metadata(Path('knowledge-base'))
+    raw = bp.read_bytes()
+    bd = json.loads(raw)
+    backlinks_hash = hashlib.sha256(raw).hexdigest()
+    cache = ConversationCache(None if args.no_conv_cache else CONV_CACHE_PATH)
+    concept_cache = ConceptCache(None if args.no_conv_cache else CONCEPT_CACHE_PATH)
+    cm = load_concept_metadata(Path('knowledge-base'), args.jobs, cache, concept_cache)
+    cache.save()
+    concept_cache.save()
     if not cm:
         print("Error: No concepts found in knowledge base")
         sys.exit(1)
-    gd = transform_to_graph_format(bd, cm, args.domain)
+    prev = load_previous_graph(op)
+    if prev and prev['metadata'].get('domainFilter') != args.domain:
+        prev = None
+    prev_pos = {n['id']: (n['x'], n['y']) for n in prev['nodes'] if 'x' in n} if prev else None
+    gd = transform_to_graph_format(bd, cm, args.domain, backlinks_hash, prev_pos)
     if gd['metadata']['nodeCount'] == 0:
         print(f"Error: No concepts match filter (domain={args.domain})")
         sys.exit(1)
+    partition = _load_partition(bp)
+    if partition is not None:
+        apply_communities(gd, partition)
     op.parent.mkdir(parents=True, exist_ok=True)
-    with open(op, 'w', encoding='utf-8') as f:
-        json.dump(gd, f, indent=2)
-    _print_summary(gd, args, op)
-
-
-def _print_summary(gd, args, op):
+    shards = split_content(gd, cm)
+    if prev:
+        stabilize_against(gd, prev['nodes'])
+    full = gd
+    cluster_shards = None
+    if _use_lod(args, gd):
+        gd, cluster_shards = build_lod_graph(gd, detect_communities(gd))
+    prev_manifest = _read_json(_sidecar(op, 'manifest'))
+    if not isinstance(prev_manifest, dict) or prev_manifest.get('formatVersion') != GRAPH_MANIFEST_VERSION:
+        prev_manifest = None
+    files = write_graph_outputs(gd, shards, op, cluster_shards, prev_manifest)
+    _, delta = write_delta_and_manifest(op, full, prev, prev_manifest, files, backlinks_hash, gd['metadata'])
+    _print_summary(gd, args, op, cache, files, delta, concept_cache)
+
+
+def _fmt_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f'{n:.0f} {unit}' if unit == 'B' else f'{n:.1f} {unit}'
+        n /= 1024
+    return f'{n:.1f} GB'
+
+
+def _print_summary(gd, args, op, cache=None, files=None, delta=None, concept_cache=None):
     """Print generation summary."""
     md = gd['metadata']
     print(f"Graph data generated: {md['nodeCount']} nodes, {md['edgeCount']} edges")
@@ -502,8 +1323,34 @@ def _print_summary(gd, args, op):
     if dd:
         top = ', '.join(f'{d}({c})' for d, c in sorted(dd.items(), key=lambda x: -x[1])[:5])
         print(f"  Domains: {top}")
+    if md.get('communities'):
+        print(f"  Communities: {md['communities']}")
     if args.domain:
         print(f"  Filter: {args.domain}")
+    if concept_cache is not None:
+        print(f"  Rems: {concept_cache.misses} re-read, {concept_cache.hits} unchanged")
+    if cache is not None:
+        print(f"  Conversations: {len(cache.seen)} ({cache.misses} parsed, {cache.hits} cached)")
+    if files:
+        sh = {name: f['bytes'] for name, f in files['shards'].items()}
+        print(f"  Size: topology {_fmt_bytes(files['topology']['bytes'])}, "
+              f"content {_fmt_bytes(sum(sh.values()))} in {len(sh)} shards")
+        if sh:
+            dom = max(sh, key=sh.get)
+            print(f"  Largest shard: {dom} ({_fmt_bytes(sh[dom])})")
+        if files['clusters']:
+            cl = sum(f['bytes'] for f in files['clusters'].values())
+            print(f"  LOD: {md['lod']['clusters']} clusters, {md['lod']['edges']} cluster edges; "
+                  f"cluster shards {_fmt_bytes(cl)}")
+    if delta:
+        if delta['full']:
+            print(f"  Delta: v{delta['to']} (full; no previous snapshot)")
+        else:
+            dn, de = delta['nodes'], delta['edges']
+            print(f"  Delta: v{delta['from']} -> v{delta['to']}: nodes +{len(dn['added'])} "
+                  f"~{len(dn['changed'])} -{len(dn['removed'])}, edges +{len(de['added'])} "
+                  f"~{len(de['changed'])} -{len(de['removed'])}, "
+                  f"{len(delta['shards']['changed'])} content shards rewritten")
     print(f"  Output: {op}")
 
 
@@ -513,6 +1360,12 @@ def main():
     parser.add_argument('--domain', type=str, help='Filter by domain')
     parser.add_argument('--output', type=str, default='knowledge-base/_index/graph-data.json')
     parser.add_argument('--force', action='store_true', help='Force regeneration')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, metavar='N',
+                        help=f'Threads for reading concept files (default: {DEFAULT_JOBS})')
+    parser.add_argument('--lod', choices=['auto', 'on', 'off'], default='auto',
+                        help=f'Clustered level-of-detail export (auto: above {LOD_AUTO_NODES} nodes)')
+    parser.add_argument('--no-conv-cache', action='store_true',
+                        help='Ignore and do not update the conversation and Rem caches')
     _run_generation(parser.parse_args())
 
 
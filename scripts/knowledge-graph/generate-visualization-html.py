@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 """
 Generate standalone HTML visualization file with embedded graph data
+
+Only the minified topology is embedded. Content shards written by
+generate-graph-data.py are copied next to the HTML as <output>-content/<d>.js
+scripts (LOD cluster shards as <output>-clusters/<c>.js), which the page
+loads on first click (script tags also work from
+file:// URLs, where fetch() is blocked).
 """
 
 import json
@@ -9,6 +15,49 @@ from pathlib import Path
 import sys
 
 
+def _js_literal(data):
+    """Minified JSON safe to embed inside a <script> element."""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+
+
+def _wrap_shards(src_dir, out_dir, callback):
+    """Write each src_dir/<name>.json as out_dir/<name>.js calling callback."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written, total = set(), 0
+    for shard in sorted(src_dir.glob('*.json')):
+        with open(shard, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        js = f"{callback}({_js_literal(shard.stem)},{_js_literal(data)});\n"
+        (out_dir / f'{shard.stem}.js').write_text(js, encoding='utf-8')
+        written.add(shard.stem)
+        total += len(js.encode('utf-8'))
+    for stale in out_dir.glob('*.js'):
+        if stale.stem not in written:
+            stale.unlink()
+    return len(written), total
+
+
+def write_content_scripts(graph_data, input_path, output_path):
+    """
+    Wrap the topology's content (and LOD cluster) shards as lazily loaded scripts.
+
+    Returns:
+        (shard count, total bytes); (0, 0) for graph data with inline content
+    """
+    md = graph_data['metadata']
+    count = total = 0
+    for dir_key, base_key, suffix, callback in (
+            ('contentDir', 'contentBase', 'content', 'loadGraphShard'),
+            ('clusterDir', 'clusterBase', 'clusters', 'loadClusterShard')):
+        if not md.get(dir_key):
+            continue
+        out_dir = output_path.with_name(f'{output_path.stem}-{suffix}')
+        n, size = _wrap_shards(input_path.parent / md[dir_key], out_dir, callback)
+        md[base_key] = out_dir.name
+        count, total = count + n, total + size
+    return count, total
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate knowledge graph visualization HTML')
     parser.add_argument('--input', type=str, default='knowledge-base/_index/graph-data.json',
@@ -38,13 +87,15 @@ def main():
     with open(template_path, 'r', encoding='utf-8') as f:
         template = f.read()
 
+    output_path = Path(args.output)
+    shard_count, shard_bytes = write_content_scripts(graph_data, input_path, output_path)
+
     # Embed graph data
-    graph_data_js = f"const graphData = {json.dumps(graph_data, indent=2)};"
+    graph_data_js = f"const graphData = {_js_literal(graph_data)};"
     html = template.replace('// GRAPH_DATA_PLACEHOLDER\n        const graphData = null;  // Will be replaced by actual data',
                            graph_data_js)
 
     # Write output
-    output_path = Path(args.output)
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html)
 
@@ -56,8 +107,14 @@ def main():
     if domain_dist:
         domain_count = len(domain_dist)
         print(f"  Domains: {domain_count} ({', '.join(f'{d}({c})' for d, c in sorted(domain_dist.items(), key=lambda x: -x[1])[:3])})")
+    lod = graph_data['metadata'].get('lod')
+    if lod:
+        print(f"  LOD: {lod['clusters']} clusters, {lod['edges']} cluster edges (expanded on click)")
     if graph_data['metadata'].get('domainFilter'):
         print(f"  Domain filter: {graph_data['metadata']['domainFilter']}")
+    print(f"  HTML size: {output_path.stat().st_size / 1024:.1f} KB")
+    if shard_count:
+        print(f"  Content: {shard_count} shards, {shard_bytes / 1024:.1f} KB (loaded on click)")
     print(f"  Output: {output_path.absolute()}")
     print(f"\nOpen in browser: file://{output_path.absolute()}")
 
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Graph Query CLI
+
+Multi-hop queries over the cached knowledge graph for review and tutor
+agents, answered from the KnowledgeGraph pickle and the reachability index
+(both next to backlinks.json) instead of re-reading backlinks.json.
+
+Queries:
+    neighbors  - k-hop neighbourhood, optionally filtered by relation type
+    path       - shortest prerequisite chain between two Rems
+                 (bidirectional BFS, skipped in O(1) when unreachable)
+    order      - topological learning order for a target Rem: every
+                 transitive prerequisite, prerequisites first; cycles are
+                 reported as one level
+
+Prerequisite direction follows reachability.normalize_edge: A prerequisite_of B
+and B has_prerequisite / depends_on A both mean "learn A before B".
+
+Usage:
+    python3 scripts/knowledge-graph/graph-query.py neighbors <rem-id> [--hops 2] [--types T ...] [--direction out|in|both]
+    python3 scripts/knowledge-graph/graph-query.py path <from-id> <to-id>
+    python3 scripts/knowledge-graph/graph-query.py order <rem-id>
+
+Output: JSON on stdout; exit code 1 if a Rem is not in the graph.
+"""
+
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from knowledge_graph import BACKLINKS_PATH, KnowledgeGraph, load_graph
+from reachability import Hierarchy, ReachabilityIndex, load_reachability
+
+
+def predecessors(hierarchy: Hierarchy) -> List[List[int]]:
+    """Reverse adjacency of a hierarchy, built once and kept on it."""
+    pred = getattr(hierarchy, '_pred', None)
+    if pred is None:
+        pred = [[] for _ in hierarchy.succ]
+        for v, targets in enumerate(hierarchy.succ):
+            for w in targets:
+                pred[w].append(v)
+        hierarchy._pred = pred
+    return pred
+
+
+def _node(kg: KnowledgeGraph, cid: str) -> Dict:
+    return {"id": cid, "title": kg.title(cid)}
+
+
+def neighborhood(kg: KnowledgeGraph, rem_id: str, hops: int = 1,
+                 types: Optional[Sequence[str]] = None, direction: str = 'both',
+                 limit: Optional[int] = None) -> Dict:
+    """
+    Breadth-first k-hop neighbourhood of rem_id.
+
+    Args:
+        kg: Loaded knowledge graph
+        rem_id: Start Rem
+        hops: Maximum distance
+        types: Only follow typed edges of these relation types (default: all links)
+        direction: 'out' (links_to), 'in' (linked_from) or 'both'
+        limit: Stop after this many neighbours
+
+    Returns:
+        Dict with neighbours in BFS order, each with distance, the Rem it was
+        reached from, and the relation type(s) on that edge
+    """
+    type_set = set(types) if types else None
+    seen = {rem_id}
+    found = []
+    frontier = [rem_id]
+    for distance in range(1, hops + 1):
+        next_frontier = []
+        for cid in frontier:
+            steps = []
+            if direction in ('out', 'both'):
+                steps.extend((other, 'out') for other in kg.neighbors(cid, type_set))
+            if direction in ('in', 'both'):
+                steps.extend((other, 'in') for other in kg.reverse(cid, type_set))
+            for other, edge_dir in steps:
+                if other in seen:
+                    continue
+                seen.add(other)
+                a, b = (cid, other) if edge_dir == 'out' else (other, cid)
+                rel_types = sorted(kg.relation_types(a, b))
+                if type_set is not None:
+                    rel_types = [t for t in rel_types if t in type_set]
+                found.append({
+                    **_node(kg, other),
+                    "distance": distance,
+                    "via": cid,
+                    "direction": edge_dir,
+                    "types": rel_types,
+                })
+                next_frontier.append(other)
+                if limit is not None and len(found) >= limit:
+                    return _neighborhood_result(kg, rem_id, hops, types, direction, found, True)
+        frontier = next_frontier
+        if not frontier:
+            break
+    return _neighborhood_result(kg, rem_id, hops, types, direction, found, False)
+
+
+def _neighborhood_result(kg, rem_id, hops, types, direction, found, truncated) -> Dict:
+    return {
+        "query": "neighbors",
+        **_node(kg, rem_id),
+        "hops": hops,
+        "types": sorted(types) if types else None,
+        "direction": direction,
+        "neighbors": found,
+        "total": len(found),
+        "truncated": truncated,
+    }
+
+
+def _bidirectional_bfs(hierarchy: Hierarchy, start: int, goal: int) -> List[int]:
+    """Shortest start -> goal path over hierarchy.succ, expanding the smaller side."""
+    if start == goal:
+        return [start]
+    succ, pred = hierarchy.succ, predecessors(hierarchy)
+    fwd = {start: None}
+    bwd = {goal: None}
+    fwd_frontier, bwd_frontier = [start], [goal]
+    while fwd_frontier and bwd_frontier:
+        forward = len(fwd_frontier) <= len(bwd_frontier)
+        frontier, parents, others, adj = (
+            (fwd_frontier, fwd, bwd, succ) if forward else (bwd_frontier, bwd, fwd, pred)
+        )
+        next_frontier = []
+        meet = None
+        for v in frontier:
+            for w in adj[v]:
+                if w in parents:
+                    continue
+                parents[w] = v
+                if w in others:
+                    meet = w
+                    break
+                next_frontier.append(w)
+            if meet is not None:
+                break
+        if meet is not None:
+            head = []
+            v = meet
+            while v is not None:
+                head.append(v)
+                v = fwd[v]
+            tail = []
+            v = bwd[meet]
+            while v is not None:
+                tail.append(v)
+                v = bwd[v]
+            return list(reversed(head)) + tail
+        if forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+    return []
+
+
+def prerequisite_path(kg: KnowledgeGraph, index: ReachabilityIndex, a: str, b: str) -> Dict:
+    """
+    Shortest prerequisite chain between a and b, in whichever direction exists.
+
+    Returns:
+        Dict with the chain ordered prerequisites first ("a_before_b" or
+        "b_before_a" direction), or an empty chain if neither reaches the other
+    """
+    hierarchy = index.families['prerequisite']
+    chain: List[str] = []
+    direction = None
+    for lower, higher, label in ((a, b, 'a_before_b'), (b, a, 'b_before_a')):
+        if lower != higher and hierarchy.reaches(lower, higher):
+            ids = _bidirectional_bfs(hierarchy, hierarchy.index[lower], hierarchy.index[higher])
+            if ids:
+                chain = [hierarchy.ids[i] for i in ids]
+                direction = label
+                break
+    return {
+        "query": "path",
+        "from": _node(kg, a),
+        "to": _node(kg, b),
+        "direction": direction,
+        "length": max(len(chain) - 1, 0),
+        "chain": [_node(kg, cid) for cid in chain],
+    }
+
+
+def learning_order(kg: KnowledgeGraph, index: ReachabilityIndex, rem_id: str) -> Dict:
+    """
+    Transitive prerequisites of rem_id in a valid learning order.
+
+    Levels are longest-path depths over the SCC condensation: level 0 has no
+    prerequisites inside the set, and every Rem comes after all of its
+    prerequisites. Members of one cycle share a level and are flagged.
+    """
+    hierarchy = index.families['prerequisite']
+    target = hierarchy.index.get(rem_id)
+    if target is None:
+        return {"query": "order", **_node(kg, rem_id), "levels": [], "order": [], "cycles": []}
+
+    pred = predecessors(hierarchy)
+    ancestors = {target}
+    queue = deque([target])
+    while queue:
+        v = queue.popleft()
+        for w in pred[v]:
+            if w not in ancestors:
+                ancestors.add(w)
+                queue.append(w)
+
+    # Tarjan numbers components sinks first, so descending comp is topological
+    comps = sorted({hierarchy.comp[v] for v in ancestors}, reverse=True)
+    members: Dict[int, List[int]] = {c: [] for c in comps}
+    for v in ancestors:
+        members[hierarchy.comp[v]].append(v)
+    level: Dict[int, int] = {}
+    for c in comps:
+        depth = 0
+        for v in members[c]:
+            for w in pred[v]:
+                cw = hierarchy.comp[w]
+                if cw != c and cw in level:
+                    depth = max(depth, level[cw] + 1)
+        level[c] = depth
+
+    levels: List[List[Dict]] = []
+    cycles = []
+    for c in sorted(comps, key=lambda c: (level[c], -c)):
+        ids = sorted(hierarchy.ids[v] for v in members[c])
+        cyclic = len(ids) > 1
+        if cyclic:
+            cycles.append(ids)
+        while len(levels) <= level[c]:
+            levels.append([])
+        levels[level[c]].extend({**_node(kg, cid), "cycle": cyclic} for cid in ids)
+
+    return {
+        "query": "order",
+        **_node(kg, rem_id),
+        "levels": levels,
+        "order": [item["id"] for lvl in levels for item in lvl],
+        "cycles": cycles,
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the knowledge graph (JSON output)')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the cached graph and index')
+    sub = parser.add_subparsers(dest='query', required=True)
+
+    p = sub.add_parser('neighbors', help='k-hop neighbourhood')
+    p.add_argument('rem_id')
+    p.add_argument('--hops', type=int, default=1, help='Maximum distance (default: 1)')
+    p.add_argument('--types', nargs='+', help='Relation types to follow')
+    p.add_argument('--direction', choices=['out', 'in', 'both'], default='both')
+    p.add_argument('--limit', type=int, help='Maximum neighbours to return')
+
+    p = sub.add_parser('path', help='Shortest prerequisite chain between two Rems')
+    p.add_argument('from_id')
+    p.add_argument('to_id')
+
+    p = sub.add_parser('order', help='Topological learning order for a target Rem')
+    p.add_argument('rem_id')
+
+    args = parser.parse_args()
+    use_cache = not args.rebuild
+
+    try:
+        kg = load_graph(use_cache=use_cache)
+    except FileNotFoundError:
+        print(f"Error: {BACKLINKS_PATH} not found", file=sys.stderr)
+        return 1
+
+    requested = [args.from_id, args.to_id] if args.query == 'path' else [args.rem_id]
+    missing = [cid for cid in requested if cid not in kg]
+    if missing:
+        print(json.dumps({"error": "not_found", "ids": missing}, ensure_ascii=False))
+        return 1
+
+    if args.query == 'neighbors':
+        result = neighborhood(kg, args.rem_id, args.hops, args.types, args.direction, args.limit)
+    else:
+        index = load_reachability(use_cache=use_cache)
+        if args.query == 'path':
+            result = prerequisite_path(kg, index, args.from_id, args.to_id)
+        else:
+            result = learning_order(kg, index, args.rem_id)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
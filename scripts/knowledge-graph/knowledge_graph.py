@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+In-process Knowledge Graph
+
+Loads knowledge-base/_index/backlinks.json once into interned-ID adjacency
+structures so graph consumers stop re-parsing the index and scanning
+typed_links_to / typed_linked_from lists linearly.
+
+Structures (concepts are interned to dense integer IDs):
+    out / inc        - untyped adjacency sets (links_to, linked_from)
+    indexed          - concepts present as keys of "links" (False for
+                       broken-link targets, which still keep their edges)
+    typed_out / _in  - ordered typed edge lists, preserving file order
+    typed_edges      - hash set of (from, to, type) for O(1) membership
+    edge_types       - (from, to) -> relation types on that edge
+    inferred         - two-hop inferred links (to, via) per concept
+
+A pickled copy is kept next to the index (backlinks-graph.pickle), keyed by
+the index's (mtime_ns, size), so repeated loads skip JSON parsing entirely.
+
+Usage:
+    from knowledge_graph import load_graph
+
+    kg = load_graph()
+    kg.has_edge('call-option', 'option-delta', 'prerequisite_of')
+    kg.neighbors('call-option', types={'prerequisite_of'})
+    kg.reverse('option-delta')
+
+CLI:
+    python3 scripts/knowledge-graph/knowledge_graph.py <concept-id> [--types T ...]
+"""
+
+import json
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from utils.file_lock import FileLock
+
+KB_DIR = ROOT / "knowledge-base"
+BACKLINKS_PATH = KB_DIR / "_index" / "backlinks.json"
+PICKLE_NAME = "backlinks-graph.pickle"
+PICKLE_VERSION = 2
+
+# Per-process cache: resolved backlinks path -> KnowledgeGraph
+_GRAPHS: Dict[str, 'KnowledgeGraph'] = {}
+
+
+class KnowledgeGraph:
+    """Adjacency and reverse indexes over backlinks.json."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.out: List[Set[int]] = []
+        self.inc: List[Set[int]] = []
+        self.typed_out: List[List[Tuple[int, str]]] = []
+        self.typed_in: List[List[Tuple[int, str]]] = []
+        self.typed_edges: Set[Tuple[int, int, str]] = set()
+        self.edge_types: Dict[Tuple[int, int], List[str]] = {}
+        self.indexed: List[bool] = []  # False for broken-link targets
+        self.inferred: Dict[str, List[Tuple[str, str]]] = {}
+        self.concepts: Dict[str, Dict[str, str]] = {}
+        self.metadata: Dict = {}
+
+    # ---------- building ----------
+
+    def _intern(self, cid: str) -> int:
+        """Return the dense ID for cid, adding a node if needed."""
+        i = self.index.get(cid)
+        if i is None:
+            i = len(self.ids)
+            cid = sys.intern(cid)
+            self.ids.append(cid)
+            self.index[cid] = i
+            self.out.append(set())
+            self.inc.append(set())
+            self.typed_out.append([])
+            self.typed_in.append([])
+            self.indexed.append(False)
+        return i
+
+    def add_node(self, cid: str) -> int:
+        """Add cid as an indexed concept (a key of "links")."""
+        i = self._intern(cid)
+        self.indexed[i] = True
+        return i
+
+    def add_link(self, a: str, b: str) -> None:
+        """Add an untyped link a -> b."""
+        ia, ib = self._intern(a), self._intern(b)
+        self.out[ia].add(ib)
+        self.inc[ib].add(ia)
+
+    def add_typed_edge(self, a: str, b: str, rel_type: str) -> bool:
+        """
+        Add a typed edge a -> b; also records the untyped link.
+
+        Returns:
+            False if the (a, b, type) edge already existed
+        """
+        ia, ib = self._intern(a), self._intern(b)
+        rel_type = sys.intern(rel_type)
+        key = (ia, ib, rel_type)
+        if key in self.typed_edges:
+            return False
+        self.typed_edges.add(key)
+        self.edge_types.setdefault((ia, ib), []).append(rel_type)
+        self.typed_out[ia].append((ib, rel_type))
+        self.typed_in[ib].append((ia, rel_type))
+        self.out[ia].add(ib)
+        self.inc[ib].add(ia)
+        return True
+
+    @classmethod
+    def from_data(cls, data: Dict) -> 'KnowledgeGraph':
+        """
+        Build from a parsed backlinks.json document.
+
+        Nodes are the keys of "links"; edges to concepts missing from the
+        index (broken links) are kept so has_edge() mirrors the raw lists.
+        Reverse indexes are derived from the forward lists (links_to,
+        typed_links_to), which are the source of truth for linked_from and
+        typed_linked_from.
+        """
+        kg = cls()
+        links = data.get("links", {})
+        for cid in links:
+            kg.add_node(cid)
+        for cid, entry in links.items():
+            for target in entry.get("links_to", []):
+                kg.add_link(cid, target)
+            for tl in entry.get("typed_links_to", []):
+                if isinstance(tl, dict) and tl.get("to"):
+                    kg.add_typed_edge(cid, tl["to"], tl.get("type", "related"))
+            inferred = [
+                (il["to"], il["via"]) for il in entry.get("inferred_links_to", [])
+                if isinstance(il, dict) and il.get("to") and il.get("via")
+            ]
+            if inferred:
+                kg.inferred[cid] = inferred
+        kg.concepts = data.get("concepts", {})
+        kg.metadata = data.get("metadata", {})
+        return kg
+
+    # ---------- queries ----------
+
+    def __contains__(self, cid: str) -> bool:
+        i = self.index.get(cid)
+        return i is not None and self.indexed[i]
+
+    def __len__(self) -> int:
+        return sum(self.indexed)
+
+    def __iter__(self) -> Iterator[str]:
+        return (cid for cid, ok in zip(self.ids, self.indexed) if ok)
+
+    def has_edge(self, a: str, b: str, rel_type: Optional[str] = None) -> bool:
+        """True if a links to b (with the given relation type, if any)."""
+        ia, ib = self.index.get(a), self.index.get(b)
+        if ia is None or ib is None:
+            return False
+        if rel_type is None:
+            return ib in self.out[ia]
+        return (ia, ib, rel_type) in self.typed_edges
+
+    def neighbors(self, a: str, types: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Outgoing neighbours of a.
+
+        Args:
+            a: Concept ID
+            types: Only follow typed edges of these relation types
+                   (default: every link, typed or not)
+
+        Returns:
+            Target IDs; typed targets keep file order when types is given
+        """
+        ia = self.index.get(a)
+        if ia is None:
+            return []
+        if types is None:
+            return [self.ids[i] for i in sorted(self.out[ia])]
+        types = set(types)
+        return _unique(self.ids[ib] for ib, t in self.typed_out[ia] if t in types)
+
+    def reverse(self, a: str, types: Optional[Iterable[str]] = None) -> List[str]:
+        """Incoming neighbours of a (concepts linking to a), optionally by type."""
+        ia = self.index.get(a)
+        if ia is None:
+            return []
+        if types is None:
+            return [self.ids[i] for i in sorted(self.inc[ia])]
+        types = set(types)
+        return _unique(self.ids[ib] for ib, t in self.typed_in[ia] if t in types)
+
+    def typed_links_to(self, a: str) -> List[Tuple[str, str]]:
+        """Outgoing typed edges of a as (to, type), in file order."""
+        ia = self.index.get(a)
+        if ia is None:
+            return []
+        return [(self.ids[ib], t) for ib, t in self.typed_out[ia]]
+
+    def typed_linked_from(self, a: str) -> List[Tuple[str, str]]:
+        """Incoming typed edges of a as (from, type)."""
+        ia = self.index.get(a)
+        if ia is None:
+            return []
+        return [(self.ids[ib], t) for ib, t in self.typed_in[ia]]
+
+    def inferred_links_to(self, a: str) -> List[Tuple[str, str]]:
+        """Two-hop inferred links of a as (to, via), in index order."""
+        return list(self.inferred.get(a, ()))
+
+    def relation_types(self, a: str, b: str) -> Set[str]:
+        """All relation types on the edge a -> b."""
+        ia, ib = self.index.get(a), self.index.get(b)
+        if ia is None or ib is None:
+            return set()
+        return set(self.edge_types.get((ia, ib), ()))
+
+    def meta(self, cid: str) -> Dict[str, str]:
+        """Concept metadata ({title, file}) or an empty dict."""
+        return self.concepts.get(cid, {})
+
+    def title(self, cid: str) -> str:
+        return self.meta(cid).get("title", cid)
+
+
+def _unique(items: Iterable[str]) -> List[str]:
+    """Deduplicate preserving order."""
+    seen = set()
+    out = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            out.append(item)
+    return out
+
+
+def pickle_path_for(backlinks_path: Path) -> Path:
+    """Return the pickle cache location for a backlinks index."""
+    return Path(backlinks_path).with_name(PICKLE_NAME)
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_pickle(pickle_path: Path, signature: Tuple[int, int]) -> Optional[KnowledgeGraph]:
+    try:
+        with open(pickle_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != PICKLE_VERSION:
+        return None
+    if tuple(cached.get("signature", ())) != signature:
+        return None
+    graph = cached.get("graph")
+    return graph if isinstance(graph, KnowledgeGraph) else None
+
+
+def _save_pickle(pickle_path: Path, signature: Tuple[int, int], kg: KnowledgeGraph) -> bool:
+    """Write the pickle cache atomically (best effort; it is a cache)."""
+    payload = {"version": PICKLE_VERSION, "signature": signature, "graph": kg}
+    try:
+        with FileLock(pickle_path, timeout=30):
+            fd, tmp = tempfile.mkstemp(dir=pickle_path.parent, prefix=f".{pickle_path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, pickle_path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+    except (OSError, TimeoutError, pickle.PicklingError):
+        return False
+    return True
+
+
+def load_graph(backlinks_path: Path = BACKLINKS_PATH, use_cache: bool = True) -> KnowledgeGraph:
+    """
+    Load the knowledge graph, cached per process and on disk.
+
+    Args:
+        backlinks_path: Path to backlinks.json
+        use_cache: Use (and refresh) the mtime-keyed pickle cache
+
+    Returns:
+        KnowledgeGraph
+
+    Raises:
+        FileNotFoundError: If backlinks.json does not exist
+    """
+    backlinks_path = Path(backlinks_path)
+    signature = _signature(backlinks_path)
+    cache_key = str(backlinks_path.resolve())
+
+    kg = _GRAPHS.get(cache_key)
+    if kg is not None and getattr(kg, "_signature", None) == signature:
+        return kg
+
+    pickle_path = pickle_path_for(backlinks_path)
+    kg = _load_pickle(pickle_path, signature) if use_cache else None
+    if kg is None:
+        with open(backlinks_path, 'r', encoding='utf-8') as f:
+            kg = KnowledgeGraph.from_data(json.load(f))
+        if use_cache:
+            _save_pickle(pickle_path, signature, kg)
+
+    kg._signature = signature
+    _GRAPHS[cache_key] = kg
+    return kg
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the knowledge graph')
+    parser.add_argument('concept_id', help='Concept ID')
+    parser.add_argument('--types', nargs='+', help='Relation types to follow')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the pickle cache')
+    args = parser.parse_args()
+
+    try:
+        kg = load_graph(BACKLINKS_PATH, use_cache=not args.no_cache)
+    except FileNotFoundError:
+        print(f"Error: {BACKLINKS_PATH} not found", file=sys.stderr)
+        return 1
+    if args.concept_id not in kg:
+        print(f"Error: concept not found: {args.concept_id}", file=sys.stderr)
+        return 1
+
+    print(json.dumps({
+        "id": args.concept_id,
+        "title": kg.title(args.concept_id),
+        "neighbors": kg.neighbors(args.concept_id, args.types),
+        "reverse": kg.reverse(args.concept_id, args.types),
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    # Run the importable module's main so the pickle cache records
+    # knowledge_graph.KnowledgeGraph, not __main__.KnowledgeGraph
+    import knowledge_graph
+    sys.exit(knowledge_graph.main())
@@ -5,13 +5,20 @@ Markdown file links. Supports preserving typed relation suffixes like
 "[[id]] {rel: synonym}" by emitting "[Title](path) {rel: synonym}".
 
 Usage:
-    source venv/bin/activate && source venv/bin/activate && python3 scripts/normalize-links.py [--mode replace|annotate] [--dry-run] [--verbose]
+    source venv/bin/activate && python3 scripts/knowledge-graph/normalize-links.py [--mode replace|annotate] [--dry-run] [--verbose]
+    source venv/bin/activate && python3 scripts/knowledge-graph/normalize-links.py --files path/to/rem.md ...
 
 Modes:
     replace  - Replace [[id]] with [Title](relative/path.md) (default)
     annotate - Keep [[id]] and append file link in parentheses, e.g.:
                [[id]] ([Title](relative/path.md))
 
+Incremental runs:
+    knowledge-base/_index/normalize-links-cache.json keeps the concept index
+    (keyed by the Rem manifest fingerprint) and a per-file "contains [[" flag
+    keyed by content hash. Without --files only new or modified files and
+    files still holding wikilinks are read; --all forces a full scan.
+
 Notes:
     - Only processes files under knowledge-base/**/concepts/*.md
     - Skips YAML frontmatter section
@@ -19,62 +26,140 @@ Notes:
 """
 
 import argparse
+import hashlib
+import json
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 ROOT = Path(__file__).parent.parent.parent
 KB_DIR = ROOT / "knowledge-base"
 
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(ROOT / "scripts"))
+from rebuild_utils import atomic_write_json
+from rem_manifest import load_manifest
+from utils.file_lock import FileLock
+
 # Patterns
 WIKILINK_RE = re.compile(r"\[\[([a-z0-9\-]+)\]\]", re.IGNORECASE)
-TYPED_SUFFIX_RE = re.compile(r"\]\]\s*(\{[^}]*\})")
 
+CACHE_NAME = "normalize-links-cache.json"
+CACHE_VERSION = 1
+DEFAULT_JOBS = 4
+
+
+def _is_rem_path(rel_path: str) -> bool:
+    """True for .md files inside non-underscore domain directories."""
+    parts = Path(rel_path).parts
+    if len(parts) < 2 or any(p.startswith('_') for p in parts[:-1]):
+        return False
+    return not Path(parts[-1]).stem.startswith('_')
 
-def build_concept_index() -> Dict[str, Tuple[str, Path]]:
+
+def build_concept_index(manifest=None) -> Dict[str, Tuple[str, Path]]:
     """Build concept-id → (title, absolute_path) index."""
     index: Dict[str, Tuple[str, Path]] = {}
 
-    def scan_directory(directory: Path):
-        """Recursively scan directory for .md files."""
-        for item in directory.iterdir():
-            if item.is_dir() and not item.name.startswith('_'):
-                scan_directory(item)
-            elif item.is_file() and item.suffix == '.md' and not item.stem.startswith('_'):
-                # Extract rem_id from frontmatter, fall back to filename
-                concept_id = item.stem.lower()
-                title = concept_id
-                try:
-                    with open(item, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                    if text.startswith('---'):
-                        end = text.find('\n---', 3)
-                        if end != -1:
-                            fm = text[3:end].strip()
-                            for line in fm.splitlines():
-                                line = line.strip()
-                                if not line or ':' not in line:
-                                    continue
-                                k, v = line.split(':', 1)
-                                k = k.strip()
-                                if k == 'rem_id':
-                                    concept_id = v.strip().strip('"').strip("'")
-                                elif k == 'title':
-                                    t = v.strip().strip('"').strip("'")
-                                    if t:
-                                        title = t
-                except Exception:
-                    pass
-                index[concept_id] = (title, item)
-
-    for domain in KB_DIR.iterdir():
-        if domain.is_dir() and not domain.name.startswith('_'):
-            scan_directory(domain)
+    if manifest is None:
+        manifest = load_manifest(KB_DIR)
+    for entry in manifest.entries():
+        # Only files inside non-underscore domain directories
+        if not _is_rem_path(entry.rel_path):
+            continue
+        # Extract rem_id from frontmatter, fall back to filename
+        concept_id = entry.rem_id or entry.path.stem.lower()
+        title = entry.title or concept_id
+        index[concept_id] = (title, entry.path)
 
     return index
 
 
+class LinkCache:
+    """
+    Persisted concept index and per-file wikilink flags.
+
+    The concept index is reused while the manifest fingerprint is unchanged.
+    Flags map a KB-relative path to (sha256, has_wikilinks); a flag is only
+    trusted while the manifest reports the same content hash for the file.
+    The file is a cache, so read and write failures are ignored.
+    """
+
+    def __init__(self, kb_dir: Path = KB_DIR):
+        self.kb_dir = Path(kb_dir)
+        self.path = self.kb_dir / "_index" / CACHE_NAME
+        self.fingerprint: Optional[str] = None
+        self.concepts: Dict[str, List[str]] = {}
+        self.flags: Dict[str, List] = {}
+        self.dirty = False
+
+    def load(self) -> 'LinkCache':
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return self
+        self.fingerprint = data.get("fingerprint")
+        self.concepts = data.get("concepts", {})
+        self.flags = data.get("files", {})
+        return self
+
+    def concept_index(self, manifest) -> Dict[str, Tuple[str, Path]]:
+        """Return the concept index, rebuilding it only when the manifest changed."""
+        fingerprint = manifest.fingerprint()
+        if fingerprint == self.fingerprint and self.concepts:
+            return {cid: (title, self.kb_dir / rel) for cid, (title, rel) in self.concepts.items()}
+
+        index = build_concept_index(manifest)
+        self.fingerprint = fingerprint
+        self.concepts = {
+            cid: [title, path.relative_to(self.kb_dir).as_posix()]
+            for cid, (title, path) in sorted(index.items())
+        }
+        self.dirty = True
+        return index
+
+    def needs_scan(self, rel_path: str, sha256: str) -> bool:
+        """True unless the file is known to hold no wikilinks at this content hash."""
+        flag = self.flags.get(rel_path)
+        return not flag or flag[0] != sha256 or bool(flag[1])
+
+    def set_flag(self, rel_path: str, sha256: str, has_links: bool) -> None:
+        if self.flags.get(rel_path) != [sha256, has_links]:
+            self.flags[rel_path] = [sha256, has_links]
+            self.dirty = True
+
+    def prune(self, live: Iterable[str]) -> None:
+        """Drop flags for files no longer in the knowledge base."""
+        live = set(live)
+        stale = [rel for rel in self.flags if rel not in live]
+        for rel in stale:
+            del self.flags[rel]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self) -> bool:
+        if not self.dirty:
+            return False
+        data = {
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "concepts": self.concepts,
+            "files": {rel: self.flags[rel] for rel in sorted(self.flags)},
+        }
+        try:
+            with FileLock(self.path, timeout=30):
+                atomic_write_json(self.path, data, indent=None)
+        except (OSError, TimeoutError):
+            return False
+        self.dirty = False
+        return True
+
+
 def convert_content(content: str, current_file: Path, idx: Dict[str, Tuple[str, Path]], mode: str) -> str:
     """Convert wikilinks in content according to mode."""
     # Skip frontmatter
@@ -86,75 +171,140 @@ def convert_content(content: str, current_file: Path, idx: Dict[str, Tuple[str,
 
     prefix = content[:start]
     body = content[start:]
+    if '[[' not in body:
+        return content
+
+    base_dir = current_file.parent
+    rel_paths: Dict[Path, str] = {}
 
     def repl(match: re.Match) -> str:
         concept_id = match.group(1).lower()
-        # Check if there is a typed suffix immediately after the match
-        after = body[match.end() - start: match.end() - start + 80]
-        typed_suffix = None
-        m2 = TYPED_SUFFIX_RE.match(body[match.end() - start - 2: match.end() - start + 120])  # include ']]'
-        if m2:
-            typed_suffix = ' ' + m2.group(1)
         entry = idx.get(concept_id)
         if not entry:
             return match.group(0)  # leave as-is
         title, target_abs = entry
         # Use os.path.relpath to handle cross-domain links (supports ../ navigation)
-        rel_path = os.path.relpath(target_abs, current_file.parent)
+        rel_path = rel_paths.get(target_abs)
+        if rel_path is None:
+            rel_path = rel_paths[target_abs] = os.path.relpath(target_abs, base_dir)
         md_link = f"[{title}]({rel_path})"
         if mode == 'annotate':
             out = f"[[{concept_id}]] ({md_link})"
         else:
             out = md_link
-        if typed_suffix:
-            out += typed_suffix
+        # A typed suffix ("{rel: ...}") right after the match is left in place
         return out
 
     new_body = WIKILINK_RE.sub(repl, body)
     return prefix + new_body
 
 
+def normalize_file(path: Path, idx: Dict[str, Tuple[str, Path]], mode: str,
+                   dry_run: bool = False) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Convert one file in place.
+
+    Returns:
+        (sha256 of the resulting content, still contains "[[", changed),
+        or None if the file could not be read
+    """
+    try:
+        raw = path.read_bytes()
+        text = raw.decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+    new_text = convert_content(text, path, idx, mode)
+    if new_text == text:
+        return hashlib.sha256(raw).hexdigest(), '[[' in text, False
+    if not dry_run:
+        path.write_text(new_text, encoding='utf-8')
+    return hashlib.sha256(new_text.encode('utf-8')).hexdigest(), '[[' in new_text, True
+
+
+def resolve_files(paths: Iterable[str], kb_dir: Path = KB_DIR) -> List[Path]:
+    """Resolve --files arguments (absolute, cwd- or KB-relative) to existing .md files."""
+    out: List[Path] = []
+    seen = set()
+    for raw in paths:
+        p = Path(raw)
+        candidates = [p] if p.is_absolute() else [Path.cwd() / p, kb_dir / p, ROOT / p]
+        for c in candidates:
+            if c.suffix == '.md' and c.is_file():
+                c = c.resolve()
+                if c not in seen:
+                    seen.add(c)
+                    out.append(c)
+                break
+    return out
+
+
 def main():
     parser = argparse.ArgumentParser(description='Normalize wikilinks to Markdown file links')
     parser.add_argument('--mode', choices=['replace', 'annotate'], default='replace')
+    parser.add_argument('--files', nargs='+', metavar='PATH',
+                        help='Only convert these files (e.g. Rems just written)')
+    parser.add_argument('--all', action='store_true',
+                        help='Read every Rem, ignoring the cached wikilink flags')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, metavar='N',
+                        help=f'Threads for converting files (default: {DEFAULT_JOBS})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Neither read nor write normalize-links-cache.json')
     parser.add_argument('--dry-run', action='store_true')
     parser.add_argument('--verbose', action='store_true')
     args = parser.parse_args()
 
-    idx = build_concept_index()
-    files = []
+    manifest = load_manifest(KB_DIR)
+    cache = LinkCache(KB_DIR)
+    if not args.no_cache:
+        cache.load()
+    idx = cache.concept_index(manifest)
+
+    kb_root = KB_DIR.resolve()
+    rem_entries = [e for e in manifest.entries() if _is_rem_path(e.rel_path)]
+    total = len(rem_entries)
+    if args.files:
+        files = resolve_files(args.files)
+        total = len(files)
+    elif args.all:
+        files = [e.path for e in rem_entries]
+    else:
+        files = [e.path for e in rem_entries if cache.needs_scan(e.rel_path, e.sha256)]
 
-    def collect_md_files(directory: Path):
-        """Recursively collect all .md files."""
-        for item in directory.iterdir():
-            if item.is_dir() and not item.name.startswith('_'):
-                collect_md_files(item)
-            elif item.is_file() and item.suffix == '.md' and not item.stem.startswith('_'):
-                files.append(item)
+    def work(md: Path):
+        return normalize_file(md, idx, args.mode, args.dry_run)
 
-    for domain in KB_DIR.iterdir():
-        if domain.is_dir() and not domain.name.startswith('_'):
-            collect_md_files(domain)
+    if args.jobs > 1 and len(files) > 1:
+        with ThreadPoolExecutor(max_workers=min(args.jobs, len(files))) as pool:
+            results = list(pool.map(work, files))
+    else:
+        results = [work(md) for md in files]
 
     changed = 0
-    for md in files:
-        try:
-            text = md.read_text(encoding='utf-8')
-        except Exception:
+    for md, result in zip(files, results):
+        if result is None:
             continue
-        new_text = convert_content(text, md, idx, args.mode)
-        if new_text != text:
+        sha, has_links, updated = result
+        if updated:
             changed += 1
             if args.verbose:
                 print(f"Updated: {md}")
-            if not args.dry_run:
-                md.write_text(new_text, encoding='utf-8')
+        try:
+            rel = md.resolve().relative_to(kb_root).as_posix()
+        except ValueError:
+            continue
+        if _is_rem_path(rel) and not (updated and args.dry_run):
+            cache.set_flag(rel, sha, has_links)
+
+    if not args.files:
+        cache.prune(e.rel_path for e in rem_entries)
+    if not args.no_cache:
+        cache.save()
 
     if args.verbose or args.dry_run:
         print(f"Processed {len(files)} files, updated {changed}")
+        if len(files) < total:
+            print(f"  Skipped {total - len(files)} files without wikilinks")
 
 
 if __name__ == '__main__':
     main()
-
-
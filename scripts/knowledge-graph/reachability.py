@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Hierarchy Reachability Index
+
+Transitive closure of the ordering relations in backlinks.json, so a
+proposed edge can be checked for closing a cycle (or contradicting an
+existing ancestor chain) anywhere in the knowledge base with one lookup.
+
+Hierarchies (edges normalized to "lower -> higher"):
+    prerequisite - A prerequisite_of B: A -> B; A depends_on / has_prerequisite B: B -> A
+    component    - A component_of B: A -> B;    A has_component B: B -> A
+
+Each hierarchy is condensed into strongly connected components (existing
+cycles collapse into one component) and every component stores the set of
+components it reaches as an integer bitset. reaches(a, b) is then a single
+bit test. Accepted batch edges can be layered on top with add_edge(), which
+keeps the closure exact for the rest of the batch.
+
+Each component also gets a DAG depth level (longest chain of lower
+components below it; level 0 has no prerequisites), so review queues can
+put prerequisites before dependants with a per-Rem lookup.
+
+The index is persisted next to backlinks.json (reachability.json), keyed by
+the index's (mtime_ns, size) like the graph pickle, and rebuilt from the
+cached KnowledgeGraph when stale.
+
+Usage:
+    from reachability import load_reachability
+
+    index = load_reachability()
+    cycle = index.closes_cycle('calculus', 'limits', 'prerequisite_of')
+    if cycle:
+        print(' → '.join(cycle))
+
+CLI:
+    python3 scripts/knowledge-graph/reachability.py [--rebuild] [--check FROM TO TYPE]
+"""
+
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from knowledge_graph import BACKLINKS_PATH, KnowledgeGraph, load_graph
+from rebuild_utils import atomic_write_json
+from utils.file_lock import FileLock
+
+INDEX_NAME = "reachability.json"
+INDEX_VERSION = 2
+
+# family -> (forward types A->B, reverse types B->A)
+HIERARCHIES: Dict[str, Tuple[Set[str], Set[str]]] = {
+    'prerequisite': ({'prerequisite_of'}, {'depends_on', 'has_prerequisite'}),
+    'component': ({'component_of'}, {'has_component'}),
+}
+
+
+def normalize_edge(a: str, b: str, rel_type: str) -> Optional[Tuple[str, str, str]]:
+    """Map a typed edge to (family, lower, higher), or None if not hierarchical."""
+    for family, (forward, reverse) in HIERARCHIES.items():
+        if rel_type in forward:
+            return family, a, b
+        if rel_type in reverse:
+            return family, b, a
+    return None
+
+
+def strongly_connected_components(nodes: int, succ: List[List[int]]) -> List[List[int]]:
+    """
+    Iterative Tarjan over integer nodes 0..nodes-1 (also used by rebuild-backlinks.py).
+
+    Components come out in reverse topological order (sinks first).
+    """
+    index = [-1] * nodes
+    low = [0] * nodes
+    on_stack = [False] * nodes
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in range(nodes):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            recurse = False
+            for j in range(i, len(succ[v])):
+                w = succ[v][j]
+                if index[w] == -1:
+                    work.append((v, j + 1))
+                    work.append((w, 0))
+                    recurse = True
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            if recurse:
+                continue
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+    return components
+
+
+class Hierarchy:
+    """Reachability over one normalized hierarchy."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.succ: List[List[int]] = []
+        self.comp: List[int] = []          # node -> component
+        self.members: List[List[int]] = []  # component -> nodes
+        self.reach: List[int] = []          # component -> bitset of reachable components (incl. self)
+        self.levels: Optional[List[int]] = []  # component -> DAG depth (None when stale)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> 'Hierarchy':
+        h = cls()
+        for a, b in edges:
+            ia, ib = h._intern(a), h._intern(b)
+            if ib not in h.succ[ia]:
+                h.succ[ia].append(ib)
+        h._close()
+        return h
+
+    def _intern(self, cid: str) -> int:
+        i = self.index.get(cid)
+        if i is None:
+            i = len(self.ids)
+            self.ids.append(cid)
+            self.index[cid] = i
+            self.succ.append([])
+        return i
+
+    def _close(self) -> None:
+        """Condense into SCCs and compute the closure bottom-up."""
+        components = strongly_connected_components(len(self.ids), self.succ)
+        self.comp = [0] * len(self.ids)
+        for c, members in enumerate(components):
+            for v in members:
+                self.comp[v] = c
+        self.members = [sorted(m) for m in components]
+        self.reach = []
+        for c, members in enumerate(self.members):
+            bits = 1 << c
+            for v in members:
+                for w in self.succ[v]:
+                    if self.comp[w] != c:
+                        bits |= self.reach[self.comp[w]]  # sinks first: already final
+            self.reach.append(bits)
+        self.levels = self._compute_levels()
+
+    def _compute_levels(self) -> List[int]:
+        """Longest-path depth per component (Kahn's order over the condensation)."""
+        n = len(self.members)
+        indegree = [0] * n
+        for v, targets in enumerate(self.succ):
+            for w in targets:
+                if self.comp[w] != self.comp[v]:
+                    indegree[self.comp[w]] += 1
+        levels = [0] * n
+        ready = [c for c in range(n) if not indegree[c]]
+        while ready:
+            c = ready.pop()
+            for v in self.members[c]:
+                for w in self.succ[v]:
+                    cw = self.comp[w]
+                    if cw == c:
+                        continue
+                    levels[cw] = max(levels[cw], levels[c] + 1)
+                    indegree[cw] -= 1
+                    if not indegree[cw]:
+                        ready.append(cw)
+        return levels
+
+    def _node(self, cid: str) -> int:
+        """Index of cid, adding an isolated node (own component) if new."""
+        i = self.index.get(cid)
+        if i is None:
+            i = self._intern(cid)
+            self.comp.append(len(self.members))
+            self.members.append([i])
+            self.reach.append(1 << self.comp[i])
+            if self.levels is not None:
+                self.levels.append(0)
+        return i
+
+    # ---------- queries ----------
+
+    def __contains__(self, cid: str) -> bool:
+        return cid in self.index
+
+    def reaches(self, a: str, b: str) -> bool:
+        """True if a path a -> ... -> b exists (a reaches itself)."""
+        if a == b:
+            return True
+        ia, ib = self.index.get(a), self.index.get(b)
+        if ia is None or ib is None:
+            return False
+        return bool(self.reach[self.comp[ia]] >> self.comp[ib] & 1)
+
+    def level(self, cid: str) -> int:
+        """DAG depth of cid's component (0 for unknown concepts)."""
+        i = self.index.get(cid)
+        if i is None:
+            return 0
+        if self.levels is None:
+            self.levels = self._compute_levels()
+        return self.levels[self.comp[i]]
+
+    def path(self, a: str, b: str) -> List[str]:
+        """One shortest path a -> ... -> b (empty if none)."""
+        if a == b:
+            return [a]
+        if not self.reaches(a, b):
+            return []
+        start, goal = self.index[a], self.index[b]
+        parent = {start: start}
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            for w in self.succ[v]:
+                if w in parent:
+                    continue
+                parent[w] = v
+                if w == goal:
+                    out = [w]
+                    while out[-1] != start:
+                        out.append(parent[out[-1]])
+                    return [self.ids[i] for i in reversed(out)]
+                queue.append(w)
+        return []
+
+    def cycles(self) -> List[List[str]]:
+        """Members of every cyclic component, sorted."""
+        out = []
+        for members in self.members:
+            if len(members) > 1 or (members and members[0] in self.succ[members[0]]):
+                out.append(sorted(self.ids[v] for v in members))
+        return sorted(out)
+
+    # ---------- batch overlay ----------
+
+    def add_edge(self, a: str, b: str) -> bool:
+        """
+        Add a -> b unless it would close a cycle; keeps the closure exact.
+
+        Returns:
+            False (and leaves the index unchanged) if b already reaches a
+        """
+        if self.reaches(b, a):
+            return False
+        ia, ib = self._node(a), self._node(b)
+        if ib not in self.succ[ia]:
+            self.succ[ia].append(ib)
+        ca, cb = self.comp[ia], self.comp[ib]
+        self.levels = None  # overlay edges can deepen levels; recomputed on demand
+        if not self.reach[ca] >> cb & 1:
+            extra = self.reach[cb]
+            for c, bits in enumerate(self.reach):
+                if bits >> ca & 1:
+                    self.reach[c] = bits | extra
+        return True
+
+    # ---------- persistence ----------
+
+    def to_json(self) -> Dict:
+        return {
+            "nodes": self.ids,
+            "succ": self.succ,
+            "comp": self.comp,
+            "reach": [format(bits, 'x') for bits in self.reach],
+            "levels": self.levels if self.levels is not None else self._compute_levels(),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'Hierarchy':
+        h = cls()
+        h.ids = list(data["nodes"])
+        h.index = {cid: i for i, cid in enumerate(h.ids)}
+        h.succ = [list(s) for s in data["succ"]]
+        h.comp = list(data["comp"])
+        h.reach = [int(bits, 16) for bits in data["reach"]]
+        h.members = [[] for _ in h.reach]
+        for v, c in enumerate(h.comp):
+            h.members[c].append(v)
+        h.levels = list(data["levels"])
+        return h
+
+
+class ReachabilityIndex:
+    """One Hierarchy per family in HIERARCHIES."""
+
+    def __init__(self, families: Optional[Dict[str, Hierarchy]] = None):
+        self.families = families or {name: Hierarchy() for name in HIERARCHIES}
+
+    @classmethod
+    def from_graph(cls, graph: KnowledgeGraph) -> 'ReachabilityIndex':
+        edges: Dict[str, List[Tuple[str, str]]] = {name: [] for name in HIERARCHIES}
+        for cid in graph:
+            for target, rel_type in graph.typed_links_to(cid):
+                normalized = normalize_edge(cid, target, rel_type)
+                if normalized:
+                    family, lower, higher = normalized
+                    edges[family].append((lower, higher))
+        return cls({name: Hierarchy.from_edges(e) for name, e in edges.items()})
+
+    def reaches(self, family: str, a: str, b: str) -> bool:
+        return self.families[family].reaches(a, b)
+
+    def closes_cycle(self, a: str, b: str, rel_type: str) -> Optional[List[str]]:
+        """
+        Cycle the typed edge a -> b would close, or None.
+
+        The cycle is returned in normalized direction, starting and ending
+        at the edge's lower end, e.g. [a, b, c, a] for a prerequisite_of b
+        when b is already (transitively) a prerequisite of a.
+        """
+        normalized = normalize_edge(a, b, rel_type)
+        if not normalized:
+            return None
+        family, lower, higher = normalized
+        hierarchy = self.families[family]
+        if not hierarchy.reaches(higher, lower):
+            return None
+        return [lower] + hierarchy.path(higher, lower)
+
+    def add_edge(self, a: str, b: str, rel_type: str) -> bool:
+        """Layer an accepted typed edge onto the index (no-op for other types)."""
+        normalized = normalize_edge(a, b, rel_type)
+        if not normalized:
+            return True
+        family, lower, higher = normalized
+        return self.families[family].add_edge(lower, higher)
+
+
+def index_path_for(backlinks_path: Path) -> Path:
+    """Return the reachability index location for a backlinks index."""
+    return Path(backlinks_path).with_name(INDEX_NAME)
+
+
+def _signature(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_reachability(backlinks_path: Path = BACKLINKS_PATH, use_cache: bool = True) -> ReachabilityIndex:
+    """
+    Load the reachability index, rebuilding it when backlinks.json changed.
+
+    Raises:
+        FileNotFoundError: If backlinks.json does not exist
+    """
+    backlinks_path = Path(backlinks_path)
+    signature = _signature(backlinks_path)
+    index_path = index_path_for(backlinks_path)
+
+    if use_cache:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("signature") == signature \
+                    and set(data.get("families", {})) == set(HIERARCHIES):
+                return ReachabilityIndex({name: Hierarchy.from_json(h) for name, h in data["families"].items()})
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    index = ReachabilityIndex.from_graph(load_graph(backlinks_path, use_cache=use_cache))
+    if use_cache:
+        payload = {
+            "version": INDEX_VERSION,
+            "signature": signature,
+            "families": {name: h.to_json() for name, h in index.families.items()},
+        }
+        try:
+            with FileLock(index_path, timeout=30):
+                atomic_write_json(index_path, payload, indent=None)
+        except (OSError, TimeoutError):
+            pass
+    return index
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Hierarchy reachability index')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the cached index')
+    parser.add_argument('--check', nargs=3, metavar=('FROM', 'TO', 'TYPE'),
+                        help='Check whether a proposed typed edge closes a cycle')
+    args = parser.parse_args()
+
+    try:
+        index = load_reachability(use_cache=not args.rebuild)
+    except FileNotFoundError:
+        print(f"Error: {BACKLINKS_PATH} not found", file=sys.stderr)
+        return 1
+
+    if args.check:
+        cycle = index.closes_cycle(*args.check)
+        print(json.dumps({"edge": args.check, "closes_cycle": bool(cycle), "cycle": cycle or []},
+                         ensure_ascii=False))
+        return 1 if cycle else 0
+
+    for name, h in index.families.items():
+        cycles = h.cycles()
+        print(f"{name}: {len(h.ids)} concepts, {sum(len(s) for s in h.succ)} edges, {len(cycles)} cyclic components")
+        for members in cycles[:5]:
+            print(f"  cycle: {', '.join(members)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
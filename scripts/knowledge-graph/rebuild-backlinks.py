@@ -15,6 +15,14 @@ Options:
     --backup-dir DIR    Custom backup directory
     --no-backup         Skip backup creation
     --cleanup-backups N Keep only N most recent backups
+    --incremental       Re-extract only changed Rems (content hashes) and patch
+                        linked_from / typed_linked_from / inferred_links_to for
+                        the affected neighbourhood only
+    --verify            Incremental run checked byte for byte against a full rebuild
+    --jobs N            Extract Rems in N worker processes (output is identical)
+    --inferred-top-k K  Keep the K best two-hop inferred links per concept,
+                        ranked by relation-weighted path score (default: 10,
+                        0 = unlimited)
 
 Examples:
     # Standard rebuild with backup
@@ -28,15 +36,27 @@ Examples:
 
     # Custom backup location
     source venv/bin/activate && source venv/bin/activate && python3 scripts/rebuild-backlinks.py --backup-dir /backups
+
+    # Incremental rebuild after editing a few Rems (extraction cache: _index/backlinks-cache.json)
+    source venv/bin/activate && python3 scripts/knowledge-graph/rebuild-backlinks.py --incremental
 """
 
 import json
+import hashlib
+import logging
 import re
 import argparse
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from scipy.sparse import csr_matrix
+except ImportError:
+    print("Error: scipy not installed. Run: pip install scipy")
+    sys.exit(1)
 
 # Add scripts directory to path for imports
 SCRIPT_DIR = Path(__file__).parent
@@ -47,17 +67,48 @@ sys.path.insert(0, str(ROOT / "scripts"))
 from rebuild_utils import (
     create_backup,
     setup_logging,
-    parse_rem_frontmatter,
+    parse_frontmatter_text,
     atomic_write_json,
     check_disk_space,
     cleanup_old_backups
 )
+from reachability import strongly_connected_components
+from rem_manifest import RemEntry, load_manifest
 from utils.file_lock import FileLock
 
 # Constants
 KB_DIR = ROOT / "knowledge-base"
 IDX_DIR = KB_DIR / "_index"
 BACKLINKS_PATH = IDX_DIR / "backlinks.json"
+CACHE_PATH = IDX_DIR / "backlinks-cache.json"
+CACHE_VERSION = "1.0.0"
+
+# Two-hop inferred links: keep only the K best per concept (0 = unlimited)
+INFERRED_TOP_K = 10
+
+# Relation weights for ranking inferred links; a path A->B->C scores
+# w(A->B) * w(B->C). Weights are dyadic fractions so sums of path scores are
+# exact in floating point, keeping sparse and incremental results identical.
+RELATION_WEIGHTS = {
+    # Structural / hierarchical
+    'prerequisite_of': 1.0, 'has_prerequisite': 1.0, 'depends_on': 1.0,
+    'component_of': 1.0, 'part_of': 1.0, 'has_part': 1.0,
+    'is_a': 1.0, 'has_subtype': 1.0, 'generalizes': 1.0, 'specializes': 1.0,
+    'extends': 1.0, 'is_extended_by': 1.0, 'member_of': 1.0, 'has_member': 1.0,
+    # Functional / causal
+    'uses': 0.75, 'used_in': 0.75, 'used_by': 0.75,
+    'example_of': 0.75, 'has_example': 0.75,
+    'applies_to': 0.75, 'applied_by': 0.75,
+    'cause_of': 0.75, 'effect_of': 0.75, 'caused_by': 0.75,
+    'defines': 0.75, 'defined_by': 0.75,
+    # Associative
+    'related': 0.5, 'related_to': 0.5, 'complements': 0.5,
+    'analogous_to': 0.5, 'synonym': 0.5,
+    # Contrastive relations transmit little
+    'contrasts_with': 0.25, 'antonym': 0.25,
+}
+DEFAULT_RELATION_WEIGHT = 0.5   # typed with an unknown relation
+UNTYPED_LINK_WEIGHT = 0.5       # plain [[wikilink]]
 
 # Regex for wikilinks: [[concept-id]]
 LINK_RE = re.compile(r'\[\[([a-z0-9\-]+)\]\]', re.IGNORECASE)
@@ -78,30 +129,42 @@ RELATED_REMS_LINK_RE = re.compile(
 )
 
 
-def scan_rems(kb_path: Path) -> List[Path]:
+def scan_rem_entries(kb_path: Path) -> List[RemEntry]:
     """
-    Scan knowledge base for all Rem markdown files (recursively).
+    Scan knowledge base for all Rem manifest entries (via the shared Rem manifest).
 
     Args:
         kb_path: Root knowledge base directory
 
     Returns:
-        List of paths to all .md files (excluding _* directories and backups)
+        Manifest entries for all .md files (excluding _* directories and backups),
+        sorted by path
     """
-    rem_files = []
-
     if not kb_path.exists():
-        return rem_files
+        return []
 
-    # Recursively find all .md files
-    for md_file in kb_path.rglob('*.md'):
+    entries = []
+    for entry in load_manifest(kb_path).entries():
         # Skip template/index/backup directories
         if any(part.startswith('_') or 'backup' in part.lower()
-               for part in md_file.parts):
+               for part in entry.path.parts):
             continue
-        rem_files.append(md_file)
+        entries.append(entry)
+
+    return sorted(entries, key=lambda e: e.path)
+
+
+def scan_rems(kb_path: Path) -> List[Path]:
+    """
+    Scan knowledge base for all Rem markdown files (via the shared Rem manifest).
 
-    return sorted(rem_files)
+    Args:
+        kb_path: Root knowledge base directory
+
+    Returns:
+        List of paths to all .md files (excluding _* directories and backups)
+    """
+    return [entry.path for entry in scan_rem_entries(kb_path)]
 
 
 def extract_wikilinks(content: str) -> List[str]:
@@ -220,68 +283,292 @@ def get_concept_id(file_path: Path, frontmatter: Dict[str, str]) -> str:
     return file_path.stem.lower()
 
 
-def detect_cycles(graph: Dict[str, Dict], logger) -> List[List[str]]:
+def find_strongly_connected_components(graph: Dict[str, Dict]) -> List[List[str]]:
     """
-    Detect cycles in the link graph using DFS.
+    Strongly connected components of the links_to graph.
+
+    Uses the iterative Tarjan in reachability.py over integer node ids, so
+    deep or highly cyclic link graphs cannot hit Python's recursion limit.
+    Links to concepts outside the graph are ignored.
 
     Args:
         graph: Link graph (concept_id -> {links_to, ...})
-        logger: Logger instance
 
     Returns:
-        List of cycles, where each cycle is a list of concept IDs
+        Components ordered by their earliest member in graph order; members
+        within a component also follow graph order
     """
-    cycles = []
-    visited = set()
-    rec_stack = set()  # Recursion stack for cycle detection
+    ids = list(graph)
+    position = {cid: i for i, cid in enumerate(ids)}
+    succ = [[position[t] for t in graph[cid].get('links_to', []) if t in position] for cid in ids]
+    components = sorted(sorted(c) for c in strongly_connected_components(len(ids), succ))
+    return [[ids[i] for i in c] for c in components]
 
-    def dfs(node: str, path: List[str]) -> None:
-        """DFS helper with path tracking."""
-        if node in rec_stack:
-            # Found a cycle
-            cycle_start = path.index(node)
-            cycle = path[cycle_start:] + [node]
-            cycles.append(cycle)
-            return
 
-        if node in visited:
-            return
+def is_cyclic_component(component: List[str], graph: Dict[str, Dict]) -> bool:
+    """True for components of size > 1, or a single concept linking to itself."""
+    if len(component) > 1:
+        return True
+    node = component[0]
+    return node in graph[node].get('links_to', [])
 
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
 
-        # Explore neighbors
-        node_data = graph.get(node, {})
-        for neighbor in node_data.get('links_to', []):
-            if neighbor in graph:  # Only follow valid links
-                dfs(neighbor, path.copy())
+def representative_cycle(component: List[str], graph: Dict[str, Dict]) -> List[str]:
+    """
+    One concrete cycle through a cyclic component (shortest back to its first member).
 
-        rec_stack.remove(node)
+    BFS restricted to the component, so linear in the component's size.
 
-    # Run DFS from each unvisited node
-    for concept_id in graph.keys():
-        if concept_id not in visited:
-            dfs(concept_id, [])
+    Returns:
+        Cycle as [start, ..., start]
+    """
+    start = component[0]
+    members = set(component)
+    parent: Dict[str, str] = {}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for node in frontier:
+            for succ in graph[node].get('links_to', []):
+                if succ == start:
+                    path = [node]
+                    while path[-1] != start:
+                        path.append(parent[path[-1]])
+                    return [start] + path[::-1][1:] + [start]
+                if succ in members and succ not in parent and succ != start:
+                    parent[succ] = node
+                    next_frontier.append(succ)
+        frontier = next_frontier
+    return [start, start]
+
+
+def detect_cycles(graph: Dict[str, Dict], logger,
+                  components: Optional[List[List[str]]] = None) -> List[List[str]]:
+    """
+    Detect cycles in the link graph via strongly connected components.
+
+    Reports each non-trivial SCC with its size and one representative cycle.
+
+    Args:
+        graph: Link graph (concept_id -> {links_to, ...})
+        logger: Logger instance
+        components: Precomputed SCCs (default: computed here)
+
+    Returns:
+        One representative cycle per cyclic component, each a list of concept IDs
+    """
+    if components is None:
+        components = find_strongly_connected_components(graph)
+
+    cyclic = [c for c in components if is_cyclic_component(c, graph)]
+    cycles = [representative_cycle(c, graph) for c in cyclic]
 
     # Log cycles if found
     if cycles:
-        logger.warning(f"Found {len(cycles)} cycle(s) in link graph:")
-        for i, cycle in enumerate(cycles, 1):
+        logger.warning(f"Found {len(cycles)} cyclic component(s) in link graph:")
+        for i, (component, cycle) in enumerate(zip(cyclic, cycles), 1):
             cycle_str = ' → '.join(cycle)
-            logger.warning(f"  Cycle {i}: {cycle_str}")
+            logger.warning(f"  SCC {i} ({len(component)} concepts), e.g. {cycle_str}")
         logger.warning("These circular references won't break the system but may affect navigation.")
 
     return cycles
 
 
-def build_backlink_graph(rem_files: List[Path], logger) -> Tuple[Dict[str, Dict], Set[str], Dict[str, Dict[str, str]]]:
+def compute_scc_ids(components: List[List[str]]) -> Dict[str, int]:
+    """Map each concept to the index of its strongly connected component."""
+    return {cid: i for i, component in enumerate(components) for cid in component}
+
+
+def extract_rem_record(file_path: Path) -> Dict:
     """
-    Build bidirectional link graph from Rem files.
+    Read one Rem and extract everything the link graph needs from it.
 
     Args:
-        rem_files: List of paths to Rem markdown files
+        file_path: Path to Rem markdown file
+
+    Returns:
+        Dict with concept_id, title, file (KB-relative), links and merged typed_links
+    """
+    # Read the file once; frontmatter and links come from the same text
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Parse frontmatter
+    frontmatter = parse_frontmatter_text(content)
+
+    # Get concept ID
+    concept_id = get_concept_id(file_path, frontmatter)
+
+    # Extract wikilinks
+    links = extract_wikilinks(content)
+    typed_links = extract_typed_links(content)
+    related_rems_links = extract_related_rems_links(content)
+
+    # Merge typed links from both sources
+    # Related Rems section takes precedence (explicit curation)
+    all_typed_links = related_rems_links + typed_links
+
+    # Deduplicate by (to, type) keeping first occurrence
+    seen_pairs = set()
+    deduped_typed: List[Dict[str, str]] = []
+    for link in all_typed_links:
+        key = (link["to"], link["type"])
+        if key not in seen_pairs:
+            seen_pairs.add(key)
+            deduped_typed.append(link)
+
+    # Store KB-relative POSIX path for portability
+    try:
+        rel_path = file_path.relative_to(KB_DIR).as_posix()
+    except ValueError:
+        # Fallback to POSIX path if not under KB_DIR
+        rel_path = file_path.as_posix()
+
+    return {
+        "concept_id": concept_id,
+        "title": frontmatter.get('title', concept_id),
+        "file": rel_path,
+        "links": links,
+        "typed_links": deduped_typed,
+    }
+
+
+def _extract_worker(file_path: Path) -> Tuple[Optional[Dict], Optional[str]]:
+    """Process-pool entry point: never raises, returns (record, error)."""
+    try:
+        return extract_rem_record(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def extract_records(file_paths: List[Path], jobs: int = 1) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Extract records for many files, optionally in a process pool.
+
+    Results are returned in input order regardless of completion order, so
+    the assembled graph is identical for any --jobs value.
+
+    Args:
+        file_paths: Files to extract
+        jobs: Worker processes (1 = serial, in-process)
+
+    Returns:
+        List of (record, error) tuples aligned with file_paths
+    """
+    if jobs <= 1 or len(file_paths) < 2:
+        return [_extract_worker(fp) for fp in file_paths]
+
+    workers = min(jobs, len(file_paths))
+    # Large chunks amortize IPC; small files make per-task overhead dominant
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_extract_worker, file_paths, chunksize=chunksize))
+
+
+def link_weights(forward_links: Dict[str, List[str]],
+                 typed_links: Dict[str, List[Dict[str, str]]]) -> Dict[Tuple[str, str], float]:
+    """
+    Weight of every in-graph link A->B (self-links excluded).
+
+    A link carries the strongest weight among its typed relations, or
+    UNTYPED_LINK_WEIGHT when it has none.
+    """
+    weights: Dict[Tuple[str, str], float] = {}
+    for a_id, targets in forward_links.items():
+        typed_w: Dict[str, float] = {}
+        for tl in typed_links.get(a_id, []):
+            w = RELATION_WEIGHTS.get(tl.get("type"), DEFAULT_RELATION_WEIGHT)
+            typed_w[tl.get("to")] = max(w, typed_w.get(tl.get("to"), 0.0))
+        for b_id in targets:
+            if b_id != a_id and b_id in forward_links:
+                weights[(a_id, b_id)] = typed_w.get(b_id, UNTYPED_LINK_WEIGHT)
+    return weights
+
+
+def compute_inferred_links(forward_links: Dict[str, List[str]],
+                           typed_links: Dict[str, List[Dict[str, str]]],
+                           sources: Optional[Iterable[str]] = None,
+                           top_k: int = INFERRED_TOP_K) -> Dict[str, List[Dict]]:
+    """
+    Ranked two-hop inferred links A->B->C => A => C.
+
+    Builds the weighted adjacency matrix W as CSR and reads candidates off
+    W² (summed path scores) and its binary counterpart A² (path counts).
+    Direct links and self-links are excluded. Candidates are ranked by
+    score, then path count, then concept order; each keeps the intermediate
+    with the strongest single path as "via".
+
+    Args:
+        forward_links: concept_id -> links_to for every concept in the graph
+        typed_links: concept_id -> typed_links_to
+        sources: Concepts to compute (default: all)
+        top_k: Links kept per concept (0 = unlimited)
+
+    Returns:
+        concept_id -> [{"to", "via", "paths", "score"}] for every source
+    """
+    nodes = list(forward_links)
+    index = {cid: i for i, cid in enumerate(nodes)}
+    if sources is None:
+        sources = nodes
+    else:
+        wanted = set(sources)
+        sources = [c for c in nodes if c in wanted]
+    if not sources:
+        return {}
+
+    weights = link_weights(forward_links, typed_links)
+    rows = [index[a] for a, _ in weights]
+    cols = [index[b] for _, b in weights]
+    n = len(nodes)
+    w_mat = csr_matrix((list(weights.values()), (rows, cols)), shape=(n, n))
+    a_mat = csr_matrix(([1] * len(rows), (rows, cols)), shape=(n, n))
+
+    src_idx = [index[c] for c in sources]
+    scores = w_mat[src_idx] @ w_mat
+    counts = a_mat[src_idx] @ a_mat
+    scores.sort_indices()
+    counts.sort_indices()
+
+    inferred: Dict[str, List[Dict]] = {}
+    for r, a_id in enumerate(sources):
+        lo, hi = scores.indptr[r], scores.indptr[r + 1]
+        direct = set(forward_links[a_id])
+        candidates = []
+        for j, score, paths in zip(scores.indices[lo:hi], scores.data[lo:hi],
+                                   counts.data[counts.indptr[r]:counts.indptr[r + 1]]):
+            c_id = nodes[j]
+            if c_id == a_id or c_id in direct:
+                continue
+            candidates.append((-float(score), -int(paths), int(j)))
+        candidates.sort()
+        if top_k:
+            candidates = candidates[:top_k]
+
+        links = []
+        for neg_score, neg_paths, j in candidates:
+            c_id = nodes[j]
+            via, best = None, 0.0
+            for b_id in forward_links[a_id]:
+                path = weights.get((a_id, b_id), 0.0) * weights.get((b_id, c_id), 0.0)
+                if path > best:
+                    via, best = b_id, path
+            links.append({"to": c_id, "via": via, "paths": -neg_paths, "score": -neg_score})
+        inferred[a_id] = links
+    return inferred
+
+
+def assemble_graph(records: List[Dict], logger,
+                   top_k: int = INFERRED_TOP_K) -> Tuple[Dict[str, Dict], Set[str], Dict[str, Dict[str, str]]]:
+    """
+    Build bidirectional link graph from extracted Rem records.
+
+    Concepts keep the order of their first record, so output is deterministic.
+
+    Args:
+        records: Records from extract_rem_record(), in file order
         logger: Logger instance for output
+        top_k: Inferred links kept per concept (0 = unlimited)
 
     Returns:
         Tuple of (link graph dict, set of broken link IDs, concepts metadata)
@@ -291,73 +578,23 @@ def build_backlink_graph(rem_files: List[Path], logger) -> Tuple[Dict[str, Dict]
     concepts_meta: Dict[str, Dict[str, str]] = {}
 
     # First pass: collect all concept IDs and forward links
-    concept_files: Dict[str, Path] = {}  # concept_id -> file_path
     forward_links: Dict[str, List[str]] = {}  # concept_id -> [target_ids]
     typed_forward_links: Dict[str, List[Dict[str, str]]] = {}  # concept_id -> [{to, type}]
 
-    for file_path in rem_files:
-        try:
-            # Parse frontmatter
-            frontmatter = parse_rem_frontmatter(file_path)
-
-            # Get concept ID
-            concept_id = get_concept_id(file_path, frontmatter)
-
-            # Read full content for wikilink extraction
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Extract wikilinks
-            links = extract_wikilinks(content)
-            typed_links = extract_typed_links(content)
-            related_rems_links = extract_related_rems_links(content)
-
-            # Merge typed links from both sources
-            # Related Rems section takes precedence (explicit curation)
-            all_typed_links = related_rems_links + typed_links
-
-            # Deduplicate by (to, type) keeping first occurrence
-            seen_pairs = set()
-            deduped_typed: List[Dict[str, str]] = []
-            for link in all_typed_links:
-                key = (link["to"], link["type"])
-                if key not in seen_pairs:
-                    seen_pairs.add(key)
-                    deduped_typed.append(link)
-
-            # Store data
-            concept_files[concept_id] = file_path
-            forward_links[concept_id] = links
-            typed_forward_links[concept_id] = deduped_typed
-
-            # Concept metadata
-            title = frontmatter.get('title', concept_id)
-            # Store KB-relative POSIX path for portability
-            try:
-                rel_path = file_path.relative_to(KB_DIR).as_posix()
-            except ValueError:
-                # Fallback to POSIX path if not under KB_DIR
-                rel_path = file_path.as_posix()
-            concepts_meta[concept_id] = {
-                "title": title,
-                "file": rel_path,
-            }
-
-            logger.debug(f"Processed {concept_id}: {len(links)} links")
-
-        except Exception as e:
-            logger.warning(f"Failed to process {file_path}: {e}")
-            continue
+    for record in records:
+        concept_id = record["concept_id"]
+        forward_links[concept_id] = record["links"]
+        typed_forward_links[concept_id] = record["typed_links"]
+        concepts_meta[concept_id] = {
+            "title": record["title"],
+            "file": record["file"],
+        }
 
     # Build graph with forward and backward links
-    all_concept_ids = set(concept_files.keys())
-
-    for concept_id in all_concept_ids:
-        links_to = forward_links.get(concept_id, [])
-
+    for concept_id, links_to in forward_links.items():
         # Check for broken links
         for target_id in links_to:
-            if target_id not in all_concept_ids:
+            if target_id not in forward_links:
                 broken_links.add(target_id)
                 logger.warning(f"Broken link: [[{target_id}]] referenced by {concept_id}")
 
@@ -383,51 +620,269 @@ def build_backlink_graph(rem_files: List[Path], logger) -> Tuple[Dict[str, Dict]
                     "type": typed.get("type", "related")
                 })
 
-    # Third pass: build simple two-hop inferred links A->B->C => A => C
+    # Third pass: ranked two-hop inferred links A->B->C => A => C
+    inferred = compute_inferred_links(forward_links, typed_forward_links, top_k=top_k)
     for a_id, a_data in graph.items():
-        inferred: List[Dict[str, str]] = []
-        direct_set = set(a_data.get("links_to", []))
-        for b_id in a_data.get("links_to", []):
-            b_data = graph.get(b_id)
-            if not b_data:
-                continue
-            for c_id in b_data.get("links_to", []):
-                if c_id == a_id:
-                    continue
-                if c_id in direct_set:
-                    continue
-                # Avoid duplicates by (to, via)
-                inferred.append({"to": c_id, "via": b_id})
-        # Deduplicate by (to, via)
-        seen_iv = set()
-        deduped: List[Dict[str, str]] = []
-        for item in inferred:
-            key = (item["to"], item["via"])
-            if key in seen_iv:
+        a_data["inferred_links_to"] = inferred[a_id]
+
+    return graph, broken_links, concepts_meta
+
+
+def build_backlink_graph(rem_files: List[Path], logger, jobs: int = 1,
+                         top_k: int = INFERRED_TOP_K) -> Tuple[Dict[str, Dict], Set[str], Dict[str, Dict[str, str]]]:
+    """
+    Build bidirectional link graph from Rem files.
+
+    Args:
+        rem_files: List of paths to Rem markdown files
+        logger: Logger instance for output
+        jobs: Worker processes for extraction (default: 1, serial)
+        top_k: Inferred links kept per concept (0 = unlimited)
+
+    Returns:
+        Tuple of (link graph dict, set of broken link IDs, concepts metadata)
+    """
+    records = []
+    for file_path, (record, error) in zip(rem_files, extract_records(rem_files, jobs)):
+        if record is None:
+            logger.warning(f"Failed to process {file_path}: {error}")
+            continue
+        records.append(record)
+        logger.debug(f"Processed {record['concept_id']}: {len(record['links'])} links")
+
+    return assemble_graph(records, logger, top_k)
+
+
+# ==================== Incremental mode ====================
+
+def load_extraction_cache(cache_path: Path = CACHE_PATH) -> Dict:
+    """
+    Load the per-file extraction cache.
+
+    Returns:
+        {"backlinks_sha256": str, "files": {rel_path: {"sha256", "record"}}},
+        or an empty cache if missing, unreadable or from another version
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, PermissionError, json.JSONDecodeError):
+        return {"backlinks_sha256": None, "files": {}}
+    if data.get("version") != CACHE_VERSION:
+        return {"backlinks_sha256": None, "files": {}}
+    return data
+
+
+def save_extraction_cache(files: Dict[str, Dict], backlinks_sha256: str,
+                          cache_path: Path = CACHE_PATH) -> None:
+    """Persist the per-file extraction cache next to backlinks.json."""
+    atomic_write_json(cache_path, {
+        "version": CACHE_VERSION,
+        "backlinks_sha256": backlinks_sha256,
+        "files": files,
+    }, indent=None)
+
+
+def collect_records(entries: List[RemEntry], cached_files: Dict[str, Dict],
+                    logger, jobs: int = 1) -> Tuple[List[Dict], Dict[str, Dict], int]:
+    """
+    Collect extraction records, re-reading only files whose content hash changed.
+
+    Args:
+        entries: Rem manifest entries (sorted)
+        cached_files: Previous extraction cache files map
+        logger: Logger instance
+        jobs: Worker processes for re-extraction (default: 1, serial)
+
+    Returns:
+        Tuple of (records in file order, new cache files map, number re-extracted)
+    """
+    stale = [e for e in entries
+             if cached_files.get(e.rel_path, {}).get("sha256") != e.sha256]
+    fresh = dict(zip((e.rel_path for e in stale),
+                     extract_records([e.path for e in stale], jobs)))
+
+    records: List[Dict] = []
+    new_cache: Dict[str, Dict] = {}
+    for entry in entries:
+        if entry.rel_path in fresh:
+            record, error = fresh[entry.rel_path]
+            if record is None:
+                logger.warning(f"Failed to process {entry.path}: {error}")
                 continue
-            seen_iv.add(key)
-            deduped.append(item)
-        a_data["inferred_links_to"] = deduped
+            logger.debug(f"Processed {record['concept_id']}: {len(record['links'])} links")
+        else:
+            record = cached_files[entry.rel_path]["record"]
+        records.append(record)
+        new_cache[entry.rel_path] = {"sha256": entry.sha256, "record": record}
+
+    return records, new_cache, len(stale)
+
 
-    # Fourth pass: detect cycles (for monitoring, non-blocking)
-    cycles = detect_cycles(graph, logger)
+def patch_backlink_graph(prev_links: Dict[str, Dict], records: List[Dict], logger,
+                         top_k: int = INFERRED_TOP_K):
+    """
+    Patch a previous graph for changed records, touching only the affected neighbourhood.
+
+    Reverse lists (linked_from, typed_linked_from) are recomputed only for
+    targets of changed/added/removed concepts, and inferred links only for
+    those concepts and their predecessors. Everything else is reused from
+    prev_links.
+
+    Args:
+        prev_links: "links" section of the previous backlinks.json
+        records: Current extraction records, in file order
+        logger: Logger instance
+        top_k: Inferred links kept per concept (0 = unlimited)
+
+    Returns:
+        Same tuple as assemble_graph(), or None if the previous graph cannot be
+        patched (concept order changed) and a full assembly is required
+    """
+    order: Dict[str, int] = {}
+    forward: Dict[str, List[str]] = {}
+    typed: Dict[str, List[Dict[str, str]]] = {}
+    concepts_meta: Dict[str, Dict[str, str]] = {}
+    for record in records:
+        cid = record["concept_id"]
+        if cid not in order:
+            order[cid] = len(order)
+        forward[cid] = record["links"]
+        typed[cid] = record["typed_links"]
+        concepts_meta[cid] = {"title": record["title"], "file": record["file"]}
+
+    # Surviving concepts must keep their relative order, or reverse lists shift
+    if [c for c in prev_links if c in order] != [c for c in order if c in prev_links]:
+        return None
+
+    added = {c for c in order if c not in prev_links}
+    removed = {c for c in prev_links if c not in order}
+    changed = {
+        c for c in order if c in prev_links and (
+            prev_links[c].get("links_to") != forward[c]
+            or prev_links[c].get("typed_links_to") != typed[c]
+        )
+    }
+    dirty = added | removed | changed
+    logger.info(f"Incremental: {len(added)} added, {len(removed)} removed, {len(changed)} changed concept(s)")
+
+    # Targets whose reverse lists must be recomputed
+    targets: Set[str] = set(added)
+    for c in dirty:
+        old = prev_links.get(c, {})
+        targets.update(old.get("links_to", []))
+        targets.update(t.get("to") for t in old.get("typed_links_to", []))
+        targets.update(forward.get(c, []))
+        targets.update(t.get("to") for t in typed.get(c, []))
+    targets = {t for t in targets if t in order}
+
+    # Reverse edges contributed by dirty sources
+    dirty_sources: Dict[str, Set[str]] = {}
+    dirty_typed_sources: Dict[str, Set[str]] = {}
+    for c in dirty:
+        if c not in order:
+            continue
+        for t in forward[c]:
+            dirty_sources.setdefault(t, set()).add(c)
+        for tl in typed[c]:
+            dirty_typed_sources.setdefault(tl.get("to"), set()).add(c)
+
+    # New concepts have no previous reverse lists: scan forward links once
+    scan_sources: Dict[str, Set[str]] = {}
+    scan_typed_sources: Dict[str, Set[str]] = {}
+    if added:
+        for s in order:
+            for t in forward[s]:
+                if t in added:
+                    scan_sources.setdefault(t, set()).add(s)
+            for tl in typed[s]:
+                if tl.get("to") in added:
+                    scan_typed_sources.setdefault(tl.get("to"), set()).add(s)
+
+    linked_from: Dict[str, List[str]] = {}
+    typed_linked_from: Dict[str, List[Dict[str, str]]] = {}
+    for t in targets:
+        if t in added:
+            sources = scan_sources.get(t, set())
+            typed_sources = scan_typed_sources.get(t, set())
+        else:
+            prev = prev_links[t]
+            sources = {s for s in prev.get("linked_from", []) if s not in dirty}
+            sources |= dirty_sources.get(t, set())
+            typed_sources = {e.get("from") for e in prev.get("typed_linked_from", [])
+                             if e.get("from") not in dirty}
+            typed_sources |= dirty_typed_sources.get(t, set())
+
+        linked_from[t] = sorted(sources, key=order.get)
+        typed_linked_from[t] = [
+            {"from": s, "type": tl.get("type", "related")}
+            for s in sorted(typed_sources, key=order.get)
+            for tl in typed[s] if tl.get("to") == t
+        ]
+
+    def predecessors(c: str) -> Set[str]:
+        """Old and new sources linking to c."""
+        preds = set(prev_links.get(c, {}).get("linked_from", []))
+        preds.update(linked_from.get(c, prev_links.get(c, {}).get("linked_from", [])))
+        return preds
+
+    # Inferred links depend on a concept's targets' forward links; adding or
+    # removing a concept also changes which two-hop targets exist
+    inferred_scope: Set[str] = set()
+    for c in dirty:
+        inferred_scope.add(c)
+        preds = predecessors(c)
+        inferred_scope.update(preds)
+        if c in added or c in removed:
+            for p in preds:
+                inferred_scope.update(predecessors(p))
+    inferred_scope = {c for c in inferred_scope if c in order}
+    inferred = compute_inferred_links(forward, typed, inferred_scope, top_k)
+
+    graph: Dict[str, Dict] = {}
+    broken_links: Set[str] = set()
+    for cid in order:
+        prev = prev_links.get(cid, {})
+        for target_id in forward[cid]:
+            if target_id not in order:
+                broken_links.add(target_id)
+                if cid in dirty:
+                    logger.warning(f"Broken link: [[{target_id}]] referenced by {cid}")
+        graph[cid] = {
+            "links_to": forward[cid],
+            "typed_links_to": typed[cid],
+            "linked_from": linked_from[cid] if cid in linked_from else prev.get("linked_from", []),
+            "typed_linked_from": (typed_linked_from[cid] if cid in typed_linked_from
+                                  else prev.get("typed_linked_from", [])),
+            "inferred_links_to": (inferred[cid] if cid in inferred_scope
+                                  else prev.get("inferred_links_to", [])),
+        }
 
     return graph, broken_links, concepts_meta
 
 
-def generate_backlinks_json(graph: Dict[str, Dict], broken_links: Set[str], concepts_meta: Dict[str, Dict[str, str]]) -> Dict:
+def generate_backlinks_json(graph: Dict[str, Dict], broken_links: Set[str], concepts_meta: Dict[str, Dict[str, str]],
+                            components: Optional[List[List[str]]] = None,
+                            top_k: int = INFERRED_TOP_K) -> Dict:
     """
     Generate final backlinks.json structure.
 
     Args:
         graph: Bidirectional link graph
         broken_links: Set of broken link IDs
+        concepts_meta: Per-concept title/file metadata
+        components: Precomputed SCCs (default: computed here)
+        top_k: Inferred-link cap the graph was built with (recorded in metadata)
 
     Returns:
         Complete backlinks.json data structure
     """
     total_links = sum(len(data["links_to"]) for data in graph.values())
 
+    if components is None:
+        components = find_strongly_connected_components(graph)
+    cyclic = [(scc_id, c) for scc_id, c in enumerate(components) if is_cyclic_component(c, graph)]
+
     return {
         "version": "1.1.0",
         "description": "Bidirectional link index for all knowledge Rems, with typed and inferred links",
@@ -437,11 +892,50 @@ def generate_backlinks_json(graph: Dict[str, Dict], broken_links: Set[str], conc
             "last_updated": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
             "total_concepts": len(graph),
             "total_links": total_links,
-            "broken_links": sorted(broken_links)
+            "broken_links": sorted(broken_links),
+            "inferred_top_k": top_k,
+            "scc_count": len(components),
+            "cyclic_components": [
+                {"scc_id": scc_id, "size": len(c), "cycle": representative_cycle(c, graph)}
+                for scc_id, c in cyclic
+            ],
+            "scc_id": compute_scc_ids(components),
         }
     }
 
 
+def serialize_backlinks(output: Dict) -> str:
+    """Serialize backlinks.json exactly as atomic_write_json() writes it."""
+    return json.dumps(output, ensure_ascii=False, indent=2)
+
+
+def load_previous_links(expected_sha256, logger, top_k: int = INFERRED_TOP_K):
+    """
+    Load the "links" section of the current backlinks.json for patching.
+
+    Only trusted when its hash matches the one recorded in the extraction
+    cache, i.e. when no other tool rewrote it since our last run, and when
+    it was built with the same inferred-link cap.
+
+    Returns:
+        Links dict, or None if a full assembly is required
+    """
+    if not expected_sha256 or not BACKLINKS_PATH.exists():
+        return None
+    raw = BACKLINKS_PATH.read_bytes()
+    if hashlib.sha256(raw).hexdigest() != expected_sha256:
+        logger.info("backlinks.json was modified outside rebuild-backlinks")
+        return None
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if data.get("metadata", {}).get("inferred_top_k") != top_k:
+        logger.info("Inferred-link cap changed since last build")
+        return None
+    return data.get("links", {})
+
+
 def main():
     """Main entry point for rebuild-backlinks script."""
     parser = argparse.ArgumentParser(
@@ -461,6 +955,15 @@ def main():
                         help='Skip backup creation')
     parser.add_argument('--cleanup-backups', type=int, metavar='N',
                         help='Keep only N most recent backups')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-extract only changed Rems and patch the affected neighbourhood')
+    parser.add_argument('--verify', action='store_true',
+                        help='Run incrementally and check the result against a full rebuild')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Extract Rems in N worker processes (default: 1)')
+    parser.add_argument('--inferred-top-k', type=int, default=INFERRED_TOP_K, metavar='K',
+                        help=f'Keep the K best two-hop inferred links per concept '
+                             f'(default: {INFERRED_TOP_K}, 0 = unlimited)')
 
     args = parser.parse_args()
 
@@ -470,22 +973,62 @@ def main():
     try:
         # Scan for Rem files
         logger.info(f"Scanning {KB_DIR} for Rem files...")
-        rem_files = scan_rems(KB_DIR)
-        logger.info(f"Found {len(rem_files)} Rem files")
+        entries = scan_rem_entries(KB_DIR)
+        logger.info(f"Found {len(entries)} Rem files")
 
-        if not rem_files:
+        if not entries:
             logger.warning("No Rem files found. Backlinks index will be empty.")
 
+        incremental = args.incremental or args.verify
+        cache = load_extraction_cache() if incremental else {"backlinks_sha256": None, "files": {}}
+
+        # Extract links (incremental: only files whose content hash changed)
+        records, new_cache, extracted = collect_records(entries, cache["files"], logger, args.jobs)
+        if incremental:
+            logger.info(f"Re-extracted {extracted} of {len(records)} Rem files")
+
         # Build backlink graph
         logger.info("Building backlink graph...")
-        graph, broken_links, concepts_meta = build_backlink_graph(rem_files, logger)
+        result = None
+        if incremental:
+            prev_links = load_previous_links(cache["backlinks_sha256"], logger, args.inferred_top_k)
+            if prev_links is not None:
+                result = patch_backlink_graph(prev_links, records, logger, args.inferred_top_k)
+            if result is None:
+                logger.info("Incremental patch not possible, assembling full graph")
+        if result is None:
+            result = assemble_graph(records, logger, args.inferred_top_k)
+        graph, broken_links, concepts_meta = result
         logger.info(f"Built graph with {len(graph)} concepts")
 
         if broken_links:
             logger.warning(f"Found {len(broken_links)} broken links: {sorted(broken_links)}")
 
+        # Strongly connected components (cycle report + scc_id metadata)
+        components = find_strongly_connected_components(graph)
+        detect_cycles(graph, logger, components)
+
         # Generate output structure
-        output = generate_backlinks_json(graph, broken_links, concepts_meta)
+        output = generate_backlinks_json(graph, broken_links, concepts_meta, components,
+                                         args.inferred_top_k)
+
+        # Verify incremental output against a from-scratch rebuild
+        verify_failed = False
+        if args.verify:
+            verify_logger = logger.getChild('verify')
+            verify_logger.setLevel(logging.ERROR)
+            full_output = generate_backlinks_json(
+                *build_backlink_graph([e.path for e in entries], verify_logger, args.jobs,
+                                      args.inferred_top_k),
+                top_k=args.inferred_top_k
+            )
+            if serialize_backlinks(full_output) == serialize_backlinks(output):
+                logger.info("✅ Verify: incremental output matches full rebuild byte for byte")
+            else:
+                verify_failed = True
+                logger.error("Verify FAILED: incremental output differs from full rebuild; "
+                             "writing full rebuild instead")
+                output = full_output
 
         # Dry-run mode
         if args.dry_run:
@@ -512,15 +1055,22 @@ def main():
         # Use file lock to prevent concurrent writes
         with FileLock(BACKLINKS_PATH, timeout=60):
             atomic_write_json(BACKLINKS_PATH, output)
+            written_sha256 = hashlib.sha256(BACKLINKS_PATH.read_bytes()).hexdigest()
         logger.info(f"✅ Backlinks rebuilt: {BACKLINKS_PATH}")
 
+        # Keep the extraction cache in step with the index we just wrote
+        try:
+            save_extraction_cache(new_cache, written_sha256)
+        except OSError as e:
+            logger.warning(f"Could not write extraction cache: {e}")
+
         # Cleanup old backups
         if args.cleanup_backups:
             deleted = cleanup_old_backups(BACKLINKS_PATH, keep_count=args.cleanup_backups)
             if deleted > 0:
                 logger.info(f"Cleaned up {deleted} old backup(s)")
 
-        return 0
+        return 1 if verify_failed else 0
 
     except KeyboardInterrupt:
         logger.error("Interrupted by user")
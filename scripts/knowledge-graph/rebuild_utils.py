@@ -105,6 +105,22 @@ def parse_rem_frontmatter(file_path: Path) -> Dict[str, Any]:
     except (FileNotFoundError, PermissionError, UnicodeDecodeError):
         return {}
 
+    return parse_frontmatter_text(content)
+
+
+def parse_frontmatter_text(content: str) -> Dict[str, Any]:
+    """
+    Parse YAML frontmatter from already-loaded Rem markdown text.
+
+    Same rules as parse_rem_frontmatter(), for callers that have the file
+    content in memory and should not read it a second time.
+
+    Args:
+        content: Full markdown text
+
+    Returns:
+        Dictionary of frontmatter fields, empty dict if no frontmatter
+    """
     # Check for frontmatter
     if not content.startswith('---'):
         return {}
@@ -199,6 +215,49 @@ def atomic_write_json(file_path: Path, data: Dict[str, Any], indent: int = 2) ->
         raise
 
 
+def atomic_write_text(file_path: Path, text: str) -> int:
+    """
+    Write text atomically, keeping the target's permission bits.
+
+    Same temp-file-and-rename scheme as atomic_write_json, for markdown
+    files rewritten in place.
+
+    Args:
+        file_path: Target file path
+        text: New file content
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        OSError: If write or rename fails
+    """
+    file_path = Path(file_path)
+    data = text.encode('utf-8')
+    try:
+        mode = file_path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = None
+
+    fd, temp_path = tempfile.mkstemp(
+        dir=file_path.parent,
+        prefix=f'.{file_path.name}.tmp-'
+    )
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        Path(temp_path).replace(file_path)
+    except Exception:
+        try:
+            Path(temp_path).unlink()
+        except Exception:
+            pass
+        raise
+    return len(data)
+
 def check_disk_space(file_path: Path, required_mb: int = 10) -> bool:
     """
     Check if sufficient disk space available.
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Reverse Reference Index
+
+Persistent map from a referenced Rem name to every file that mentions it,
+with character offsets, covering knowledge-base/ and chats/. A Rem is
+referenced either as a wikilink ([[name]], keyed by name) or as a Markdown
+file link ([Title](../path/name.md)). File links are resolved against the
+referencing file's directory and keyed by the target's knowledge-base path
+("file:language/french/name.md", see file_key); links with a URL scheme,
+absolute paths and targets outside knowledge-base/ are ignored. Wikilink
+offsets point at the name and file-link offsets at the target's file name,
+so a rename is a splice at each offset.
+
+Index location: knowledge-base/_index/reference-index.json
+
+Refresh strategy (same as the Rem manifest):
+    - Walk both trees and stat every .md file
+    - Reuse entries whose (mtime_ns, size) signature is unchanged
+    - Re-scan only new or modified files
+    - Drop entries for deleted files
+
+Usage:
+    from reference_index import load_reference_index
+
+    index = load_reference_index()
+    for path, offsets in index.references('old-rem-id').items():
+        ...
+    index.references(index.file_key(rem_path))  # file links to rem_path
+
+CLI:
+    python3 scripts/knowledge-graph/reference_index.py [name ...] [--rebuild]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from rebuild_utils import atomic_write_json
+from utils.file_lock import FileLock
+
+KB_DIR = ROOT / "knowledge-base"
+CHATS_DIR = ROOT / "chats"
+INDEX_NAME = "reference-index.json"
+INDEX_VERSION = "2.0.0"
+FILE_PREFIX = "file:"
+
+WIKILINK_RE = re.compile(r'\[\[([A-Za-z0-9_.\-]+)\]\]')
+FILELINK_RE = re.compile(r'\]\(([^()\s]*?)([A-Za-z0-9_.\-]+\.md)\)')
+SCHEME_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+.\-]*:')
+
+
+def scan_references(content: str, source_dir: Optional[Path] = None,
+                    kb_root: Optional[Path] = None) -> Dict[str, List[int]]:
+    """
+    Reference key -> sorted offsets of every wikilink and file link in content.
+
+    Args:
+        content: Markdown text
+        source_dir: Directory of the referencing file (default: kb_root)
+        kb_root: knowledge-base/ directory file links are keyed against
+            (default: current directory)
+
+    Returns:
+        {name: offsets} for wikilinks and {"file:<kb path>": offsets} for
+        file links that resolve inside kb_root
+    """
+    kb = os.path.abspath(kb_root or '.')
+    base = os.path.abspath(source_dir) if source_dir is not None else kb
+    refs: Dict[str, List[int]] = {}
+    for m in WIKILINK_RE.finditer(content):
+        refs.setdefault(m.group(1), []).append(m.start(1))
+    for m in FILELINK_RE.finditer(content):
+        directory, filename = m.group(1), m.group(2)
+        if SCHEME_RE.match(directory) or directory.startswith('/'):
+            continue
+        rel = os.path.relpath(os.path.normpath(os.path.join(base, directory, filename)), kb)
+        if rel.split(os.sep)[0] == '..':
+            continue
+        refs.setdefault(FILE_PREFIX + Path(rel).as_posix(), []).append(m.start(2))
+    for offsets in refs.values():
+        offsets.sort()
+    return refs
+
+
+class ReferenceIndex:
+    """Incrementally refreshed name -> (file, offsets) index."""
+
+    def __init__(self, roots: Optional[Dict[str, Path]] = None, index_path: Optional[Path] = None):
+        self.roots = roots or {"kb": KB_DIR, "chats": CHATS_DIR}
+        self.index_path = Path(index_path) if index_path else Path(self.roots["kb"]) / "_index" / INDEX_NAME
+        # "<root>/<rel path>" -> {"mtime_ns", "size", "refs": {name: [offsets]}}
+        self._files: Dict[str, Dict] = {}
+        self._inverted: Optional[Dict[str, Dict[str, List[int]]]] = None
+        self.dirty = False
+        self.stats = {"reused": 0, "scanned": 0, "removed": 0}
+
+    def load(self) -> 'ReferenceIndex':
+        """Load the persisted index; a missing or corrupt file yields an empty one."""
+        self._files = {}
+        self._inverted = None
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.dirty = True
+            return self
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            self.dirty = True
+            return self
+        self._files = data.get("files", {})
+        return self
+
+    def _walk(self) -> Iterator[Tuple[str, Path]]:
+        """Yield (key, path) for every referencing .md file."""
+        for root_name, root in self.roots.items():
+            root = Path(root)
+            if not root.exists():
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(d for d in dirnames if not (root_name == "kb" and d == "_index"))
+                for name in sorted(filenames):
+                    if not name.endswith('.md'):
+                        continue
+                    if root_name == "kb" and name.startswith('_'):
+                        continue
+                    path = Path(dirpath) / name
+                    yield f"{root_name}/{path.relative_to(root).as_posix()}", path
+
+    def refresh(self) -> 'ReferenceIndex':
+        """Re-stat both trees and re-scan only new or changed files."""
+        self.stats = {"reused": 0, "scanned": 0, "removed": 0}
+        seen = set()
+        for key, path in self._walk():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entry = self._files.get(key)
+            if entry is not None and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                seen.add(key)
+                self.stats["reused"] += 1
+                continue
+            try:
+                content = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            seen.add(key)
+            self._files[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                                "refs": scan_references(content, path.parent, self.roots["kb"])}
+            self.stats["scanned"] += 1
+            self.dirty = True
+
+        for key in [k for k in self._files if k not in seen]:
+            del self._files[key]
+            self.stats["removed"] += 1
+            self.dirty = True
+        self._inverted = None
+        return self
+
+    def save(self, force: bool = False) -> bool:
+        """Persist the index atomically if it changed (best effort; it is a cache)."""
+        if not (self.dirty or force):
+            return False
+        data = {"version": INDEX_VERSION, "files": {k: self._files[k] for k in sorted(self._files)}}
+        try:
+            with FileLock(self.index_path, timeout=30):
+                atomic_write_json(self.index_path, data, indent=None)
+        except (OSError, TimeoutError):
+            return False
+        self.dirty = False
+        return True
+
+    def path_for(self, key: str) -> Path:
+        root_name, rel = key.split('/', 1)
+        return Path(self.roots[root_name]) / rel
+
+    def root_of(self, key: str) -> str:
+        return key.split('/', 1)[0]
+
+    def file_key(self, path: Path) -> str:
+        """Reference key for file links to a knowledge-base file."""
+        return FILE_PREFIX + Path(os.path.relpath(path, self.roots["kb"])).as_posix()
+
+    def references(self, name: str) -> Dict[str, List[int]]:
+        """File key -> offsets of every reference to name (a Rem name or file_key)."""
+        if self._inverted is None:
+            inverted: Dict[str, Dict[str, List[int]]] = {}
+            for key, entry in self._files.items():
+                for ref, offsets in entry.get("refs", {}).items():
+                    inverted.setdefault(ref, {})[key] = offsets
+            self._inverted = inverted
+        return self._inverted.get(name, {})
+
+    def references_to(self, names: Iterable[str]) -> Dict[str, List[Tuple[int, str]]]:
+        """File key -> sorted (offset, name) for every reference to any of names."""
+        out: Dict[str, List[Tuple[int, str]]] = {}
+        for name in names:
+            for key, offsets in self.references(name).items():
+                out.setdefault(key, []).extend((off, name) for off in offsets)
+        for hits in out.values():
+            hits.sort()
+        return out
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+def load_reference_index(roots: Optional[Dict[str, Path]] = None, save: bool = True) -> ReferenceIndex:
+    """Load, refresh and (if changed) persist the reference index."""
+    index = ReferenceIndex(roots).load().refresh()
+    if save:
+        index.save()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh or query the reverse reference index')
+    parser.add_argument('names', nargs='*', help='Rem names to look up')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Discard the existing index and re-scan every file')
+    args = parser.parse_args()
+
+    index = ReferenceIndex()
+    if not args.rebuild:
+        index.load()
+    index.refresh()
+    index.save(force=args.rebuild)
+
+    s = index.stats
+    print(f"Reference index: {len(index)} files ({s['scanned']} scanned, {s['reused']} reused, {s['removed']} removed)")
+    for name in args.names:
+        print(json.dumps({"name": name, "files": index.references(name)}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Batch Related Rems Rewriter
+
+Shared engine behind sync-related-rems-from-backlinks.py and
+materialize-inferred-links.py. Every edit for a run is planned against one
+in-memory KnowledgeGraph, then each affected Rem is read once, all of its
+edits are applied, and the file is replaced atomically only if the text
+actually changed.
+
+Links are compared by target concept, not by spelling: a section already
+normalized to "[Title](path.md) {rel: type}" matches the "[[id]] {rel: type}"
+it would be regenerated as, so normalized Rems are not rewritten every run.
+
+Usage:
+    from knowledge_graph import load_graph
+    from related_rems import BatchRewriter, plan_related_sync
+
+    graph = load_graph()
+    rewriter = BatchRewriter(KB_DIR)
+    plan_related_sync(rewriter, graph, ['call-option'])
+    stats = rewriter.run()
+    print(stats.summary())
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from knowledge_graph import KnowledgeGraph
+from rebuild_utils import atomic_write_text
+
+KB_DIR = SCRIPT_DIR.parent.parent / "knowledge-base"
+
+# "## Related Rems" header and body, up to the next "##" heading or EOF
+RELATED_SECTION_RE = re.compile(r'(##\s+Related\s+Rems\s*\n)(.*?)(?=\n##|\Z)', re.DOTALL | re.IGNORECASE)
+# One bullet: "- [[id]] {rel: type}" or "- [Title](path.md) {rel: type}"
+BULLET_RE = re.compile(
+    r'^\s*[-*]\s+(?:\[\[([^\]]+)\]\]|\[[^\]]*\]\(([^)\s]+\.md)\))\s*(?:\{\s*rel:\s*([^,}]+)[^}]*\})?',
+    re.MULTILINE,
+)
+WIKILINK_RE = re.compile(r'\[\[([a-z0-9\-]+)\]\]', re.IGNORECASE)
+MDLINK_RE = re.compile(r'\]\(([^)\s]+\.md)\)')
+
+Transform = Callable[[str], str]
+
+
+@dataclass
+class RewriteStats:
+    """Outcome of a BatchRewriter run."""
+    files_changed: int = 0
+    bytes_written: int = 0
+    files_unchanged: int = 0
+    errors: int = 0
+    changed: List[Path] = field(default_factory=list)
+
+    def summary(self, dry_run: bool = False) -> str:
+        verb = "Would change" if dry_run else "Changed"
+        return (f"{verb} {self.files_changed} files, {self.bytes_written} bytes written "
+                f"({self.files_unchanged} unchanged, {self.errors} errors)")
+
+
+class BatchRewriter:
+    """Collect per-file text transforms and apply them in one pass."""
+
+    def __init__(self, kb_dir: Path = KB_DIR, dry_run: bool = False):
+        self.kb_dir = Path(kb_dir)
+        self.dry_run = dry_run
+        self._edits: Dict[Path, List[Transform]] = {}
+
+    def add(self, path: Path, transform: Transform) -> None:
+        """Queue a transform; transforms for one file run in insertion order."""
+        self._edits.setdefault(Path(path), []).append(transform)
+
+    def __len__(self) -> int:
+        return len(self._edits)
+
+    def run(self, verbose: bool = False) -> RewriteStats:
+        """
+        Read each queued file once, apply its transforms, write if changed.
+
+        In dry-run mode nothing is written; bytes_written reports what would be.
+        """
+        stats = RewriteStats()
+        for path, transforms in self._edits.items():
+            try:
+                text = path.read_text(encoding='utf-8')
+                new_text = text
+                for transform in transforms:
+                    new_text = transform(new_text)
+                if new_text == text:
+                    stats.files_unchanged += 1
+                    continue
+                if self.dry_run:
+                    written = len(new_text.encode('utf-8'))
+                else:
+                    written = atomic_write_text(path, new_text)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error processing {path}: {e}", file=sys.stderr)
+                stats.errors += 1
+                continue
+            stats.files_changed += 1
+            stats.bytes_written += written
+            stats.changed.append(path)
+            if verbose:
+                status = "[DRY RUN] Would update" if self.dry_run else "✓ Updated"
+                print(f"{status}: {self._display(path)}")
+        return stats
+
+    def _display(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.kb_dir))
+        except ValueError:
+            return str(path)
+
+
+# ---------- link resolution ----------
+
+def file_index(graph: KnowledgeGraph) -> Dict[str, str]:
+    """KB-relative file path -> concept ID, from the index's concept metadata."""
+    return {meta['file']: cid for cid, meta in graph.concepts.items() if meta.get('file')}
+
+
+def resolve_link(target: str, file_rel: str, files: Dict[str, str]) -> Optional[str]:
+    """Concept ID for a [[id]] or a relative .md link written in file_rel."""
+    if not target.endswith('.md'):
+        return target.lower()
+    rel = os.path.normpath(os.path.join(os.path.dirname(file_rel), target)).replace(os.sep, '/')
+    return files.get(rel)
+
+
+def parse_related_bullets(section: str, file_rel: str, files: Dict[str, str]) -> List[Tuple[str, str]]:
+    """(concept ID, relation type) for every bullet in a Related Rems body."""
+    out = []
+    for m in BULLET_RE.finditer(section):
+        cid = resolve_link(m.group(1) or m.group(2), file_rel, files)
+        out.append((cid or '', (m.group(3) or '').strip()))
+    return out
+
+
+def linked_ids(text: str, file_rel: str, files: Dict[str, str]) -> Set[str]:
+    """Every concept the text links to, as [[id]] or as a relative .md link."""
+    ids = {m.lower() for m in WIKILINK_RE.findall(text)}
+    for target in MDLINK_RE.findall(text):
+        cid = resolve_link(target, file_rel, files)
+        if cid:
+            ids.add(cid)
+    return ids
+
+
+# ---------- Related Rems sections ----------
+
+def collect_related_rems(concept_id: str, graph: KnowledgeGraph) -> List[Tuple[str, str, str, str]]:
+    """
+    Collect related Rems for a given concept.
+
+    Only collects forward relations (typed_links_to).
+    Reverse relations are already present in the target concept's forward relations.
+    This prevents duplicate paired relations in Related Rems sections.
+
+    Design Principle:
+    In a bidirectional graph, if A→B exists as a forward relation, then B's forward
+    relations will contain the corresponding reverse relation B→A. We only need to
+    write each node's outgoing edges. The backlinks.json maintains bidirectionality,
+    not individual Rem files.
+
+    Args:
+        concept_id: ID of the concept
+        graph: Indexed knowledge graph
+
+    Returns:
+        List of (rem_id, title, file_path, relation_type) tuples, deduplicated
+    """
+    if concept_id not in graph:
+        return []
+
+    related = []
+    seen_ids = set()
+
+    # Helper to add related Rem
+    def add_related(rem_id: str, rel_type: str):
+        if rem_id in seen_ids or rem_id == concept_id:
+            return
+        seen_ids.add(rem_id)
+        meta = graph.meta(rem_id)
+        title = meta.get('title', rem_id)
+        file_path = meta.get('file', '')
+        related.append((rem_id, title, file_path, rel_type))
+
+    # ONLY forward typed relations (explicit relationships)
+    for rem_id, rel_type in graph.typed_links_to(concept_id):
+        add_related(rem_id, rel_type)
+
+    return related
+
+
+def format_related_rems_section(related: List[Tuple[str, str, str, str]]) -> str:
+    """
+    Format Related Rems section as markdown.
+
+    Args:
+        related: List of (rem_id, title, file_path, relation_type) tuples
+
+    Returns:
+        Formatted markdown section
+    """
+    if not related:
+        return "## Related Rems\n\n*(No related Rems found)*"
+
+    lines = ["## Related Rems", ""]
+
+    for rem_id, title, file_path, rel_type in related:
+        # Format: - [[id]] {rel: type}; normalize-links.py turns it into a file link
+        lines.append(f"- [[{rem_id}]] {{rel: {rel_type}}}")
+
+    return "\n".join(lines)
+
+
+def replace_related_section(content: str, related: List[Tuple[str, str, str, str]],
+                            file_rel: str = '', files: Optional[Dict[str, str]] = None) -> str:
+    """
+    Return content with its Related Rems section regenerated from related.
+
+    The section is left untouched when it already lists the same
+    (target, relation) pairs in the same order, whatever the link spelling.
+    A missing section is appended at the end of the file.
+    """
+    new_section = format_related_rems_section(related)
+    match = RELATED_SECTION_RE.search(content)
+    if not match:
+        if not content.endswith('\n'):
+            content += '\n'
+        return content + '\n' + new_section + '\n'
+
+    wanted = [(rem_id, rel_type) for rem_id, _, _, rel_type in related]
+    body = match.group(2)
+    if parse_related_bullets(body, file_rel, files or {}) == wanted:
+        if wanted or body.strip() == new_section.split('\n', 2)[2]:
+            return content
+    return content[:match.start()] + new_section + '\n' + content[match.end():]
+
+
+def plan_related_sync(rewriter: BatchRewriter, graph: KnowledgeGraph,
+                      concept_ids: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Queue Related Rems rewrites for concept_ids.
+
+    Returns:
+        (concept_id, reason) for concepts that were skipped
+    """
+    files = file_index(graph)
+    skipped = []
+    for concept_id in concept_ids:
+        path, reason = concept_file(rewriter.kb_dir, graph, concept_id)
+        if path is None:
+            skipped.append((concept_id, reason))
+            continue
+        related = collect_related_rems(concept_id, graph)
+        file_rel = graph.meta(concept_id)['file']
+        rewriter.add(path, lambda text, r=related, f=file_rel: replace_related_section(text, r, f, files))
+    return skipped
+
+
+# ---------- inferred links ----------
+
+def add_line_if_missing(text: str, to_id: str, via_id: str) -> str:
+    bullet = f"- [[{to_id}]] {{rel: inferred, via: {via_id}}}"
+    if bullet in text:
+        return text
+    # Avoid adding if a direct line already exists for to_id
+    if f"[[{to_id}]]" in text:
+        return text
+    lines = text.splitlines()
+    # Ensure related section exists
+    # Skip frontmatter
+    start_idx = 0
+    if text.startswith('---'):
+        end = text.find('\n---', 3)
+        if end != -1:
+            start_idx = text[: end + 4].count('\n')
+    insert_idx = None
+    for i in range(start_idx, len(lines)):
+        if lines[i].strip().lower().lstrip('#').strip() == 'related concepts':
+            insert_idx = i + 1
+            break
+    if insert_idx is None:
+        if lines and lines[-1].strip() != '':
+            lines.append('')
+        lines.append('## Related Concepts')
+        lines.append('')
+        insert_idx = len(lines)
+    lines.insert(insert_idx, bullet)
+    return '\n'.join(lines)
+
+
+def add_inferred_lines(text: str, inferred: List[Tuple[str, str]],
+                       file_rel: str = '', files: Optional[Dict[str, str]] = None,
+                       tally: Optional[Dict[str, int]] = None) -> str:
+    """Add inferred bullets for targets the text does not already link to."""
+    present = linked_ids(text, file_rel, files or {})
+    for to_id, via_id in inferred:
+        if to_id in present:
+            continue
+        text = add_line_if_missing(text, to_id, via_id)
+        present.add(to_id)
+        if tally is not None:
+            tally['added'] = tally.get('added', 0) + 1
+    return text
+
+
+def plan_inferred_links(rewriter: BatchRewriter, graph: KnowledgeGraph,
+                        concept_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Queue inferred-link bullets for concept_ids (default: all with inferences).
+
+    Returns:
+        Tally dict: "queued" inferred links now, "added" filled in by
+        rewriter.run() with the bullets actually inserted
+    """
+    files = file_index(graph)
+    if concept_ids is None:
+        concept_ids = list(graph.inferred)
+    tally = {'queued': 0, 'added': 0}
+    for concept_id in concept_ids:
+        inferred = graph.inferred_links_to(concept_id)
+        if not inferred:
+            continue
+        path, _ = concept_file(rewriter.kb_dir, graph, concept_id)
+        if path is None:
+            continue
+        tally['queued'] += len(inferred)
+        file_rel = graph.meta(concept_id)['file']
+        rewriter.add(path, lambda text, i=inferred, f=file_rel: add_inferred_lines(text, i, f, files, tally))
+    return tally
+
+
+def concept_file(kb_dir: Path, graph: KnowledgeGraph, concept_id: str) -> Tuple[Optional[Path], str]:
+    """Resolve a concept's Rem file, or (None, reason) if it has none."""
+    meta = graph.concepts.get(concept_id)
+    if not meta:
+        return None, f"No metadata for concept '{concept_id}'"
+    file_rel = meta.get('file')
+    if not file_rel:
+        return None, f"No file path for concept '{concept_id}'"
+    path = Path(kb_dir) / file_rel
+    if not path.exists():
+        return None, f"File not found: {path}"
+    return path, ''
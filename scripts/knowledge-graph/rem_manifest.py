@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Rem Corpus Manifest
+
+Persistent, incrementally refreshed inventory of every markdown file under
+knowledge-base/. Each entry records the file's stat signature (mtime, size),
+a SHA-256 content hash, the parsed frontmatter and the first "# " heading,
+so KB scanners can share one parse instead of each re-reading the tree.
+
+Manifest location: knowledge-base/_index/rem-manifest.json
+
+Refresh strategy:
+    - Walk the tree and stat every .md file
+    - Reuse entries whose (mtime_ns, size) signature is unchanged
+    - Re-read, re-hash and re-parse only new or modified files
+    - Drop entries for deleted files
+
+Usage:
+    from rem_manifest import load_manifest
+
+    manifest = load_manifest(KB_DIR)
+    for entry in manifest.entries():
+        if entry.rem_id:
+            print(entry.rem_id, entry.title, entry.path)
+
+CLI:
+    python3 scripts/knowledge-graph/rem_manifest.py [--rebuild] [--verbose]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from rebuild_utils import atomic_write_json, parse_frontmatter_text
+from utils.file_lock import FileLock
+
+KB_DIR = ROOT / "knowledge-base"
+MANIFEST_NAME = "rem-manifest.json"
+MANIFEST_VERSION = "1.0.0"
+
+
+def manifest_path_for(kb_dir: Path) -> Path:
+    """Return the manifest location for a knowledge base root."""
+    return Path(kb_dir) / "_index" / MANIFEST_NAME
+
+
+def parse_list_value(value: Any) -> List[str]:
+    """
+    Normalize a frontmatter list value to a list of strings.
+
+    Accepts inline YAML lists ("[a, 'b']"), single scalars and real lists.
+    """
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if not value:
+        return []
+    value = str(value).strip()
+    if value.startswith('[') and value.endswith(']'):
+        return [t.strip().strip('"\'') for t in value[1:-1].split(',') if t.strip()]
+    return [value]
+
+
+def extract_heading(content: str) -> str:
+    """Return the first level-1 markdown heading after the frontmatter."""
+    body = content
+    if content.startswith('---'):
+        end = content.find('\n---', 3)
+        if end != -1:
+            body = content[end + 4:]
+    for line in body.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('# '):
+            return stripped[2:].strip()
+    return ''
+
+
+@dataclass
+class RemEntry:
+    """One markdown file recorded in the manifest."""
+    rel_path: str
+    path: Path
+    mtime_ns: int
+    size: int
+    sha256: str
+    frontmatter: Dict[str, Any] = field(default_factory=dict)
+    heading: str = ''
+
+    @property
+    def rem_id(self) -> Optional[str]:
+        return self.frontmatter.get('rem_id') or None
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.frontmatter.get('title') or None
+
+    @property
+    def isced(self) -> str:
+        return self.frontmatter.get('isced', '')
+
+    @property
+    def subdomain(self) -> str:
+        return self.frontmatter.get('subdomain', '')
+
+    @property
+    def source(self) -> Optional[str]:
+        return self.frontmatter.get('source') or None
+
+    @property
+    def tags(self) -> List[str]:
+        return parse_list_value(self.frontmatter.get('tags'))
+
+    @property
+    def has_frontmatter(self) -> bool:
+        return bool(self.frontmatter)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "sha256": self.sha256,
+            "frontmatter": self.frontmatter,
+            "heading": self.heading,
+        }
+
+
+class RemManifest:
+    """Incrementally refreshed manifest of all Rem markdown files."""
+
+    def __init__(self, kb_dir: Path = KB_DIR, manifest_path: Optional[Path] = None):
+        self.kb_dir = Path(kb_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else manifest_path_for(self.kb_dir)
+        self._entries: Dict[str, RemEntry] = {}
+        self.dirty = False
+        self.stats = {"reused": 0, "parsed": 0, "removed": 0}
+
+    def load(self) -> 'RemManifest':
+        """Load the persisted manifest; a missing or corrupt file yields an empty one."""
+        self._entries = {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, PermissionError, json.JSONDecodeError):
+            self.dirty = True
+            return self
+
+        if data.get("version") != MANIFEST_VERSION:
+            self.dirty = True
+            return self
+
+        for rel, raw in data.get("files", {}).items():
+            try:
+                self._entries[rel] = RemEntry(
+                    rel_path=rel,
+                    path=self.kb_dir / rel,
+                    mtime_ns=raw["mtime_ns"],
+                    size=raw["size"],
+                    sha256=raw["sha256"],
+                    frontmatter=raw.get("frontmatter", {}),
+                    heading=raw.get("heading", ''),
+                )
+            except (KeyError, TypeError):
+                self.dirty = True
+        return self
+
+    def _walk(self) -> Iterator[Path]:
+        """Yield every .md file under the knowledge base."""
+        if not self.kb_dir.exists():
+            return
+        for dirpath, dirnames, filenames in os.walk(self.kb_dir):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith('.md'):
+                    yield Path(dirpath) / name
+
+    def _parse(self, rel: str, path: Path, st: os.stat_result) -> Optional[RemEntry]:
+        """Read, hash and parse a single file."""
+        try:
+            raw = path.read_bytes()
+        except (FileNotFoundError, PermissionError):
+            return None
+        digest = hashlib.sha256(raw).hexdigest()
+
+        previous = self._entries.get(rel)
+        if previous is not None and previous.sha256 == digest:
+            # Touched but not modified: keep the parse, refresh the signature
+            previous.mtime_ns = st.st_mtime_ns
+            previous.size = st.st_size
+            return previous
+
+        try:
+            content = raw.decode('utf-8')
+        except UnicodeDecodeError:
+            content = ''
+        return RemEntry(
+            rel_path=rel,
+            path=path,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            sha256=digest,
+            frontmatter=parse_frontmatter_text(content),
+            heading=extract_heading(content),
+        )
+
+    def refresh(self) -> 'RemManifest':
+        """Re-stat the tree and re-parse only new or changed files."""
+        self.stats = {"reused": 0, "parsed": 0, "removed": 0}
+        seen = set()
+
+        for path in self._walk():
+            rel = path.relative_to(self.kb_dir).as_posix()
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            seen.add(rel)
+
+            entry = self._entries.get(rel)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self.stats["reused"] += 1
+                continue
+
+            entry = self._parse(rel, path, st)
+            if entry is None:
+                seen.discard(rel)
+                continue
+            self._entries[rel] = entry
+            self.stats["parsed"] += 1
+            self.dirty = True
+
+        for rel in [r for r in self._entries if r not in seen]:
+            del self._entries[rel]
+            self.stats["removed"] += 1
+            self.dirty = True
+
+        return self
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Persist the manifest atomically if it changed.
+
+        The manifest is a cache, so write failures are swallowed and reported
+        through the return value rather than raised.
+        """
+        if not (self.dirty or force):
+            return False
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": {rel: self._entries[rel].to_json() for rel in sorted(self._entries)},
+        }
+        try:
+            with FileLock(self.manifest_path, timeout=30):
+                atomic_write_json(self.manifest_path, data, indent=None)
+        except (OSError, TimeoutError):
+            return False
+        self.dirty = False
+        return True
+
+    def entries(self) -> List[RemEntry]:
+        """All entries sorted by KB-relative path."""
+        return [self._entries[rel] for rel in sorted(self._entries)]
+
+    def fingerprint(self) -> str:
+        """Digest over (path, content hash) pairs; changes whenever any Rem changes."""
+        h = hashlib.sha256()
+        for rel in sorted(self._entries):
+            h.update(rel.encode('utf-8'))
+            h.update(b'\0')
+            h.update(self._entries[rel].sha256.encode('ascii'))
+            h.update(b'\n')
+        return h.hexdigest()
+
+    def get(self, rel_path: str) -> Optional[RemEntry]:
+        return self._entries.get(rel_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def load_manifest(kb_dir: Path = KB_DIR, save: bool = True) -> RemManifest:
+    """
+    Load, refresh and (if changed) persist the manifest for a knowledge base.
+
+    This is the entry point every KB scanner should use.
+
+    Args:
+        kb_dir: Knowledge base root directory
+        save: Write the refreshed manifest back to disk
+
+    Returns:
+        Fresh RemManifest
+    """
+    manifest = RemManifest(kb_dir).load().refresh()
+    if save:
+        manifest.save()
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the Rem corpus manifest')
+    parser.add_argument('--kb-dir', type=str, default=str(KB_DIR),
+                        help='Knowledge base root (default: knowledge-base/)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Discard the existing manifest and re-parse every file')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    manifest = RemManifest(Path(args.kb_dir))
+    if not args.rebuild:
+        manifest.load()
+    manifest.refresh()
+    written = manifest.save(force=args.rebuild)
+
+    s = manifest.stats
+    print(f"Manifest: {len(manifest)} files ({s['parsed']} parsed, {s['reused']} reused, {s['removed']} removed)")
+    if args.verbose:
+        print(f"  Path: {manifest.manifest_path}{'' if written else ' (unchanged)'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
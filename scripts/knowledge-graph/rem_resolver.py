@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Rem ID → File Path Resolver
+
+Constant-time lookup of a Rem's markdown file by rem_id, replacing the
+per-concept `glob('**/...')` scans scattered across review and archival
+scripts. Built from the shared Rem manifest (rem_manifest.py) and persisted
+to knowledge-base/_index/rem-resolver.json, keyed by the manifest
+fingerprint so it is only rebuilt when a Rem is added, changed or removed.
+
+Indexed keys (all lowercase):
+    rem_ids   - frontmatter rem_id
+    stems     - filename stem ("{rem_id}.md", legacy "{rem_id}.rem.md")
+    suffixes  - every hyphen suffix of the stem, covering numeric prefixes
+                ("041-{rem_id}.md") and subdomain insertion
+                ("041-fx-derivatives-{rest}.md")
+
+Resolution order (non-legacy .md first, then legacy .rem.md):
+    1. Frontmatter rem_id
+    2. "*-{rem_id}.md" (suffix index)
+    3. "{rem_id}.md" (stem index)
+    4. Filename contains rem_id (linear fallback, misses only)
+    5. Fuzzy: filename contains >=70% of rem_id words (optional)
+
+Usage:
+    from rem_resolver import get_resolver
+
+    resolver = get_resolver(KB_DIR)
+    path = resolver.resolve('fx-pricing-shift-types', domain='0412-finance')
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from rebuild_utils import atomic_write_json
+from rem_manifest import KB_DIR, load_manifest
+from utils.file_lock import FileLock
+
+RESOLVER_NAME = "rem-resolver.json"
+RESOLVER_VERSION = "1.0.0"
+LEGACY_SUFFIX = ".rem.md"
+FUZZY_MATCH_RATIO = 0.7
+
+# Per-process cache: kb_dir -> RemResolver
+_RESOLVERS: Dict[str, 'RemResolver'] = {}
+
+
+def split_filename(name: str):
+    """Return (base stem, is_legacy) for a Rem filename."""
+    if name.endswith(LEGACY_SUFFIX):
+        return name[:-len(LEGACY_SUFFIX)], True
+    if name.endswith('.md'):
+        return name[:-3], False
+    return name, False
+
+
+class RemResolver:
+    """Hash-indexed rem_id / filename / alias resolver."""
+
+    def __init__(self, kb_dir: Path = KB_DIR):
+        self.kb_dir = Path(kb_dir)
+        self.index_path = self.kb_dir / "_index" / RESOLVER_NAME
+        self.fingerprint = ''
+        self.files: List[str] = []
+        self.legacy: Dict[str, bool] = {}
+        self.rem_ids: Dict[str, List[str]] = {}
+        self.stems: Dict[str, List[str]] = {}
+        self.suffixes: Dict[str, List[str]] = {}
+
+    # ---------- building ----------
+
+    def _add(self, table: Dict[str, List[str]], key: str, rel: str) -> None:
+        table.setdefault(key, []).append(rel)
+
+    def build(self, entries) -> 'RemResolver':
+        """Build all lookup tables from manifest entries."""
+        self.files, self.legacy = [], {}
+        self.rem_ids, self.stems, self.suffixes = {}, {}, {}
+
+        for entry in entries:
+            rel = entry.rel_path
+            stem, is_legacy = split_filename(entry.path.name)
+            stem = stem.lower()
+            self.files.append(rel)
+            self.legacy[rel] = is_legacy
+
+            if entry.rem_id:
+                self._add(self.rem_ids, entry.rem_id.lower(), rel)
+            self._add(self.stems, stem, rel)
+
+            # Every "-{suffix}" of the stem, e.g. 041-fx-a-b → fx-a-b, a-b, b
+            pos = stem.find('-')
+            while pos != -1:
+                self._add(self.suffixes, stem[pos + 1:], rel)
+                pos = stem.find('-', pos + 1)
+
+        return self
+
+    def load(self) -> bool:
+        """Load a persisted index; returns False if missing or stale format."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, PermissionError, json.JSONDecodeError):
+            return False
+        if data.get("version") != RESOLVER_VERSION:
+            return False
+        self.fingerprint = data.get("fingerprint", '')
+        self.files = data.get("files", [])
+        self.legacy = {rel: rel.endswith(LEGACY_SUFFIX) for rel in self.files}
+        self.rem_ids = data.get("rem_ids", {})
+        self.stems = data.get("stems", {})
+        self.suffixes = data.get("suffixes", {})
+        return True
+
+    def save(self) -> bool:
+        """Persist the index (best effort; it is a cache)."""
+        data = {
+            "version": RESOLVER_VERSION,
+            "fingerprint": self.fingerprint,
+            "files": self.files,
+            "rem_ids": self.rem_ids,
+            "stems": self.stems,
+            "suffixes": self.suffixes,
+        }
+        try:
+            with FileLock(self.index_path, timeout=30):
+                atomic_write_json(self.index_path, data, indent=None)
+        except (OSError, TimeoutError):
+            return False
+        return True
+
+    # ---------- lookups ----------
+
+    def _pick(self, rels: List[str], domain: str, legacy: bool) -> Optional[Path]:
+        """Prefer domain matches, then the shortest path."""
+        rels = [r for r in rels if self.legacy.get(r, False) == legacy]
+        if not rels:
+            return None
+        domain_matches = [r for r in rels if domain in r]
+        best = sorted(domain_matches or rels, key=lambda r: (len(r), r))[0]
+        return self.kb_dir / best
+
+    def by_rem_id(self, rem_id: str) -> List[Path]:
+        """All files whose frontmatter rem_id equals rem_id."""
+        return [self.kb_dir / r for r in self.rem_ids.get(rem_id.lower(), [])]
+
+    def find_all(self, rem_id: str) -> List[Path]:
+        """Candidates from the first non-empty exact tier (rem_id, stem, suffix)."""
+        key = rem_id.lower()
+        for table in (self.rem_ids, self.stems, self.suffixes):
+            rels = table.get(key)
+            if rels:
+                return [self.kb_dir / r for r in sorted(set(rels))]
+        return []
+
+    def resolve(self, rem_id: str, domain: str = '', fuzzy: bool = True) -> Optional[Path]:
+        """
+        Resolve a rem_id to its markdown file.
+
+        Args:
+            rem_id: Rem identifier (schedule.json key / frontmatter rem_id)
+            domain: Optional domain path fragment used to break ties
+            fuzzy: Allow the 70%-of-words filename fallback
+
+        Returns:
+            Path under kb_dir, or None if nothing matches
+        """
+        key = rem_id.lower()
+        domain = domain or ''
+
+        for legacy in (False, True):
+            for table in (self.rem_ids, self.suffixes, self.stems):
+                hit = self._pick(table.get(key, []), domain, legacy)
+                if hit:
+                    return hit
+
+            # Substring fallback only runs for ids the hash tables missed
+            contains = [r for r in self.files
+                        if key in split_filename(Path(r).name)[0].lower()]
+            hit = self._pick(contains, domain, legacy)
+            if hit:
+                return hit
+
+            if fuzzy and not legacy:
+                hit = self._fuzzy(key, domain)
+                if hit:
+                    return hit
+
+        return None
+
+    def _fuzzy(self, key: str, domain: str) -> Optional[Path]:
+        """Match filenames containing most of the rem_id words (subdomain swaps)."""
+        parts = key.replace('-', ' ').split()
+        if not parts:
+            return None
+        for rel in self.files:
+            if self.legacy.get(rel) or (domain and domain not in rel):
+                continue
+            name = split_filename(Path(rel).name)[0].lower()
+            matching = sum(1 for part in parts if part in name)
+            if matching / len(parts) >= FUZZY_MATCH_RATIO:
+                return self.kb_dir / rel
+        return None
+
+
+def get_resolver(kb_dir: Path = KB_DIR) -> RemResolver:
+    """
+    Return a fresh resolver for kb_dir, cached per process.
+
+    Refreshes the Rem manifest (re-stat only) and reuses the persisted
+    index when the manifest fingerprint is unchanged.
+    """
+    kb_dir = Path(kb_dir)
+    cache_key = str(kb_dir.resolve())
+    if cache_key in _RESOLVERS:
+        return _RESOLVERS[cache_key]
+
+    manifest = load_manifest(kb_dir)
+    fingerprint = manifest.fingerprint()
+
+    resolver = RemResolver(kb_dir)
+    if not (resolver.load() and resolver.fingerprint == fingerprint):
+        resolver.build(manifest.entries())
+        resolver.fingerprint = fingerprint
+        resolver.save()
+
+    _RESOLVERS[cache_key] = resolver
+    return resolver
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Resolve Rem IDs to file paths')
+    parser.add_argument('rem_ids', nargs='+', help='Rem IDs to resolve')
+    parser.add_argument('--domain', default='', help='Domain hint for tie-breaking')
+    parser.add_argument('--no-fuzzy', action='store_true', help='Disable fuzzy filename matching')
+    args = parser.parse_args()
+
+    resolver = get_resolver()
+    missing = 0
+    for rem_id in args.rem_ids:
+        path = resolver.resolve(rem_id, args.domain, fuzzy=not args.no_fuzzy)
+        if path is None:
+            missing += 1
+            print(f"{rem_id}\tNOT FOUND", file=sys.stderr)
+        else:
+            print(f"{rem_id}\t{path}")
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,22 +2,35 @@
 """
 Standardize Rem naming conventions by renaming files and updating all references.
 
+References are looked up in the persistent reverse reference index
+(knowledge-base/_index/reference-index.json, see reference_index.py) instead
+of re-reading the whole corpus per rename. The batch then loads each affected
+file once, applies every substitution for it, and writes schedule.json once.
+Both [[old-name]] wikilinks and [Title](.../old-name.md) links that resolve
+to the renamed file are updated; links to other files with the same name and
+external URLs are left alone.
+
 Usage:
-    source venv/bin/activate && source venv/bin/activate && python3 scripts/standardize-rem-names.py --domain language/french [--dry-run] [--verbose]
+    source venv/bin/activate && source venv/bin/activate && python3 scripts/knowledge-graph/standardize-rem-names.py --domain language/french [--dry-run] [--verbose]
 """
 
 import argparse
 import json
-import re
 import shutil
+import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Tuple
 
-ROOT = Path(__file__).parent.parent
+ROOT = Path(__file__).parent.parent.parent
 KB_DIR = ROOT / "knowledge-base"
 SCHEDULE_FILE = ROOT / ".review" / "schedule.json"
 CHATS_DIR = ROOT / "chats"
 
+sys.path.insert(0, str(Path(__file__).parent))
+from rebuild_utils import atomic_write_text
+from reference_index import ReferenceIndex
+
 # Domain-specific rename maps
 # Format: 'old_rem_id': 'new_rem_id'
 # Note: For files in subdirectories, the file path will be constructed from the rem_id
@@ -36,76 +49,104 @@ RENAME_MAPS = {
 }
 
 
-def find_all_references(old_name, kb_dir, chats_dir):
-    """Find all files referencing old_name."""
-    refs = []
-    pattern = re.compile(rf'\[\[{re.escape(old_name)}\]\]')
+def load_index(kb_dir=None, chats_dir=None) -> ReferenceIndex:
+    """Load and refresh the reference index for the knowledge base and chats."""
+    index = ReferenceIndex({"kb": kb_dir or KB_DIR, "chats": chats_dir or CHATS_DIR})
+    index.load().refresh()
+    index.save()
+    return index
 
-    # Search in knowledge base
-    for md_file in kb_dir.rglob('*.md'):
-        if md_file.name.startswith('_'):
+
+def find_all_references(old_name, kb_dir, chats_dir, index=None):
+    """Find all files referencing old_name."""
+    index = index or load_index(kb_dir, chats_dir)
+    return [index.path_for(key) for key in sorted(index.references(old_name))]
+
+
+def apply_substitutions(content: str, hits: List[Tuple[int, str]],
+                        substitutions: Dict[str, Tuple[str, str]]) -> Tuple[str, int]:
+    """
+    Splice new text in at the indexed offsets.
+
+    hits are (offset, reference key); substitutions maps each key to
+    (old text, new text). Offsets whose text no longer holds the old text
+    (file changed after indexing) are skipped.
+
+    Returns:
+        (updated content, number of substitutions)
+    """
+    parts = []
+    last = 0
+    count = 0
+    for offset, key in hits:
+        old_text, new_text = substitutions[key]
+        end = offset + len(old_text)
+        if offset < last or content[offset:end] != old_text:
             continue
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            if pattern.search(content):
-                refs.append(md_file)
-        except Exception:
-            pass
-
-    # Search in chat archives
-    for md_file in chats_dir.rglob('*.md'):
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            if pattern.search(content):
-                refs.append(md_file)
-        except Exception:
-            pass
-
-    return refs
-
-
-def update_file_references(file_path, old_name, new_name, dry_run=False):
-    """Update all references in a file."""
+        parts.append(content[last:offset])
+        parts.append(new_text)
+        last = end
+        count += 1
+    parts.append(content[last:])
+    return ''.join(parts), count
+
+
+def update_file_references(file_path, hits, substitutions, dry_run=False):
+    """Apply every rename for one file in a single read and write."""
     try:
         content = file_path.read_text(encoding='utf-8')
-        old_pattern = f'[[{old_name}]]'
-        new_pattern = f'[[{new_name}]]'
-
-        if old_pattern in content:
-            if not dry_run:
-                updated = content.replace(old_pattern, new_pattern)
-                file_path.write_text(updated, encoding='utf-8')
-            return True
+        updated, count = apply_substitutions(content, hits, substitutions)
+        if count and not dry_run:
+            atomic_write_text(file_path, updated)
+        return count > 0
     except Exception as e:
         print(f"  ❌ Error updating {file_path}: {e}")
     return False
 
 
-def update_fsrs_schedule(old_name, new_name, dry_run=False):
-    """Update FSRS schedule with renamed Rem ID."""
+def update_fsrs_schedule(renames: Dict[str, str], dry_run=False) -> int:
+    """
+    Update FSRS schedule with all renamed Rem IDs in one load and one write.
+
+    Returns: Number of schedule entries renamed
+    """
     if not SCHEDULE_FILE.exists():
-        return False
+        return 0
 
     try:
         with open(SCHEDULE_FILE, 'r', encoding='utf-8') as f:
             schedule = json.load(f)
 
-        if old_name in schedule.get('concepts', {}):
-            if not dry_run:
+        concepts = schedule.get('concepts', {})
+        present = [old for old in renames if old in concepts]
+        if present and not dry_run:
+            for old_name in present:
                 # Rename key and update rem_id field
-                schedule['concepts'][new_name] = schedule['concepts'].pop(old_name)
-                schedule['concepts'][new_name]['rem_id'] = new_name
+                new_name = renames[old_name]
+                concepts[new_name] = concepts.pop(old_name)
+                concepts[new_name]['rem_id'] = new_name
 
-                # Backup original
-                backup_file = SCHEDULE_FILE.with_suffix('.json.backup-' + datetime.now().strftime('%Y%m%d-%H%M%S'))
-                shutil.copy2(SCHEDULE_FILE, backup_file)
+            # Backup original
+            backup_file = SCHEDULE_FILE.with_suffix('.json.backup-' + datetime.now().strftime('%Y%m%d-%H%M%S'))
+            shutil.copy2(SCHEDULE_FILE, backup_file)
 
-                with open(SCHEDULE_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(schedule, f, indent=2, ensure_ascii=False)
-            return True
+            with open(SCHEDULE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(schedule, f, indent=2, ensure_ascii=False)
+        return len(present)
     except Exception as e:
         print(f"  ❌ Error updating FSRS schedule: {e}")
-    return False
+    return 0
+
+
+def load_schedule_ids():
+    """Rem IDs present in the FSRS schedule (empty if unavailable)."""
+    if not SCHEDULE_FILE.exists():
+        return set()
+    try:
+        with open(SCHEDULE_FILE, 'r', encoding='utf-8') as f:
+            return set(json.load(f).get('concepts', {}))
+    except Exception:
+        return set()
 
 
 def standardize_domain(domain, dry_run=False, verbose=False):
@@ -122,7 +163,6 @@ def standardize_domain(domain, dry_run=False, verbose=False):
 
     print(f"📋 Proposed Renames ({len(rename_map)} files):\n")
 
-    # Preview changes
     stats = {
         'files_renamed': 0,
         'references_updated': 0,
@@ -130,6 +170,14 @@ def standardize_domain(domain, dry_run=False, verbose=False):
         'chats_updated': 0
     }
 
+    index = load_index()
+    scheduled = load_schedule_ids()
+
+    # Plan: validate every rename before touching anything
+    planned: Dict[str, str] = {}
+    # Reference key (wikilink name or file link key) -> (old text, new text)
+    substitutions: Dict[str, Tuple[str, str]] = {}
+    moves: List[Tuple[Path, Path]] = []
     for old_name, new_name in rename_map.items():
         # Search for files matching old_name (could be in subdirectories)
         # Try both .md and .rem.md extensions
@@ -153,50 +201,46 @@ def standardize_domain(domain, dry_run=False, verbose=False):
             print(f"  ❌ {old_name} → {new_name} - target already exists!")
             continue
 
-        # Find references
-        refs = find_all_references(old_name, KB_DIR, CHATS_DIR)
-        kb_refs = [r for r in refs if str(r).startswith(str(KB_DIR))]
-        chat_refs = [r for r in refs if str(r).startswith(str(CHATS_DIR))]
+        # Find references: wikilinks by name, file links by resolved path
+        file_key = index.file_key(old_file)
+        refs = {**index.references(old_name), **index.references(file_key)}
+        kb_refs = sorted(k for k in refs if index.root_of(k) == 'kb')
+        chat_refs = sorted(k for k in refs if index.root_of(k) == 'chats')
 
-        print(f"{stats['files_renamed'] + 1}. {old_name} → {new_name}")
+        print(f"{len(planned) + 1}. {old_name} → {new_name}")
         print(f"   - File: {old_file.relative_to(KB_DIR)}")
         print(f"   - Target: {new_file.relative_to(KB_DIR)}")
         print(f"   - Referenced by: {len(kb_refs)} Rems, {len(chat_refs)} conversations")
-
-        # Check FSRS schedule
-        has_fsrs = False
-        if SCHEDULE_FILE.exists():
-            try:
-                with open(SCHEDULE_FILE, 'r', encoding='utf-8') as f:
-                    schedule = json.load(f)
-                has_fsrs = old_name in schedule.get('concepts', {})
-            except Exception:
-                pass
-        print(f"   - FSRS entry: {'Yes' if has_fsrs else 'No'}")
+        print(f"   - FSRS entry: {'Yes' if old_name in scheduled else 'No'}")
 
         if verbose:
             if kb_refs:
-                print(f"     KB refs: {', '.join(r.stem for r in kb_refs[:3])}")
+                print(f"     KB refs: {', '.join(index.path_for(k).stem for k in kb_refs[:3])}")
             if chat_refs:
-                print(f"     Chat refs: {', '.join(r.stem for r in chat_refs[:3])}")
-
-        # Execute rename
-        if not dry_run:
-            # 1. Rename file
+                print(f"     Chat refs: {', '.join(index.path_for(k).stem for k in chat_refs[:3])}")
+
+        planned[old_name] = new_name
+        substitutions[old_name] = (old_name, new_name)
+        substitutions[file_key] = (old_file.name, new_file.name)
+        moves.append((old_file, new_file))
+
+    # Execute: one read/write per referencing file, then renames, then schedule
+    if not dry_run and planned:
+        for key, hits in sorted(index.references_to(substitutions).items()):
+            if update_file_references(index.path_for(key), hits, substitutions):
+                if index.root_of(key) == 'kb':
+                    stats['references_updated'] += 1
+                else:
+                    stats['chats_updated'] += 1
+
+        for old_file, new_file in moves:
             old_file.rename(new_file)
             stats['files_renamed'] += 1
 
-            # 2. Update references in other files
-            for ref_file in refs:
-                if update_file_references(ref_file, old_name, new_name):
-                    if str(ref_file).startswith(str(KB_DIR)):
-                        stats['references_updated'] += 1
-                    else:
-                        stats['chats_updated'] += 1
+        stats['fsrs_updated'] = update_fsrs_schedule(planned)
 
-            # 3. Update FSRS schedule
-            if update_fsrs_schedule(old_name, new_name):
-                stats['fsrs_updated'] += 1
+        index.refresh()
+        index.save()
 
     print("\n" + "=" * 63)
 
@@ -206,10 +250,10 @@ def standardize_domain(domain, dry_run=False, verbose=False):
         print("✅ Batch Rename Completed\n")
         print(f"📝 Renamed Files: {stats['files_renamed']}")
         print(f"🔗 Updated References:")
-        print(f"  - {stats['references_updated']} wikilinks in Rems")
-        print(f"  - {stats['chats_updated']} references in conversations")
+        print(f"  - {stats['references_updated']} Rems with updated links")
+        print(f"  - {stats['chats_updated']} conversations with updated references")
         print(f"  - {stats['fsrs_updated']} FSRS schedule entries")
-        print(f"\n📊 Next: Run 'python3 scripts/rebuild-backlinks.py' to update index")
+        print(f"\n📊 Next: Run 'python3 scripts/knowledge-graph/rebuild-backlinks.py' to update index")
 
 
 def main():
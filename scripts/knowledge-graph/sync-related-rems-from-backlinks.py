@@ -13,6 +13,11 @@ What it does:
 3. Formats them as markdown links with relationship types
 4. Writes/updates the "## Related Rems" section in each Rem file
 
+All sections are computed from one in-memory graph and written by the
+batch engine in related_rems.py: each file is read once and atomically
+replaced only when its section actually changes (links already normalized
+to [Title](path.md) count as unchanged).
+
 Design Principle:
 In a bidirectional graph, each edge is stored once as a forward relation.
 We only write each node's outgoing edges to avoid duplicates.
@@ -33,25 +38,26 @@ Examples:
     source venv/bin/activate && source venv/bin/activate && python scripts/knowledge-graph/sync-related-rems-from-backlinks.py --verbose
 """
 
-import json
-import re
 import sys
 import argparse
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
 
 # Constants
 ROOT = Path(__file__).parent.parent.parent
 KB_DIR = ROOT / "knowledge-base"
 IDX_FILE = KB_DIR / "_index" / "backlinks.json"
 
+sys.path.insert(0, str(Path(__file__).parent))
+from knowledge_graph import KnowledgeGraph, load_graph
+from related_rems import BatchRewriter, plan_related_sync
+
 
-def load_backlinks_index() -> Tuple[Dict, Dict]:
+def load_backlinks_index() -> KnowledgeGraph:
     """
-    Load backlinks.json and return links graph and concepts metadata.
+    Load backlinks.json as an indexed KnowledgeGraph.
 
     Returns:
-        Tuple of (links_dict, concepts_dict)
+        KnowledgeGraph (links and concepts metadata)
 
     Raises:
         SystemExit if backlinks.json doesn't exist
@@ -62,143 +68,7 @@ def load_backlinks_index() -> Tuple[Dict, Dict]:
             f"Run: python scripts/knowledge-graph/rebuild-backlinks.py"
         )
 
-    with open(IDX_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    links = data.get('links', {})
-    concepts = data.get('concepts', {})
-
-    return links, concepts
-
-
-def collect_related_rems(concept_id: str, links_data: Dict, concepts_meta: Dict) -> List[Tuple[str, str, str]]:
-    """
-    Collect related Rems for a given concept.
-
-    Only collects forward relations (typed_links_to).
-    Reverse relations are already present in the target concept's forward relations.
-    This prevents duplicate paired relations in Related Rems sections.
-
-    Design Principle:
-    In a bidirectional graph, if A→B exists as a forward relation, then B's forward
-    relations will contain the corresponding reverse relation B→A. We only need to
-    write each node's outgoing edges. The backlinks.json maintains bidirectionality,
-    not individual Rem files.
-
-    Args:
-        concept_id: ID of the concept
-        links_data: Links graph from backlinks.json
-        concepts_meta: Concepts metadata from backlinks.json
-
-    Returns:
-        List of (rem_id, title, file_path, relation_type) tuples, deduplicated
-    """
-    if concept_id not in links_data:
-        return []
-
-    data = links_data[concept_id]
-    related = []
-    seen_ids = set()
-
-    # Helper to add related Rem
-    def add_related(rem_id: str, rel_type: str):
-        if rem_id in seen_ids or rem_id == concept_id:
-            return
-        seen_ids.add(rem_id)
-        meta = concepts_meta.get(rem_id, {})
-        title = meta.get('title', rem_id)
-        file_path = meta.get('file', '')
-        related.append((rem_id, title, file_path, rel_type))
-
-    # ONLY forward typed relations (explicit relationships)
-    for typed_link in data.get('typed_links_to', []):
-        rem_id = typed_link.get('to')
-        rel_type = typed_link.get('type', 'related')
-        if rem_id:
-            add_related(rem_id, rel_type)
-
-    return related
-
-
-def format_related_rems_section(related: List[Tuple[str, str, str, str]]) -> str:
-    """
-    Format Related Rems section as markdown.
-
-    Args:
-        related: List of (rem_id, title, file_path, relation_type) tuples
-
-    Returns:
-        Formatted markdown section
-    """
-    if not related:
-        return "## Related Rems\n\n*(No related Rems found)*"
-
-    lines = ["## Related Rems", ""]
-
-    for rem_id, title, file_path, rel_type in related:
-        # Format: - [Title](relative/path.md) {rel: type}
-        lines.append(f"- [[{rem_id}]] {{rel: {rel_type}}}")
-
-    return "\n".join(lines)
-
-
-def update_rem_file(file_path: Path, new_section: str, dry_run: bool = False, verbose: bool = False) -> bool:
-    """
-    Update Related Rems section in a Rem file.
-
-    Args:
-        file_path: Path to Rem file
-        new_section: New Related Rems section content
-        dry_run: If True, don't actually modify file
-        verbose: If True, print details
-
-    Returns:
-        True if file was modified (or would be in dry-run)
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Find and replace existing Related Rems section
-        # Pattern: ## Related Rems ... (until next ## or end of file)
-        pattern = r'(##\s+Related\s+Rems\s*\n)(.*?)(?=\n##|\Z)'
-
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-
-        if match:
-            # Replace existing section
-            old_content = match.group(2).strip()
-            new_content = new_section.split('\n', 2)[2] if '\n' in new_section else ""  # Skip header
-
-            # Skip if content is the same
-            if old_content == new_content.strip():
-                return False
-
-            modified = re.sub(pattern, new_section + '\n', content, count=1, flags=re.DOTALL | re.IGNORECASE)
-        else:
-            # Append new section at the end
-            if not content.endswith('\n'):
-                content += '\n'
-            modified = content + '\n' + new_section + '\n'
-
-        # Write if modified
-        if modified != content:
-            if not dry_run:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(modified)
-
-            if verbose:
-                rel_path = file_path.relative_to(KB_DIR)
-                status = "[DRY RUN] Would update" if dry_run else "✓ Updated"
-                print(f"{status}: {rel_path}")
-
-            return True
-
-        return False
-
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}", file=sys.stderr)
-        return False
+    return load_graph(IDX_FILE)
 
 
 def main():
@@ -219,8 +89,8 @@ def main():
 
     # Load backlinks index
     print("Loading backlinks index...")
-    links_data, concepts_meta = load_backlinks_index()
-    print(f"Found {len(links_data)} concepts in backlinks index")
+    graph = load_backlinks_index()
+    print(f"Found {len(graph)} concepts in backlinks index")
 
     if args.dry_run:
         print("\n⚠️  DRY RUN MODE - No files will be modified\n")
@@ -230,55 +100,30 @@ def main():
         concept_ids = args.concept_ids
         print(f"Processing {len(concept_ids)} specific concepts")
     else:
-        concept_ids = list(links_data.keys())
+        concept_ids = list(graph)
         print(f"Processing all {len(concept_ids)} concepts")
 
-    # Process each concept
-    updated_count = 0
-    skipped_count = 0
-
-    for concept_id in concept_ids:
-        # Get concept metadata
-        meta = concepts_meta.get(concept_id)
-        if not meta:
-            if args.verbose:
-                print(f"⚠️  Warning: No metadata for concept '{concept_id}'", file=sys.stderr)
-            skipped_count += 1
-            continue
-
-        file_rel = meta.get('file')
-        if not file_rel:
-            if args.verbose:
-                print(f"⚠️  Warning: No file path for concept '{concept_id}'", file=sys.stderr)
-            skipped_count += 1
-            continue
-
-        file_path = KB_DIR / file_rel
-        if not file_path.exists():
-            if args.verbose:
-                print(f"⚠️  Warning: File not found: {file_path}", file=sys.stderr)
-            skipped_count += 1
-            continue
-
-        # Collect related Rems
-        related = collect_related_rems(concept_id, links_data, concepts_meta)
-
-        # Format new section
-        new_section = format_related_rems_section(related)
-
-        # Update file
-        if update_rem_file(file_path, new_section, dry_run=args.dry_run, verbose=args.verbose):
-            updated_count += 1
+    # Plan every section from the one graph, then rewrite in a single pass
+    rewriter = BatchRewriter(KB_DIR, dry_run=args.dry_run)
+    skipped = plan_related_sync(rewriter, graph, concept_ids)
+    if args.verbose:
+        for _, reason in skipped:
+            print(f"⚠️  Warning: {reason}", file=sys.stderr)
+    stats = rewriter.run(verbose=args.verbose)
+    updated_count = stats.files_changed
+    skipped_count = len(skipped)
 
     # Summary
     print()
     if args.dry_run:
         print(f"Would update {updated_count} files")
         print(f"Would skip {skipped_count} files (no metadata/file not found)")
+        print(stats.summary(dry_run=True))
         print("\nRun without --dry-run to apply changes")
     else:
         print(f"✅ Updated {updated_count} files")
         print(f"⏭️  Skipped {skipped_count} files (no metadata/file not found)")
+        print(stats.summary())
 
         if updated_count > 0:
             print(f"\n💡 Next step:")
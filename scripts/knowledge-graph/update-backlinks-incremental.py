@@ -19,6 +19,9 @@ from typing import Dict, List, Set
 # Portable project root
 PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
 
+sys.path.insert(0, str(Path(__file__).parent))
+from rem_resolver import get_resolver
+
 
 def extract_typed_links_from_rem(rem_file: Path) -> List[Dict[str, str]]:
     """Extract links with {rel: type} annotations from a Rem file.
@@ -122,38 +125,10 @@ def save_backlinks(backlinks: Dict):
 
 
 def find_rem_file(concept_id: str) -> Path:
-    """Find Rem file by concept ID (recursively scan ISCED structure)."""
-    kb_dir = PROJECT_DIR / 'knowledge-base'
-
-    def scan_for_rem(directory: Path) -> Path:
-        """Recursively search for rem_id match in frontmatter."""
-        for item in directory.iterdir():
-            if item.is_dir() and not item.name.startswith('_'):
-                result = scan_for_rem(item)
-                if result:
-                    return result
-            elif item.is_file() and item.suffix == '.md' and not item.stem.startswith('_'):
-                # Check frontmatter for rem_id match
-                try:
-                    content = item.read_text(encoding='utf-8')
-                    if content.startswith('---'):
-                        end = content.find('\n---', 3)
-                        if end != -1:
-                            fm = content[3:end].strip()
-                            for line in fm.splitlines():
-                                if line.strip().startswith('rem_id:'):
-                                    file_rem_id = line.split(':', 1)[1].strip().strip('"').strip("'")
-                                    if file_rem_id == concept_id:
-                                        return item
-                except Exception:
-                    pass
-        return None
-
-    for domain in kb_dir.iterdir():
-        if domain.is_dir() and not domain.name.startswith('_'):
-            result = scan_for_rem(domain)
-            if result:
-                return result
+    """Find Rem file by concept ID (frontmatter rem_id, via the Rem resolver index)."""
+    matches = get_resolver(PROJECT_DIR / 'knowledge-base').by_rem_id(concept_id)
+    if matches:
+        return sorted(matches)[0]
 
     raise FileNotFoundError(f"Rem file not found for concept: {concept_id}")
 
@@ -163,6 +138,13 @@ def update_backlinks_for_concepts(concept_ids: List[str]):
     backlinks = load_backlinks()
     links_map = backlinks.get('links', {})
 
+    # Hashed (from, to, type) set of existing reverse entries
+    reverse_edges = {
+        (e.get('from'), target_id, e.get('type'))
+        for target_id, entry in links_map.items()
+        for e in entry.get('typed_linked_from', [])
+    }
+
     # Process each new concept
     for concept_id in concept_ids:
         try:
@@ -198,9 +180,10 @@ def update_backlinks_for_concepts(concept_ids: List[str]):
                 }
 
                 # Check if already exists
-                existing = links_map[target_id]["typed_linked_from"]
-                if not any(e.get('from') == concept_id and e.get('type') == rel_type for e in existing):
-                    existing.append(reverse_entry)
+                key = (concept_id, target_id, rel_type)
+                if key not in reverse_edges:
+                    reverse_edges.add(key)
+                    links_map[target_id]["typed_linked_from"].append(reverse_entry)
 
             print(f"✅ Updated typed backlinks for: {concept_id} ({len(typed_links)} relations)")
 
@@ -12,6 +12,10 @@ from progress_calculator import ProgressCalculator
 from progress_formatter import ProgressFormatter
 from recommendation_engine import RecommendationEngine
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'review'))
+from due_index import load_due_index
+from schedule_store import open_store
+
 def load_data():
     """Load all necessary JSON files."""
     data = {}
@@ -26,9 +30,15 @@ def load_data():
 
     # Load review schedule
     schedule_file = Path('.review/schedule.json')
-    if schedule_file.exists():
+    store = open_store(schedule_file) if schedule_file.exists() else None
+    if store is not None:
+        # Read-only SQLite store: current with every rating, answers the due-index queries
+        data['schedule'] = store.to_schedule()
+        data['due_index'] = store
+    elif schedule_file.exists():
         with open(schedule_file) as f:
             data['schedule'] = json.load(f)
+        data['due_index'] = load_due_index(schedule_file)
     else:
         data['schedule'] = {'concepts': [], 'metadata': {'concepts_due_today': 0}}
 
@@ -14,6 +14,7 @@ class ProgressCalculator:
         self.data = data
         self.materials = data.get('materials_index', {}).get('materials', {})
         self.schedule = data.get('schedule', {})
+        self.due_index = data.get('due_index')
         self.history = data.get('history', {})
         self.kb_metadata = data.get('kb_metadata', {})
 
@@ -38,7 +39,10 @@ class ProgressCalculator:
         streak = self.calculate_learning_streak(learning_sessions)
 
         # Review statistics
-        concepts_due_today = self.schedule.get('metadata', {}).get('concepts_due_today', 0)
+        if self.due_index is not None:
+            concepts_due_today = self.due_index.count_due(datetime.now().strftime('%Y-%m-%d'))
+        else:
+            concepts_due_today = self.schedule.get('metadata', {}).get('concepts_due_today', 0)
         next_review_date = self.get_next_review_date()
 
         return {
@@ -150,6 +154,9 @@ class ProgressCalculator:
 
     def get_next_review_date(self):
         """Get the next review date from schedule."""
+        if self.due_index is not None:
+            return self.due_index.next_review()
+
         concepts = self.schedule.get('concepts', [])
         if not concepts:
             return None
@@ -35,36 +35,19 @@ KB_DIR = ROOT / "knowledge-base"
 
 # Add scripts to path
 sys.path.append(str(ROOT / "scripts"))
+sys.path.append(str(ROOT / "scripts" / "knowledge-graph"))  # For rem_resolver
 from utils.file_lock import safe_read_json, safe_write_json
+from rem_resolver import get_resolver
 
 
 def find_rem_file(rem_id: str, domain: str) -> Path:
     """
-    Find Rem file by searching knowledge base.
+    Find Rem file via the persistent Rem resolver index.
     Returns Path if found, None otherwise.
     """
-    kb_root = Path(KB_DIR)
-
-    # Pattern priority:
-    # 1. Exact match with optional numeric prefix: NNN-{rem_id}.md
-    # 2. Exact match without prefix: {rem_id}.md
-    # 3. Fuzzy match containing rem_id
-    patterns = [
-        f"**/*-{rem_id}.md",
-        f"**/{rem_id}.md",
-        f"**/*{rem_id}*.md",
-    ]
-
-    for pattern in patterns:
-        matches = list(kb_root.glob(pattern))
-        if matches:
-            # Prefer domain match
-            domain_matches = [m for m in matches if domain in str(m)]
-            if domain_matches:
-                return domain_matches[0]
-            return matches[0]
-
-    return None
+    # Covers NNN-{rem_id}.md, {rem_id}.md and filenames containing rem_id,
+    # preferring domain matches
+    return get_resolver(KB_DIR).resolve(rem_id, domain, fuzzy=False)
 
 
 def find_orphaned_entries(schedule: dict) -> list:
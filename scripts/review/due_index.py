@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Due Index
+
+Concepts sorted by next_review, with one sorted bucket per domain, so "what
+is due" questions are answered by binary search instead of scanning every
+concept in schedule.json:
+
+    due(on)                 ids due on or before a date    O(log n + k)
+    count_due(on)           number due on or before        O(log n)
+    count_due_by_domain(on) per-domain counts              O(domains * log n)
+    upcoming(after, n)      next n reviews after a date    O(log n + n)
+
+The index is persisted next to schedule.json (due-index.json), keyed by the
+schedule's (mtime_ns, size) plus the review-log offset it covers, and
+rebuilt from the schedule when stale. Ratings still pending in
+review-log.jsonl are overlaid in memory on load, so the index reflects every
+rating even before schedule.json is materialized; the file itself is only
+rewritten when rebuilt or when ReviewScheduler.materialize folds the log in.
+
+Alongside it, concept-states.jsonl holds one [id, domain, fsrs_state] line
+per concept, sorted by id, so a single concept's state is found by binary
+search over the file (concept_state, O(log n) seeks) instead of parsing
+schedule.json. A rating therefore costs a lookup and a log append,
+independent of the schedule's size.
+
+Usage:
+    from due_index import load_due_index
+
+    index = load_due_index('.review/schedule.json')
+    index.count_due('2025-11-02')
+    index.upcoming('2025-11-02', 5)
+
+CLI:
+    python3 scripts/review/due_index.py [--schedule PATH] [--date YYYY-MM-DD] [--upcoming N] [--rebuild]
+"""
+
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from review_log import ReviewLog
+
+INDEX_NAME = "due-index.json"
+INDEX_VERSION = 2
+STATES_NAME = "concept-states.jsonl"
+STATES_VERSION = 1
+MAX_ID = "\U0010ffff"  # sorts after every concept ID sharing a date
+
+Entry = Tuple[str, str]  # (next_review YYYY-MM-DD, concept id)
+
+
+def _review_date(concept: Dict) -> Optional[str]:
+    next_review = (concept.get("fsrs_state") or {}).get("next_review")
+    return str(next_review)[:10] if next_review else None
+
+
+class DueIndex:
+    """Concept IDs sorted by (next_review, id), overall and per domain."""
+
+    def __init__(self, entries: Optional[List[Entry]] = None,
+                 domains: Optional[Dict[str, List[Entry]]] = None):
+        self.entries: List[Entry] = entries or []
+        self.domains: Dict[str, List[Entry]] = domains or {}
+        self._where: Optional[Dict[str, Tuple[str, str]]] = None
+
+    @classmethod
+    def from_concepts(cls, concepts: Dict[str, Dict]) -> "DueIndex":
+        """Build from schedule["concepts"]; concepts without next_review are skipped."""
+        index = cls()
+        for cid, concept in concepts.items():
+            when = _review_date(concept)
+            if when:
+                entry = (when, cid)
+                index.entries.append(entry)
+                index.domains.setdefault(concept.get("domain", ""), []).append(entry)
+        index.entries.sort()
+        for bucket in index.domains.values():
+            bucket.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _bucket(self, domain: Optional[str]) -> List[Entry]:
+        return self.entries if domain is None else self.domains.get(domain, [])
+
+    # ---------- queries ----------
+
+    def count_due(self, on: str, domain: Optional[str] = None) -> int:
+        """Concepts with next_review on or before `on` (YYYY-MM-DD)."""
+        return bisect_right(self._bucket(domain), (on, MAX_ID))
+
+    def due(self, on: str, domain: Optional[str] = None) -> List[str]:
+        """IDs due on or before `on`, most overdue first."""
+        bucket = self._bucket(domain)
+        return [cid for _, cid in bucket[:bisect_right(bucket, (on, MAX_ID))]]
+
+    def count_due_by_domain(self, on: str) -> Dict[str, int]:
+        """Due counts per domain (domains with nothing due are omitted)."""
+        counts = {}
+        for domain, bucket in self.domains.items():
+            n = bisect_right(bucket, (on, MAX_ID))
+            if n:
+                counts[domain] = n
+        return counts
+
+    def upcoming(self, after: str, n: int, domain: Optional[str] = None) -> List[Entry]:
+        """The next n (next_review, id) entries strictly after `after`."""
+        bucket = self._bucket(domain)
+        start = bisect_right(bucket, (after, MAX_ID))
+        return bucket[start:start + n]
+
+    def next_review(self, domain: Optional[str] = None) -> Optional[str]:
+        """Earliest next_review (overdue dates included)."""
+        bucket = self._bucket(domain)
+        return bucket[0][0] if bucket else None
+
+    # ---------- maintenance ----------
+
+    def _locations(self) -> Dict[str, Tuple[str, str]]:
+        if self._where is None:
+            self._where = {cid: (when, domain)
+                           for domain, bucket in self.domains.items() for when, cid in bucket}
+        return self._where
+
+    @staticmethod
+    def _discard(bucket: List[Entry], entry: Entry) -> None:
+        i = bisect_left(bucket, entry)
+        if i < len(bucket) and bucket[i] == entry:
+            del bucket[i]
+
+    def remove(self, cid: str) -> None:
+        where = self._locations()
+        if cid not in where:
+            return
+        when, domain = where.pop(cid)
+        self._discard(self.entries, (when, cid))
+        bucket = self.domains.get(domain)
+        if bucket is not None:
+            self._discard(bucket, (when, cid))
+            if not bucket:
+                del self.domains[domain]
+
+    def update(self, cid: str, concept: Dict) -> None:
+        """Re-index one concept after its schedule entry changed."""
+        self.remove(cid)
+        when = _review_date(concept)
+        if not when:
+            return
+        domain = concept.get("domain", "")
+        insort(self.entries, (when, cid))
+        insort(self.domains.setdefault(domain, []), (when, cid))
+        self._locations()[cid] = (when, domain)
+
+    # ---------- persistence ----------
+
+    def to_json(self) -> Dict:
+        return {
+            "entries": [list(e) for e in self.entries],
+            "domains": {d: [list(e) for e in bucket] for d, bucket in self.domains.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "DueIndex":
+        return cls([tuple(e) for e in data["entries"]],
+                   {d: [tuple(e) for e in bucket] for d, bucket in data["domains"].items()})
+
+
+def index_path_for(schedule_path: Path) -> Path:
+    """Return the due index location for a schedule file."""
+    return Path(schedule_path).with_name(INDEX_NAME)
+
+
+def _signature(path: Path) -> List[int]:
+    st = Path(path).stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def save_due_index(index: DueIndex, schedule_path: Path, log_offset: int = 0) -> None:
+    """Write the index stamped with the schedule's signature and the log offset it covers."""
+    index_path = index_path_for(schedule_path)
+    payload = {"version": INDEX_VERSION, "signature": _signature(schedule_path),
+               "log_offset": log_offset, **index.to_json()}
+    temp_path = index_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, index_path)
+
+
+def _read_index(schedule_path: Path, signature: Optional[List[int]]) -> Optional[Tuple[DueIndex, int]]:
+    """(index, log offset) if the cached index matches `signature`."""
+    try:
+        with open(index_path_for(schedule_path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") == INDEX_VERSION and data.get("signature") == signature:
+            return DueIndex.from_json(data), int(data["log_offset"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _save_quietly(index: DueIndex, schedule_path: Path, log_offset: int) -> None:
+    # Best effort: a failed write leaves a stale index, which the next load rebuilds
+    try:
+        save_due_index(index, schedule_path, log_offset)
+    except OSError:
+        pass
+
+
+def load_due_index(schedule_path: Path = Path('.review/schedule.json'), use_cache: bool = True) -> DueIndex:
+    """
+    Load the due index, rebuilding it when schedule.json changed.
+
+    Review-log events not yet materialized into schedule.json are applied
+    on top, so ratings count as soon as they are logged.
+
+    Raises:
+        FileNotFoundError: If schedule.json does not exist
+    """
+    schedule_path = Path(schedule_path)
+    log = ReviewLog(schedule_path)
+    signature = _signature(schedule_path)
+    cached = _read_index(schedule_path, signature) if use_cache else None
+    if cached is not None:
+        index, offset = cached
+        concepts = None
+    else:
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            concepts = json.load(f).get("concepts", {})
+        index, offset = DueIndex.from_concepts(concepts), log.checkpoint()
+        if use_cache:
+            _save_quietly(index, schedule_path, offset)
+            _save_states_quietly(concepts, schedule_path)
+
+    events, end = log.read(offset)
+    where = index._locations()
+    for event in events:
+        cid = event["concept"]
+        if concepts is not None:
+            if cid not in concepts:
+                continue  # removed from the schedule since the rating
+            domain = concepts[cid].get("domain", "")
+        elif cid in where:
+            domain = where[cid][1]
+        else:
+            continue  # not indexed yet; picked up when schedule.json is materialized
+        index.update(cid, {"domain": domain, "fsrs_state": event["fsrs_state"]})
+    return index
+
+
+def refresh_due_index(schedule_path: Path, concepts: Dict[str, Dict], changed: List[str],
+                      previous_signature: Optional[List[int]], log_offset: int = 0) -> None:
+    """
+    Bring the index in line with a schedule that was just rewritten.
+
+    Applies `changed` incrementally if the index matched the schedule as it
+    was before the write (previous_signature); otherwise rebuilds from
+    `concepts`. log_offset is the review-log position the rewritten
+    schedule.json covers.
+    """
+    schedule_path = Path(schedule_path)
+    cached = _read_index(schedule_path, previous_signature) if previous_signature else None
+    if cached is None:
+        index = DueIndex.from_concepts(concepts)
+    else:
+        index = cached[0]
+        for cid in changed:
+            if cid in concepts:
+                index.update(cid, concepts[cid])
+            else:
+                index.remove(cid)
+    _save_quietly(index, schedule_path, log_offset)
+    _save_states_quietly(concepts, schedule_path)
+
+
+# ---------- per-concept states ----------
+
+def states_path_for(schedule_path: Path) -> Path:
+    """Return the concept states location for a schedule file."""
+    return Path(schedule_path).with_name(STATES_NAME)
+
+
+def save_concept_states(concepts: Dict[str, Dict], schedule_path: Path) -> None:
+    """Write concept-states.jsonl (sorted by id) stamped with the schedule's signature."""
+    states_path = states_path_for(schedule_path)
+    temp_path = states_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"version": STATES_VERSION, "signature": _signature(schedule_path)}) + '\n')
+        for cid in sorted(concepts):
+            concept = concepts[cid]
+            f.write(json.dumps([cid, concept.get("domain", ""), concept.get("fsrs_state") or {}],
+                               ensure_ascii=False, separators=(',', ':')) + '\n')
+    os.replace(temp_path, states_path)
+
+
+def _save_states_quietly(concepts: Dict[str, Dict], schedule_path: Path) -> None:
+    try:
+        save_concept_states(concepts, schedule_path)
+    except OSError:
+        pass
+
+
+def _bisect_states(f, lo: int, hi: int, cid: str) -> Optional[list]:
+    """Binary search the lines starting in [lo, hi) for cid."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid - 1 if mid > lo else lo)
+        if mid > lo:
+            f.readline()  # move to the first line start at or after mid
+        start = f.tell()
+        if start >= hi:
+            hi = mid
+            continue
+        line = f.readline()
+        record = json.loads(line)
+        if record[0] < cid:
+            lo = f.tell()
+        elif record[0] > cid:
+            hi = start
+        else:
+            return record
+    return None
+
+
+def _lookup_state(schedule_path: Path, cid: str) -> Tuple[bool, Optional[list]]:
+    """(states file current, [id, domain, fsrs_state] or None)."""
+    try:
+        with open(states_path_for(schedule_path), 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get("version") != STATES_VERSION or header.get("signature") != _signature(schedule_path):
+                return False, None
+            lo = f.tell()
+            hi = f.seek(0, os.SEEK_END)
+            return True, _bisect_states(f, lo, hi, cid)
+    except (OSError, ValueError, AttributeError, IndexError, TypeError):
+        return False, None
+
+
+def concept_state(schedule_path: Path, cid: str, pending: Optional[List[Dict]] = None) -> Optional[Dict]:
+    """
+    Current {"domain", "fsrs_state"} of one concept without parsing schedule.json.
+
+    The latest pending review-log event for cid wins; otherwise the state is
+    looked up in concept-states.jsonl, which is rebuilt from schedule.json
+    only if the schedule changed behind it.
+
+    Args:
+        schedule_path: Path to schedule.json
+        cid: Concept ID
+        pending: Pending review-log events, if the caller already read them
+
+    Returns:
+        None if the concept is not in the schedule
+
+    Raises:
+        FileNotFoundError: If schedule.json does not exist
+    """
+    schedule_path = Path(schedule_path)
+    current, record = _lookup_state(schedule_path, cid)
+    if not current:
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            concepts = json.load(f).get("concepts", {})
+        _save_states_quietly(concepts, schedule_path)
+        if cid not in concepts:
+            return None
+        record = [cid, concepts[cid].get("domain", ""), concepts[cid].get("fsrs_state") or {}]
+    if record is None:
+        return None
+    state = record[2]
+    if pending is None:
+        pending = ReviewLog(schedule_path).pending()[0]
+    for event in pending:
+        if event["concept"] == cid:
+            state = event["fsrs_state"]
+    return {"domain": record[1], "fsrs_state": dict(state)}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Due review counts from the due index')
+    parser.add_argument('--schedule', default='.review/schedule.json', help='Path to schedule.json')
+    parser.add_argument('--date', default=None, help='As-of date (YYYY-MM-DD, default: today)')
+    parser.add_argument('--upcoming', type=int, default=5, help='Upcoming reviews to list')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the cached index')
+    args = parser.parse_args()
+
+    on = args.date or date.today().strftime('%Y-%m-%d')
+    try:
+        index = load_due_index(Path(args.schedule), use_cache=not args.rebuild)
+    except FileNotFoundError:
+        print(f"Error: {args.schedule} not found", file=sys.stderr)
+        return 1
+
+    print(json.dumps({
+        "date": on,
+        "due": index.count_due(on),
+        "due_by_domain": index.count_due_by_domain(on),
+        "upcoming": [{"id": cid, "next_review": when} for when, cid in index.upcoming(on, args.upcoming)],
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Vectorized Batch FSRS
+
+Column-oriented FSRS over the whole schedule: schedule.json is loaded once
+into NumPy arrays (stability, difficulty, last_review as day ordinals,
+review_count, next_review), and retrievability, intervals and next states
+for any rating vector are computed in single vectorized calls.
+
+Results match FSRSAlgorithm.review() (same formulas, clamps and integer
+day arithmetic); dates are parsed once at load time instead of per review.
+
+Usage:
+    from fsrs_batch import BatchFSRS
+
+    batch = BatchFSRS()
+    cols = batch.load_schedule('.review/schedule.json')
+    r = batch.retrievability(cols, date.today())
+    nxt = batch.review(cols, ratings=3, review_date=datetime.now())
+    batch.to_state(nxt, 0)  # same dict as FSRSAlgorithm.review()
+
+CLI:
+    python3 scripts/review/fsrs_batch.py [--schedule PATH] [--date YYYY-MM-DD] [--parameters PATH]
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fsrs_algorithm import FSRSAlgorithm
+from review_log import ReviewLog, apply_events
+from review_scheduler import PARAMETERS_PATH, load_parameters
+
+NO_DATE = -1  # ordinal for missing / unparseable dates
+
+DateLike = Union[date, datetime, str]
+
+
+def _parse_date(value) -> Optional[datetime]:
+    """Parse a schedule date like FSRSAlgorithm.review (tz dropped, not converted)."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day)
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return parsed.replace(tzinfo=None) if parsed.tzinfo is not None else parsed
+
+
+def _ordinal(value: DateLike) -> int:
+    parsed = _parse_date(value)
+    return parsed.toordinal() if parsed else NO_DATE
+
+
+def _time_of_day_us(dt: datetime) -> int:
+    return ((dt.hour * 60 + dt.minute) * 60 + dt.second) * 1_000_000 + dt.microsecond
+
+
+@dataclass
+class ScheduleColumns:
+    """FSRS state of many concepts as parallel arrays (row i = ids[i])."""
+
+    ids: List[str]
+    difficulty: np.ndarray      # float64
+    stability: np.ndarray       # float64
+    review_count: np.ndarray    # int64
+    last_review: np.ndarray     # int64 day ordinal (NO_DATE if never reviewed)
+    last_review_us: np.ndarray  # int64 microseconds into last_review's day
+    next_review: np.ndarray     # int64 day ordinal (NO_DATE if unset)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, concept_id: str) -> int:
+        index = getattr(self, '_index', None)
+        if index is None:
+            index = self._index = {cid: i for i, cid in enumerate(self.ids)}
+        return index[concept_id]
+
+
+class BatchFSRS:
+    """FSRSAlgorithm over ScheduleColumns."""
+
+    def __init__(self, parameters: Dict = None, parameters_path: Path = PARAMETERS_PATH):
+        """
+        Args:
+            parameters: FSRS parameters (default: the fitted ones at
+                parameters_path, as ReviewScheduler uses, else FSRSAlgorithm defaults)
+        """
+        if parameters is None:
+            parameters = load_parameters(parameters_path)
+        scalar = FSRSAlgorithm(parameters)
+        self.w = np.asarray(scalar.w, dtype=np.float64)
+        self.desired_retention = scalar.desired_retention
+        self.maximum_interval = scalar.maximum_interval
+
+    # ---------- loading ----------
+
+    @staticmethod
+    def columns(concepts: Dict[str, Dict]) -> ScheduleColumns:
+        """Build columns from schedule["concepts"] (dates parsed once here)."""
+        n = len(concepts)
+        ids = list(concepts)
+        difficulty = np.empty(n)
+        stability = np.empty(n)
+        review_count = np.zeros(n, dtype=np.int64)
+        last_review = np.full(n, NO_DATE, dtype=np.int64)
+        last_review_us = np.zeros(n, dtype=np.int64)
+        next_review = np.full(n, NO_DATE, dtype=np.int64)
+        for i, cid in enumerate(ids):
+            state = concepts[cid].get('fsrs_state') or {}
+            difficulty[i] = state.get('difficulty', np.nan)
+            stability[i] = state.get('stability', np.nan)
+            review_count[i] = state.get('review_count', 0) or 0
+            last = _parse_date(state.get('last_review'))
+            if last is not None:
+                last_review[i] = last.toordinal()
+                last_review_us[i] = _time_of_day_us(last)
+            next_review[i] = _ordinal(state.get('next_review'))
+        return ScheduleColumns(ids, difficulty, stability, review_count,
+                               last_review, last_review_us, next_review)
+
+    def load_schedule(self, schedule_path: Union[str, Path]) -> ScheduleColumns:
+        """Load schedule.json (v2.0.0) into columns, with pending review-log ratings applied."""
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            concepts = json.load(f).get('concepts', {})
+        apply_events(concepts, ReviewLog(schedule_path).pending()[0])
+        return self.columns(concepts)
+
+    # ---------- formulas (vectorized FSRSAlgorithm methods) ----------
+
+    def calculate_retrievability(self, elapsed_days, stability) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.exp(np.log(0.9) * np.asarray(elapsed_days, dtype=np.float64) / stability)
+
+    def calculate_interval(self, stability) -> np.ndarray:
+        interval = np.asarray(stability, dtype=np.float64) * np.log(self.desired_retention) / np.log(0.9)
+        return np.clip(np.rint(interval), 1, self.maximum_interval).astype(np.int64)
+
+    def initial_difficulty(self, ratings: np.ndarray) -> np.ndarray:
+        # Ratings 1-3 map to w4-w6; anything else is treated as Easy (w7)
+        return self.w[np.where((ratings >= 1) & (ratings <= 3), ratings + 3, 7)]
+
+    def initial_stability(self, ratings: np.ndarray) -> np.ndarray:
+        return np.maximum(self.w[np.clip(ratings, 1, 4) - 1], 0.1)
+
+    def next_difficulty(self, difficulty, ratings) -> np.ndarray:
+        return np.clip(difficulty + self.w[15] * (ratings - 3), 1, 10)
+
+    def next_stability(self, difficulty, stability, retrievability, ratings) -> np.ndarray:
+        w = self.w
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            forgot = (w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1)
+                      * np.exp(w[14] * (1 - retrievability)))
+            forgot = np.minimum(forgot, stability)
+            si = (np.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                  * (np.exp(w[10] * (1 - retrievability)) - 1))
+            hard_penalty = np.where(ratings == 2, w[15], 0.0)
+            easy_bonus = np.where(ratings == 4, w[16], 0.0)
+            recalled = stability * (1 + si - hard_penalty + easy_bonus)
+        new_stability = np.where(ratings == 1, forgot, recalled)
+        return np.maximum(0.1, np.minimum(new_stability, self.maximum_interval))
+
+    # ---------- batch operations ----------
+
+    def elapsed_days(self, cols: ScheduleColumns, review_date: DateLike) -> np.ndarray:
+        """Whole days since last review, floored like timedelta.days, clamped at 0."""
+        when = _parse_date(review_date)
+        days = when.toordinal() - cols.last_review
+        days -= (_time_of_day_us(when) < cols.last_review_us).astype(np.int64)
+        return np.maximum(days, 0)
+
+    def retrievability(self, cols: ScheduleColumns, on: DateLike) -> np.ndarray:
+        """Current retrievability of every concept (1.0 if never reviewed)."""
+        r = self.calculate_retrievability(self.elapsed_days(cols, on), cols.stability)
+        return np.where(cols.review_count == 0, 1.0, r)
+
+    def predict_retention(self, cols: ScheduleColumns, days_ahead: int) -> np.ndarray:
+        """Vectorized FSRSAlgorithm.predict_retention."""
+        return self.calculate_retrievability(days_ahead, cols.stability)
+
+    def due(self, cols: ScheduleColumns, on: DateLike) -> np.ndarray:
+        """Boolean mask of concepts with next_review on or before the date."""
+        return (cols.next_review != NO_DATE) & (cols.next_review <= _ordinal(on))
+
+    def review(self, cols: ScheduleColumns, ratings, review_date: Optional[datetime] = None) -> ScheduleColumns:
+        """
+        Apply ratings to every row (FSRSAlgorithm.review, vectorized).
+
+        Args:
+            cols: Current states
+            ratings: Rating per row (1-4), or one rating for all rows
+            review_date: Date of review (default: now)
+
+        Returns:
+            New ScheduleColumns; its retrievability at review time is kept
+            as the `retrievability` attribute and intervals as `interval`
+        """
+        if review_date is None:
+            review_date = datetime.now()
+        review_date = _parse_date(review_date)
+        ratings = np.broadcast_to(np.asarray(ratings, dtype=np.int64), (len(cols),))
+        first = cols.review_count == 0
+
+        r = np.where(first, 1.0, self.calculate_retrievability(self.elapsed_days(cols, review_date),
+                                                                cols.stability))
+        difficulty = np.where(first, self.initial_difficulty(ratings),
+                              self.next_difficulty(cols.difficulty, ratings))
+        stability = np.where(first, self.initial_stability(ratings),
+                             self.next_stability(cols.difficulty, cols.stability, r, ratings))
+        interval = self.calculate_interval(stability)
+
+        today = review_date.toordinal()
+        out = ScheduleColumns(
+            ids=cols.ids,
+            difficulty=difficulty,
+            stability=stability,
+            review_count=cols.review_count + 1,
+            last_review=np.full(len(cols), today, dtype=np.int64),
+            last_review_us=np.zeros(len(cols), dtype=np.int64),
+            next_review=today + interval,
+        )
+        out.retrievability = r
+        out.interval = interval
+        return out
+
+    @staticmethod
+    def to_state(cols: ScheduleColumns, i: int) -> Dict:
+        """Row i of a review() result as the dict FSRSAlgorithm.review returns."""
+        return {
+            "difficulty": round(float(cols.difficulty[i]), 4),
+            "stability": round(float(cols.stability[i]), 4),
+            "retrievability": round(float(cols.retrievability[i]), 4),
+            "interval": int(cols.interval[i]),
+            "next_review": date.fromordinal(int(cols.next_review[i])).strftime('%Y-%m-%d'),
+            "review_count": int(cols.review_count[i]),
+            "last_review": date.fromordinal(int(cols.last_review[i])).strftime('%Y-%m-%d'),
+        }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Batch FSRS summary of the schedule')
+    parser.add_argument('--schedule', default='.review/schedule.json', help='Path to schedule.json')
+    parser.add_argument('--date', default=None, help='As-of date (YYYY-MM-DD, default: today)')
+    parser.add_argument('--parameters', default=str(PARAMETERS_PATH),
+                        help='Fitted FSRS parameters (defaults are used when absent)')
+    args = parser.parse_args()
+
+    on = datetime.strptime(args.date, '%Y-%m-%d') if args.date else datetime.now()
+    batch = BatchFSRS(parameters_path=Path(args.parameters))
+    try:
+        cols = batch.load_schedule(args.schedule)
+    except FileNotFoundError:
+        print(f"Error: {args.schedule} not found", file=sys.stderr)
+        return 1
+
+    r = batch.retrievability(cols, on)
+    reviewed = cols.review_count > 0
+    week = batch.due(cols, on + timedelta(days=7))
+    print(json.dumps({
+        "date": on.strftime('%Y-%m-%d'),
+        "concepts": len(cols),
+        "due": int(batch.due(cols, on).sum()),
+        "due_7_days": int(week.sum()),
+        "mean_retrievability": round(float(r[reviewed].mean()), 4) if reviewed.any() else None,
+        "below_desired_retention": int((r[reviewed] < batch.desired_retention).sum()),
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
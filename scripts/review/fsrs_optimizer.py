@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+FSRS Parameter Optimizer
+
+Fits the 18 FSRS weights to the user's own review history.
+
+Each card's review log is replayed with candidate weights: the first
+review initializes difficulty and stability (unless the log entry carries
+the state the card already had), every later review predicts recall with
+the forgetting curve, and the state is then updated with the actual
+rating. The objective is the log-loss of predicted retrievability against
+observed recall (rating > 1).
+
+Replay is vectorized across cards with BatchFSRS (the same formulas as
+FSRSAlgorithm): cards are sorted by log length so step j only touches the
+prefix of cards that have a j-th review. Weights are fitted with bounded
+L-BFGS-B and stopped early once the loss stops improving.
+
+The result is written to .review/fsrs-parameters.json, which
+ReviewScheduler loads in place of the default parameters.
+
+Usage:
+    source venv/bin/activate && python scripts/review/fsrs_optimizer.py [--history PATH] [--dry-run]
+
+History format (.review/history.json): review events under "reviews" or
+under each session's "reviews":
+    {"concept": "rem-id", "rating": 3, "date": "2025-11-02", "elapsed_days": 4}
+"concept" may also be "rem_id" / "id"; "elapsed_days" is derived from
+consecutive dates ("date", "reviewed_at" or "timestamp") when missing.
+Events from the review log (review-log.jsonl) are read as well.
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fsrs_algorithm import FSRSAlgorithm
+from fsrs_batch import BatchFSRS
+from review_log import ReviewLog
+from schedule_store import open_store
+
+HISTORY_PATH = Path('.review/history.json')
+SCHEDULE_PATH = Path('.review/schedule.json')  # review-log.jsonl lives next to it
+PARAMETERS_PATH = Path('.review/fsrs-parameters.json')
+
+MIN_REVIEWS = 30
+MIN_FORGOT = 10
+MIN_CONCEPTS = 3
+
+EPS = 1e-6
+PATIENCE = 5           # iterations without improvement before stopping
+MIN_IMPROVEMENT = 1e-5  # absolute loss decrease that counts as improvement
+
+# (low, high) per weight; every default lies inside its range
+WEIGHT_BOUNDS = [
+    (0.1, 100.0), (0.1, 100.0), (0.1, 100.0), (0.1, 100.0),  # w0-w3: initial stability
+    (0.01, 10.0), (0.01, 10.0), (0.01, 10.0), (0.01, 10.0),  # w4-w7: initial difficulty
+    (0.0, 5.0), (0.0, 1.0), (0.01, 5.0),                      # w8-w10: stability increase
+    (0.01, 5.0), (0.0, 1.0), (0.0, 1.0), (0.0, 5.0),          # w11-w14: post-lapse stability
+    (0.0, 1.0), (0.0, 6.0), (0.0, 1.0),                       # w15-w17: difficulty step, easy bonus
+]
+
+
+def _event_date(event: Dict) -> Optional[datetime]:
+    for key in ('date', 'reviewed_at', 'timestamp'):
+        value = event.get(key)
+        if value:
+            try:
+                parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            return parsed.replace(tzinfo=None)
+    return None
+
+
+def card_logs(history: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Group review events per card in review order.
+
+    Events keep list order unless every event of a card is dated, in which
+    case they are sorted by date. Missing elapsed_days are derived from the
+    previous review's date (0 if undated).
+    """
+    cards: Dict[str, List[Dict]] = {}
+    for event in history:
+        cid = event.get('concept') or event.get('rem_id') or event.get('id')
+        if cid is None or event.get('rating') is None:
+            continue
+        cards.setdefault(cid, []).append(event)
+
+    logs = {}
+    for cid, events in cards.items():
+        dates = [_event_date(e) for e in events]
+        if all(dates):
+            order = sorted(range(len(events)), key=lambda i: dates[i])
+            events = [events[i] for i in order]
+            dates = [dates[i] for i in order]
+        log = []
+        for i, event in enumerate(events):
+            elapsed = event.get('elapsed_days')
+            if elapsed is None:
+                elapsed = (dates[i] - dates[i - 1]).days if i and dates[i] and dates[i - 1] else 0
+            log.append({
+                'rating': min(4, max(1, int(event['rating']))),
+                'elapsed_days': max(0, int(elapsed)),
+                'difficulty': event.get('difficulty'),
+                'stability': event.get('stability'),
+            })
+        logs[cid] = log
+    return logs
+
+
+class FSRSOptimizer:
+    """Fit FSRS weights to review history."""
+
+    def __init__(self, history: List[Dict], parameters: Dict = None):
+        """
+        Args:
+            history: Review events (see module docstring)
+            parameters: Starting parameters (default: FSRSAlgorithm defaults)
+        """
+        self.history = history
+        self.default_params = FSRSAlgorithm.default_parameters()
+        self.batch = BatchFSRS(parameters or {"w": self.default_params})
+        self.initial_params = list(self.batch.w)
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """Pad per-card logs into (cards, steps) arrays, longest logs first."""
+        logs = sorted(card_logs(self.history).values(), key=len, reverse=True)
+        n = len(logs)
+        steps = len(logs[0]) if logs else 0
+        self.ratings = np.zeros((n, steps), dtype=np.int64)
+        self.elapsed = np.zeros((n, steps), dtype=np.float64)
+        self.active = [sum(1 for log in logs if len(log) > j) for j in range(steps)]
+        self.start_d = np.full(n, np.nan)
+        self.start_s = np.full(n, np.nan)
+        for i, log in enumerate(logs):
+            for j, event in enumerate(log):
+                self.ratings[i, j] = event['rating']
+                self.elapsed[i, j] = event['elapsed_days']
+            first = log[0]
+            if first['difficulty'] is not None and first['stability'] is not None:
+                self.start_d[i] = float(first['difficulty'])
+                self.start_s[i] = max(float(first['stability']), 0.1)
+        self.has_state = ~np.isnan(self.start_s)
+        self.predicted = int(self.has_state.sum()) + sum(self.active[1:])
+
+    def should_optimize(self) -> Tuple[bool, str]:
+        """Check whether the history is rich enough to fit 18 weights."""
+        n = len(self.history)
+        if n < MIN_REVIEWS:
+            return False, f"Need {MIN_REVIEWS}+ reviews (have {n})"
+        concepts = {e.get('concept') or e.get('rem_id') or e.get('id') for e in self.history}
+        concepts.discard(None)
+        if len(concepts) < MIN_CONCEPTS:
+            return False, f"Need {MIN_CONCEPTS}+ distinct concepts (have {len(concepts)})"
+        forgot = sum(1 for e in self.history if e.get('rating') == 1)
+        if forgot < MIN_FORGOT:
+            return False, f"Need {MIN_FORGOT}+ forgot events (rating 1) (have {forgot})"
+        return True, f"Ready: {n} reviews, {len(concepts)} concepts, {forgot} forgot events"
+
+    def loss_function(self, w) -> float:
+        """Mean log-loss of predicted retrievability over replayed reviews."""
+        if not self.predicted:
+            return 0.0
+        batch = self.batch
+        batch.w = np.asarray(w, dtype=np.float64)
+        d = self.start_d.copy()
+        s = self.start_s.copy()
+        total = 0.0
+        for j, k in enumerate(self.active):
+            r = self.ratings[:k, j]
+            dk, sk = d[:k], s[:k]
+            init = np.isnan(sk)
+            seen = ~init
+            if seen.any():
+                ret = np.clip(batch.calculate_retrievability(self.elapsed[:k, j][seen], sk[seen]), EPS, 1 - EPS)
+                recalled = r[seen] > 1
+                total -= np.sum(np.where(recalled, np.log(ret), np.log1p(-ret)))
+                rs = r[seen]
+                new_s = batch.next_stability(dk[seen], sk[seen], ret, rs)
+                dk[seen] = batch.next_difficulty(dk[seen], rs)
+                sk[seen] = new_s
+            if init.any():
+                dk[init] = batch.initial_difficulty(r[init])
+                sk[init] = batch.initial_stability(r[init])
+        loss = total / self.predicted
+        return float(loss) if np.isfinite(loss) else 1e6
+
+    def optimize(self, max_iterations: int = 200) -> Dict:
+        """
+        Fit weights with bounded L-BFGS-B, stopping early on a loss plateau.
+
+        Returns:
+            {w, loss, baseline_loss, improvement (% of baseline), success,
+             iterations, reviews}; if fitting does not beat the starting
+            weights, those are returned with success False
+        """
+        x0 = np.clip(np.asarray(self.initial_params, dtype=np.float64), *zip(*WEIGHT_BOUNDS))
+        baseline = self.loss_function(x0)
+        state = {'best': baseline, 'stale': 0, 'iterations': 0}
+
+        def early_stop(intermediate_result):
+            state['iterations'] += 1
+            if intermediate_result.fun < state['best'] - MIN_IMPROVEMENT:
+                state['best'] = intermediate_result.fun
+                state['stale'] = 0
+            else:
+                state['stale'] += 1
+                if state['stale'] >= PATIENCE:
+                    raise StopIteration
+
+        result = minimize(self.loss_function, x0, method='L-BFGS-B', bounds=WEIGHT_BOUNDS,
+                          callback=early_stop, options={'maxiter': max_iterations})
+        w = np.clip(np.round(result.x, 4), *zip(*WEIGHT_BOUNDS))
+        loss = self.loss_function(w)
+        success = loss < baseline
+        if not success:
+            w, loss = x0, baseline
+        return {
+            'w': [float(x) for x in w],
+            'loss': loss,
+            'baseline_loss': baseline,
+            'improvement': (baseline - loss) / baseline * 100 if baseline > 0 else 0.0,
+            'success': bool(success),
+            'iterations': state['iterations'],
+            'reviews': self.predicted,
+        }
+
+
+def load_history(history_path: Path = HISTORY_PATH) -> List[Dict]:
+    """Review events from history.json ("reviews" and sessions[*]["reviews"])."""
+    with open(history_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    events = list(data.get('reviews', []))
+    for session in data.get('sessions', []):
+        if isinstance(session, dict):
+            events.extend(session.get('reviews', []))
+    return events
+
+
+def load_review_log(schedule_path: Path = SCHEDULE_PATH) -> List[Dict]:
+    """
+    Rating events from the append-only review log (see review_log.py), or
+    from the SQLite store's reviews table when that backend is enabled.
+    """
+    store = open_store(schedule_path)
+    if store is not None:
+        return store.reviews()
+    events, _ = ReviewLog(schedule_path).read()
+    return events
+
+
+def save_parameters(result: Dict, user_id: str, output_path: Path = PARAMETERS_PATH,
+                    base: Dict = None) -> None:
+    """Write fitted weights where ReviewScheduler picks them up."""
+    base = base or {}
+    payload = {
+        'w': result['w'],
+        'desired_retention': base.get('desired_retention', 0.9),
+        'maximum_interval': base.get('maximum_interval', 36500),
+        'user_id': user_id,
+        'optimized_at': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'loss': round(result['loss'], 6),
+        'baseline_loss': round(result['baseline_loss'], 6),
+        'reviews': result['reviews'],
+    }
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    temp_path.replace(output_path)
+
+
+def run_optimization(user_id: str, history_path: Path = HISTORY_PATH,
+                     output_path: Path = PARAMETERS_PATH, max_iterations: int = 200,
+                     dry_run: bool = False, schedule_path: Path = SCHEDULE_PATH) -> Dict:
+    """
+    Fit parameters from review history and save them if they improve the loss.
+
+    History is history.json plus the review log next to schedule_path.
+
+    Returns:
+        {optimized: bool, reason: str, ...optimize() result when it ran}
+    """
+    try:
+        history = load_history(Path(history_path))
+    except FileNotFoundError:
+        history = []
+    except (OSError, ValueError) as e:
+        return {'optimized': False, 'reason': f"Unreadable review history: {e}"}
+    history.extend(load_review_log(Path(schedule_path)))
+    if not history:
+        return {'optimized': False, 'reason': f"No review history at {history_path} or in the review log"}
+
+    optimizer = FSRSOptimizer(history)
+    ready, reason = optimizer.should_optimize()
+    if not ready:
+        return {'optimized': False, 'reason': reason}
+
+    result = optimizer.optimize(max_iterations)
+    if not result['success']:
+        return {'optimized': False, 'reason': 'Fitted weights did not improve on the current ones', **result}
+    if not dry_run:
+        save_parameters(result, user_id, output_path)
+    return {'optimized': True, 'reason': reason, 'output': str(output_path), **result}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fit FSRS parameters to review history')
+    parser.add_argument('--user', default='default', help='User ID recorded in the parameters file')
+    parser.add_argument('--history', default=str(HISTORY_PATH), help='Review history file')
+    parser.add_argument('--schedule', default=str(SCHEDULE_PATH), help='schedule.json next to the review log')
+    parser.add_argument('--output', default=str(PARAMETERS_PATH), help='Parameters file to write')
+    parser.add_argument('--max-iterations', type=int, default=200)
+    parser.add_argument('--dry-run', action='store_true', help='Fit but do not write parameters')
+    args = parser.parse_args()
+
+    result = run_optimization(args.user, Path(args.history), Path(args.output),
+                              args.max_iterations, args.dry_run, Path(args.schedule))
+    print(json.dumps(result, indent=2))
+    return 0 if result['optimized'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,6 +17,9 @@ import sys
 import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "knowledge-graph"))
+from knowledge_graph import load_graph
+
 # Relation priority for review (higher = review first)
 RELATION_PRIORITY = {
     # Prerequisites must be mastered first
@@ -45,15 +48,19 @@ RELATION_PRIORITY = {
     'analogous_to': 1
 }
 
+# Relation types kept by each --priority filter
+PRIORITY_FILTERS = {
+    'prerequisites': {'has_prerequisite', 'prerequisite_of'},
+    'contrasts': {'antonym', 'contrasts_with'},
+    'examples': {'example_of', 'has_example'},
+}
+
 def load_backlinks():
-    """Load backlinks index"""
+    """Load the knowledge graph (None if the backlinks index is missing)"""
     backlinks_path = Path('knowledge-base/_index/backlinks.json')
     if not backlinks_path.exists():
-        return {}
-
-    with open(backlinks_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data.get('links', {})
+        return None
+    return load_graph(backlinks_path)
 
 def get_linked_rems(rem_id, priority_filter=None):
     """
@@ -66,9 +73,9 @@ def get_linked_rems(rem_id, priority_filter=None):
     Returns:
         Dict with linked_rems array sorted by priority
     """
-    backlinks = load_backlinks()
+    graph = load_backlinks()
 
-    if rem_id not in backlinks:
+    if graph is None or rem_id not in graph:
         return {
             'rem_id': rem_id,
             'linked_rems': [],
@@ -78,34 +85,21 @@ def get_linked_rems(rem_id, priority_filter=None):
             }
         }
 
-    rem_data = backlinks[rem_id]
+    allowed = PRIORITY_FILTERS.get(priority_filter)
     linked = []
 
-    # Process typed_links_to (outgoing)
-    for link in rem_data.get('typed_links_to', []):
-        linked.append({
-            'id': link['to'],
-            'type': link['type'],
-            'direction': 'outgoing',
-            'priority': RELATION_PRIORITY.get(link['type'], 0)
-        })
-
-    # Process typed_linked_from (incoming)
-    for link in rem_data.get('typed_linked_from', []):
-        linked.append({
-            'id': link['from'],
-            'type': link['type'],
-            'direction': 'incoming',
-            'priority': RELATION_PRIORITY.get(link['type'], 0)
-        })
-
-    # Apply priority filter
-    if priority_filter == 'prerequisites':
-        linked = [l for l in linked if l['type'] in ['has_prerequisite', 'prerequisite_of']]
-    elif priority_filter == 'contrasts':
-        linked = [l for l in linked if l['type'] in ['antonym', 'contrasts_with']]
-    elif priority_filter == 'examples':
-        linked = [l for l in linked if l['type'] in ['example_of', 'has_example']]
+    # Outgoing then incoming typed edges (indexed, file order)
+    for direction, edges in (('outgoing', graph.typed_links_to(rem_id)),
+                             ('incoming', graph.typed_linked_from(rem_id))):
+        for other_id, rel_type in edges:
+            if allowed is not None and rel_type not in allowed:
+                continue
+            linked.append({
+                'id': other_id,
+                'type': rel_type,
+                'direction': direction,
+                'priority': RELATION_PRIORITY.get(rel_type, 0)
+            })
 
     # Sort by priority (highest first)
     linked.sort(key=lambda x: x['priority'], reverse=True)
@@ -20,7 +20,11 @@ import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
 
+sys.path.insert(0, str(Path(__file__).parent))
+from review_scheduler import ReviewScheduler
+
 SESSION_DIR = Path('.review')
+SCHEDULE_PATH = SESSION_DIR / 'schedule.json'
 STALE_THRESHOLD_HOURS = 4
 
 
@@ -101,6 +105,16 @@ def make_session_meta(session):
     }
 
 
+def materialize_schedule():
+    """Apply the session's logged ratings to schedule.json (session end)."""
+    if not SCHEDULE_PATH.exists():
+        return 0
+    try:
+        return ReviewScheduler().materialize(SCHEDULE_PATH)
+    except (OSError, ValueError, BlockingIOError):
+        return 0  # Ratings stay in the review log; applied on next read
+
+
 def build_complete_result(session, reviewed):
     """Build result dict when all Rems are reviewed."""
     msg = f'All {reviewed} Rems reviewed. Session complete.'
@@ -141,6 +155,7 @@ def get_next_rem(session_id: str):
     next_rem, next_idx = find_next_pending(rems, start)
     reviewed, pending = count_by_status(rems)
     if next_rem is None:
+        materialize_schedule()
         return build_complete_result(session, reviewed)
     result = build_next_result(session, next_rem, next_idx, reviewed, pending)
     stale = check_stale(session)
@@ -151,6 +166,7 @@ def get_next_rem(session_id: str):
 
 def cleanup_session(session_id: str):
     """Delete session-{session_id}.json at session end."""
+    materialize_schedule()
     sf = session_file_for(session_id)
     if not sf.exists():
         return {'success': True, 'message': f'No session file to clean up ({sf.name})'}
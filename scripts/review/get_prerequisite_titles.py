@@ -2,7 +2,7 @@
 """
 Get Prerequisite Titles for Review Suggestions
 
-Extract prerequisite Rem titles from backlinks index.
+Extract prerequisite Rem titles from the knowledge graph (backlinks index).
 Used for contextual messages during review.
 
 Usage:
@@ -15,6 +15,9 @@ import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from get_linked_rems import get_linked_rems
+
 def load_schedule():
     """Load review schedule for title lookup"""
     schedule_path = Path('.review/schedule.json')
@@ -35,10 +38,7 @@ def get_prerequisite_titles(rem_id):
     Returns:
         Comma-separated string of prerequisite titles
     """
-    # Load linked rems
-    sys.path.append('scripts/review')
-    from get_linked_rems import get_linked_rems
-
+    # Linked rems from the indexed knowledge graph
     linked_data = get_linked_rems(rem_id, priority_filter='prerequisites')
     linked_rems = linked_data.get('linked_rems', [])
 
@@ -14,11 +14,16 @@ Design Philosophy:
 
 import json
 import random
+import sqlite3
 import sys
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+from due_index import DueIndex, load_due_index
+from schedule_store import SQLiteScheduleStore, open_store
+
 
 def load_schedule(schedule_path: Path) -> Dict[str, Any]:
     """Load review schedule from JSON file."""
@@ -32,16 +37,51 @@ def load_schedule(schedule_path: Path) -> Dict[str, Any]:
         return {"concepts": {}}
 
 
-def get_due_rems(schedule: Dict[str, Any]) -> list[Dict[str, Any]]:
+def load_store(schedule_path: Path) -> Optional[SQLiteScheduleStore]:
+    """Read-only SQLite store for the schedule, or None if not enabled or unreadable."""
+    try:
+        return open_store(schedule_path)
+    except sqlite3.Error:
+        return None
+
+
+def load_index(schedule_path: Path) -> Optional[DueIndex]:
+    """Due index for the schedule, or None if the schedule is missing or unreadable."""
+    try:
+        return load_due_index(schedule_path)
+    except (ValueError, OSError):
+        return None
+
+
+def get_due_rems(schedule: Dict[str, Any], index: Optional[DueIndex] = None) -> list[Dict[str, Any]]:
     """
     Get all rems that are due or overdue for review.
 
+    Args:
+        schedule: Loaded schedule.json
+        index: Due index of the same schedule (skips the scan over all concepts)
+
     Returns:
         List of concept dicts with metadata
     """
     today = date.today()
     concepts = schedule.get('concepts', {})
 
+    if index is not None and isinstance(concepts, dict):
+        due_rems = []
+        for rem_id in index.due(today.strftime('%Y-%m-%d')):
+            concept = concepts.get(rem_id)
+            if concept is None:
+                continue
+            next_review = concept.get('fsrs_state', {}).get('next_review')
+            try:
+                review_date = datetime.strptime(next_review[:10], '%Y-%m-%d').date()
+            except (ValueError, TypeError):
+                continue
+            concept['_days_overdue'] = (today - review_date).days
+            due_rems.append(concept)
+        return due_rems
+
     if isinstance(concepts, dict):
         concepts = concepts.values()
 
@@ -81,8 +121,21 @@ def select_random_due_rem(
     Returns:
         Rem metadata dict or None if no rems due
     """
-    schedule = load_schedule(schedule_path)
-    due_rems = get_due_rems(schedule)
+    today = date.today().strftime('%Y-%m-%d')
+    store = load_store(schedule_path)
+    if store is not None:
+        # The store holds every rating; schedule.json and the due index may lag it
+        due_rems = []
+        for rem_id, concept in store.due_concepts(today):
+            review_date = datetime.strptime(concept['fsrs_state']['next_review'][:10], '%Y-%m-%d').date()
+            due_rems.append({"id": rem_id, **concept, "_days_overdue": (date.today() - review_date).days})
+    else:
+        index = load_index(schedule_path)
+        if index is not None and not index.count_due(today):
+            return None
+
+        schedule = load_schedule(schedule_path)
+        due_rems = get_due_rems(schedule, index)
 
     if not due_rems:
         return None
@@ -126,8 +179,20 @@ def get_due_count(schedule_path: Path) -> Dict[str, int]:
     Returns:
         {"overdue": N, "due_today": M, "total": N+M}
     """
-    schedule = load_schedule(schedule_path)
     today = date.today()
+    index = load_store(schedule_path)
+    if index is None:
+        index = load_index(schedule_path)
+    if index is not None:
+        total = index.count_due(today.strftime('%Y-%m-%d'))
+        overdue = index.count_due((today - timedelta(days=1)).strftime('%Y-%m-%d'))
+        return {
+            "overdue": overdue,
+            "due_today": total - overdue,
+            "total": total
+        }
+
+    schedule = load_schedule(schedule_path)
     concepts = schedule.get('concepts', {})
 
     if isinstance(concepts, dict):
@@ -14,6 +14,16 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "knowledge-graph"))
+from knowledge_graph import load_graph
+from communities import load_communities
+from reachability import load_reachability
+
+sys.path.insert(0, str(Path(__file__).parent))
+from due_index import load_due_index
+from review_scheduler import ReviewScheduler
+from schedule_store import open_store
+
 
 class ReviewLoader:
     """Handle review workflow operations."""
@@ -65,7 +75,8 @@ class ReviewLoader:
 
     def load_schedule(self) -> Dict:
         """
-        Load schedule.json.
+        Load schedule.json, materializing pending review-log events first
+        (or the SQLite store's concepts, if that backend is enabled).
 
         Returns:
             Schedule dictionary with Rem entries (from "concepts" key)
@@ -79,6 +90,12 @@ class ReviewLoader:
                 f"Run `source venv/bin/activate && python3 scripts/scan-and-populate-rems.py` first."
             )
 
+        store = open_store(self.schedule_path)
+        if store is not None:
+            return store.concepts()
+
+        ReviewScheduler().materialize(self.schedule_path)
+
         with open(self.schedule_path, "r", encoding="utf-8") as f:
             data = json.load(f)
             # Extract concepts dictionary (v2.0.0 format)
@@ -117,19 +134,18 @@ class ReviewLoader:
         if today is None:
             today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-        schedule = self.load_schedule()
         mode = criteria.get("mode", "automatic")
+        if mode == "automatic" and self.schedule_path.exists():
+            store = open_store(self.schedule_path)
+            if store is not None:
+                return [{"id": rem_id, **rem_data} for rem_id, rem_data in store.due_concepts(today)]
+
+        schedule = self.load_schedule()
 
         if mode == "automatic":
-            # Filter Rems due today or earlier
-            filtered = []
-            for rem_id, rem_data in schedule.items():
-                # Get next_review from fsrs_state (v2.0.0 format)
-                fsrs_state = rem_data.get("fsrs_state", {})
-                next_review = fsrs_state.get("next_review", "")
-                if next_review and next_review <= today:
-                    filtered.append({"id": rem_id, **rem_data})
-            return filtered
+            # Filter Rems due today or earlier (due index, most overdue first)
+            due_ids = load_due_index(self.schedule_path).due(today)
+            return [{"id": rem_id, **schedule[rem_id]} for rem_id in due_ids if rem_id in schedule]
 
         elif mode == "domain":
             # Filter Rems by domain (supports partial/hierarchical matching)
@@ -250,10 +266,11 @@ class ReviewLoader:
         Sort Rems using graph clustering: group related Rems together.
 
         Strategy: Associative learning - review connected concepts together
-        1. Build relation graph (any typed link counts)
-        2. Find connected components (clusters)
-        3. Sort clusters by urgency (earliest due cluster first)
-        4. Within cluster: sort by urgency
+        1. Group session Rems by their cached knowledge-graph community
+           (Louvain over the whole KB, see communities.py); falls back to
+           connected components of the session's typed links without networkx
+        2. Sort clusters by urgency (earliest due cluster first)
+        3. Within cluster: sort by urgency
 
         Result: Related Rems review consecutively (associative learning)
 
@@ -266,66 +283,23 @@ class ReviewLoader:
 
         Example:
             Session: [remA, remB, remC, remD]
-            Relations: remA↔remB (any type), remC↔remD
-            Clusters: {remA, remB}, {remC, remD}
+            Communities: {remA, remB}, {remC, remD}
             Result: [remA, remB, remC, remD] or [remC, remD, remA, remB]
                     (clusters stay together, order by cluster urgency)
         """
         if len(rems) <= 1:
             return rems
 
-        # Build set of session Rem IDs
-        session_ids = {rem.get("id") for rem in rems}
         id_to_rem = {rem.get("id"): rem for rem in rems}
 
-        # Load backlinks to build relation graph
         backlinks_path = Path("knowledge-base/_index/backlinks.json")
         if not backlinks_path.exists():
             return self.sort_by_urgency(rems, scheduler)
 
-        with open(backlinks_path, "r", encoding="utf-8") as f:
-            backlinks_data = json.load(f)
-        backlinks = backlinks_data.get("links", {})
-
-        # Build adjacency list (undirected graph)
-        # Any typed relation counts - no priority discrimination
-        graph = {rem_id: set() for rem_id in session_ids}
-
-        for rem_id in session_ids:
-            if rem_id not in backlinks:
-                continue
-            rem_links = backlinks[rem_id]
-
-            # Add outgoing links
-            for link in rem_links.get("typed_links_to", []):
-                target_id = link["to"]
-                if target_id in session_ids:
-                    graph[rem_id].add(target_id)
-                    graph[target_id].add(rem_id)  # Undirected
-
-            # Add incoming links
-            for link in rem_links.get("typed_linked_from", []):
-                source_id = link["from"]
-                if source_id in session_ids:
-                    graph[rem_id].add(source_id)
-                    graph[source_id].add(rem_id)  # Undirected
-
-        # Find connected components using DFS
-        visited = set()
-        clusters = []
-
-        def dfs(node, cluster):
-            visited.add(node)
-            cluster.append(node)
-            for neighbor in graph[node]:
-                if neighbor not in visited:
-                    dfs(neighbor, cluster)
-
-        for rem_id in session_ids:
-            if rem_id not in visited:
-                cluster = []
-                dfs(rem_id, cluster)
-                clusters.append(cluster)
+        try:
+            clusters = load_communities(backlinks_path).group(id_to_rem)
+        except ImportError:
+            clusters = self._connected_components(list(id_to_rem), backlinks_path)
 
         # Sort clusters by minimum urgency date in cluster
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -360,6 +334,76 @@ class ReviewLoader:
 
         return result
 
+    def sort_by_prerequisites(
+        self, rems: List[Dict], scheduler
+    ) -> List[Dict]:
+        """
+        Sort Rems so prerequisites are reviewed before their dependants.
+
+        Uses the cached DAG depth levels of the prerequisite hierarchy
+        (prerequisite_of / has_prerequisite / depends_on, cycles condensed;
+        see reachability.py), so ordering is one lookup per Rem.
+
+        Order: 1) prerequisite level (0 = no prerequisites), 2) urgency
+        (earliest next_review first), 3) Rem ID. Rems outside the hierarchy
+        are level 0; members of one prerequisite cycle share a level.
+
+        Args:
+            rems: List of Rem entries
+            scheduler: ReviewScheduler instance
+
+        Returns:
+            Sorted list (prerequisites first)
+
+        Example:
+            Session: [derivatives, limits, sets]
+            Relations: sets prerequisite_of limits, limits prerequisite_of derivatives
+            Result: [sets, limits, derivatives]
+        """
+        if len(rems) <= 1:
+            return rems
+
+        backlinks_path = Path("knowledge-base/_index/backlinks.json")
+        if not backlinks_path.exists():
+            return self.sort_by_urgency(rems, scheduler)
+
+        hierarchy = load_reachability(backlinks_path).families["prerequisite"]
+
+        def prereq_key(rem: Dict) -> tuple:
+            fsrs_state = rem.get("fsrs_state", {})
+            next_review = fsrs_state.get("next_review", rem.get("next_review_date", ""))
+            return (hierarchy.level(rem.get("id")), next_review or "1900-01-01", rem.get("id", ""))
+
+        return sorted(rems, key=prereq_key)
+
+    def _connected_components(self, session_ids: List[str], backlinks_path: Path) -> List[List[str]]:
+        """Connected components of the typed links among session Rems."""
+        kg = load_graph(backlinks_path)
+        session = set(session_ids)
+        graph = {rem_id: set() for rem_id in session_ids}
+        for rem_id in session_ids:
+            for other_id, _ in kg.typed_links_to(rem_id) + kg.typed_linked_from(rem_id):
+                if other_id in session and other_id != rem_id:
+                    graph[rem_id].add(other_id)
+                    graph[other_id].add(rem_id)
+
+        visited = set()
+        clusters = []
+        for rem_id in session_ids:
+            if rem_id in visited:
+                continue
+            visited.add(rem_id)
+            cluster, stack = [], [rem_id]
+            while stack:
+                node = stack.pop()
+                cluster.append(node)
+                for neighbor in graph[node]:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        stack.append(neighbor)
+            clusters.append(cluster)
+        return clusters
+
 
 # Self-test
 if __name__ == "__main__":
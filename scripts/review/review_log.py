@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Append-Only Review Log
+
+Every rating is appended to review-log.jsonl (next to schedule.json) as one
+JSON line and fsynced, instead of rewriting the whole schedule. Each event
+carries the concept's resulting fsrs_state, so applying an event is
+idempotent and the log can be replayed onto any older schedule.json.
+
+schedule.json is materialized lazily (ReviewScheduler.materialize): pending
+events after the checkpoint offset are applied in one atomic rewrite, then
+the checkpoint (review-log.checkpoint.json) moves to the end of the applied
+events. A crash between the two just replays the same events again. A torn
+final line (crash mid-append) is never applied and is terminated by the
+next append.
+
+The log itself is never truncated: it is the complete per-rating history
+used by fsrs_optimizer.py.
+
+Event format:
+    {"concept": "rem-id", "rating": 3, "reviewed_at": "2025-11-02T10:15:00",
+     "elapsed_days": 4, "difficulty": 5.1, "stability": 8.2,
+     "fsrs_state": {...}}
+difficulty / stability / elapsed_days describe the state before the rating
+and are omitted for a concept's first review.
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+LOG_NAME = "review-log.jsonl"
+CHECKPOINT_NAME = "review-log.checkpoint.json"
+
+
+class ReviewLog:
+    """review-log.jsonl and its checkpoint for one schedule.json."""
+
+    def __init__(self, schedule_path):
+        self.schedule_path = Path(schedule_path)
+        self.path = self.schedule_path.with_name(LOG_NAME)
+        self.checkpoint_path = self.schedule_path.with_name(CHECKPOINT_NAME)
+
+    def size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def locked(self):
+        """Exclusive lock on the log (blocking) for appends and materialization."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def append(self, event: Dict) -> Tuple[int, int]:
+        """
+        Append one event and fsync it before returning.
+
+        Returns:
+            (log size before, log size after) the append
+        """
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self.locked() as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                with open(self.path, 'rb') as r:
+                    r.seek(end - 1)
+                    if r.read(1) != b'\n':
+                        line = b'\n' + line  # terminate a torn line from a crashed append
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return end, end + len(line)
+
+    def checkpoint(self) -> int:
+        """Byte offset up to which events are already in schedule.json."""
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                offset = int(json.load(f)["offset"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+        return offset if 0 <= offset <= self.size() else 0
+
+    def set_checkpoint(self, offset: int) -> None:
+        temp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"offset": offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+
+    def read(self, offset: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Complete events from offset onwards.
+
+        Returns:
+            (events, end offset after the last complete line); unparseable
+            lines are skipped
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        end = data.rfind(b'\n') + 1
+        events = []
+        for line in data[:end].splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict) and event.get('concept') and isinstance(event.get('fsrs_state'), dict):
+                events.append(event)
+        return events, offset + end
+
+    def pending(self) -> Tuple[List[Dict], int]:
+        """Events not yet materialized into schedule.json."""
+        return self.read(self.checkpoint())
+
+
+def apply_events(concepts: Dict[str, Dict], events: List[Dict]) -> List[str]:
+    """Apply events to schedule["concepts"] in place; returns the changed IDs."""
+    changed = []
+    for event in events:
+        concept = concepts.get(event['concept'])
+        if concept is None:
+            continue  # removed from the schedule since the rating
+        concept['fsrs_state'] = dict(event['fsrs_state'])
+        concept['active_algorithm'] = 'fsrs'
+        changed.append(event['concept'])
+    return changed
@@ -16,13 +16,46 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(__file__))
 
 from fsrs_algorithm import FSRSAlgorithm
+from due_index import concept_state, refresh_due_index
+from review_log import ReviewLog, apply_events
+from schedule_store import SQLiteScheduleStore, open_store
+
+# Written by fsrs_optimizer.py; default parameters are used when absent
+PARAMETERS_PATH = Path('.review/fsrs-parameters.json')
+
+# Pending review-log events that trigger materializing schedule.json
+COMPACT_EVERY = 50
+
+
+def _signature(path) -> list:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_parameters(parameters_path: Path = PARAMETERS_PATH) -> Optional[Dict]:
+    """Fitted FSRS parameters, or None if missing or not 18 weights."""
+    try:
+        with open(parameters_path, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(params, dict):
+        return None
+    w = params.get('w')
+    if not isinstance(w, list) or len(w) != 18:
+        return None
+    return params
 
 
 class ReviewScheduler:
     """FSRS-based review scheduler."""
 
-    def __init__(self):
-        self.fsrs = FSRSAlgorithm()
+    def __init__(self, parameters_path: Path = PARAMETERS_PATH, compact_every: int = COMPACT_EVERY):
+        self.fsrs = FSRSAlgorithm(load_parameters(parameters_path))
+        self.compact_every = compact_every
+        # schedule path -> (schedule signature, log size, pending events, schedule)
+        self._schedules: Dict[str, tuple] = {}
+        self._stores: Dict[str, SQLiteScheduleStore] = {}
 
     def schedule_review(
         self,
@@ -176,6 +209,138 @@ class ReviewScheduler:
                 except Exception as e:
                     import logging; logging.warning(f"Failed to remove lock file: {e}")
 
+    def _store(self, schedule_path: str) -> Optional[SQLiteScheduleStore]:
+        """SQLite backend for this schedule, if enabled (schedule.db exists)."""
+        key = str(schedule_path)
+        store = self._stores.get(key)
+        if store is None:
+            store = open_store(schedule_path, write=True)
+            if store is not None:
+                self._stores[key] = store
+        else:
+            store.sync(schedule_path)
+        return store
+
+    def load_schedule(self, schedule_path: str) -> Dict:
+        """
+        Load schedule.json with pending review-log events applied (read-only).
+
+        The result is kept in memory until schedule.json or the log changes
+        behind this scheduler, so a review loop parses the schedule once.
+        With the SQLite backend enabled, the schedule is read from the store.
+
+        Args:
+            schedule_path: Path to schedule.json
+
+        Returns:
+            Schedule dict (v2.0.0) reflecting every logged rating
+        """
+        store = self._store(schedule_path)
+        if store is not None:
+            return store.to_schedule()
+
+        cached = self._cached(schedule_path)
+        if cached:
+            return cached[3]
+
+        log = ReviewLog(schedule_path)
+        signature = _signature(schedule_path)
+        log_size = log.size()
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            schedule = json.load(f)
+        events, _ = log.pending()
+        apply_events(schedule.get('concepts', {}), events)
+        self._schedules[str(schedule_path)] = (signature, log_size, len(events), schedule)
+        return schedule
+
+    def _cached(self, schedule_path: str) -> Optional[tuple]:
+        """The in-memory schedule entry, if schedule.json and the log are unchanged."""
+        cached = self._schedules.get(str(schedule_path))
+        if cached and cached[0] == _signature(schedule_path) and cached[1] == ReviewLog(schedule_path).size():
+            return cached
+        return None
+
+    def get_concept(self, schedule_path: str, concept_id: str) -> Optional[Dict]:
+        """
+        Current schedule entry for one concept, without parsing schedule.json.
+
+        Comes from the SQLite store or the in-memory schedule when available;
+        otherwise from the due index's concept states plus the review log, in
+        which case only "domain" and "fsrs_state" are returned.
+
+        Returns:
+            None if the concept is not in the schedule
+        """
+        store = self._store(schedule_path)
+        if store is not None:
+            return store.concept(concept_id)
+        cached = self._cached(schedule_path)
+        if cached:
+            return cached[3]['concepts'].get(concept_id)
+        return concept_state(schedule_path, concept_id)
+
+    def materialize(self, schedule_path: str) -> int:
+        """
+        Apply pending review-log events to schedule.json in one atomic save.
+
+        Runs every `compact_every` ratings, at session end and before
+        readers that need the full schedule. After a crash it replays the
+        log tail; events hold absolute states, so replays are harmless.
+        With the SQLite backend, schedule.json is regenerated from the store.
+
+        Args:
+            schedule_path: Path to schedule.json
+
+        Returns:
+            Number of events applied
+        """
+        store = self._store(schedule_path)
+        if store is not None:
+            exported = store.unexported()
+            if exported:
+                self.save_schedule_atomic(schedule_path, store.to_schedule())
+                store.mark_exported(schedule_path)
+            return exported
+
+        log = ReviewLog(schedule_path)
+        if log.size() == log.checkpoint():
+            return 0
+
+        with log.locked():
+            events, end = log.pending()
+            if events:
+                previous_signature = _signature(schedule_path)
+                with open(schedule_path, 'r', encoding='utf-8') as f:
+                    schedule = json.load(f)
+                changed = apply_events(schedule['concepts'], events)
+                self.save_schedule_atomic(schedule_path, schedule)
+                refresh_due_index(schedule_path, schedule['concepts'], changed, previous_signature, end)
+            if end != log.checkpoint():
+                log.set_checkpoint(end)
+
+        self._schedules.pop(str(schedule_path), None)
+        return len(events)
+
+    @staticmethod
+    def _review_event(concept_id: str, rating: int, before: Dict, after: Dict) -> Dict:
+        """Review-log event; pre-review state is kept for the FSRS optimizer."""
+        reviewed_at = datetime.now()
+        event = {
+            "concept": concept_id,
+            "rating": rating,
+            "reviewed_at": reviewed_at.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        if (before.get("review_count") or 0) > 0 and before.get("stability") is not None:
+            try:
+                last = datetime.fromisoformat(str(before["last_review"]).replace('Z', '+00:00'))
+                event["elapsed_days"] = max(0, (reviewed_at - last.replace(tzinfo=None)).days)
+            except (KeyError, TypeError, ValueError):
+                pass
+            event["difficulty"] = before.get("difficulty")
+            event["stability"] = before["stability"]
+        event["fsrs_state"] = after
+        return event
+
     def update_and_save(
         self,
         schedule_path: str,
@@ -183,9 +348,15 @@ class ReviewScheduler:
         rating: int
     ) -> Dict:
         """
-        Update concept and save schedule atomically.
+        Update concept and record the rating durably.
 
-        Convenience method for review sessions - handles all the boilerplate safely.
+        The rating is appended (fsynced) to the review log next to
+        schedule.json, or committed to the SQLite store if enabled. The
+        concept is looked up without parsing schedule.json (see
+        get_concept) and neither schedule.json nor the due index is
+        rewritten; both catch up every `compact_every` ratings (see
+        materialize), so the cost per rating does not grow with the
+        schedule.
 
         Args:
             schedule_path: Path to schedule.json
@@ -193,7 +364,8 @@ class ReviewScheduler:
             rating: User rating (1-4: Again, Hard, Good, Easy)
 
         Returns:
-            Updated concept with new FSRS state (JSON-safe string dates)
+            Updated concept with new FSRS state (JSON-safe string dates);
+            may hold only "domain" and "fsrs_state" (see get_concept)
 
         Example:
             >>> scheduler = ReviewScheduler()
@@ -205,20 +377,47 @@ class ReviewScheduler:
             >>> print(updated['fsrs_state']['next_review'])
             '2025-11-15'
         """
-        # Load current schedule
-        with open(schedule_path, 'r') as f:
-            schedule = json.load(f)
-
-        # Update concept
-        if concept_id not in schedule['concepts']:
+        store = self._store(schedule_path)
+        if store is not None:
+            concept = store.concept(concept_id)
+            if concept is None:
+                raise ValueError(f"Concept '{concept_id}' not found in schedule")
+            before = dict(concept.get('fsrs_state') or {})
+            updated_concept = self.schedule_review(concept, rating)
+            store.record_review(concept_id, updated_concept, self._review_event(
+                concept_id, rating, before, updated_concept['fsrs_state']))
+            if store.unexported() >= self.compact_every:
+                self.materialize(schedule_path)
+            return updated_concept
+
+        # Look up one concept: in memory if this scheduler holds the schedule,
+        # else a binary search in the due index's concept states
+        key = str(schedule_path)
+        log = ReviewLog(schedule_path)
+        cached = self._cached(schedule_path)
+        if cached:
+            concept = cached[3]['concepts'].get(concept_id)
+            pending = cached[2]
+        else:
+            events, _ = log.pending()
+            concept = concept_state(schedule_path, concept_id, events)
+            pending = len(events)
+        if concept is None:
             raise ValueError(f"Concept '{concept_id}' not found in schedule")
 
-        concept = schedule['concepts'][concept_id]
-        # Returns JSON-safe strings for dates
+        before = dict(concept.get('fsrs_state') or {})
+        # Returns JSON-safe strings for dates (updates the in-memory schedule in place)
         updated_concept = self.schedule_review(concept, rating)
-        schedule['concepts'][concept_id] = updated_concept
 
-        # Save atomically with backup
-        self.save_schedule_atomic(schedule_path, schedule)
+        # Durable append; keep the in-memory schedule if nobody else wrote meanwhile
+        start, end = log.append(
+            self._review_event(concept_id, rating, before, updated_concept['fsrs_state']))
+        if cached and start == cached[1]:
+            self._schedules[key] = (cached[0], end, pending + 1, cached[3])
+        else:
+            self._schedules.pop(key, None)
+
+        if pending + 1 >= self.compact_every:
+            self.materialize(schedule_path)
 
         return updated_concept
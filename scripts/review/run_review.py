@@ -11,12 +11,14 @@ Usage:
     source venv/bin/activate && python scripts/review/run_review.py --lang zh    # Force Chinese dialogue
     source venv/bin/activate && python scripts/review/run_review.py --easy       # Easy mode (rapid-fire fact recall)
     source venv/bin/activate && python scripts/review/run_review.py --hard       # Hard mode (analysis/application)
+    source venv/bin/activate && python scripts/review/run_review.py --order prereq  # Prerequisites before dependants
     source venv/bin/activate && python scripts/review/run_review.py finance      # Domain-specific review
     source venv/bin/activate && python scripts/review/run_review.py [[rem-id]]   # Specific Rem review
 
 Format codes: m=multiple-choice, c=cloze, s=short-answer, p=problem-solving
 Language codes: zh=Chinese, en=English, fr=French
 Difficulty modes: easy, normal (default), hard
+Order modes: relation (default; related Rems together), prereq (prerequisite DAG levels), urgency
 
 Blind mode: Outputs only Rem ID and path (no title/domain/fsrs_state). Used by main agent to prevent
 bypassing review-master subagent consultation. Only review-master should see full Rem data.
@@ -24,9 +26,12 @@ bypassing review-master subagent consultation. Only review-master should see ful
 import sys
 sys.path.append('scripts/review')
 sys.path.append('scripts/utilities')
+sys.path.append('scripts/knowledge-graph')
 from review_loader import ReviewLoader
 from review_scheduler import ReviewScheduler
 from review_stats_lib import ReviewStats
+from due_index import load_due_index
+from rem_resolver import get_resolver
 from datetime import datetime
 import subprocess
 import json
@@ -100,7 +105,7 @@ def extract_frontmatter_field(filepath: str, field: str) -> str:
 
 def resolve_content_path(domain: str, rem_id: str) -> str:
     """
-    Resolve the actual path to a Rem file by searching recursively.
+    Resolve the actual path to a Rem file via the persistent Rem resolver index.
     Handles files with numeric prefixes and subdomain insertion.
     Examples:
       rem_id: fx-pricing-shift-types
@@ -109,56 +114,12 @@ def resolve_content_path(domain: str, rem_id: str) -> str:
     """
     kb_root = Path("knowledge-base")
 
-    # Extract potential parts for flexible matching
-    # rem_id may be missing subdomain that appears in filename
-    # Strategy: Search by substring after removing common delimiters
-    rem_id_parts = rem_id.replace('-', ' ').split()
-
-    # Pattern priority:
-    # 1. Exact match with optional numeric prefix: NNN-{rem_id}.md
-    # 2. Exact match without prefix: {rem_id}.md
-    # 3. Filename contains all words from rem_id (handles subdomain insertion)
-    patterns = [
-        f"**/*-{rem_id}.md",     # Match: 041-fx-pricing-shift-types.md
-        f"**/{rem_id}.md",        # Match: fx-pricing-shift-types.md
-        f"**/*{rem_id}*.md",      # Match: any file containing rem_id
-    ]
-
-    for pattern in patterns:
-        matches = list(kb_root.glob(pattern))
-        if matches:
-            # Prefer domain match, then shortest path
-            domain_matches = [m for m in matches if domain in str(m)]
-            if domain_matches:
-                return str(sorted(domain_matches, key=lambda x: len(str(x)))[0])
-            # Fall back to first match
-            return str(matches[0])
-
-    # Fallback: Fuzzy match by checking if filename contains most rem_id parts
-    # Example: rem_id "fx-greeks-delta-vs-fxdelta" matches "040-fx-derivatives-delta-vs-fxdelta.md"
-    # (greeks→derivatives substitution)
-    # Require at least 70% of parts to match (handles subdomain/category swaps)
-    domain_pattern = f"{domain}/*.md" if domain and '/' not in domain else "**/*.md"
-    all_md_files = list(kb_root.glob(domain_pattern))
-    # Filter by domain if pattern was too broad
-    if '/' in domain:
-        all_md_files = [f for f in all_md_files if domain in str(f)]
-    for md_file in all_md_files:
-        filename_lower = md_file.stem.lower()
-        matching_parts = sum(1 for part in rem_id_parts if part in filename_lower)
-        match_ratio = matching_parts / len(rem_id_parts) if rem_id_parts else 0
-        # Require 70% match + domain match
-        if match_ratio >= 0.7:
-            return str(md_file)
-
-    # Legacy .rem.md extension (same logic)
-    for pattern in [f"**/*-{rem_id}.rem.md", f"**/{rem_id}.rem.md", f"**/*{rem_id}*.rem.md"]:
-        matches = list(kb_root.glob(pattern))
-        if matches:
-            domain_matches = [m for m in matches if domain in str(m)]
-            if domain_matches:
-                return str(sorted(domain_matches, key=lambda x: len(str(x)))[0])
-            return str(matches[0])
+    # Index lookups are O(1); only misses fall back to substring/fuzzy matching
+    # Example fuzzy hit: rem_id "fx-greeks-delta-vs-fxdelta" matches
+    # "040-fx-derivatives-delta-vs-fxdelta.md" (greeks→derivatives substitution)
+    resolved = get_resolver(kb_root).resolve(rem_id, domain)
+    if resolved:
+        return str(resolved)
 
     # File not found - return expected path for error reporting
     return str(kb_root / domain / f"{rem_id}.md")
@@ -265,6 +226,7 @@ future_days = 7  # Default lookahead
 format_preference = None
 lang_preference = None
 difficulty_mode = 'normal'  # Default: current behavior unchanged
+order_mode = 'relation'  # Default: cluster related Rems
 
 # Extract --days parameter if present
 if '--days' in args:
@@ -316,6 +278,22 @@ if '--lang' in args:
         print("Error: --lang must be followed by a language code (zh, en, fr)")
         sys.exit(1)
 
+# Extract --order parameter if present
+if '--order' in args:
+    order_index = args.index('--order')
+    if order_index + 1 < len(args):
+        order_code = args[order_index + 1]
+        valid_orders = ['relation', 'prereq', 'urgency']
+        if order_code in valid_orders:
+            order_mode = order_code
+            args = [a for a in args if a not in ['--order', order_code]]
+        else:
+            print(f"Error: Invalid order '{order_code}'. Valid orders: relation, prereq, urgency")
+            sys.exit(1)
+    else:
+        print("Error: --order must be followed by an order (relation, prereq, urgency)")
+        sys.exit(1)
+
 # Extract difficulty mode if present (--easy, --normal, --hard)
 valid_modes = {'--easy': 'easy', '--normal': 'normal', '--hard': 'hard'}
 for flag, mode in valid_modes.items():
@@ -329,14 +307,26 @@ args = [a for a in args if a not in ['--timeline', '--blind']]
 
 criteria = loader.parse_arguments(args)
 
+# Apply ratings still in the review log (previous session end / crash recovery)
+scheduler.materialize('.review/schedule.json')
+
 # Load schedule - it returns the full schedule dict
 with open('.review/schedule.json', 'r', encoding='utf-8') as f:
     schedule_data = json.load(f)
 
+today = datetime.now().strftime('%Y-%m-%d')
+concepts = schedule_data.get('concepts', {})
+if criteria['mode'] in ('domain', 'specific'):
+    candidate_ids = list(concepts)
+else:
+    # Due index: only due Rems need their files resolved and frontmatter read
+    candidate_ids = [cid for cid in load_due_index(Path('.review/schedule.json')).due(today) if cid in concepts]
+
 # Convert to list format for filtering
 schedule = []
 missing_files = []
-for rem_id, rem_data in schedule_data.get('concepts', {}).items():
+for rem_id in candidate_ids:
+    rem_data = concepts[rem_id]
     path = resolve_content_path(rem_data.get('domain', ''), rem_id)
 
     # Validate file exists before adding to schedule
@@ -370,7 +360,6 @@ if missing_files:
     print(f"\nThese Rems will be skipped. Run /maintain to clean up schedule.\n")
 
 # Filter based on mode
-today = datetime.now().strftime('%Y-%m-%d')
 if criteria['mode'] == 'automatic':
     # Filter for rems due today OR overdue (next_review <= today)
     # Fixed: Changed == to <= to include accumulated overdue Rems
@@ -408,7 +397,12 @@ print()
 
 # Display filtered overview
 by_domain = loader.group_by_domain(rems)
-sorted_rems = loader.sort_by_relation_and_urgency(rems, scheduler)
+if order_mode == 'prereq':
+    sorted_rems = loader.sort_by_prerequisites(rems, scheduler)
+elif order_mode == 'urgency':
+    sorted_rems = loader.sort_by_urgency(rems, scheduler)
+else:
+    sorted_rems = loader.sort_by_relation_and_urgency(rems, scheduler)
 
 # Apply batch limit to prevent token overflow
 # Easy mode allows higher throughput (rapid-fire); normal/hard use standard limit
@@ -466,6 +460,7 @@ if blind_mode:
         'format_preference': format_preference,
         'lang_preference': lang_preference,
         'difficulty_mode': difficulty_mode,
+        'order': order_mode,
         'blind': True  # Flag indicating blind mode active
     }
 else:
@@ -481,6 +476,7 @@ else:
         'format_preference': format_preference,
         'lang_preference': lang_preference,
         'difficulty_mode': difficulty_mode,
+        'order': order_mode,
         'blind': False
     }
 
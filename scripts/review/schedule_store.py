@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+SQLite Schedule Store
+
+Optional backend for the review schedule: schedule.db next to schedule.json,
+in WAL mode so hooks and analytics read while a review session writes,
+without taking the schedule's flock.
+
+Tables:
+    concepts  rem_id (primary key), domain, next_review, data (concept JSON)
+              indexed on (next_review, rem_id) and (domain, next_review)
+    reviews   one row per rating (same fields as review-log events)
+    meta      schedule.json header fields and export bookkeeping
+
+The store is opt-in: ReviewScheduler and ReviewLoader use it whenever
+schedule.db exists (`schedule_store.py import` creates it). schedule.json
+stays the exchange format: ReviewScheduler.materialize regenerates it (v2.0.0)
+from the store, and edits other tools make to schedule.json are merged back
+by the next writer (ReviewScheduler, or `schedule_store.py sync`); a concept
+keeps the store's fsrs_state if the store has seen more reviews of it.
+Readers open schedule.db read-only and never merge.
+
+Usage:
+    from schedule_store import open_store
+
+    store = open_store('.review/schedule.json')  # None if not enabled
+    store.due('2025-11-02')
+
+CLI:
+    python3 scripts/review/schedule_store.py import [--schedule PATH]
+    python3 scripts/review/schedule_store.py export [--schedule PATH]
+    python3 scripts/review/schedule_store.py sync [--schedule PATH]
+    python3 scripts/review/schedule_store.py status [--schedule PATH] [--date YYYY-MM-DD]
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from review_log import ReviewLog
+
+STORE_NAME = "schedule.db"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS concepts (
+    rem_id TEXT PRIMARY KEY,
+    domain TEXT NOT NULL DEFAULT '',
+    next_review TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_concepts_next_review ON concepts(next_review, rem_id);
+CREATE INDEX IF NOT EXISTS idx_concepts_domain ON concepts(domain, next_review);
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rem_id TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    reviewed_at TEXT,
+    elapsed_days INTEGER,
+    difficulty REAL,
+    stability REAL,
+    fsrs_state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_rem_id ON reviews(rem_id, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def store_path_for(schedule_path: Path) -> Path:
+    """Return the SQLite store location for a schedule file."""
+    return Path(schedule_path).with_name(STORE_NAME)
+
+
+def _signature(path: Path) -> Optional[List[int]]:
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _next_review(concept: Dict) -> Optional[str]:
+    next_review = (concept.get("fsrs_state") or {}).get("next_review")
+    return str(next_review)[:10] if next_review else None
+
+
+def _review_count(concept: Dict) -> int:
+    return (concept.get("fsrs_state") or {}).get("review_count") or 0
+
+
+class SQLiteScheduleStore:
+    """schedule.db: concepts, reviews and schedule header."""
+
+    def __init__(self, db_path: Path, readonly: bool = False):
+        self.db_path = Path(db_path)
+        self.readonly = readonly
+        if readonly:
+            # mode=ro: readers never take the write lock or create the schema
+            self.conn = sqlite3.connect(self.db_path.resolve().as_uri() + "?mode=ro", uri=True,
+                                        timeout=30, isolation_level=None)
+            return
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self.conn.execute("PRAGMA journal_mode=WAL")  # persistent: set once at creation
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ---------- meta ----------
+
+    def _meta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+    # ---------- reads ----------
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM concepts").fetchone()[0]
+
+    def concept(self, rem_id: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM concepts WHERE rem_id = ?", (rem_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def concepts(self) -> Dict[str, Dict]:
+        """schedule["concepts"] in insertion order."""
+        rows = self.conn.execute("SELECT rem_id, data FROM concepts ORDER BY rowid")
+        return {rem_id: json.loads(data) for rem_id, data in rows}
+
+    def due_concepts(self, on: str, domain: Optional[str] = None) -> List[Tuple[str, Dict]]:
+        """(rem_id, concept) due on or before `on`, most overdue first."""
+        if domain is None:
+            rows = self.conn.execute(
+                "SELECT rem_id, data FROM concepts WHERE next_review <= ? ORDER BY next_review, rem_id", (on,))
+        else:
+            rows = self.conn.execute(
+                "SELECT rem_id, data FROM concepts WHERE domain = ? AND next_review <= ? "
+                "ORDER BY next_review, rem_id", (domain, on))
+        return [(rem_id, json.loads(data)) for rem_id, data in rows]
+
+    def due(self, on: str, domain: Optional[str] = None) -> List[str]:
+        """IDs due on or before `on`, most overdue first."""
+        return [rem_id for rem_id, _ in self.due_concepts(on, domain)]
+
+    def count_due(self, on: str, domain: Optional[str] = None) -> int:
+        if domain is None:
+            row = self.conn.execute("SELECT COUNT(*) FROM concepts WHERE next_review <= ?", (on,)).fetchone()
+        else:
+            row = self.conn.execute("SELECT COUNT(*) FROM concepts WHERE domain = ? AND next_review <= ?",
+                                    (domain, on)).fetchone()
+        return row[0]
+
+    def count_due_by_domain(self, on: str) -> Dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT domain, COUNT(*) FROM concepts WHERE next_review <= ? GROUP BY domain", (on,))
+        return dict(rows.fetchall())
+
+    def next_review(self, domain: Optional[str] = None) -> Optional[str]:
+        """Earliest next_review (overdue dates included), as DueIndex.next_review."""
+        if domain is None:
+            row = self.conn.execute("SELECT MIN(next_review) FROM concepts").fetchone()
+        else:
+            row = self.conn.execute("SELECT MIN(next_review) FROM concepts WHERE domain = ?",
+                                    (domain,)).fetchone()
+        return row[0]
+
+    def upcoming(self, after: str, n: int) -> List[Tuple[str, str]]:
+        """The next n (next_review, rem_id) strictly after `after`."""
+        rows = self.conn.execute(
+            "SELECT next_review, rem_id FROM concepts WHERE next_review > ? ORDER BY next_review, rem_id LIMIT ?",
+            (after, n))
+        return [tuple(r) for r in rows]
+
+    def reviews(self) -> List[Dict]:
+        """Every recorded rating as review-log events (oldest first)."""
+        events = []
+        for rem_id, rating, reviewed_at, elapsed, difficulty, stability, state in self.conn.execute(
+                "SELECT rem_id, rating, reviewed_at, elapsed_days, difficulty, stability, fsrs_state "
+                "FROM reviews ORDER BY id"):
+            event = {"concept": rem_id, "rating": rating, "reviewed_at": reviewed_at}
+            if stability is not None:
+                event.update(elapsed_days=elapsed, difficulty=difficulty, stability=stability)
+            event["fsrs_state"] = json.loads(state)
+            events.append(event)
+        return events
+
+    def to_schedule(self) -> Dict:
+        """The schedule as the v2.0.0 schedule.json document."""
+        header = self._meta("header", {"version": "2.0.0", "concepts": None})
+        return {k: (self.concepts() if k == "concepts" else v) for k, v in header.items()}
+
+    # ---------- writes ----------
+
+    def _upsert(self, rem_id: str, concept: Dict) -> None:
+        self.conn.execute(
+            "INSERT INTO concepts (rem_id, domain, next_review, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(rem_id) DO UPDATE SET domain = excluded.domain, "
+            "next_review = excluded.next_review, data = excluded.data",
+            (rem_id, concept.get("domain", "") or "", _next_review(concept),
+             json.dumps(concept, ensure_ascii=False)))
+
+    def _insert_review(self, event: Dict) -> None:
+        self.conn.execute(
+            "INSERT INTO reviews (rem_id, rating, reviewed_at, elapsed_days, difficulty, stability, fsrs_state) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (event["concept"], event["rating"], event.get("reviewed_at"), event.get("elapsed_days"),
+             event.get("difficulty"), event.get("stability"),
+             json.dumps(event["fsrs_state"], ensure_ascii=False)))
+
+    def record_review(self, rem_id: str, concept: Dict, event: Dict) -> None:
+        """Store a concept's new state and its rating in one transaction."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._upsert(rem_id, concept)
+            self._insert_review(event)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def import_events(self, events: List[Dict]) -> None:
+        """Add past ratings (e.g. review-log.jsonl) to the reviews table."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for event in events:
+                self._insert_review(event)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def sync(self, schedule_path: Path) -> bool:
+        """
+        Merge schedule.json into the store if it changed since the last export.
+
+        schedule.json decides which concepts exist and their metadata; the
+        store keeps its fsrs_state where it has seen more reviews.
+
+        Returns:
+            True if schedule.json was merged
+        """
+        signature = _signature(schedule_path)
+        if signature is None or signature == self._meta("json_signature"):
+            return False
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        incoming = data.get("concepts", {})
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = {rem_id: json.loads(d) for rem_id, d in
+                       self.conn.execute("SELECT rem_id, data FROM concepts")}
+            for rem_id, concept in incoming.items():
+                ours = current.get(rem_id)
+                if ours is not None and _review_count(ours) > _review_count(concept):
+                    concept = {**concept, "fsrs_state": ours.get("fsrs_state"),
+                               "active_algorithm": ours.get("active_algorithm", "fsrs")}
+                self._upsert(rem_id, concept)
+            removed = [(rem_id,) for rem_id in current if rem_id not in incoming]
+            self.conn.executemany("DELETE FROM concepts WHERE rem_id = ?", removed)
+            header = {k: (None if k == "concepts" else v) for k, v in data.items()}
+            header.setdefault("concepts", None)
+            self._set_meta("header", header)
+            self._set_meta("json_signature", signature)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def unexported(self) -> int:
+        """Ratings recorded since schedule.json was last regenerated."""
+        row = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM reviews").fetchone()
+        return row[0] - self._meta("exported_review_id", 0)
+
+    def mark_exported(self, schedule_path: Path) -> None:
+        """Record that schedule.json now matches the store."""
+        row = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM reviews").fetchone()
+        self._set_meta("exported_review_id", row[0])
+        self._set_meta("json_signature", _signature(schedule_path))
+
+
+def open_store(schedule_path: Path, write: bool = False) -> Optional[SQLiteScheduleStore]:
+    """
+    Open the store for a schedule.
+
+    Readers (the default) get a read-only connection and see the store as
+    last written. Writers (write=True) first merge outside edits to
+    schedule.json, so the merge happens on the write path only.
+
+    Returns:
+        None if the SQLite backend is not enabled (no schedule.db)
+    """
+    db_path = store_path_for(schedule_path)
+    if not db_path.exists():
+        return None
+    if not write:
+        return SQLiteScheduleStore(db_path, readonly=True)
+    store = SQLiteScheduleStore(db_path)
+    store.sync(schedule_path)
+    return store
+
+
+def create_store(schedule_path: Path) -> SQLiteScheduleStore:
+    """Enable the backend: build schedule.db from schedule.json and the review log."""
+    from review_scheduler import ReviewScheduler
+
+    schedule_path = Path(schedule_path)
+    ReviewScheduler().materialize(schedule_path)
+    db_path = store_path_for(schedule_path)
+    if db_path.exists():
+        raise FileExistsError(f"{db_path} already exists")
+    store = SQLiteScheduleStore(db_path)
+    store.sync(schedule_path)
+    store.import_events(ReviewLog(schedule_path).read()[0])
+    store.mark_exported(schedule_path)
+    return store
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SQLite backend for the review schedule')
+    parser.add_argument('command', choices=['import', 'export', 'sync', 'status'])
+    parser.add_argument('--schedule', default='.review/schedule.json', help='Path to schedule.json')
+    parser.add_argument('--date', default=None, help='As-of date for status (YYYY-MM-DD, default: today)')
+    args = parser.parse_args()
+    schedule_path = Path(args.schedule)
+
+    if args.command == 'import':
+        try:
+            store = create_store(schedule_path)
+        except (FileNotFoundError, FileExistsError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps({"store": str(store.db_path), "concepts": len(store),
+                          "reviews": len(store.reviews())}, indent=2))
+        return 0
+
+    store = open_store(schedule_path, write=args.command == 'sync')
+    if store is None:
+        print(f"Error: {store_path_for(schedule_path)} not found (run import first)", file=sys.stderr)
+        return 1
+
+    if args.command == 'sync':
+        print(json.dumps({"store": str(store.db_path), "concepts": len(store)}, indent=2))
+        return 0
+
+    if args.command == 'export':
+        from review_scheduler import ReviewScheduler
+
+        exported = ReviewScheduler().materialize(schedule_path)
+        print(json.dumps({"schedule": str(schedule_path), "ratings_exported": exported}, indent=2))
+        return 0
+
+    on = args.date or date.today().strftime('%Y-%m-%d')
+    print(json.dumps({
+        "store": str(store.db_path),
+        "concepts": len(store),
+        "due": store.count_due(on),
+        "due_by_domain": store.count_due_by_domain(on),
+        "unexported_ratings": store.unexported(),
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,6 +21,7 @@ from datetime import datetime
 
 # Add review scripts to path
 sys.path.append('scripts/review')
+from due_index import load_due_index
 from review_scheduler import ReviewScheduler
 
 
@@ -40,6 +41,8 @@ def update_session_state(concept_id, rating, session_id=None):
 
     Root cause fix: Session state must be persisted to disk so main agent
     can recover the Rem list after context loss.
+
+    Returns True if no pending Rems remain in the session afterwards.
     """
     import tempfile, os
     if session_id:
@@ -48,12 +51,12 @@ def update_session_state(concept_id, rating, session_id=None):
         # Backward compat: try to find single active session
         session_path = find_single_session_file()
     if not session_path or not session_path.exists():
-        return  # No active session (e.g., non-blind mode review)
+        return False  # No active session (e.g., non-blind mode review)
     try:
         with open(session_path, 'r', encoding='utf-8') as f:
             session = json.load(f)
     except (json.JSONDecodeError, IOError):
-        return  # Corrupted session file, skip update
+        return False  # Corrupted session file, skip update
     rems = session.get('rems', [])
     updated = False
     for i, rem in enumerate(rems):
@@ -67,7 +70,7 @@ def update_session_state(concept_id, rating, session_id=None):
             updated = True
             break
     if not updated:
-        return
+        return False
     # Atomic write
     temp_fd, temp_path = tempfile.mkstemp(dir=str(session_path.parent), suffix='.tmp')
     try:
@@ -77,6 +80,7 @@ def update_session_state(concept_id, rating, session_id=None):
     except Exception:
         if os.path.exists(temp_path):
             os.unlink(temp_path)
+    return not any(rem.get('status') == 'pending' for rem in rems)
 
 
 def main():
@@ -96,10 +100,11 @@ def main():
 
     schedule_path = Path('.review/schedule.json')
 
-    # Load schedule
+    # Look up the Rem (with ratings still pending in the review log)
+    # without parsing the whole schedule
+    scheduler = ReviewScheduler()
     try:
-        with open(schedule_path, 'r', encoding='utf-8') as f:
-            schedule = json.load(f)
+        concept = scheduler.get_concept(schedule_path, concept_id)
     except FileNotFoundError:
         print(f"Error: Schedule file not found at {schedule_path}", file=sys.stderr)
         sys.exit(1)
@@ -108,39 +113,21 @@ def main():
         sys.exit(1)
 
     # Check if concept exists
-    if concept_id not in schedule['concepts']:
+    if concept is None:
         print(f"Error: Concept '{concept_id}' not found in schedule", file=sys.stderr)
-        available = list(schedule['concepts'].keys())[:5]
+        available = [cid for _, cid in load_due_index(schedule_path).entries[:5]]
         print(f"Available concepts (first 5): {available}", file=sys.stderr)
         sys.exit(1)
 
-    # Get concept
-    concept = schedule['concepts'][concept_id]
-
     # Store old state for comparison
     old_fsrs = concept['fsrs_state'].copy()
 
-    # Initialize scheduler and update
-    scheduler = ReviewScheduler()
-    updated_rem = scheduler.schedule_review(concept, rating)
-
-    # Save back to schedule
-    schedule['concepts'][concept_id] = updated_rem
-
-    # Atomic write: write to temp file, then rename
-    temp_path = None
+    # Update and append the rating to the review log (fsynced);
+    # schedule.json is rewritten only periodically and at session end
     try:
-        import tempfile, os
-        temp_fd, temp_path = tempfile.mkstemp(
-            dir=str(schedule_path.parent), suffix='.tmp'
-        )
-        with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-            json.dump(schedule, f, indent=2, ensure_ascii=False)
-        os.rename(temp_path, str(schedule_path))
-    except Exception as e:
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
-        print(f"Error: Failed to save schedule: {e}", file=sys.stderr)
+        updated_rem = scheduler.update_and_save(schedule_path, concept_id, rating)
+    except (OSError, BlockingIOError) as e:
+        print(f"Error: Failed to save review: {e}", file=sys.stderr)
         sys.exit(1)
 
     # Print results for agent to parse and show user
@@ -174,8 +161,12 @@ def main():
         }
     }
 
-    # Update session file to mark Rem as reviewed
-    update_session_state(concept_id, rating, session_id)
+    # Update session file to mark Rem as reviewed; materialize at session end
+    if update_session_state(concept_id, rating, session_id):
+        try:
+            scheduler.materialize(schedule_path)
+        except (OSError, BlockingIOError):
+            pass  # Ratings stay in the review log; applied on next read
 
     print(json.dumps(output, indent=2, ensure_ascii=False))
 
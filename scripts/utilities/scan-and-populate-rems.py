@@ -38,7 +38,6 @@ import sys
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Set, Optional
-import re
 
 # Project root
 ROOT = Path(__file__).parent.parent.parent  # Go up to knowledge-system root
@@ -48,8 +47,10 @@ SCHEDULE_PATH = ROOT / ".review" / "schedule.json"
 # Add scripts to path for imports
 sys.path.append(str(ROOT / "scripts" / "review"))
 sys.path.append(str(ROOT / "scripts"))
+sys.path.append(str(ROOT / "scripts" / "knowledge-graph"))  # For rem_manifest
 
 from fsrs_algorithm import FSRSAlgorithm
+from rem_manifest import load_manifest
 from utils.file_lock import safe_write_json, safe_read_json
 
 # FSRS defaults
@@ -172,80 +173,6 @@ def save_schedule(schedule: Dict, dry_run: bool = False):
         raise
 
 
-def extract_frontmatter(file_path: Path) -> Optional[Dict]:
-    """
-    Extract YAML frontmatter from Rem file.
-
-    Returns:
-        Dict with frontmatter fields, or None if no frontmatter
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract frontmatter (between --- markers)
-        match = re.search(r'^---\n(.*?)\n---', content, re.DOTALL)
-        if not match:
-            return None
-
-        frontmatter_text = match.group(1)
-
-        # Simple YAML parser (key: value)
-        frontmatter = {}
-        for line in frontmatter_text.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            # Handle "key: value" format
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-
-                # Remove quotes
-                if value.startswith('"') or value.startswith("'"):
-                    value = value[1:-1]
-
-                # Parse arrays (simple)
-                if value.startswith('['):
-                    value = [v.strip() for v in value[1:-1].split(',')]
-
-                frontmatter[key] = value
-
-        return frontmatter if frontmatter else None
-
-    except Exception as e:
-        print(f"⚠️  Error reading {file_path}: {e}")
-        return None
-
-
-def extract_markdown_title(file_path: Path) -> Optional[str]:
-    """
-    Extract title from first Markdown heading (# ...) in Rem file.
-
-    Returns:
-        Title string (without # prefix), or None if not found
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Skip frontmatter (between --- markers)
-        content_without_fm = re.sub(r'^---\n.*?\n---\n', '', content, flags=re.DOTALL)
-
-        # Find first level-1 heading (# Title)
-        match = re.search(r'^#\s+(.+)$', content_without_fm, re.MULTILINE)
-        if match:
-            return match.group(1).strip()
-
-        return None
-
-    except Exception as e:
-        print(f"⚠️  Error extracting title from {file_path}: {e}")
-        return None
-
-
 def is_reviewable_rem(file_path: Path, frontmatter: Dict) -> bool:
     """
     Determine if a Rem file should be added to review schedule.
@@ -310,9 +237,10 @@ def find_all_rems(domain_filter: Optional[str] = None) -> List[tuple]:
     """
     rems = []
 
-    # Recursively scan all .md files
-    for md_file in KB_DIR.rglob('*.md'):
-        frontmatter = extract_frontmatter(md_file)
+    # Frontmatter and headings come from the shared Rem manifest
+    for entry in load_manifest(KB_DIR).entries():
+        md_file = entry.path
+        frontmatter = entry.frontmatter
         if not frontmatter:
             continue
 
@@ -329,7 +257,7 @@ def find_all_rems(domain_filter: Optional[str] = None) -> List[tuple]:
 
         # Extract title from Markdown heading (# ...)
         # Fallback chain: frontmatter title → Markdown heading → rem_id
-        title = frontmatter.get('title') or extract_markdown_title(md_file) or rem_id
+        title = frontmatter.get('title') or entry.heading or rem_id
 
         rems.append((domain, rem_id, md_file, frontmatter, title))
 
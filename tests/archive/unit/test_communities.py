@@ -0,0 +1,125 @@
+"""
+Tests for the community partition cache (scripts/knowledge-graph/communities.py).
+
+Tests coverage for:
+- Louvain partition over the whole knowledge graph
+- Stable community IDs across recomputation
+- Persistence keyed by the backlinks.json signature
+- Review session grouping in ReviewLoader
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).parent.parent.parent / 'scripts'
+sys.path.insert(0, str(SCRIPTS / 'knowledge-graph'))
+sys.path.insert(0, str(SCRIPTS / 'review'))
+
+import knowledge_graph
+from knowledge_graph import KnowledgeGraph
+from communities import CommunityPartition, compute_communities, index_path_for, load_communities
+from review_loader import ReviewLoader
+
+
+def typed(*edges):
+    """backlinks.json document from (from, to, type) triples."""
+    links = {}
+    for a, b, rel in edges:
+        links.setdefault(a, {"links_to": [], "typed_links_to": []})
+        links.setdefault(b, {"links_to": [], "typed_links_to": []})
+        links[a]["links_to"].append(b)
+        links[a]["typed_links_to"].append({"to": b, "type": rel})
+    return {"links": links, "concepts": {}}
+
+
+def cliques(*groups, bridges=()):
+    """Dense groups joined by single bridge edges (one connected component)."""
+    edges = [(a, b, "related") for g in groups for a in g for b in g if a < b]
+    return typed(*edges, *((a, b, "related") for a, b in bridges))
+
+
+BACKLINKS = cliques(("a1", "a2", "a3", "a4"), ("b1", "b2", "b3", "b4"), bridges=[("a1", "b1")])
+
+
+class TestCommunities:
+    """Test partition computation."""
+
+    def test_splits_single_component(self):
+        communities = compute_communities(KnowledgeGraph.from_data(BACKLINKS))
+        assert len(set(communities.values())) == 2
+        assert communities["a1"] == communities["a4"]
+        assert communities["a1"] != communities["b1"]
+
+    def test_ids_stable_against_previous(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        previous = {cid: (7 if cid.startswith("a") else 3) for cid in kg}
+        communities = compute_communities(kg, previous)
+        assert communities["a2"] == 7 and communities["b2"] == 3
+
+    def test_group_keeps_order_and_singletons(self):
+        partition = CommunityPartition({"a": 0, "b": 1, "c": 0})
+        assert partition.group(["a", "b", "x", "c"]) == [["a", "c"], ["b"], ["x"]]
+        assert partition.color("a") != partition.color("b")
+        assert partition.color("x") is None
+
+
+class TestPersistence:
+    """Test the signature-keyed cache next to backlinks.json."""
+
+    def test_recomputed_when_backlinks_change(self, tmp_path):
+        path = tmp_path / "_index" / "backlinks.json"
+        path.parent.mkdir()
+        path.write_text(json.dumps(BACKLINKS), encoding='utf-8')
+        knowledge_graph._GRAPHS.clear()
+
+        first = load_communities(path)
+        assert index_path_for(path).exists()
+        assert load_communities(path).communities == first.communities
+
+        grown = cliques(("a1", "a2", "a3", "a4", "a5"), ("b1", "b2", "b3", "b4"), bridges=[("a1", "b1")])
+        path.write_text(json.dumps(grown), encoding='utf-8')
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        second = load_communities(path)
+        assert second.community("a5") == second.community("a1") == first.community("a1")
+        assert second.community("b1") == first.community("b1")
+        knowledge_graph._GRAPHS.clear()
+
+    def test_rebuild_persists(self, tmp_path):
+        path = tmp_path / "_index" / "backlinks.json"
+        path.parent.mkdir()
+        path.write_text(json.dumps(BACKLINKS), encoding='utf-8')
+        knowledge_graph._GRAPHS.clear()
+
+        cached = load_communities(path)
+        data = json.loads(index_path_for(path).read_text(encoding='utf-8'))
+        data["communities"] = {cid: c + 10 for cid, c in data["communities"].items()}
+        index_path_for(path).write_text(json.dumps(data), encoding='utf-8')
+
+        rebuilt = load_communities(path, rebuild=True)
+        assert rebuilt.communities == cached.communities  # fresh ids, not the edited cache
+        assert json.loads(index_path_for(path).read_text(encoding='utf-8'))["communities"] == cached.communities
+        knowledge_graph._GRAPHS.clear()
+
+
+class TestReviewGrouping:
+    """Test ReviewLoader.sort_by_relation_and_urgency with cached communities."""
+
+    def test_due_rems_grouped_by_community(self, tmp_path, monkeypatch):
+        index_dir = tmp_path / "knowledge-base" / "_index"
+        index_dir.mkdir(parents=True)
+        (index_dir / "backlinks.json").write_text(json.dumps(BACKLINKS), encoding='utf-8')
+        monkeypatch.chdir(tmp_path)
+        knowledge_graph._GRAPHS.clear()
+
+        rems = [
+            {"id": "a2", "fsrs_state": {"next_review": "2025-01-03"}},
+            {"id": "b2", "fsrs_state": {"next_review": "2025-01-02"}},
+            {"id": "a3", "fsrs_state": {"next_review": "2025-01-05"}},
+            {"id": "b3", "fsrs_state": {"next_review": "2025-01-04"}},
+        ]
+        ordered = [r["id"] for r in ReviewLoader().sort_by_relation_and_urgency(rems, None)]
+        assert ordered == ["b2", "b3", "a2", "a3"]
+        knowledge_graph._GRAPHS.clear()
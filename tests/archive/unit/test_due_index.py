@@ -0,0 +1,166 @@
+"""
+Tests for the due index (scripts/review/due_index.py).
+
+Tests coverage for:
+- Due / per-domain / upcoming queries
+- Incremental updates matching a full rebuild
+- Persistence keyed by schedule.json's signature
+- ReviewScheduler.materialize keeping the index current
+- Ratings still pending in the review log
+- Per-concept state lookup without parsing schedule.json
+"""
+
+import json
+import random
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts' / 'review'))
+
+from due_index import DueIndex, concept_state, index_path_for, load_due_index
+from review_log import ReviewLog
+from review_scheduler import ReviewScheduler
+
+
+def concept(next_review, domain="finance"):
+    return {"domain": domain, "fsrs_state": {"next_review": next_review}}
+
+
+CONCEPTS = {
+    "delta": concept("2025-11-01"),
+    "gamma": concept("2025-11-03"),
+    "vega": concept("2025-11-10"),
+    "subjunctive": concept("2025-10-20", "language"),
+    "ser-estar": concept("2025-11-03", "language"),
+    "new-rem": {"domain": "finance", "fsrs_state": {}},
+}
+
+
+@pytest.fixture
+def schedule_path(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({"version": "2.0.0", "concepts": CONCEPTS}))
+    return path
+
+
+class TestQueries:
+    """Test due-date queries."""
+
+    def test_due_and_counts(self):
+        index = DueIndex.from_concepts(CONCEPTS)
+        assert index.due("2025-11-03") == ["subjunctive", "delta", "gamma", "ser-estar"]
+        assert index.count_due("2025-11-02") == 2
+        assert index.count_due("2025-11-03", "language") == 2
+        assert index.count_due_by_domain("2025-11-01") == {"finance": 1, "language": 1}
+        assert len(index) == 5
+
+    def test_upcoming_and_next_review(self):
+        index = DueIndex.from_concepts(CONCEPTS)
+        assert index.upcoming("2025-11-01", 2) == [("2025-11-03", "gamma"), ("2025-11-03", "ser-estar")]
+        assert index.upcoming("2025-11-01", 5, "finance") == [("2025-11-03", "gamma"), ("2025-11-10", "vega")]
+        assert index.next_review() == "2025-10-20"
+        assert index.next_review("missing") is None
+
+
+class TestUpdates:
+    """Test incremental maintenance."""
+
+    def test_random_updates_match_rebuild(self):
+        rng = random.Random(3)
+        concepts = {f"c{i}": concept(f"2025-11-{rng.randint(1, 28):02d}", rng.choice("abc"))
+                    for i in range(50)}
+        index = DueIndex.from_concepts(concepts)
+        for _ in range(200):
+            cid = f"c{rng.randint(0, 59)}"
+            if rng.random() < 0.1:
+                concepts.pop(cid, None)
+                index.remove(cid)
+            else:
+                concepts[cid] = concept(f"2025-11-{rng.randint(1, 28):02d}", rng.choice("abc"))
+                index.update(cid, concepts[cid])
+        rebuilt = DueIndex.from_concepts(concepts)
+        assert index.entries == rebuilt.entries
+        assert index.domains == rebuilt.domains
+
+
+class TestPersistence:
+    """Test the persisted index."""
+
+    def test_cached_until_schedule_changes(self, schedule_path):
+        assert load_due_index(schedule_path).count_due("2025-11-03") == 4
+        assert index_path_for(schedule_path).exists()
+
+        data = json.loads(schedule_path.read_text())
+        data["concepts"]["vega"]["fsrs_state"]["next_review"] = "2025-11-02"
+        schedule_path.write_text(json.dumps(data))
+        assert load_due_index(schedule_path).count_due("2025-11-03") == 5
+
+    def test_materialize_refreshes_index(self, schedule_path):
+        load_due_index(schedule_path)
+        scheduler = ReviewScheduler()
+        updated = scheduler.update_and_save(str(schedule_path), "subjunctive", 3)
+        assert scheduler.materialize(str(schedule_path)) == 1
+
+        cached = json.loads(index_path_for(schedule_path).read_text())
+        st = schedule_path.stat()
+        assert cached["signature"] == [st.st_mtime_ns, st.st_size]
+
+        index = load_due_index(schedule_path)
+        when = updated["fsrs_state"]["next_review"]
+        assert (when, "subjunctive") in index.domains["language"]
+        assert "subjunctive" not in index.due("2025-11-03")
+        concepts = json.loads(schedule_path.read_text())["concepts"]
+        assert index.entries == DueIndex.from_concepts(concepts).entries
+
+    def test_ratings_counted_before_materialize(self, schedule_path):
+        today = date.today().strftime("%Y-%m-%d")
+        assert load_due_index(schedule_path).count_due(today) == 5
+        scheduler = ReviewScheduler()
+        for cid in ("delta", "gamma", "subjunctive"):
+            scheduler.update_and_save(str(schedule_path), cid, 3)
+
+        assert json.loads(schedule_path.read_text())["concepts"] == CONCEPTS
+        assert load_due_index(schedule_path).due(today) == ["ser-estar", "vega"]
+
+        # Rebuilt from schedule.json plus the pending log tail
+        index_path_for(schedule_path).unlink()
+        assert load_due_index(schedule_path).due(today) == ["ser-estar", "vega"]
+
+    def test_overlays_events_logged_by_other_writers(self, schedule_path):
+        load_due_index(schedule_path)
+        ReviewLog(schedule_path).append({"concept": "vega", "rating": 3,
+                                         "fsrs_state": {"next_review": "2099-01-01"}})
+        index = load_due_index(schedule_path)
+        assert index.upcoming("2098-12-31", 1) == [("2099-01-01", "vega")]
+        assert "vega" not in load_due_index(schedule_path).due("2025-11-30")
+
+
+class TestConceptStates:
+    """Test the sorted per-concept state file."""
+
+    def test_lookup_matches_schedule(self, schedule_path):
+        for cid, concept in CONCEPTS.items():
+            assert concept_state(schedule_path, cid) == {"domain": concept["domain"],
+                                                         "fsrs_state": concept["fsrs_state"]}
+        assert concept_state(schedule_path, "missing") is None
+        assert concept_state(schedule_path, "a") is None and concept_state(schedule_path, "zz") is None
+
+    def test_rating_is_append_only(self, schedule_path, monkeypatch):
+        load_due_index(schedule_path)
+        index_bytes = index_path_for(schedule_path).read_bytes()
+
+        def full_parse(*args, **kwargs):
+            raise AssertionError("schedule.json parsed for a single rating")
+
+        monkeypatch.setattr(json, "load", full_parse)
+        updated = ReviewScheduler().update_and_save(str(schedule_path), "vega", 3)
+        assert ReviewScheduler().get_concept(str(schedule_path), "vega")["fsrs_state"] == updated["fsrs_state"]
+        with pytest.raises(ValueError):
+            ReviewScheduler().update_and_save(str(schedule_path), "missing", 3)
+        monkeypatch.undo()
+
+        assert index_path_for(schedule_path).read_bytes() == index_bytes
+        assert json.loads(schedule_path.read_text())["concepts"] == CONCEPTS
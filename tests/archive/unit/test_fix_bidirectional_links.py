@@ -0,0 +1,99 @@
+"""
+Tests for scripts/fix-bidirectional-links.py.
+
+Tests coverage for:
+- Missing reverse links, scoped with --concept-ids
+- Duplicate-free typed_linked_from insertion
+"""
+
+import copy
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS = Path(__file__).parent.parent.parent / 'scripts'
+sys.path.insert(0, str(SCRIPTS / 'knowledge-graph'))
+
+from knowledge_graph import KnowledgeGraph
+
+
+def import_script(script_path):
+    """Import a Python script with hyphens in the name."""
+    spec = importlib.util.spec_from_file_location(script_path.stem.replace('-', '_'), script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+fix_links = import_script(SCRIPTS / 'fix-bidirectional-links.py')
+
+
+def entry(typed_to=(), typed_from=()):
+    return {
+        "links_to": [t for t, _ in typed_to],
+        "typed_links_to": [{"to": t, "type": rel} for t, rel in typed_to],
+        "linked_from": [s for s, _ in typed_from],
+        "typed_linked_from": [{"from": s, "type": rel} for s, rel in typed_from],
+    }
+
+
+BACKLINKS = {
+    "links": {
+        # call-option -> put-option [antonym] has no reverse, but call-option
+        # already carries a stale typed_linked_from entry for it
+        "call-option": entry([("put-option", "antonym"), ("stock", "uses")],
+                             [("put-option", "antonym")]),
+        "put-option": entry(typed_from=[("call-option", "antonym")]),
+        "stock": entry(typed_from=[("call-option", "uses")]),
+        "bond": entry([("yield", "related_to")]),
+        "yield": entry(typed_from=[("bond", "related_to")]),
+    }
+}
+
+
+def missing_edges(concept_ids=None):
+    graph = KnowledgeGraph.from_data(copy.deepcopy(BACKLINKS))
+    missing, _ = fix_links.find_missing_bidirectional(graph, concept_ids)
+    return sorted((m["source"], m["target"], m["type"]) for m in missing)
+
+
+class TestFindMissing:
+    """Test missing-reverse detection."""
+
+    def test_full_scan(self):
+        assert missing_edges() == [
+            ("put-option", "call-option", "antonym"),
+            ("stock", "call-option", "used_in"),
+            ("yield", "bond", "related_to"),
+        ]
+
+    def test_concept_ids_scope(self):
+        assert missing_edges(["yield"]) == [("yield", "bond", "related_to")]
+        assert missing_edges(["stock"]) == [("stock", "call-option", "used_in")]
+        assert missing_edges(["missing-rem"]) == []
+
+
+class TestAddMissing:
+    """Test writing reverse links into backlinks.json data."""
+
+    def test_reverse_entries_not_duplicated(self):
+        data = copy.deepcopy(BACKLINKS)
+        graph = KnowledgeGraph.from_data(data)
+        missing, _ = fix_links.find_missing_bidirectional(graph)
+        assert fix_links.add_missing_links(data, graph, missing) == 3
+
+        links = data["links"]
+        # call-option already listed put-option in typed_linked_from (stale entry)
+        assert links["call-option"]["typed_linked_from"] == [
+            {"from": "put-option", "type": "antonym"},
+            {"from": "stock", "type": "used_in"},
+        ]
+        assert {"to": "call-option", "type": "antonym"} in links["put-option"]["typed_links_to"]
+        assert links["bond"]["typed_linked_from"] == [{"from": "yield", "type": "related_to"}]
+
+        # A second run finds nothing and changes nothing
+        graph = KnowledgeGraph.from_data(data)
+        again, _ = fix_links.find_missing_bidirectional(graph)
+        assert again == []
+        assert fix_links.add_missing_links(data, graph, missing) == 0
+        assert len(links["call-option"]["typed_linked_from"]) == 2
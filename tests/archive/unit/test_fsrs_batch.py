@@ -0,0 +1,116 @@
+"""
+Tests for the vectorized batch FSRS engine (scripts/review/fsrs_batch.py).
+
+Tests coverage for:
+- Parity with FSRSAlgorithm.review over randomized states and ratings
+- Day-ordinal elapsed time (timedelta.days semantics)
+- Due masks and schedule.json loading
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'review'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from fsrs_algorithm import FSRSAlgorithm
+from fsrs_batch import NO_DATE, BatchFSRS
+
+
+def random_concepts(n, seed=7):
+    """Random schedule["concepts"] mixing new and reviewed states."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    concepts = {}
+    for i in range(n):
+        if rng.random() < 0.15:
+            state = {"difficulty": 5.0, "stability": 3.1, "last_review": None, "review_count": 0}
+        else:
+            last = base + timedelta(days=rng.randint(0, 400), hours=rng.choice([0, 0, 9, 23]))
+            last_review = last.strftime('%Y-%m-%d') if last.hour == 0 else last.isoformat()
+            state = {
+                "difficulty": rng.uniform(1, 10),
+                "stability": rng.uniform(0.1, 400),
+                "last_review": last_review,
+                "review_count": rng.randint(1, 30),
+            }
+        state["next_review"] = (base + timedelta(days=rng.randint(0, 500))).strftime('%Y-%m-%d')
+        concepts[f"rem-{i}"] = {"fsrs_state": state}
+    return concepts
+
+
+class TestParity:
+    """BatchFSRS.review must match FSRSAlgorithm.review row by row."""
+
+    @pytest.mark.parametrize("parameters", [None, {"w": FSRSAlgorithm.default_parameters(),
+                                                   "desired_retention": 0.85, "maximum_interval": 365}])
+    def test_randomized_states(self, parameters):
+        concepts = random_concepts(2000)
+        rng = np.random.default_rng(3)
+        ratings = rng.integers(1, 5, len(concepts))
+        review_date = datetime(2026, 3, 1, 14, 30)
+
+        scalar = FSRSAlgorithm(parameters)
+        batch = BatchFSRS(parameters)
+        result = batch.review(batch.columns(concepts), ratings, review_date)
+
+        for i, (cid, concept) in enumerate(concepts.items()):
+            expected = scalar.review(concept["fsrs_state"], int(ratings[i]), review_date)
+            got = batch.to_state(result, i)
+            for key in ("interval", "next_review", "review_count", "last_review"):
+                assert got[key] == expected[key], (cid, key)
+            for key in ("difficulty", "stability", "retrievability"):
+                assert got[key] == pytest.approx(expected[key], abs=1e-4), (cid, key)
+
+    def test_scalar_rating_broadcasts(self):
+        batch = BatchFSRS()
+        cols = batch.columns(random_concepts(10))
+        a = batch.review(cols, 3, datetime(2026, 1, 1))
+        b = batch.review(cols, np.full(10, 3), datetime(2026, 1, 1))
+        assert np.array_equal(a.stability, b.stability)
+
+
+class TestColumns:
+    """Test elapsed time, retrievability and due masks."""
+
+    def test_elapsed_floors_like_timedelta(self):
+        batch = BatchFSRS()
+        cols = batch.columns({
+            "a": {"fsrs_state": {"last_review": "2025-01-01T20:00:00", "review_count": 1, "stability": 1}},
+            "b": {"fsrs_state": {"last_review": "2025-01-01", "review_count": 1, "stability": 1}},
+        })
+        assert list(batch.elapsed_days(cols, datetime(2025, 1, 3, 8))) == [1, 2]
+
+    def test_due_and_retrievability(self):
+        batch = BatchFSRS()
+        cols = batch.columns({
+            "new": {"fsrs_state": {"review_count": 0, "next_review": "2025-02-01"}},
+            "old": {"fsrs_state": {"review_count": 2, "stability": 10.0,
+                                   "last_review": "2025-01-01", "next_review": "2025-01-11"}},
+            "unset": {"fsrs_state": {}},
+        })
+        assert cols.next_review[cols.row("unset")] == NO_DATE
+        assert list(batch.due(cols, "2025-01-20")) == [False, True, False]
+        r = batch.retrievability(cols, "2025-01-11")
+        assert r[0] == 1.0
+        assert r[1] == pytest.approx(0.9)
+
+    def test_load_schedule(self, tmp_path):
+        path = tmp_path / "schedule.json"
+        path.write_text(json.dumps({"version": "2.0.0", "concepts": random_concepts(5)}), encoding='utf-8')
+        cols = BatchFSRS().load_schedule(path)
+        assert cols.ids == [f"rem-{i}" for i in range(5)]
+
+    def test_fitted_parameters_by_default(self, tmp_path):
+        path = tmp_path / "fsrs-parameters.json"
+        w = [round(x * 1.1, 4) for x in FSRSAlgorithm.default_parameters()]
+        path.write_text(json.dumps({"w": w, "desired_retention": 0.85}), encoding='utf-8')
+        batch = BatchFSRS(parameters_path=path)
+        assert list(batch.w) == w and batch.desired_retention == 0.85
+        assert list(BatchFSRS(parameters_path=tmp_path / "missing.json").w) == FSRSAlgorithm.default_parameters()
@@ -0,0 +1,117 @@
+"""
+Tests for FSRS parameter fitting (scripts/review/fsrs_optimizer.py).
+
+Tests coverage for:
+- Per-card log grouping and elapsed-day derivation
+- Vectorized replay matching FSRSAlgorithm
+- Fitting on synthetic history and ReviewScheduler pickup
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts' / 'review'))
+
+from fsrs_algorithm import FSRSAlgorithm
+from fsrs_optimizer import FSRSOptimizer, card_logs, load_history, run_optimization
+from review_scheduler import ReviewScheduler
+
+
+def simulate(w, cards=40, reviews=8, seed=7):
+    """Review events whose recall follows FSRS with weights w."""
+    rng = np.random.default_rng(seed)
+    fsrs = FSRSAlgorithm({"w": list(w)})
+    events = []
+    for c in range(cards):
+        d = s = None
+        for j in range(reviews):
+            elapsed = int(rng.integers(1, 30)) if j else 0
+            if s is None:
+                rating = 3
+                d, s = fsrs.initial_difficulty(rating), fsrs.initial_stability(rating)
+            else:
+                r = fsrs.calculate_retrievability(elapsed, s)
+                rating = int(rng.choice([2, 3, 4], p=[0.2, 0.6, 0.2])) if rng.random() < r else 1
+                s = fsrs.next_stability(d, s, r, rating)
+                d = fsrs.next_difficulty(d, rating)
+            events.append({"concept": f"c{c}", "rating": rating, "elapsed_days": elapsed})
+    return events
+
+
+class TestCardLogs:
+    """Test history grouping."""
+
+    def test_sorted_by_date_with_elapsed_days(self):
+        logs = card_logs([
+            {"rem_id": "a", "rating": 3, "date": "2025-01-05"},
+            {"rem_id": "a", "rating": 1, "date": "2025-01-01"},
+            {"id": "b", "rating": 4},
+            {"concept": "c"},
+        ])
+        assert [(e["rating"], e["elapsed_days"]) for e in logs["a"]] == [(1, 0), (3, 4)]
+        assert list(logs) == ["a", "b"]
+
+
+class TestReplay:
+    """Test the vectorized replay against the scalar algorithm."""
+
+    def test_loss_matches_scalar_replay(self):
+        events = simulate(FSRSAlgorithm.default_parameters(), cards=6, reviews=5)
+        events[0].update(difficulty=6.0, stability=4.0)
+        optimizer = FSRSOptimizer(events)
+        fsrs = FSRSAlgorithm()
+
+        total, count = 0.0, 0
+        for log in card_logs(events).values():
+            d = s = None
+            if log[0]["stability"] is not None:
+                d, s = log[0]["difficulty"], log[0]["stability"]
+            for e in log:
+                if s is None:
+                    d, s = fsrs.initial_difficulty(e["rating"]), fsrs.initial_stability(e["rating"])
+                    continue
+                r = min(max(fsrs.calculate_retrievability(e["elapsed_days"], s), 1e-6), 1 - 1e-6)
+                total -= math.log(r) if e["rating"] > 1 else math.log(1 - r)
+                count += 1
+                s, d = fsrs.next_stability(d, s, r, e["rating"]), fsrs.next_difficulty(d, e["rating"])
+
+        assert optimizer.predicted == count
+        assert math.isclose(optimizer.loss_function(fsrs.w), total / count, rel_tol=1e-9)
+
+
+class TestFit:
+    """Test fitting and parameter pickup."""
+
+    def test_fit_improves_on_default_weights(self):
+        true_w = FSRSAlgorithm.default_parameters()
+        true_w[0:4] = [2.0, 4.0, 8.0, 20.0]
+        true_w[8] = 2.0
+        events = simulate(true_w)
+        result = FSRSOptimizer(events).optimize(max_iterations=100)
+        assert result["success"]
+        assert result["loss"] < result["baseline_loss"]
+
+    def test_run_optimization_writes_parameters(self, tmp_path):
+        history = tmp_path / "history.json"
+        history.write_text(json.dumps({"sessions": [{"reviews": simulate(FSRSAlgorithm.default_parameters(), seed=3)}]}))
+        output = tmp_path / "fsrs-parameters.json"
+
+        result = run_optimization("u1", history, output, max_iterations=50)
+
+        assert len(load_history(history)) == 320
+        if result["optimized"]:
+            saved = json.loads(output.read_text())
+            assert saved["w"] == result["w"] and saved["user_id"] == "u1"
+            assert ReviewScheduler(output).fsrs.w == result["w"]
+        else:
+            assert not output.exists()
+
+    def test_scheduler_ignores_invalid_parameters(self, tmp_path):
+        bad = tmp_path / "fsrs-parameters.json"
+        bad.write_text(json.dumps({"w": [1.0, 2.0]}))
+        assert ReviewScheduler(bad).fsrs.w == FSRSAlgorithm.default_parameters()
+        assert ReviewScheduler(tmp_path / "missing.json").fsrs.w == FSRSAlgorithm.default_parameters()
@@ -4,7 +4,9 @@ Unit tests for scripts/generate-graph-data.py
 
 import unittest
 import json
+import os
 import sys
+import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -278,5 +280,299 @@ class TestGraphGeneration(unittest.TestCase):
         self.assertEqual(result['metadata']['edgeCount'], len(result['edges']))
 
 
+class TestGraphMetrics(unittest.TestCase):
+    """Test server-side metrics, layout and the metrics cache"""
+
+    def setUp(self):
+        self.ids = ['a', 'b', 'c', 'd']
+        self.edges = [
+            {'source': 'a', 'target': 'b', 'weight': 2.5},
+            {'source': 'b', 'target': 'c', 'weight': 1.0},
+            {'source': 'c', 'target': 'a', 'weight': 1.0},
+        ]
+
+    def test_metrics_attributes(self):
+        """Metrics are computed per node; isolated nodes form their own cluster"""
+        metrics, clusters = generate_graph_data.compute_graph_metrics(self.ids, self.edges)
+        self.assertEqual(clusters, 2)
+        self.assertAlmostEqual(sum(m['pageRank'] for m in metrics.values()), 1.0, places=4)
+        self.assertEqual(metrics['a']['clustering'], 1.0)
+        self.assertEqual(metrics['d']['degree'], 0)
+        self.assertEqual(metrics['d']['cluster'], 1)
+        for m in metrics.values():
+            self.assertIn('x', m)
+            self.assertIn('y', m)
+
+    def test_cutoff_layout_deterministic(self):
+        """Large-graph layout is seeded and normalized"""
+        import networkx as nx
+        g = nx.cycle_graph(600)
+        ids = list(g.nodes())
+        pos = generate_graph_data._cutoff_fr_layout(g, ids, iterations=5)
+        self.assertEqual(pos.shape, (600, 2))
+        self.assertLessEqual(abs(pos).max(), 1.0)
+        self.assertTrue((pos == generate_graph_data._cutoff_fr_layout(g, ids, iterations=5)).all())
+
+    def test_metrics_cached_by_graph(self):
+        """Unchanged nodes and edges reuse cached metrics, even under a new backlinks hash"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / 'graph-metrics-cache.json'
+            with patch.object(generate_graph_data, 'METRICS_CACHE_PATH', cache_path):
+                first = generate_graph_data._graph_metrics(self.ids, self.edges, 'h1')
+                self.assertTrue(cache_path.exists())
+                with patch.object(generate_graph_data, 'compute_graph_metrics') as compute:
+                    self.assertEqual(generate_graph_data._graph_metrics(self.ids, self.edges, 'h1'), first)
+                    compute.assert_not_called()
+                    self.assertEqual(generate_graph_data._graph_metrics(self.ids, self.edges, 'h2'), first)
+                    compute.assert_not_called()
+                    compute.return_value = ({}, 0)
+                    edges = self.edges + [{'source': 'c', 'target': 'd', 'weight': 1.0}]
+                    generate_graph_data._graph_metrics(self.ids, edges, 'h3')
+                    compute.assert_called_once()
+
+
+class TestLodExport(unittest.TestCase):
+    """Test the clustered level-of-detail export"""
+
+    def setUp(self):
+        # Two dense triangles per domain joined by a single bridge edge
+        metadata = {cid: {'title': cid.upper(), 'domain': dom}
+                    for dom, ids in (('ict', 'abcdef'), ('health', 'xyz'))
+                    for cid in ids}
+        links = {}
+        for group in ('abc', 'def', 'xyz'):
+            for s_id in group:
+                links[s_id] = {'links_to': [t for t in group if t != s_id]}
+        links['c']['links_to'].append('d')
+        links['a']['links_to'].append('x')
+        self.graph = generate_graph_data.transform_to_graph_format({'links': links}, metadata)
+
+    def test_communities_stay_within_domain(self):
+        clusters = generate_graph_data.detect_communities(self.graph)
+        self.assertEqual(clusters['a'], clusters['b'])
+        self.assertNotEqual(clusters['a'], clusters['d'])
+        self.assertTrue(clusters['x'].startswith('health-'))
+
+    def test_cached_partition_split_by_domain(self):
+        """Tagged nodes are grouped by (domain, community) instead of re-running Louvain"""
+        from communities import CommunityPartition
+        partition = CommunityPartition(
+            {cid: (0 if cid in 'abcxyz' else 1) for cid in 'abcdefxyz'})
+        generate_graph_data.apply_communities(self.graph, partition)
+        self.assertEqual(self.graph['metadata']['communities'], 2)
+        by_id = {n['id']: n for n in self.graph['nodes']}
+        self.assertEqual(by_id['a']['communityColor'], by_id['x']['communityColor'])
+
+        clusters = generate_graph_data.detect_communities(self.graph)
+        self.assertEqual(clusters['a'], clusters['c'])
+        self.assertNotEqual(clusters['a'], clusters['d'])
+        self.assertNotEqual(clusters['a'], clusters['x'])
+
+    def test_super_nodes_and_shards(self):
+        """Every node and edge lands in exactly one cluster view"""
+        clusters = generate_graph_data.detect_communities(self.graph)
+        lod, shards = generate_graph_data.build_lod_graph(self.graph, clusters)
+
+        self.assertEqual(len(lod['nodes']), 3)
+        self.assertEqual(sum(n['members'] for n in lod['nodes']), 9)
+        self.assertTrue(all(n['kind'] == 'cluster' for n in lod['nodes']))
+        self.assertEqual(lod['metadata']['lod']['clusters'], 3)
+
+        intra = sum(len(sh['edges']) for sh in shards.values())
+        external = {id(e) for sh in shards.values() for e in sh['external']}
+        self.assertEqual(intra + len(external), len(self.graph['edges']))
+        self.assertEqual(sum(e['count'] for e in lod['edges']), len(external))
+        for e in shards[clusters['c']]['external']:
+            self.assertIn('sourceCluster', e)
+            self.assertIn('targetCluster', e)
+
+
+class TestContentShards(unittest.TestCase):
+    """Test the lean topology / per-domain content shard split"""
+
+    def setUp(self):
+        conv = {'title': 'Chat', 'path': 'chats/c.md', 'date': '2025-01-01', 'tags': [],
+                'summary': 'S', 'excerpt': 'E', 'content': 'FULL ' * 200}
+        self.metadata = {
+            'a': {'title': 'A', 'domain': 'ict', 'content': 'Body A', 'conversation': conv},
+            'b': {'title': 'B', 'domain': 'ict', 'content': 'Body B', 'conversation': conv},
+            'c': {'title': 'C', 'domain': 'health', 'content': 'Body C', 'conversation': None},
+        }
+        self.graph = generate_graph_data.transform_to_graph_format({'links': {}}, self.metadata)
+
+    def test_topology_has_no_content(self):
+        """Content moves to shards; nodes keep a shard reference"""
+        shards = generate_graph_data.split_content(self.graph, self.metadata)
+        for node in self.graph['nodes']:
+            self.assertNotIn('content', node)
+            self.assertNotIn('conversations', node)
+            self.assertEqual(node['shard'], node['domain'])
+        self.assertEqual(sorted(shards), ['health', 'ict'])
+        self.assertEqual(shards['ict']['nodes']['a']['content'], 'Body A')
+        conv = shards['ict']['nodes']['a']['conversations'][0]
+        self.assertNotIn('content', conv)
+        # Full conversation stored once per shard
+        self.assertEqual(list(shards['ict']['conversations']), ['chats/c.md'])
+        self.assertEqual(shards['health']['conversations'], {})
+
+    def test_write_outputs(self):
+        """Topology and shards are written minified; stale shards removed"""
+        shards = generate_graph_data.split_content(self.graph, self.metadata)
+        with tempfile.TemporaryDirectory() as tmp:
+            op = Path(tmp) / 'graph-data.json'
+            content_dir = Path(tmp) / 'graph-data-content'
+            content_dir.mkdir()
+            (content_dir / 'stale.json').write_text('{}', encoding='utf-8')
+
+            files = generate_graph_data.write_graph_outputs(self.graph, shards, op)
+
+            self.assertEqual(sorted(p.name for p in content_dir.iterdir()), ['health.json', 'ict.json'])
+            self.assertEqual(files['topology']['bytes'], op.stat().st_size)
+            self.assertNotIn('\n', op.read_text(encoding='utf-8'))
+            topology = json.loads(op.read_text(encoding='utf-8'))
+            self.assertEqual(topology['metadata']['contentDir'], 'graph-data-content')
+            ict = json.loads((content_dir / 'ict.json').read_text(encoding='utf-8'))
+            self.assertEqual(ict['nodes']['b']['content'], 'Body B')
+
+
+class TestGraphDelta(unittest.TestCase):
+    """Test snapshot diffing, stabilization and the change manifest"""
+
+    def setUp(self):
+        metadata = {cid: {'title': cid, 'domain': 'ict'} for cid in 'abcd'}
+        self.links = {'a': {'links_to': ['b']}, 'b': {'links_to': ['c']}, 'c': {'links_to': ['a']}}
+        self.metadata = metadata
+        self.prev = generate_graph_data.transform_to_graph_format({'links': self.links}, metadata)
+
+    def _regenerate(self, links):
+        pos = {n['id']: (n['x'], n['y']) for n in self.prev['nodes']}
+        gd = generate_graph_data.transform_to_graph_format({'links': links}, self.metadata, prev_positions=pos)
+        generate_graph_data.stabilize_against(gd, self.prev['nodes'])
+        return gd
+
+    def test_unchanged_graph_has_empty_delta(self):
+        gd = self._regenerate(self.links)
+        delta = generate_graph_data.diff_graphs(self.prev, gd)
+        for kind in ('nodes', 'edges'):
+            self.assertEqual(delta[kind], {'added': [], 'removed': [], 'changed': []})
+
+    def test_delta_lists_touched_nodes_and_edges(self):
+        links = dict(self.links, d={'links_to': ['a']})
+        links['c'] = {'links_to': []}
+        gd = self._regenerate(links)
+        delta = generate_graph_data.diff_graphs(self.prev, gd)
+
+        self.assertEqual([e['source'] for e in delta['edges']['added']], ['d'])
+        self.assertEqual(delta['edges']['removed'], [['c', 'a', 'reference']])
+        changed = {n['id'] for n in delta['nodes']['changed']}
+        self.assertIn('d', changed)
+        # Existing nodes keep their layout position
+        prev_pos = {n['id']: (n['x'], n['y']) for n in self.prev['nodes']}
+        for n in gd['nodes']:
+            self.assertEqual((n['x'], n['y']), prev_pos[n['id']])
+
+    def test_stabilize_keeps_small_metric_changes_and_cluster_ids(self):
+        gd = self._regenerate(self.links)
+        prev = [dict(n) for n in gd['nodes']]
+        for n in gd['nodes']:
+            n['pageRank'] *= 1.01
+            n['cluster'] += 5  # renumbered components map back to old ids
+        gd['nodes'][0]['betweenness'] = prev[0]['betweenness'] + 1
+        generate_graph_data.stabilize_against(gd, prev)
+
+        self.assertEqual([n['pageRank'] for n in gd['nodes']], [n['pageRank'] for n in prev])
+        self.assertEqual([n['cluster'] for n in gd['nodes']], [n['cluster'] for n in prev])
+        self.assertNotEqual(gd['nodes'][0]['betweenness'], prev[0]['betweenness'])
+
+    def test_manifest_versions_and_shard_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            op = Path(tmp) / 'graph-data.json'
+            manifest = None
+            for version, body in ((1, 'one'), (2, 'one'), (3, 'two')):
+                gd = generate_graph_data.transform_to_graph_format({'links': self.links}, self.metadata)
+                shards = {'ict': {'nodes': {'a': {'content': body}}, 'conversations': {}}}
+                prev = generate_graph_data.load_previous_graph(op)
+                files = generate_graph_data.write_graph_outputs(gd, shards, op, None, manifest)
+                manifest, delta = generate_graph_data.write_delta_and_manifest(
+                    op, gd, prev, manifest, files, 'hash', gd['metadata'])
+                self.assertEqual(manifest['version'], version)
+                self.assertEqual(delta['shards']['changed'], [] if version == 2 else ['ict'])
+
+            self.assertFalse(delta['full'])
+            on_disk = json.loads((Path(tmp) / 'graph-data-manifest.json').read_text(encoding='utf-8'))
+            self.assertEqual(on_disk['delta']['file'], 'graph-data-delta.json')
+            self.assertEqual(on_disk['shards']['ict']['sha256'], manifest['shards']['ict']['sha256'])
+
+
+class TestConversationCache(unittest.TestCase):
+    """Test the path+mtime conversation cache"""
+
+    CONV = "---\ndate: 2025-01-01\ntags: [a, b]\n---\n## Summary\nShort.\n\n## Full Conversation\n### User\nHi\n"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.conv = self.dir / 'chat.md'
+        self.conv.write_text(self.CONV, encoding='utf-8')
+        self.cache_path = self.dir / 'conversation-cache.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parsed_once_and_persisted(self):
+        """Shared chats are parsed once per run and reused across runs"""
+        cache = generate_graph_data.ConversationCache(self.cache_path)
+        first = cache.get(self.conv)
+        cache.get(self.conv)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        self.assertEqual(first['summary'], 'Short.')
+        self.assertEqual(first['tags'], ['a', 'b'])
+        self.assertTrue(cache.save())
+
+        reloaded = generate_graph_data.ConversationCache(self.cache_path)
+        with patch.object(generate_graph_data, '_parse_conversation') as parse:
+            self.assertEqual(reloaded.get(self.conv), first)
+            parse.assert_not_called()
+        self.assertFalse(reloaded.save())
+
+    def test_invalidated_on_change(self):
+        """Modified chats are re-parsed"""
+        cache = generate_graph_data.ConversationCache(self.cache_path)
+        cache.get(self.conv)
+        cache.save()
+
+        self.conv.write_text(self.CONV.replace('Short.', 'Longer summary.'), encoding='utf-8')
+        st = self.conv.stat()
+        os.utime(self.conv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        reloaded = generate_graph_data.ConversationCache(self.cache_path)
+        self.assertEqual(reloaded.get(self.conv)['summary'], 'Longer summary.')
+        self.assertEqual(reloaded.misses, 1)
+
+    def test_concept_cache_tracks_rem_and_conversation(self):
+        """Cached Rem metadata is dropped when its conversation changes"""
+        rem = self.dir / 'rem.md'
+        rem.write_text('---\nrem_id: r\n---\n# R\n', encoding='utf-8')
+        meta = {'r': {'title': 'R', 'conversation': {'path': str(self.conv), 'summary': 'Short.', 'content': 'full'}}}
+        conv_cache = generate_graph_data.ConversationCache()
+        cache = generate_graph_data.ConceptCache(self.dir / 'concept-cache.json')
+        cache.put(rem, meta)
+        self.assertNotIn('content', cache.entries[str(rem)]['meta']['r']['conversation'])
+        cache.save()
+
+        reloaded = generate_graph_data.ConceptCache(self.dir / 'concept-cache.json')
+        hit = reloaded.get(rem, conv_cache)
+        self.assertEqual(hit['r']['conversation']['content'], '### User\nHi')
+
+        st = self.conv.stat()
+        os.utime(self.conv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        self.assertIsNone(reloaded.get(rem, conv_cache))
+
+    def test_missing_file(self):
+        """Missing chats yield an empty dict"""
+        cache = generate_graph_data.ConversationCache()
+        self.assertEqual(cache.get(self.dir / 'missing.md'), {})
+
+
 if __name__ == '__main__':
     unittest.main()
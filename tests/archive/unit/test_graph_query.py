@@ -0,0 +1,118 @@
+"""
+Tests for the graph query CLI (scripts/knowledge-graph/graph-query.py).
+
+Tests coverage for:
+- k-hop neighbourhoods with type and direction filters
+- Shortest prerequisite chains (bidirectional BFS)
+- Topological learning orders with condensed cycles
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'knowledge-graph'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from knowledge_graph import KnowledgeGraph
+from reachability import ReachabilityIndex
+
+spec = importlib.util.spec_from_file_location("graph_query", SCRIPT_DIR / "graph-query.py")
+graph_query = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(graph_query)
+
+
+def typed(*edges):
+    """backlinks.json document from (from, to, type) triples."""
+    links = {}
+    for a, b, rel in edges:
+        links.setdefault(a, {"links_to": [], "typed_links_to": []})
+        links.setdefault(b, {"links_to": [], "typed_links_to": []})
+        links[a]["links_to"].append(b)
+        links[a]["typed_links_to"].append({"to": b, "type": rel})
+    return {"links": links, "concepts": {"sets": {"title": "Sets"}}}
+
+
+BACKLINKS = typed(
+    ("sets", "functions", "prerequisite_of"),
+    ("functions", "limits", "prerequisite_of"),
+    ("derivatives", "limits", "depends_on"),
+    ("sets", "limits", "related"),
+    ("integrals", "derivatives", "has_prerequisite"),
+    ("p", "q", "prerequisite_of"),
+    ("q", "p", "prerequisite_of"),
+    ("q", "integrals", "prerequisite_of"),
+)
+
+
+@pytest.fixture
+def kg():
+    return KnowledgeGraph.from_data(BACKLINKS)
+
+
+@pytest.fixture
+def index(kg):
+    return ReachabilityIndex.from_graph(kg)
+
+
+class TestNeighborhood:
+    """Test k-hop neighbourhoods."""
+
+    def test_distances_and_types(self, kg):
+        result = graph_query.neighborhood(kg, 'sets', hops=2, direction='out')
+        by_id = {n['id']: n for n in result['neighbors']}
+        assert by_id['functions']['distance'] == 1
+        assert by_id['limits'] == {
+            "id": "limits", "title": "limits", "distance": 1,
+            "via": "sets", "direction": "out", "types": ["related"],
+        }
+        assert result['title'] == 'Sets'
+
+    def test_type_filter_and_direction(self, kg):
+        result = graph_query.neighborhood(kg, 'limits', hops=3, types=['prerequisite_of', 'depends_on'],
+                                          direction='in')
+        assert [(n['id'], n['distance']) for n in result['neighbors']] == [
+            ('functions', 1), ('derivatives', 1), ('sets', 2)]
+
+    def test_limit(self, kg):
+        result = graph_query.neighborhood(kg, 'sets', hops=5, limit=2)
+        assert result['total'] == 2 and result['truncated']
+
+
+class TestPrerequisitePath:
+    """Test shortest prerequisite chains."""
+
+    def test_chain_through_mixed_relation_types(self, kg, index):
+        result = graph_query.prerequisite_path(kg, index, 'sets', 'integrals')
+        assert [n['id'] for n in result['chain']] == [
+            'sets', 'functions', 'limits', 'derivatives', 'integrals']
+        assert result['direction'] == 'a_before_b' and result['length'] == 4
+
+    def test_reverse_direction(self, kg, index):
+        result = graph_query.prerequisite_path(kg, index, 'derivatives', 'functions')
+        assert result['direction'] == 'b_before_a'
+        assert [n['id'] for n in result['chain']] == ['functions', 'limits', 'derivatives']
+
+    def test_unrelated(self, kg, index):
+        result = graph_query.prerequisite_path(kg, index, 'sets', 'p')
+        assert result['chain'] == [] and result['direction'] is None
+
+
+class TestLearningOrder:
+    """Test topological learning orders."""
+
+    def test_prerequisites_first(self, kg, index):
+        result = graph_query.learning_order(kg, index, 'integrals')
+        order = result['order']
+        assert order[-1] == 'integrals'
+        assert order.index('sets') < order.index('functions') < order.index('limits') \
+            < order.index('derivatives')
+        assert result['cycles'] == [['p', 'q']]
+        assert [n['id'] for n in result['levels'][0]] == ['p', 'q', 'sets']
+        assert all(n['cycle'] for n in result['levels'][0] if n['id'] in ('p', 'q'))
+
+    def test_no_prerequisites(self, kg, index):
+        result = graph_query.learning_order(kg, index, 'sets')
+        assert result['order'] == ['sets']
@@ -0,0 +1,163 @@
+"""
+Tests for the in-process KnowledgeGraph (scripts/knowledge-graph/knowledge_graph.py).
+
+Tests coverage for:
+- Adjacency / reverse indexes built from backlinks.json
+- O(1) typed edge lookups
+- mtime-keyed pickle cache
+"""
+
+import json
+import os
+import pickle
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'knowledge-graph'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import knowledge_graph
+from knowledge_graph import KnowledgeGraph, load_graph, pickle_path_for
+
+
+BACKLINKS = {
+    "version": "1.1.0",
+    "links": {
+        "call-option": {
+            "links_to": ["option-delta", "stock", "market"],
+            "typed_links_to": [
+                {"to": "option-delta", "type": "prerequisite_of"},
+                {"to": "stock", "type": "uses"},
+            ],
+            "linked_from": [],
+            "typed_linked_from": [],
+            "inferred_links_to": [{"to": "market", "via": "stock", "score": 0.5}],
+        },
+        "option-delta": {
+            "links_to": ["call-option"],
+            "typed_links_to": [{"to": "call-option", "type": "has_prerequisite"}],
+            "linked_from": ["call-option"],
+            "typed_linked_from": [{"from": "call-option", "type": "prerequisite_of"}],
+        },
+        "stock": {
+            "links_to": [],
+            "typed_links_to": [],
+            "linked_from": ["call-option"],
+            "typed_linked_from": [{"from": "call-option", "type": "uses"}],
+        },
+    },
+    "concepts": {
+        "call-option": {"title": "Call Option", "file": "finance/call-option.md"},
+        "option-delta": {"title": "Option Delta", "file": "finance/option-delta.md"},
+        "stock": {"title": "Stock", "file": "finance/stock.md"},
+    },
+    "metadata": {"total_concepts": 3},
+}
+
+
+@pytest.fixture
+def backlinks_file(tmp_path):
+    """Write backlinks.json into a temporary _index directory."""
+    index_dir = tmp_path / "_index"
+    index_dir.mkdir()
+    path = index_dir / "backlinks.json"
+    path.write_text(json.dumps(BACKLINKS), encoding='utf-8')
+    knowledge_graph._GRAPHS.clear()
+    yield path
+    knowledge_graph._GRAPHS.clear()
+
+
+class TestKnowledgeGraph:
+    """Test index construction and queries."""
+
+    def test_membership_excludes_broken_targets(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        assert "call-option" in kg
+        assert "market" not in kg
+        assert len(kg) == 3
+        assert list(kg) == ["call-option", "option-delta", "stock"]
+
+    def test_has_edge(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        assert kg.has_edge("call-option", "option-delta")
+        assert kg.has_edge("call-option", "market")
+        assert kg.has_edge("call-option", "option-delta", "prerequisite_of")
+        assert not kg.has_edge("call-option", "option-delta", "uses")
+        assert not kg.has_edge("stock", "call-option")
+        assert not kg.has_edge("unknown", "stock")
+
+    def test_neighbors_and_reverse(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        assert kg.neighbors("call-option") == ["option-delta", "stock", "market"]
+        assert kg.neighbors("call-option", types={"uses"}) == ["stock"]
+        assert kg.reverse("stock") == ["call-option"]
+        assert kg.reverse("call-option", types={"has_prerequisite"}) == ["option-delta"]
+        assert kg.reverse("unknown") == []
+
+    def test_typed_edge_lists_and_metadata(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        assert kg.typed_links_to("call-option") == [
+            ("option-delta", "prerequisite_of"), ("stock", "uses")
+        ]
+        assert kg.typed_linked_from("option-delta") == [("call-option", "prerequisite_of")]
+        assert kg.relation_types("call-option", "stock") == {"uses"}
+        assert kg.title("stock") == "Stock"
+        assert kg.title("market") == "market"
+
+    def test_inferred_links(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        assert kg.inferred_links_to("call-option") == [("market", "stock")]
+        assert kg.inferred_links_to("stock") == []
+        assert "market" not in kg
+
+    def test_add_typed_edge_is_idempotent(self):
+        kg = KnowledgeGraph.from_data(BACKLINKS)
+        assert kg.add_typed_edge("stock", "call-option", "used_by")
+        assert not kg.add_typed_edge("stock", "call-option", "used_by")
+        assert kg.has_edge("stock", "call-option", "used_by")
+        assert kg.typed_linked_from("call-option") == [
+            ("option-delta", "has_prerequisite"), ("stock", "used_by")
+        ]
+
+
+class TestPickleCache:
+    """Test mtime-keyed pickle cache."""
+
+    def test_cache_written_and_reused(self, backlinks_file):
+        kg = load_graph(backlinks_file)
+        assert pickle_path_for(backlinks_file).exists()
+
+        knowledge_graph._GRAPHS.clear()
+        cached = load_graph(backlinks_file)
+        assert cached is not kg
+        assert cached.neighbors("call-option") == kg.neighbors("call-option")
+
+    def test_cache_invalidated_on_change(self, backlinks_file):
+        load_graph(backlinks_file)
+
+        data = json.loads(backlinks_file.read_text(encoding='utf-8'))
+        data["links"]["stock"]["links_to"] = ["call-option"]
+        backlinks_file.write_text(json.dumps(data), encoding='utf-8')
+        st = backlinks_file.stat()
+        os.utime(backlinks_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert load_graph(backlinks_file).has_edge("stock", "call-option")
+
+    def test_script_pickles_importable_class(self, backlinks_file, monkeypatch, capsys):
+        """Run as a script, the cache must not record __main__.KnowledgeGraph."""
+        monkeypatch.setattr(knowledge_graph, "BACKLINKS_PATH", backlinks_file)
+        monkeypatch.setattr(sys, "argv", ["knowledge_graph.py", "call-option"])
+        with pytest.raises(SystemExit) as exit_info:
+            runpy.run_path(knowledge_graph.__file__, run_name="__main__")
+        assert exit_info.value.code == 0
+        assert json.loads(capsys.readouterr().out)["id"] == "call-option"
+
+        with open(pickle_path_for(backlinks_file), 'rb') as f:
+            assert type(pickle.load(f)["graph"]).__module__ == "knowledge_graph"
+
+    def test_missing_index_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_graph(tmp_path / "backlinks.json")
@@ -0,0 +1,173 @@
+"""
+Tests for the hierarchy reachability index (scripts/knowledge-graph/reachability.py).
+
+Tests coverage for:
+- Closure over prerequisite / component hierarchies with SCC condensation
+- Cycle checks for proposed edges, including batch overlays
+- Persistence keyed by the backlinks.json signature
+- KB-wide checks in validate_hierarchical_consistency
+- DAG depth levels and prerequisite-ordered review queues
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).parent.parent.parent / 'scripts'
+sys.path.insert(0, str(SCRIPTS / 'knowledge-graph'))
+sys.path.insert(0, str(SCRIPTS / 'archival'))
+sys.path.insert(0, str(SCRIPTS / 'review'))
+
+import knowledge_graph
+from knowledge_graph import KnowledgeGraph
+from reachability import Hierarchy, ReachabilityIndex, index_path_for, load_reachability
+from review_loader import ReviewLoader
+from validate_hierarchical_consistency import check_hierarchy, detect_cycles
+
+
+def typed(*edges):
+    """backlinks.json document from (from, to, type) triples."""
+    links = {}
+    for a, b, rel in edges:
+        links.setdefault(a, {"links_to": [], "typed_links_to": []})
+        links.setdefault(b, {"links_to": [], "typed_links_to": []})
+        links[a]["links_to"].append(b)
+        links[a]["typed_links_to"].append({"to": b, "type": rel})
+    return {"links": links, "concepts": {}}
+
+
+BACKLINKS = typed(
+    ("sets", "functions", "prerequisite_of"),
+    ("functions", "limits", "prerequisite_of"),
+    ("derivatives", "limits", "depends_on"),
+    ("wheel", "car", "component_of"),
+    ("a", "b", "prerequisite_of"),
+    ("b", "a", "prerequisite_of"),
+)
+
+
+@pytest.fixture
+def index():
+    return ReachabilityIndex.from_graph(KnowledgeGraph.from_data(BACKLINKS))
+
+
+class TestHierarchy:
+    """Test closure and queries."""
+
+    def test_transitive_reachability(self, index):
+        assert index.reaches('prerequisite', 'sets', 'derivatives')
+        assert not index.reaches('prerequisite', 'derivatives', 'sets')
+        assert index.reaches('component', 'wheel', 'car')
+        assert not index.reaches('prerequisite', 'wheel', 'car')
+
+    def test_existing_cycles_condensed(self, index):
+        prereq = index.families['prerequisite']
+        assert prereq.cycles() == [['a', 'b']]
+        assert prereq.reaches('a', 'b') and prereq.reaches('b', 'a')
+
+    def test_closes_cycle(self, index):
+        assert index.closes_cycle('derivatives', 'sets', 'prerequisite_of') == [
+            'derivatives', 'sets', 'functions', 'limits', 'derivatives']
+        assert index.closes_cycle('sets', 'derivatives', 'has_prerequisite') is not None
+        assert index.closes_cycle('sets', 'derivatives', 'prerequisite_of') is None
+        assert index.closes_cycle('car', 'wheel', 'component_of') == ['car', 'wheel', 'car']
+        assert index.closes_cycle('car', 'wheel', 'related_to') is None
+
+    def test_batch_overlay(self, index):
+        assert index.add_edge('x', 'y', 'prerequisite_of')
+        assert index.add_edge('y', 'sets', 'prerequisite_of')
+        assert index.reaches('prerequisite', 'x', 'limits')
+        assert index.closes_cycle('limits', 'x', 'prerequisite_of') is not None
+        assert not index.add_edge('limits', 'x', 'prerequisite_of')
+
+    def test_json_round_trip(self, index):
+        prereq = index.families['prerequisite']
+        restored = Hierarchy.from_json(json.loads(json.dumps(prereq.to_json())))
+        assert restored.reaches('sets', 'derivatives')
+        assert restored.cycles() == prereq.cycles()
+        assert restored.path('sets', 'limits') == ['sets', 'functions', 'limits']
+
+
+class TestLevels:
+    """Test DAG depth levels over the condensation."""
+
+    def test_longest_chain_depth(self, index):
+        prereq = index.families['prerequisite']
+        assert [prereq.level(c) for c in ('sets', 'functions', 'limits', 'derivatives')] == [0, 1, 2, 3]
+        assert prereq.level('a') == prereq.level('b') == 0
+        assert prereq.level('unknown') == 0
+
+    def test_overlay_and_round_trip(self, index):
+        prereq = index.families['prerequisite']
+        index.add_edge('derivatives', 'a', 'prerequisite_of')
+        assert prereq.level('a') == prereq.level('b') == 4
+        restored = Hierarchy.from_json(json.loads(json.dumps(prereq.to_json())))
+        assert restored.level('b') == 4
+
+
+class TestPersistence:
+    """Test the signature-keyed cache next to backlinks.json."""
+
+    def test_rebuilt_when_backlinks_change(self, tmp_path):
+        path = tmp_path / "_index" / "backlinks.json"
+        path.parent.mkdir()
+        path.write_text(json.dumps(BACKLINKS), encoding='utf-8')
+        knowledge_graph._GRAPHS.clear()
+
+        assert load_reachability(path).reaches('prerequisite', 'sets', 'limits')
+        assert index_path_for(path).exists()
+        assert load_reachability(path).reaches('prerequisite', 'sets', 'limits')
+
+        path.write_text(json.dumps(typed(("limits", "sets", "prerequisite_of"))), encoding='utf-8')
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        index = load_reachability(path)
+        assert index.reaches('prerequisite', 'limits', 'sets')
+        assert not index.reaches('prerequisite', 'sets', 'limits')
+        knowledge_graph._GRAPHS.clear()
+
+
+class TestValidatorIntegration:
+    """Test KB-wide checks in validate_hierarchical_consistency."""
+
+    def test_check_hierarchy_against_kb_and_batch(self, index):
+        rems = [
+            {"rem_id": "integrals", "typed_relations": [
+                {"to": "sets", "type": "prerequisite_of"},
+                {"to": "derivatives", "type": "depends_on"},
+            ]},
+        ]
+        errors, cycles = check_hierarchy(rems, index)
+        assert [(e.from_rem, e.to_rem) for e in errors] == [("integrals", "derivatives")]
+        assert cycles == [["derivatives", "integrals", "sets", "functions", "limits"]]
+
+    def test_detect_cycles_without_index_is_batch_only(self):
+        rems = [
+            {"rem_id": "p", "typed_relations": [{"to": "q", "type": "prerequisite_of"}]},
+            {"rem_id": "q", "typed_relations": [{"to": "p", "type": "prerequisite_of"}]},
+        ]
+        assert len(detect_cycles(rems)) == 1
+
+
+class TestReviewOrder:
+    """Test ReviewLoader.sort_by_prerequisites."""
+
+    def test_prerequisites_before_dependants(self, tmp_path, monkeypatch):
+        index_dir = tmp_path / "knowledge-base" / "_index"
+        index_dir.mkdir(parents=True)
+        (index_dir / "backlinks.json").write_text(json.dumps(BACKLINKS), encoding='utf-8')
+        monkeypatch.chdir(tmp_path)
+        knowledge_graph._GRAPHS.clear()
+
+        rems = [
+            {"id": "derivatives", "fsrs_state": {"next_review": "2025-01-01"}},
+            {"id": "wheel", "fsrs_state": {"next_review": "2025-01-03"}},
+            {"id": "functions", "fsrs_state": {"next_review": "2025-01-02"}},
+            {"id": "sets", "fsrs_state": {"next_review": "2025-01-04"}},
+        ]
+        ordered = [r["id"] for r in ReviewLoader().sort_by_prerequisites(rems, None)]
+        assert ordered == ["wheel", "sets", "functions", "derivatives"]
+        knowledge_graph._GRAPHS.clear()
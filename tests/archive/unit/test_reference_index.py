@@ -0,0 +1,133 @@
+"""
+Tests for the reverse reference index (scripts/knowledge-graph/reference_index.py)
+and the batch rename in standardize-rem-names.py.
+
+Tests coverage for:
+- Wikilink and file-link reference offsets; file links resolved by path
+- Incremental (stat-keyed) refresh and persistence
+- Batch rename: one write per file, schedule.json written once
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'knowledge-graph'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from reference_index import ReferenceIndex, scan_references
+
+
+def import_script(script_name):
+    """Import a Python script with hyphens in the name."""
+    spec = importlib.util.spec_from_file_location(script_name.replace('-', '_'), SCRIPT_DIR / script_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Knowledge base with one domain plus a chats archive."""
+    kb = tmp_path / "knowledge-base"
+    chats = tmp_path / "chats"
+    (kb / "language" / "french").mkdir(parents=True)
+    (kb / "_index").mkdir()
+    chats.mkdir()
+    (kb / "language" / "french" / "vouloir-verb.md").write_text(
+        "---\nrem_id: vouloir-verb\n---\n# Vouloir\nSee [[avoir-faim-expression]].\n", encoding='utf-8')
+    (kb / "language" / "french" / "avoir-faim-expression.md").write_text(
+        "# Avoir faim\n- [Vouloir](vouloir-verb.md) {rel: related}\n- [[vouloir-verb]]\n", encoding='utf-8')
+    (chats / "2025-01-01-session.md").write_text(
+        "Created [[vouloir-verb]] and [[avoir-faim-expression]].\n", encoding='utf-8')
+    return tmp_path
+
+
+class TestScanReferences:
+    """Test reference extraction."""
+
+    def test_offsets_point_at_names(self, tmp_path):
+        text = "a [[x-y]] b [T](../d/x-y.md) c [U](z.rem.md) [[x-y]]"
+        refs = scan_references(text, tmp_path / "kb" / "c", tmp_path / "kb")
+        assert set(refs) == {"x-y", "file:d/x-y.md", "file:c/z.rem.md"}
+        assert all(text[o:o + 3] == "x-y" for o in refs["x-y"])
+        assert len(refs["x-y"]) == 2
+        assert text[refs["file:d/x-y.md"][0]:].startswith("x-y.md)")
+        assert text[refs["file:c/z.rem.md"][0]:].startswith("z.rem.md)")
+
+    def test_file_links_resolved_against_source(self, tmp_path):
+        kb = tmp_path / "knowledge-base"
+        text = "[x](https://example.com/docs/foo.md) [y](../../chats/2025/foo.md) [z](/abs/foo.md) [w](foo.md)"
+        refs = scan_references(text, kb / "finance", kb)
+        assert set(refs) == {"file:finance/foo.md"}
+        assert set(scan_references("[a](../finance/foo.md)", kb / "language", kb)) == {"file:finance/foo.md"}
+
+
+class TestReferenceIndex:
+    """Test refresh, persistence and lookups."""
+
+    def test_refresh_is_incremental(self, corpus):
+        roots = {"kb": corpus / "knowledge-base", "chats": corpus / "chats"}
+        index = ReferenceIndex(roots).load().refresh()
+        assert index.stats["scanned"] == 3
+        assert sorted(index.references("vouloir-verb")) == [
+            "chats/2025-01-01-session.md",
+            "kb/language/french/avoir-faim-expression.md",
+        ]
+        assert index.save()
+
+        reloaded = ReferenceIndex(roots).load().refresh()
+        assert reloaded.stats == {"reused": 3, "scanned": 0, "removed": 0}
+
+        path = corpus / "chats" / "2025-01-01-session.md"
+        path.write_text("Nothing here.\n", encoding='utf-8')
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        reloaded.refresh()
+        assert reloaded.stats["scanned"] == 1
+        assert list(reloaded.references("vouloir-verb")) == ["kb/language/french/avoir-faim-expression.md"]
+
+
+class TestBatchRename:
+    """Test standardize-rem-names batch rename."""
+
+    def test_domain_rename(self, corpus, monkeypatch):
+        standardize = import_script('standardize-rem-names.py')
+        schedule = corpus / ".review" / "schedule.json"
+        schedule.parent.mkdir()
+        schedule.write_text(json.dumps({"concepts": {
+            "vouloir-verb": {"rem_id": "vouloir-verb"},
+            "avoir-faim-expression": {"rem_id": "avoir-faim-expression"},
+        }}), encoding='utf-8')
+        finance = corpus / "knowledge-base" / "finance"
+        finance.mkdir()
+        (finance / "vouloir-verb.md").write_text("# Unrelated\n", encoding='utf-8')
+        notes = ("[Same name](vouloir-verb.md) [Web](https://example.com/fr/vouloir-verb.md) "
+                 "[Rem](../language/french/vouloir-verb.md)\n")
+        (finance / "notes.md").write_text(notes, encoding='utf-8')
+        monkeypatch.setattr(standardize, 'KB_DIR', corpus / "knowledge-base")
+        monkeypatch.setattr(standardize, 'CHATS_DIR', corpus / "chats")
+        monkeypatch.setattr(standardize, 'SCHEDULE_FILE', schedule)
+
+        standardize.standardize_domain('language/french')
+
+        french = corpus / "knowledge-base" / "language" / "french"
+        assert sorted(p.name for p in french.iterdir()) == [
+            "french-expression-avoir-faim.md", "french-verb-vouloir.md"]
+        text = (french / "french-expression-avoir-faim.md").read_text(encoding='utf-8')
+        assert "[Vouloir](french-verb-vouloir.md)" in text
+        assert "[[french-verb-vouloir]]" in text
+        assert "[[french-expression-avoir-faim]]" in (french / "french-verb-vouloir.md").read_text(encoding='utf-8')
+        assert (finance / "notes.md").read_text(encoding='utf-8') == notes.replace(
+            "(../language/french/vouloir-verb.md)", "(../language/french/french-verb-vouloir.md)")
+        chat = (corpus / "chats" / "2025-01-01-session.md").read_text(encoding='utf-8')
+        assert chat == "Created [[french-verb-vouloir]] and [[french-expression-avoir-faim]].\n"
+
+        concepts = json.loads(schedule.read_text(encoding='utf-8'))["concepts"]
+        assert set(concepts) == {"french-verb-vouloir", "french-expression-avoir-faim"}
+        assert concepts["french-verb-vouloir"]["rem_id"] == "french-verb-vouloir"
+        assert len(list(schedule.parent.glob("schedule.json.backup-*"))) == 1
@@ -0,0 +1,138 @@
+"""
+Tests for the batch Related Rems rewriter (scripts/knowledge-graph/related_rems.py).
+
+Tests coverage for:
+- Related Rems sections regenerated from one in-memory graph
+- Normalized links treated as unchanged
+- Inferred links skipped when already linked
+- Atomic rewrite of changed files only, with byte accounting
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'knowledge-graph'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from knowledge_graph import KnowledgeGraph
+from related_rems import (
+    BatchRewriter,
+    plan_inferred_links,
+    plan_related_sync,
+    replace_related_section,
+)
+
+
+BACKLINKS = {
+    "links": {
+        "call-option": {
+            "links_to": ["put-option"],
+            "typed_links_to": [{"to": "put-option", "type": "contrasts_with"}],
+            "inferred_links_to": [{"to": "stock", "via": "put-option", "score": 1.0}],
+        },
+        "put-option": {
+            "links_to": ["stock"],
+            "typed_links_to": [
+                {"to": "call-option", "type": "contrasts_with"},
+                {"to": "stock", "type": "uses"},
+            ],
+        },
+        "stock": {"links_to": [], "typed_links_to": []},
+    },
+    "concepts": {
+        "call-option": {"title": "Call Option", "file": "finance/call-option.md"},
+        "put-option": {"title": "Put Option", "file": "finance/put-option.md"},
+        "stock": {"title": "Stock", "file": "equity/stock.md"},
+    },
+}
+
+FRONTMATTER = "---\ntitle: {title}\n---\n\n# {title}\n"
+
+
+@pytest.fixture
+def kb(tmp_path):
+    """Three Rems across two domains, none with a Related Rems section yet."""
+    for cid, meta in BACKLINKS["concepts"].items():
+        path = tmp_path / meta["file"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(FRONTMATTER.format(title=meta["title"]), encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def graph():
+    return KnowledgeGraph.from_data(BACKLINKS)
+
+
+class TestRelatedSync:
+    """Test section planning and rewriting."""
+
+    def test_sections_written_once_then_stable(self, kb, graph):
+        rewriter = BatchRewriter(kb)
+        assert plan_related_sync(rewriter, graph, list(graph)) == []
+        stats = rewriter.run()
+        assert stats.files_changed == 3
+        assert stats.bytes_written == sum(p.stat().st_size for p in stats.changed)
+
+        text = (kb / "finance" / "put-option.md").read_text(encoding='utf-8')
+        assert "- [[call-option]] {rel: contrasts_with}\n- [[stock]] {rel: uses}" in text
+        assert "*(No related Rems found)*" in (kb / "equity" / "stock.md").read_text(encoding='utf-8')
+
+        rewriter = BatchRewriter(kb)
+        plan_related_sync(rewriter, graph, list(graph))
+        stats = rewriter.run()
+        assert stats.files_changed == 0
+        assert stats.files_unchanged == 3
+
+    def test_normalized_links_count_as_unchanged(self, graph):
+        files = {"finance/call-option.md": "call-option", "equity/stock.md": "stock"}
+        related = [("call-option", "Call Option", "finance/call-option.md", "contrasts_with"),
+                   ("stock", "Stock", "equity/stock.md", "uses")]
+        content = ("# Put Option\n\n## Related Rems\n\n"
+                   "- [Call Option](call-option.md) {rel: contrasts_with}\n"
+                   "- [Stock](../equity/stock.md) {rel: uses}\n")
+        assert replace_related_section(content, related, "finance/put-option.md", files) == content
+
+        changed = replace_related_section(content, related[:1], "finance/put-option.md", files)
+        assert "- [[call-option]] {rel: contrasts_with}" in changed
+        assert "stock" not in changed.split("## Related Rems")[1]
+
+    def test_missing_file_is_skipped(self, kb, graph):
+        (kb / "equity" / "stock.md").unlink()
+        rewriter = BatchRewriter(kb)
+        skipped = plan_related_sync(rewriter, graph, ["stock", "unknown"])
+        assert [cid for cid, _ in skipped] == ["stock", "unknown"]
+        assert len(rewriter) == 0
+
+    def test_dry_run_reports_without_writing(self, kb, graph):
+        before = (kb / "finance" / "call-option.md").read_text(encoding='utf-8')
+        rewriter = BatchRewriter(kb, dry_run=True)
+        plan_related_sync(rewriter, graph, ["call-option"])
+        stats = rewriter.run()
+        assert stats.files_changed == 1 and stats.bytes_written > len(before)
+        assert (kb / "finance" / "call-option.md").read_text(encoding='utf-8') == before
+
+
+class TestInferredLinks:
+    """Test inferred-link materialization through the batch engine."""
+
+    def test_inferred_bullet_added_once(self, kb, graph):
+        assert graph.inferred_links_to("call-option") == [("stock", "put-option")]
+
+        rewriter = BatchRewriter(kb)
+        tally = plan_inferred_links(rewriter, graph)
+        stats = rewriter.run()
+        assert tally == {"queued": 1, "added": 1}
+        assert stats.files_changed == 1
+        text = (kb / "finance" / "call-option.md").read_text(encoding='utf-8')
+        assert "- [[stock]] {rel: inferred, via: put-option}" in text
+
+        # Once normalized to a file link, the target still counts as linked
+        path = kb / "finance" / "call-option.md"
+        path.write_text(text.replace("[[stock]]", "[Stock](../equity/stock.md)"), encoding='utf-8')
+        rewriter = BatchRewriter(kb)
+        tally = plan_inferred_links(rewriter, graph)
+        assert rewriter.run().files_changed == 0
+        assert tally["added"] == 0
@@ -0,0 +1,117 @@
+"""
+Tests for the Rem corpus manifest (scripts/knowledge-graph/rem_manifest.py).
+
+Tests coverage for:
+- Reuse of entries whose (mtime_ns, size) signature is unchanged
+- SHA-256 change detection for touched and modified files
+- Dropping entries for deleted files
+- Persistence and fingerprint
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'knowledge-graph'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from rem_manifest import RemManifest, load_manifest, manifest_path_for
+
+
+def write_rem(path, rem_id, title):
+    path.write_text(f"---\nrem_id: {rem_id}\ntitle: {title}\n---\n# {title}\nBody.\n", encoding='utf-8')
+
+
+@pytest.fixture
+def kb(tmp_path):
+    """Knowledge base with two Rems in one domain."""
+    root = tmp_path / "knowledge-base"
+    (root / "finance").mkdir(parents=True)
+    write_rem(root / "finance" / "call-option.md", "call-option", "Call Option")
+    write_rem(root / "finance" / "put-option.md", "put-option", "Put Option")
+    return root
+
+
+class TestRefresh:
+    """Test incremental refresh of the manifest."""
+
+    def test_initial_parse(self, kb):
+        manifest = RemManifest(kb).load().refresh()
+        assert manifest.stats == {"reused": 0, "parsed": 2, "removed": 0}
+        entry = manifest.get("finance/call-option.md")
+        assert entry.rem_id == "call-option"
+        assert entry.title == "Call Option"
+        assert entry.heading == "Call Option"
+        assert [e.rel_path for e in manifest.entries()] == ["finance/call-option.md", "finance/put-option.md"]
+
+    def test_unchanged_signature_is_reused(self, kb):
+        manifest = RemManifest(kb).load().refresh()
+        path = kb / "finance" / "call-option.md"
+        st = path.stat()
+        # Same size and mtime: the file is not re-read, even though its bytes differ
+        write_rem(path, "call-optiom", "Call Option")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        manifest.refresh()
+        assert manifest.stats == {"reused": 2, "parsed": 0, "removed": 0}
+        assert manifest.get("finance/call-option.md").rem_id == "call-option"
+
+    def test_touched_file_keeps_parse(self, kb):
+        manifest = RemManifest(kb).load().refresh()
+        path = kb / "finance" / "call-option.md"
+        before = manifest.get("finance/call-option.md")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+        manifest.refresh()
+        entry = manifest.get("finance/call-option.md")
+        assert entry is before
+        assert entry.mtime_ns == st.st_mtime_ns + 10 ** 9
+
+    def test_modified_file_is_rehashed(self, kb):
+        manifest = RemManifest(kb).load().refresh()
+        path = kb / "finance" / "call-option.md"
+        old_hash = manifest.get("finance/call-option.md").sha256
+        st = path.stat()
+        write_rem(path, "call-option", "European Call Option")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+        manifest.refresh()
+        entry = manifest.get("finance/call-option.md")
+        assert manifest.stats == {"reused": 1, "parsed": 1, "removed": 0}
+        assert entry.sha256 != old_hash
+        assert entry.title == "European Call Option"
+
+    def test_deleted_file_is_removed(self, kb):
+        manifest = RemManifest(kb).load().refresh()
+        fingerprint = manifest.fingerprint()
+        (kb / "finance" / "put-option.md").unlink()
+
+        manifest.refresh()
+        assert manifest.stats == {"reused": 1, "parsed": 0, "removed": 1}
+        assert manifest.get("finance/put-option.md") is None
+        assert len(manifest) == 1
+        assert manifest.fingerprint() != fingerprint
+
+
+class TestPersistence:
+    """Test saving and reloading the manifest."""
+
+    def test_reload_reuses_entries(self, kb):
+        first = load_manifest(kb)
+        assert manifest_path_for(kb).exists()
+        assert not first.dirty
+
+        second = load_manifest(kb)
+        assert second.stats == {"reused": 2, "parsed": 0, "removed": 0}
+        assert second.fingerprint() == first.fingerprint()
+        assert not second.save()  # nothing changed, nothing written
+
+    def test_corrupt_manifest_is_rebuilt(self, kb):
+        manifest_path_for(kb).parent.mkdir(parents=True)
+        manifest_path_for(kb).write_text("{not json", encoding='utf-8')
+        manifest = load_manifest(kb)
+        assert manifest.stats["parsed"] == 2
+        assert RemManifest(kb).load().get("finance/put-option.md").rem_id == "put-option"
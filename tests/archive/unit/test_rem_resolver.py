@@ -0,0 +1,101 @@
+"""
+Tests for the rem_id → file resolver (scripts/knowledge-graph/rem_resolver.py).
+
+Tests coverage for:
+- Exact frontmatter rem_id hits and domain tie-breaking
+- Numeric-prefix and suffix filename hits, legacy .rem.md files
+- The fuzzy (most rem_id words) fallback
+- Rebuilding the persisted index when the manifest fingerprint changes
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).parent.parent.parent / 'scripts' / 'knowledge-graph'
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import rem_resolver
+from rem_resolver import RemResolver, get_resolver
+
+
+@pytest.fixture
+def kb(tmp_path, monkeypatch):
+    """Knowledge base with two domains; the per-process resolver cache is isolated."""
+    monkeypatch.setattr(rem_resolver, '_RESOLVERS', {})
+    root = tmp_path / "knowledge-base"
+    finance = root / "0412-finance"
+    language = root / "0231-language"
+    finance.mkdir(parents=True)
+    language.mkdir(parents=True)
+    (finance / "call-option.md").write_text("---\nrem_id: call-option\n---\n# Call\n", encoding='utf-8')
+    (finance / "renamed-file.md").write_text("---\nrem_id: put-option\n---\n# Put\n", encoding='utf-8')
+    (finance / "041-interest-rate-swap.md").write_text("# Swap\n", encoding='utf-8')
+    (finance / "fx-derivatives-pricing-shift-kinds.md").write_text("# FX\n", encoding='utf-8')
+    (finance / "old-concept.rem.md").write_text("# Legacy\n", encoding='utf-8')
+    (language / "call-option.md").write_text("# Homonym\n", encoding='utf-8')
+    return root
+
+
+class TestResolve:
+    """Test the resolution tiers."""
+
+    def test_frontmatter_rem_id(self, kb):
+        resolver = get_resolver(kb)
+        assert resolver.resolve("put-option") == kb / "0412-finance" / "renamed-file.md"
+        assert resolver.resolve("PUT-OPTION") == kb / "0412-finance" / "renamed-file.md"
+        assert resolver.by_rem_id("call-option") == [kb / "0412-finance" / "call-option.md"]
+
+    def test_domain_breaks_ties(self, kb):
+        resolver = get_resolver(kb)
+        assert resolver.resolve("call-option", domain="0412-finance") == kb / "0412-finance" / "call-option.md"
+        assert len(resolver.find_all("call-option")) == 1  # rem_id tier wins over stems
+        assert len(resolver.stems["call-option"]) == 2
+
+    def test_numeric_prefix_and_suffix(self, kb):
+        resolver = get_resolver(kb)
+        swap = kb / "0412-finance" / "041-interest-rate-swap.md"
+        assert resolver.resolve("interest-rate-swap") == swap
+        assert resolver.resolve("rate-swap") == swap
+
+    def test_legacy_files(self, kb):
+        resolver = get_resolver(kb)
+        assert resolver.resolve("old-concept") == kb / "0412-finance" / "old-concept.rem.md"
+
+    def test_fuzzy_fallback(self, kb):
+        resolver = get_resolver(kb)
+        fx = kb / "0412-finance" / "fx-derivatives-pricing-shift-kinds.md"
+        assert resolver.resolve("fx-pricing-shift-types") == fx
+        assert resolver.resolve("fx-pricing-shift-types", fuzzy=False) is None
+        assert resolver.resolve("fx-pricing-shift-types", domain="0231-language") is None
+        assert resolver.resolve("no-such-rem") is None
+
+
+class TestPersistence:
+    """Test the fingerprint-keyed index on disk."""
+
+    def test_unchanged_fingerprint_reuses_index(self, kb):
+        first = get_resolver(kb)
+        assert first.index_path.exists()
+        rem_resolver._RESOLVERS.clear()
+        with patch.object(RemResolver, 'build') as build:
+            second = get_resolver(kb)
+            build.assert_not_called()
+        assert second.fingerprint == first.fingerprint
+        assert second.resolve("interest-rate-swap") == kb / "0412-finance" / "041-interest-rate-swap.md"
+
+    def test_changed_fingerprint_rebuilds(self, kb):
+        first = get_resolver(kb)
+        assert first.resolve("bond-yield", fuzzy=False) is None
+        (kb / "0412-finance" / "bond-yield.md").write_text("---\nrem_id: bond-yield\n---\n", encoding='utf-8')
+
+        assert get_resolver(kb) is first  # cached for the rest of the process
+        rem_resolver._RESOLVERS.clear()
+        second = get_resolver(kb)
+        assert second.fingerprint != first.fingerprint
+        assert second.resolve("bond-yield") == kb / "0412-finance" / "bond-yield.md"
+
+        reloaded = RemResolver(kb)
+        assert reloaded.load() and reloaded.fingerprint == second.fingerprint
@@ -0,0 +1,118 @@
+"""
+Tests for the append-only review log (scripts/review/review_log.py).
+
+Tests coverage for:
+- Appending, reading and torn-line handling
+- Lazy materialization of schedule.json by ReviewScheduler
+- Crash recovery by replaying the log tail
+- Log events as FSRS optimizer history
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts' / 'review'))
+
+from fsrs_optimizer import card_logs, load_review_log
+from review_log import ReviewLog
+from review_scheduler import ReviewScheduler
+
+
+def state(next_review, review_count=1):
+    return {"difficulty": 5.0, "stability": 4.0, "retrievability": 0.9, "interval": 4,
+            "next_review": next_review, "review_count": review_count, "last_review": "2025-10-20"}
+
+
+@pytest.fixture
+def schedule_path(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({"version": "2.0.0", "concepts": {
+        "delta": {"domain": "finance", "fsrs_state": state("2025-10-24")},
+        "gamma": {"domain": "finance", "fsrs_state": {}},
+    }}, indent=2))
+    return path
+
+
+def on_disk(path, cid):
+    return json.loads(Path(path).read_text())["concepts"][cid]["fsrs_state"]
+
+
+class TestReviewLog:
+    """Test the log file itself."""
+
+    def test_append_and_read(self, schedule_path):
+        log = ReviewLog(schedule_path)
+        start, end = log.append({"concept": "delta", "rating": 3, "fsrs_state": state("2025-11-01")})
+        assert start == 0 and end == log.size()
+        events, offset = log.read()
+        assert [e["rating"] for e in events] == [3] and offset == end
+
+    def test_torn_line_is_skipped_and_terminated(self, schedule_path):
+        log = ReviewLog(schedule_path)
+        log.append({"concept": "delta", "rating": 3, "fsrs_state": state("2025-11-01")})
+        with open(log.path, 'ab') as f:
+            f.write(b'{"concept": "delta", "rat')
+        events, offset = log.read()
+        assert len(events) == 1 and offset < log.size()
+
+        log.append({"concept": "gamma", "rating": 4, "fsrs_state": state("2025-11-05")})
+        events, offset = log.read()
+        assert [e["concept"] for e in events] == ["delta", "gamma"] and offset == log.size()
+
+
+class TestMaterialize:
+    """Test lazy schedule.json materialization."""
+
+    def test_ratings_logged_not_rewritten(self, schedule_path):
+        before = schedule_path.read_bytes()
+        scheduler = ReviewScheduler()
+        updated = scheduler.update_and_save(str(schedule_path), "gamma", 3)
+
+        assert schedule_path.read_bytes() == before
+        assert scheduler.load_schedule(str(schedule_path))["concepts"]["gamma"]["fsrs_state"] == \
+            updated["fsrs_state"]
+        assert ReviewScheduler().load_schedule(str(schedule_path))["concepts"]["gamma"]["fsrs_state"] == \
+            updated["fsrs_state"]
+
+        assert scheduler.materialize(str(schedule_path)) == 1
+        assert on_disk(schedule_path, "gamma") == updated["fsrs_state"]
+        assert scheduler.materialize(str(schedule_path)) == 0
+
+    def test_materialized_every_n_ratings(self, schedule_path):
+        scheduler = ReviewScheduler(compact_every=3)
+        for rating in (3, 3):
+            scheduler.update_and_save(str(schedule_path), "delta", rating)
+        assert on_disk(schedule_path, "delta")["review_count"] == 1
+        updated = scheduler.update_and_save(str(schedule_path), "delta", 4)
+        assert on_disk(schedule_path, "delta") == updated["fsrs_state"]
+        assert updated["fsrs_state"]["review_count"] == 4
+
+    def test_crash_recovery_replays_tail(self, schedule_path):
+        scheduler = ReviewScheduler()
+        scheduler.update_and_save(str(schedule_path), "delta", 3)
+        scheduler.materialize(str(schedule_path))
+        updated = scheduler.update_and_save(str(schedule_path), "gamma", 2)
+
+        # Crash after schedule.json was written but before the checkpoint moved
+        log = ReviewLog(schedule_path)
+        log.checkpoint_path.unlink()
+        assert ReviewScheduler().materialize(str(schedule_path)) == 2
+        assert on_disk(schedule_path, "gamma") == updated["fsrs_state"]
+        assert on_disk(schedule_path, "delta")["review_count"] == 2
+        assert log.checkpoint() == log.size()
+
+
+class TestOptimizerHistory:
+    """Test log events as optimizer input."""
+
+    def test_events_carry_prior_state(self, schedule_path):
+        scheduler = ReviewScheduler()
+        scheduler.update_and_save(str(schedule_path), "delta", 1)
+        scheduler.update_and_save(str(schedule_path), "gamma", 3)
+
+        logs = card_logs(load_review_log(schedule_path))
+        assert logs["delta"][0]["stability"] == 4.0 and logs["delta"][0]["elapsed_days"] > 0
+        assert logs["gamma"][0]["stability"] is None
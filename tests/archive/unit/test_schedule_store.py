@@ -0,0 +1,131 @@
+"""
+Tests for the SQLite schedule store (scripts/review/schedule_store.py).
+
+Tests coverage for:
+- Import from schedule.json and the review log, export back to v2.0.0 JSON
+- Due queries on the indexed concepts table
+- ReviewScheduler / ReviewLoader using the store when enabled
+- Merging outside edits to schedule.json
+- Read-only readers (mini review, progress) seeing ratings not yet exported
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts' / 'review'))
+
+from mini_review_session import get_due_count, select_random_due_rem
+from review_loader import ReviewLoader
+from review_scheduler import ReviewScheduler
+from schedule_store import create_store, open_store, store_path_for
+
+
+def state(next_review, review_count=1):
+    return {"difficulty": 5.0, "stability": 4.0, "retrievability": 0.9, "interval": 4,
+            "next_review": next_review, "review_count": review_count, "last_review": "2025-10-20"}
+
+
+SCHEDULE = {
+    "version": "2.0.0",
+    "concepts": {
+        "delta": {"id": "delta", "title": "Δ Delta", "domain": "finance", "fsrs_state": state("2025-10-24")},
+        "gamma": {"id": "gamma", "title": "Gamma", "domain": "finance", "fsrs_state": state("2025-11-20")},
+        "ser": {"id": "ser", "title": "Ser", "domain": "language", "fsrs_state": state("2025-10-01")},
+    },
+    "metadata": {"total_concepts": 3},
+}
+
+
+@pytest.fixture
+def schedule_path(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps(SCHEDULE, indent=2))
+    return path
+
+
+class TestImportExport:
+    """Test enabling the backend and regenerating JSON."""
+
+    def test_round_trip(self, schedule_path):
+        ReviewScheduler().update_and_save(str(schedule_path), "gamma", 3)  # pending in the review log
+        store = create_store(schedule_path)
+
+        assert len(store) == 3 and len(store.reviews()) == 1
+        assert store.to_schedule() == json.loads(schedule_path.read_text())
+        assert list(store.to_schedule()) == ["version", "concepts", "metadata"]
+        conn = sqlite3.connect(str(store_path_for(schedule_path)))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_concepts_next_review", "idx_concepts_domain"} <= indexes
+
+    def test_queries(self, schedule_path):
+        store = create_store(schedule_path)
+        assert store.due("2025-10-24") == ["ser", "delta"]
+        assert store.count_due("2025-10-24", "finance") == 1
+        assert store.count_due_by_domain("2025-12-01") == {"finance": 2, "language": 1}
+        assert store.upcoming("2025-10-24", 5) == [("2025-11-20", "gamma")]
+
+
+class TestSchedulerBackend:
+    """Test the scheduler and loader on the SQLite backend."""
+
+    def test_ratings_go_to_store_then_export(self, schedule_path):
+        create_store(schedule_path)
+        before = schedule_path.read_bytes()
+        scheduler = ReviewScheduler()
+        updated = scheduler.update_and_save(str(schedule_path), "delta", 4)
+
+        assert schedule_path.read_bytes() == before
+        assert not store_path_for(schedule_path).with_name("review-log.jsonl").exists()
+        assert open_store(schedule_path).concept("delta")["fsrs_state"] == updated["fsrs_state"]
+        assert ReviewLoader(str(schedule_path)).load_schedule()["delta"]["fsrs_state"] == updated["fsrs_state"]
+
+        assert scheduler.materialize(str(schedule_path)) == 1
+        exported = json.loads(schedule_path.read_text())
+        assert exported["concepts"]["delta"]["fsrs_state"] == updated["fsrs_state"]
+        assert exported["metadata"] == SCHEDULE["metadata"]
+        assert scheduler.materialize(str(schedule_path)) == 0
+
+    def test_loader_due_filter(self, schedule_path):
+        create_store(schedule_path)
+        rems = ReviewLoader(str(schedule_path)).filter_rems({"mode": "automatic"}, "2025-10-24")
+        assert [r["id"] for r in rems] == ["ser", "delta"]
+
+    def test_outside_edits_are_merged(self, schedule_path):
+        create_store(schedule_path)
+        updated = ReviewScheduler().update_and_save(str(schedule_path), "delta", 3)
+
+        # Another tool rewrites schedule.json from its stale copy and adds a Rem
+        data = json.loads(schedule_path.read_text())
+        data["concepts"]["vega"] = {"id": "vega", "domain": "finance", "fsrs_state": {}}
+        del data["concepts"]["ser"]
+        data["concepts"]["delta"]["title"] = "Delta"
+        schedule_path.write_text(json.dumps(data))
+
+        # Readers see the store as last written; the next writer merges
+        reader = open_store(schedule_path)
+        assert list(reader.concepts()) == ["delta", "gamma", "ser"]
+        store = open_store(schedule_path, write=True)
+        assert list(store.concepts()) == ["delta", "gamma", "vega"]
+        assert store.concept("delta")["title"] == "Delta"
+        assert store.concept("delta")["fsrs_state"] == updated["fsrs_state"]
+
+    def test_readers_are_read_only(self, schedule_path):
+        create_store(schedule_path)
+        reader = open_store(schedule_path)
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            reader.conn.execute("DELETE FROM concepts")
+        assert reader.count_due("2025-10-24") == 2
+
+    def test_readers_see_unexported_ratings(self, schedule_path):
+        create_store(schedule_path)
+        ReviewScheduler().update_and_save(str(schedule_path), "delta", 4)  # no longer due
+
+        assert get_due_count(schedule_path)["total"] == 2
+        picked = select_random_due_rem(schedule_path, "most_overdue")
+        assert picked["id"] == "ser" and picked["_days_overdue"] > 0
+        assert open_store(schedule_path).next_review("finance") == "2025-11-20"
@@ -9,6 +9,7 @@ Tests coverage for:
 """
 
 import json
+import logging
 import re
 import sys
 import tempfile
@@ -358,6 +359,80 @@ class TestBuildBacklinkGraph:
             # Should not duplicate direct links
             assert link["to"] not in graph["call-option"]["links_to"]
 
+    def test_inferred_links_ranked_and_capped(self):
+        """Test inferred links are ranked by weighted path score and capped at top-K."""
+        forward = {
+            "a": ["b", "c", "d"],
+            "b": ["x", "y"],
+            "c": ["x", "z"],
+            "d": ["x", "y"],
+            "x": [], "y": [], "z": [],
+        }
+        typed = {
+            "a": [{"to": "c", "type": "prerequisite_of"}],
+            "b": [{"to": "x", "type": "contrasts_with"}],
+            "c": [{"to": "z", "type": "prerequisite_of"}],
+        }
+
+        inferred = rebuild_backlinks.compute_inferred_links(forward, typed, top_k=0)["a"]
+        # z: 1 strong path (1.0), x: 3 paths (0.125 + 0.5 + 0.25), y: 2 paths (0.25 + 0.25)
+        assert [link["to"] for link in inferred] == ["z", "x", "y"]
+        assert inferred[0] == {"to": "z", "via": "c", "paths": 1, "score": 1.0}
+        assert inferred[1]["paths"] == 3
+        assert inferred[1]["via"] == "c"  # strongest single path wins
+
+        capped = rebuild_backlinks.compute_inferred_links(forward, typed, ["a"], top_k=2)
+        assert list(capped) == ["a"]
+        assert [link["to"] for link in capped["a"]] == ["z", "x"]
+
+    def test_parallel_extraction_matches_serial(self, temp_kb, monkeypatch):
+        """--jobs N yields the same records in the same order as --jobs 1."""
+        # Workers are pickled by module name, so load the script under an importable one
+        spec = importlib.util.spec_from_file_location('rebuild_backlinks', SCRIPT_DIR / 'rebuild-backlinks.py')
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, 'rebuild_backlinks', module)
+        spec.loader.exec_module(module)
+        for i in range(6):
+            (temp_kb / "finance" / f"extra-{i}.md").write_text(f"# Extra {i}\n- [[stock]]\n- [[extra-{i + 1}]]\n")
+        rem_files = scan_rems(temp_kb)
+        serial = module.extract_records(rem_files, jobs=1)
+        assert all(record is not None for record, _ in serial)
+        assert module.extract_records(rem_files, jobs=3) == serial
+
+
+class TestIncrementalPatch:
+    """Test patch_backlink_graph (--incremental) against a full rebuild."""
+
+    @staticmethod
+    def records(kb_dir):
+        return [record for record, _ in rebuild_backlinks.extract_records(scan_rems(kb_dir))]
+
+    @staticmethod
+    def output(result):
+        return rebuild_backlinks.serialize_backlinks(generate_backlinks_json(*result))
+
+    @pytest.mark.parametrize("change", ["add", "edit", "remove"])
+    def test_patch_matches_full_rebuild(self, temp_kb, change):
+        logger = logging.getLogger("test-incremental")
+        concepts = temp_kb / "finance" / "concepts"
+        prev = generate_backlinks_json(*rebuild_backlinks.assemble_graph(self.records(temp_kb), logger))
+        prev_links = json.loads(rebuild_backlinks.serialize_backlinks(prev))["links"]
+
+        if change == "add":
+            (concepts / "market.md").write_text(
+                "---\nid: market\ntitle: Market\n---\n# Market\n- [[stock]] {rel: related}\n- [[put-option]]\n")
+        elif change == "edit":
+            # stock's plain link retargeted from call-option to put-option
+            (concepts / "stock.md").write_text(
+                "---\nid: stock\ntitle: Stock\n---\n# Stock\n- [[put-option]]\n- [[market]]\n")
+        else:
+            (concepts / "put-option.md").unlink()
+
+        records = self.records(temp_kb)
+        patched = rebuild_backlinks.patch_backlink_graph(prev_links, records, logger)
+        assert patched is not None
+        assert self.output(patched) == self.output(rebuild_backlinks.assemble_graph(records, logger))
+
 
 class TestGenerateBacklinksJson:
     """Test generate_backlinks_json function."""
@@ -446,6 +521,46 @@ See [[call-option]] for details.
         finally:
             normalize_links.KB_DIR = old_kb
 
+    def test_normalize_keeps_typed_suffix_once(self, temp_kb):
+        """Test typed suffix stays in place and is not duplicated."""
+        normalize_links = import_script('normalize-links.py')
+        old_kb = normalize_links.KB_DIR
+        normalize_links.KB_DIR = temp_kb
+
+        try:
+            index = normalize_links.build_concept_index()
+            current_file = temp_kb / "finance" / "concepts" / "test.md"
+            for content in ("- [[put-option]] {rel: antonym}\n",
+                            "---\ntitle: Test\n---\n- [[put-option]] {rel: antonym}\n"):
+                result = normalize_links.convert_content(content, current_file, index, "replace")
+                assert result.endswith("- [Put Option](put-option.md) {rel: antonym}\n")
+        finally:
+            normalize_links.KB_DIR = old_kb
+
+    def test_normalize_link_cache_flags(self, temp_kb):
+        """Test files without wikilinks are skipped until their content changes."""
+        normalize_links = import_script('normalize-links.py')
+        manifest = normalize_links.load_manifest(temp_kb, save=False)
+        cache = normalize_links.LinkCache(temp_kb)
+        index = cache.concept_index(manifest)
+        assert set(index) == {"call-option", "put-option", "stock"}
+
+        put_option = temp_kb / "finance" / "concepts" / "put-option.md"
+        sha, has_links, changed = normalize_links.normalize_file(put_option, index, "replace")
+        assert changed and not has_links
+        assert "[Call Option](call-option.md) {rel: antonym}" in put_option.read_text()
+
+        rel = "finance/concepts/put-option.md"
+        cache.set_flag(rel, sha, has_links)
+        cache.save()
+
+        reloaded = normalize_links.LinkCache(temp_kb).load()
+        manifest = normalize_links.load_manifest(temp_kb, save=False)
+        assert reloaded.concept_index(manifest) == index
+        assert not reloaded.needs_scan(rel, manifest.get(rel).sha256)
+        assert reloaded.needs_scan(rel, "0" * 64)
+        assert reloaded.needs_scan("finance/concepts/stock.md", manifest.get("finance/concepts/stock.md").sha256)
+
 
 class TestAddRelationScript:
     """Test add-relation.py script functions."""
@@ -647,7 +762,42 @@ id: b
                 assert link["to"] != concept_id
         
         shutil.rmtree(tmpdir)
-    
+
+    def test_strongly_connected_components(self):
+        """Test SCC ids and cycle report in metadata."""
+        graph = {
+            "a": {"links_to": ["b"]},
+            "b": {"links_to": ["c", "missing"]},
+            "c": {"links_to": ["a", "d"]},
+            "d": {"links_to": ["d"]},
+            "e": {"links_to": ["a"]},
+        }
+        for data in graph.values():
+            data.update({"typed_links_to": [], "linked_from": [],
+                         "typed_linked_from": [], "inferred_links_to": []})
+
+        components = rebuild_backlinks.find_strongly_connected_components(graph)
+        assert components == [["a", "b", "c"], ["d"], ["e"]]
+
+        output = generate_backlinks_json(graph, set(), {})
+        scc_id = output["metadata"]["scc_id"]
+        assert scc_id["a"] == scc_id["b"] == scc_id["c"] == 0
+        assert scc_id["d"] == 1 and scc_id["e"] == 2
+
+        cyclic = output["metadata"]["cyclic_components"]
+        assert [c["scc_id"] for c in cyclic] == [0, 1]
+        assert cyclic[0]["cycle"] == ["a", "b", "c", "a"]
+        assert cyclic[1]["cycle"] == ["d", "d"]
+
+    def test_deep_chain_does_not_recurse(self):
+        """Test SCC detection on a chain deeper than the recursion limit."""
+        n = sys.getrecursionlimit() * 2
+        graph = {f"n{i}": {"links_to": [f"n{i + 1}"] if i + 1 < n else ["n0"]} for i in range(n)}
+
+        components = rebuild_backlinks.find_strongly_connected_components(graph)
+        assert len(components) == 1
+        assert len(components[0]) == n
+
     def test_concept_with_no_links(self):
         """Test concept with no outgoing links."""
         tmpdir = tempfile.mkdtemp()